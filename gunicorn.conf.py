@@ -7,7 +7,13 @@ backlog = 2048
 
 # Worker processes
 workers = 2
-worker_class = "sync"
+# Threaded workers serve job_platform.wsgi - a turn waiting on the LLM or TTS
+# holds one thread, not the whole worker. Most views are sync, so under
+# job_platform.asgi (GUNICORN_WORKER_CLASS=uvicorn_worker.UvicornWorker) they
+# would share one executor thread per worker and streamed responses would be
+# buffered; benchmark with `manage.py loadtest_interviews` before switching.
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.environ.get("GUNICORN_THREADS", 8))
 worker_connections = 1000
 timeout = 60  # Increased from default 30 seconds
 keepalive = 2
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 import os
+import tempfile
 from pathlib import Path
 from decouple import config
 try:
@@ -356,6 +357,31 @@ NEW_TTS_API_KEY = config('NEW_TTS_API_KEY', default='')
 NEW_TTS_VOICE_ID = config('NEW_TTS_VOICE_ID', default='')
 NEW_TTS_MODEL_ID = config('NEW_TTS_MODEL_ID', default='')
 
+        # LLM client connection pool (shared per worker process)
+LLM_POOL_MAX_CONNECTIONS = config('LLM_POOL_MAX_CONNECTIONS', default=20, cast=int)
+LLM_POOL_MAX_KEEPALIVE = config('LLM_POOL_MAX_KEEPALIVE', default=10, cast=int)
+LLM_POOL_KEEPALIVE_EXPIRY = config('LLM_POOL_KEEPALIVE_EXPIRY', default=30.0, cast=float)
+LLM_HTTP2 = config('LLM_HTTP2', default=True, cast=bool)  # Needs the optional h2 package
+
+        # Interviewer completion cache (jobapp.utils.llm_cache) - per worker process; the job
+        # namespace versions live in LLM_CACHE_ALIAS so invalidation reaches every worker
+LLM_CACHE_ENABLED = config('LLM_CACHE_ENABLED', default=True, cast=bool)
+LLM_CACHE_MAX_ENTRIES = config('LLM_CACHE_MAX_ENTRIES', default=2000, cast=int)
+LLM_CACHE_TTL = config('LLM_CACHE_TTL', default=3600, cast=int)
+LLM_CACHE_ALIAS = 'llm_versions'
+LLM_CACHE_VERSION_TTL = config('LLM_CACHE_VERSION_TTL', default=5.0, cast=float)  # Seconds a worker reuses a namespace version
+
+        # Upstream circuit breakers (jobapp.upstream_health) for the LLM and Daisy TTS. After
+        # UPSTREAM_FAILURE_THRESHOLD consecutive failures calls go straight to the fallbacks
+        # until a background probe succeeds; timeouts follow the observed p95 latency
+UPSTREAM_FAILURE_THRESHOLD = config('UPSTREAM_FAILURE_THRESHOLD', default=3, cast=int)
+UPSTREAM_COOLDOWN = config('UPSTREAM_COOLDOWN', default=15.0, cast=float)  # Seconds before the first probe, doubled while probes fail
+UPSTREAM_MAX_COOLDOWN = config('UPSTREAM_MAX_COOLDOWN', default=300.0, cast=float)
+UPSTREAM_WINDOW = config('UPSTREAM_WINDOW', default=50, cast=int)  # Recent calls kept per upstream
+UPSTREAM_MIN_SAMPLES = config('UPSTREAM_MIN_SAMPLES', default=10, cast=int)  # Successful calls before timeouts adapt
+UPSTREAM_TIMEOUT_FACTOR = config('UPSTREAM_TIMEOUT_FACTOR', default=2.0, cast=float)  # Timeout = p95 latency x this
+UPSTREAM_TIMEOUT_FLOOR = config('UPSTREAM_TIMEOUT_FLOOR', default=3.0, cast=float)
+
         # COMMENTED OUT - RunPod TTS Configuration (replaced with ElevenLabs)
         # RUNPOD_API_KEY = config('RUNPOD_API_KEY', default='')
         # JWT_SECRET = config('JWT_SECRET', default='')
@@ -369,6 +395,111 @@ SESSION_SAVE_EVERY_REQUEST = True
 SESSION_EXPIRE_AT_BROWSER_CLOSE = False
 SESSION_COOKIE_AGE = 7200  # 2 hours
 
+        # Interview conversation state store (header row + append-only turn log)
+        # Options: jobapp.interview_state.DatabaseBackend, .CacheBackend, .MemoryBackend
+INTERVIEW_STATE_BACKEND = config('INTERVIEW_STATE_BACKEND', default='jobapp.interview_state.DatabaseBackend')
+        # Cache alias for the CacheBackend - must be shared by all worker processes, not LocMemCache
+INTERVIEW_STATE_CACHE_ALIAS = config('INTERVIEW_STATE_CACHE_ALIAS', default='fragments')
+
+        # TTS audio cache (jobapp.tts_cache) - least recently used files are evicted past these limits
+TTS_CACHE_MAX_BYTES = config('TTS_CACHE_MAX_BYTES', default=500 * 1024 * 1024, cast=int)
+TTS_CACHE_MAX_FILES = config('TTS_CACHE_MAX_FILES', default=5000, cast=int)
+# Pre-synthesize scripted interviewer phrases (jobapp.interview_phrases) on startup and for new jobs/interviews
+TTS_PHRASE_WARMUP = config('TTS_PHRASE_WARMUP', default=True, cast=bool)
+
+        # Background task queue (jobapp.tasks). With TASK_WORKER_EMBEDDED each web
+        # process runs a worker thread - for development; production runs
+        # `manage.py run_task_worker` as its own service (render.yaml)
+TASK_WORKER_EMBEDDED = config('TASK_WORKER_EMBEDDED', default=DEBUG, cast=bool)
+TASK_POLL_INTERVAL = config('TASK_POLL_INTERVAL', default=5.0, cast=float)
+TASK_RETRY_BASE_DELAY = config('TASK_RETRY_BASE_DELAY', default=30, cast=int)
+TASK_RETRY_MAX_DELAY = config('TASK_RETRY_MAX_DELAY', default=3600, cast=int)
+TASK_LOCK_TIMEOUT = config('TASK_LOCK_TIMEOUT', default=600, cast=int)  # Reclaim tasks whose worker died (running tasks refresh their lock every quarter of this)
+TASK_RETENTION_DAYS = config('TASK_RETENTION_DAYS', default=14, cast=int)  # Finished tasks are deleted by a daily sweep
+
+        # Email outbox (jobapp.outbox). Emails are queued by requests and sent by the task
+        # worker in batches, one SMTP connection per batch
+OUTBOX_BATCH_SIZE = config('OUTBOX_BATCH_SIZE', default=50, cast=int)
+OUTBOX_MAX_ATTEMPTS = config('OUTBOX_MAX_ATTEMPTS', default=6, cast=int)
+OUTBOX_RETRY_BASE_DELAY = config('OUTBOX_RETRY_BASE_DELAY', default=60, cast=int)
+OUTBOX_RETRY_MAX_DELAY = config('OUTBOX_RETRY_MAX_DELAY', default=3600, cast=int)
+OUTBOX_LOCK_TIMEOUT = config('OUTBOX_LOCK_TIMEOUT', default=300, cast=int)  # Resend emails whose worker died mid-batch
+OUTBOX_RETENTION_DAYS = config('OUTBOX_RETENTION_DAYS', default=30, cast=int)  # Sent/failed emails are deleted after this
+OUTBOX_KEY_RETENTION_DAYS = config('OUTBOX_KEY_RETENTION_DAYS', default=365, cast=int)  # ...except keyed ones, kept (bodies cleared) to stop resends
+
+        # Bulk candidate import (jobapp.candidate_import)
+CANDIDATE_IMPORT_CHUNK_SIZE = config('CANDIDATE_IMPORT_CHUNK_SIZE', default=500, cast=int)
+CANDIDATE_IMPORT_MAX_ROWS = config('CANDIDATE_IMPORT_MAX_ROWS', default=20000, cast=int)
+CANDIDATE_IMPORT_PROCESSES = config('CANDIDATE_IMPORT_PROCESSES', default=0, cast=int)  # Resume parsing processes, 0 = one per CPU
+BULK_SCHEDULE_MAX_CANDIDATES = config('BULK_SCHEDULE_MAX_CANDIDATES', default=500, cast=int)  # Interviews per bulk scheduling request
+INTERVIEW_ID_BLOCK_SIZE = config('INTERVIEW_ID_BLOCK_SIZE', default=50, cast=int)  # Interview IDs reserved per database round trip (jobapp.id_allocator)
+
+        # Job search (jobapp.search). On PostgreSQL the tsvector column is used instead of the BM25 index
+JOB_SEARCH_POSTGRES = config('JOB_SEARCH_POSTGRES', default=True, cast=bool)
+JOB_SEARCH_PG_CONFIG = config('JOB_SEARCH_PG_CONFIG', default='english')  # Text search configuration (stemming, stop words)
+
+        # Recruiter dashboard (jobapp.dashboard) - cards per section page
+DASHBOARD_SECTION_SIZE = config('DASHBOARD_SECTION_SIZE', default=10, cast=int)
+
+        # Rendered dashboard HTML (jobapp.fragment_cache). The cache has to be shared by all
+        # worker processes so invalidation reaches them - a file cache on one host, or point
+        # FRAGMENT_CACHE_BACKEND / FRAGMENT_CACHE_LOCATION at Redis or Memcached
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'fragments': {
+        'BACKEND': config('FRAGMENT_CACHE_BACKEND', default='django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': config('FRAGMENT_CACHE_LOCATION', default=os.path.join(tempfile.gettempdir(), 'job_portal_fragments')),
+    },
+}
+if CACHES['fragments']['BACKEND'].endswith('FileBasedCache'):
+    CACHES['fragments']['OPTIONS'] = {'MAX_ENTRIES': 20000}
+        # LLM completion cache namespace versions (LLM_CACHE_ALIAS) - kept apart from the fragments,
+        # whose culling would drop them and with them every cached completion of a job
+CACHES['llm_versions'] = {
+    'BACKEND': CACHES['fragments']['BACKEND'],
+    'LOCATION': config('LLM_VERSION_CACHE_LOCATION', default=(
+        os.path.join(tempfile.gettempdir(), 'job_portal_llm_versions')
+        if CACHES['fragments']['BACKEND'].endswith('FileBasedCache') else CACHES['fragments']['LOCATION']
+    )),
+    'KEY_PREFIX': 'llm',
+}
+if CACHES['llm_versions']['BACKEND'].endswith('FileBasedCache'):
+    # One stamp per job - never enough to reach a cull
+    CACHES['llm_versions']['OPTIONS'] = {'MAX_ENTRIES': 1000000}
+FRAGMENT_CACHE_ALIAS = 'fragments'
+FRAGMENT_CACHE_TIMEOUT = config('FRAGMENT_CACHE_TIMEOUT', default=600, cast=int)
+
+        # HTTP caching of the public job pages (jobapp.http_cache). Shared caches cannot be
+        # purged when a job changes, so keep their lifetime short
+PUBLIC_PAGE_VERSION = config('PUBLIC_PAGE_VERSION', default=config('RENDER_GIT_COMMIT', default='dev'))  # Part of every ETag
+PUBLIC_PAGE_MAX_AGE = config('PUBLIC_PAGE_MAX_AGE', default=60, cast=int)
+PUBLIC_PAGE_SHARED_MAX_AGE = config('PUBLIC_PAGE_SHARED_MAX_AGE', default=300, cast=int)
+PUBLIC_PAGE_STALE_WHILE_REVALIDATE = config('PUBLIC_PAGE_STALE_WHILE_REVALIDATE', default=60, cast=int)
+
+        # Media delivery (jobapp.media_delivery). Behind nginx set MEDIA_OFFLOAD=x-accel-redirect and map
+        # MEDIA_ACCEL_REDIRECT_PREFIX to MEDIA_ROOT in an `internal` location; x-sendfile for Apache
+MEDIA_OFFLOAD = config('MEDIA_OFFLOAD', default='')
+MEDIA_ACCEL_REDIRECT_PREFIX = config('MEDIA_ACCEL_REDIRECT_PREFIX', default='/protected-media/')
+MEDIA_MAX_AGE = config('MEDIA_MAX_AGE', default=3600, cast=int)  # Public media without content-hashed names
+
+        # Chunked interview recording uploads (jobapp.recording_upload). Chunks are written
+        # to disk as they are read, so only one block per request is held in memory
+RECORDING_CHUNK_MAX_BYTES = config('RECORDING_CHUNK_MAX_BYTES', default=8 * 1024 * 1024, cast=int)
+RECORDING_MAX_BYTES = config('RECORDING_MAX_BYTES', default=500 * 1024 * 1024, cast=int)
+RECORDING_UPLOAD_GRACE_SECONDS = config('RECORDING_UPLOAD_GRACE_SECONDS', default=600, cast=int)  # Idle time before an unfinished upload is finalized
+
+        # Recording post-processing (jobapp.recording_processing) - needs ffmpeg on the PATH
+        # (or RECORDING_FFMPEG); without it recordings are stored as uploaded
+RECORDING_FFMPEG = config('RECORDING_FFMPEG', default='')
+RECORDING_REVIEW_CODEC = config('RECORDING_REVIEW_CODEC', default='opus')  # opus (.webm) or aac (.m4a, for older Safari)
+RECORDING_REVIEW_BITRATE = config('RECORDING_REVIEW_BITRATE', default='16k')  # Mono speech; about 2MB for a 15 minute interview
+RECORDING_NORMALIZE = config('RECORDING_NORMALIZE', default=True, cast=bool)  # Loudness-normalize the review rendition
+RECORDING_PEAKS = config('RECORDING_PEAKS', default=800, cast=int)  # Waveform bars on the results page
+RECORDING_PROCESSES = config('RECORDING_PROCESSES', default=1, cast=int)
+RECORDING_PROCESS_TIMEOUT = config('RECORDING_PROCESS_TIMEOUT', default=900, cast=int)
+
         # File upload settings - Increase for better performance
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
\ No newline at end of file
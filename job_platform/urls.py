@@ -15,7 +15,7 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path, include, re_path
+from django.urls import path, include
 from django.conf.urls.static import static
 from django.conf import settings
 from django.views.static import serve
@@ -36,25 +36,9 @@ urlpatterns = [
     path('ftco-32x32.png', serve, {'document_root': settings.STATIC_ROOT, 'path': 'favicon.ico'}),
 ]
 
-# Serve media files
-# urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# Media files are served by jobapp.views.serve_media (access checks, byte ranges,
+# X-Accel-Redirect / X-Sendfile behind a proxy) in every environment
 
 # Serve static files in development
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
-
-# Ensure media files are served in production too
-if not settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-    # Add explicit media serving for production
-    from django.views.static import serve
-    import re
-    urlpatterns += [
-        re_path(r'^media/(?P<path>.*)$', serve, {'document_root': settings.MEDIA_ROOT}),
-    ]   
-    
-    
-    
-   
-    
@@ -0,0 +1,65 @@
+# Cursor pagination for the API list endpoints
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from jobapp.pagination import InvalidCursor, approximate_count, paginate
+
+
+class KeysetPagination(BasePagination):
+    """Keyset pages ordered by the view's ``keyset`` (default newest id first).
+
+    ``?page_size=`` is capped at ``max_page_size``; ``?count=1`` adds an
+    approximate total.
+    """
+    page_size = 20
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        keys = getattr(view, 'keyset', ('-id',))
+        try:
+            page_size = min(int(request.query_params.get('page_size', self.page_size)), self.max_page_size)
+        except ValueError:
+            page_size = self.page_size
+        try:
+            self.page = paginate(queryset, keys, request.query_params.get(self.cursor_query_param), max(page_size, 1))
+        except InvalidCursor:
+            raise NotFound('Invalid cursor')
+
+        self.count = None
+        if request.query_params.get('count') in ('1', 'true'):
+            self.count, self.count_is_exact = approximate_count(queryset)
+        return self.page.items
+
+    def _link(self, cursor):
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        body = {
+            'next': self._link(self.page.next_cursor),
+            'previous': self._link(self.page.previous_cursor),
+        }
+        if self.count is not None:
+            body['count'] = self.count
+            body['count_is_exact'] = self.count_is_exact
+        body['results'] = data
+        return Response(body)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'count': {'type': 'integer'},
+                'count_is_exact': {'type': 'boolean'},
+                'results': schema,
+            },
+        }
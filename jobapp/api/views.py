@@ -3,6 +3,7 @@
 from rest_framework import generics , permissions
 from jobapp.models import Job , Application , Interview , CustomUser
 from .serializers import RegisterSerializer , JobSerializer , ApplicationSerializer , InterviewSerializer
+from .pagination import KeysetPagination
 from django.contrib.auth import get_user_model
 from rest_framework.permissions import AllowAny
 from datetime import datetime
@@ -26,6 +27,8 @@ class JobListCreate(generics.ListCreateAPIView):
     queryset = Job.objects.all()
     serializer_class = JobSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset = ('-date_posted', '-id')
     
     
 class jobdetail(generics.RetrieveUpdateDestroyAPIView):
@@ -45,6 +48,8 @@ class ApplicationList(generics.ListAPIView):
     queryset = Application.objects.all()
     serializer_class = ApplicationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset = ('-applied_at', '-id')
     
     def get_queryset(self):
         return Application.objects.filter(applicant=self.request.user)
@@ -55,6 +60,8 @@ class ApplicationList(generics.ListAPIView):
 class InterviewList(generics.ListAPIView):
     serializer_class = InterviewSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset = ('-created_at', '-id')
     
     
     def get_queryset(self):
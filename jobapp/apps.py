@@ -8,6 +8,24 @@ class JobappConfig(AppConfig):
     def ready(self):
         import jobapp.signals  #This runs the signals at startup
         
+        from django.conf import settings
+        from django.core.signals import request_started
+        if getattr(settings, 'TTS_PHRASE_WARMUP', True):
+            # Queued on the first request of each worker - the database is
+            # not available yet while apps load
+            request_started.connect(queue_phrase_warmup, dispatch_uid='jobapp_phrase_warmup')
+
+
+def queue_phrase_warmup(sender, **kwargs):
+    from django.core.signals import request_started
+    request_started.disconnect(dispatch_uid='jobapp_phrase_warmup')
+    try:
+        from .tasks import enqueue_phrase_warmup
+        enqueue_phrase_warmup()
+    except Exception as e:
+        import logging
+        logging.getLogger(__name__).warning(f"Could not queue phrase audio warm-up: {e}")
+        
         
         
 def ready(self):
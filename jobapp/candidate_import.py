@@ -0,0 +1,350 @@
+"""
+Bulk candidate import.
+
+A recruiter uploads a CSV of name/email/phone (optionally a ``resume``
+column naming a file) and a ZIP of resumes. The import runs on the task
+queue: rows are validated, deduplicated against the recruiter's existing
+candidates (emails compared case-insensitively) with one query, and
+inserted with bulk_create in chunks, updating the CandidateImport row's
+progress after each chunk. Resumes are stored only for the rows that were
+actually inserted. Resume text is then extracted in a process pool and stored in
+the ResumeText cache, so interviews never parse those files again.
+
+A resume is matched to its row by the ``resume`` column, or else by a file
+named after the candidate's email (``jane@example.com.pdf``).
+"""
+import io
+import os
+import csv
+import hashlib
+import logging
+import zipfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.validators import validate_email
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Header spellings accepted for each column
+COLUMN_ALIASES = {
+    'name': ('name', 'full name', 'full_name', 'candidate name', 'candidate'),
+    'email': ('email', 'e-mail', 'email address', 'email_address'),
+    'phone': ('phone', 'phone number', 'phone_number', 'mobile', 'telephone'),
+    'resume': ('resume', 'resume file', 'resume_file', 'cv'),
+}
+RESUME_EXTENSIONS = ('.pdf', '.docx', '.txt')
+# Errors stored on the import; error_count keeps counting past this
+MAX_STORED_ERRORS = 500
+
+
+def chunk_size():
+    return getattr(settings, 'CANDIDATE_IMPORT_CHUNK_SIZE', 500)
+
+
+def max_rows():
+    return getattr(settings, 'CANDIDATE_IMPORT_MAX_ROWS', 20000)
+
+
+def _header_map(fieldnames):
+    normalized = {(name or '').strip().lower(): name for name in fieldnames or []}
+    return {
+        column: next((normalized[alias] for alias in aliases if alias in normalized), None)
+        for column, aliases in COLUMN_ALIASES.items()
+    }
+
+
+def read_rows(csv_file):
+    """Validated rows and per-row errors from an uploaded CSV.
+
+    Returns ``(rows, errors)``; rows are dicts with ``row`` (the line number),
+    name, email, phone and resume.
+    """
+    csv_file.open('rb')
+    try:
+        text = csv_file.read().decode('utf-8-sig', errors='replace')
+    finally:
+        csv_file.close()
+
+    reader = csv.DictReader(io.StringIO(text))
+    columns = _header_map(reader.fieldnames)
+    missing = [column for column in ('name', 'email', 'phone') if not columns[column]]
+    if missing:
+        raise ValueError(f"CSV is missing the column(s): {', '.join(missing)}")
+
+    rows, errors = [], []
+    for record in reader:
+        line = reader.line_num
+        if len(rows) + len(errors) >= max_rows():
+            errors.append({'row': line, 'email': '', 'error': f"Import is limited to {max_rows()} rows"})
+            break
+        value = lambda column: (record.get(columns[column]) or '').strip() if columns[column] else ''
+        row = {'row': line, 'name': value('name'), 'email': value('email').lower(), 'phone': value('phone'), 'resume': value('resume')}
+        if not any((row['name'], row['email'], row['phone'])):
+            continue  # Blank line
+
+        try:
+            if not row['name']:
+                raise ValidationError('Name is required.')
+            if len(row['name']) > 100:
+                raise ValidationError('Name is longer than 100 characters.')
+            validate_email(row['email'])
+            if not row['phone']:
+                raise ValidationError('Phone number is required.')
+            if len(row['phone']) > 20:
+                raise ValidationError('Phone number is longer than 20 characters.')
+        except ValidationError as e:
+            errors.append({'row': line, 'email': row['email'], 'error': ' '.join(e.messages)})
+            continue
+        rows.append(row)
+    return rows, errors
+
+
+class ResumeArchive:
+    """Resumes in an uploaded ZIP, looked up by file name or by email"""
+
+    def __init__(self, zip_field):
+        self.entries = {}
+        self.zip = None
+        if not zip_field:
+            return
+        zip_field.open('rb')
+        self.zip = zipfile.ZipFile(zip_field)
+        for info in self.zip.infolist():
+            name = os.path.basename(info.filename)
+            # Skip folders, macOS metadata and anything that is not a resume
+            if info.is_dir() or not name or name.startswith('.') or '__MACOSX' in info.filename:
+                continue
+            if os.path.splitext(name)[1].lower() in RESUME_EXTENSIONS:
+                self.entries.setdefault(name.lower(), info)
+
+    def find(self, row):
+        if row['resume']:
+            return self.entries.get(os.path.basename(row['resume']).lower())
+        for extension in RESUME_EXTENSIONS:
+            info = self.entries.get(f"{row['email']}{extension}")
+            if info:
+                return info
+        return None
+
+    def save(self, info):
+        """Store one resume under candidate_resumes/ and return its storage name"""
+        max_size = getattr(settings, 'FILE_UPLOAD_MAX_MEMORY_SIZE', 10 * 1024 * 1024)
+        if info.file_size > max_size:
+            raise ValueError(f"Resume {os.path.basename(info.filename)} is larger than {max_size // (1024 * 1024)}MB")
+        data = self.zip.read(info)
+        return default_storage.save(f"candidate_resumes/{os.path.basename(info.filename)}", ContentFile(data))
+
+    def close(self):
+        if self.zip:
+            self.zip.close()
+
+
+def _extract_text(path):
+    """Runs in a pool process - no database access"""
+    from jobapp.utils.resume_reader import extract_resume_text
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    resume_file = io.BytesIO(data)
+    resume_file.name = path
+    return extract_resume_text(resume_file)
+
+
+def _pool_size(jobs):
+    processes = getattr(settings, 'CANDIDATE_IMPORT_PROCESSES', None) or os.cpu_count() or 1
+    return max(1, min(processes, jobs))
+
+
+def cache_resume_texts(names):
+    """Extract and cache the text of stored resumes ``names``, in parallel.
+
+    Files whose contents are already cached (by SHA-256) are not parsed
+    again. Returns ``{name: error}`` for the files that failed.
+    """
+    from .models import ResumeText
+    from .utils.resume_reader import _resume_cache_name
+
+    files = {}
+    for name in names:
+        path = default_storage.path(name)
+        with open(path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        stat = os.stat(path)
+        files[name] = {'path': path, 'hash': digest, 'size': stat.st_size, 'mtime': stat.st_mtime}
+
+    known = dict(
+        ResumeText.objects.filter(content_hash__in={info['hash'] for info in files.values()})
+        .values_list('content_hash', 'text')
+    )
+    texts, failures = {}, {}
+    todo = [name for name, info in files.items() if info['hash'] not in known]
+    for name, info in files.items():
+        if info['hash'] in known:
+            texts[name] = known[info['hash']]
+
+    if todo:
+        workers = _pool_size(len(todo))
+        if workers > 1:
+            # spawn, not fork - the web process has threads (task worker, TTS) and open connections
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+                futures = {name: pool.submit(_extract_text, files[name]['path']) for name in todo}
+                for name, future in futures.items():
+                    try:
+                        texts[name] = future.result()
+                    except BrokenProcessPool as e:
+                        logger.warning(f"Resume parsing pool failed, parsing {name} in process: {e}")
+                    except Exception as e:
+                        failures[name] = str(e)
+        # Without a pool, or for what a broken pool left behind
+        for name in todo:
+            if name in texts or name in failures:
+                continue
+            try:
+                texts[name] = _extract_text(files[name]['path'])
+            except Exception as e:
+                failures[name] = str(e)
+
+    ResumeText.objects.bulk_create([
+        ResumeText(
+            file_name=_resume_cache_name(files[name]['path']),
+            file_size=files[name]['size'],
+            file_mtime=files[name]['mtime'],
+            content_hash=files[name]['hash'],
+            text=text,
+        )
+        for name, text in texts.items()
+    ], batch_size=500, ignore_conflicts=True)
+    return failures
+
+
+def run_import(import_id):
+    """Run CandidateImport ``import_id``; progress is saved as it goes"""
+    from .models import Candidate, CandidateImport
+
+    candidate_import = CandidateImport.objects.select_related('added_by').get(pk=import_id)
+    recruiter = candidate_import.added_by
+    CandidateImport.objects.filter(pk=import_id).update(status='running')
+
+    errors = []
+    def add_error(row, email, error):
+        errors.append({'row': row, 'email': email, 'error': error})
+
+    try:
+        rows, row_errors = read_rows(candidate_import.csv_file)
+    except Exception as e:
+        CandidateImport.objects.filter(pk=import_id).update(
+            status='failed', errors=[{'row': 0, 'email': '', 'error': str(e)}], error_count=1, finished_at=timezone.now()
+        )
+        logger.error(f"❌ Candidate import {import_id} could not read its CSV: {e}")
+        return
+    errors.extend(row_errors)
+    total = len(rows) + len(row_errors)
+    CandidateImport.objects.filter(pk=import_id).update(total_rows=total, processed_rows=len(row_errors))
+
+    # One set-based query for every email already in the recruiter's list, in any case
+    existing = set(
+        Candidate.objects.filter(added_by=recruiter)
+        .annotate(email_lower=Lower('email'))
+        .filter(email_lower__in={row['email'] for row in rows})
+        .values_list('email_lower', flat=True)
+    )
+    archive = ResumeArchive(candidate_import.resumes_zip)
+    created = duplicates = 0
+    resume_names = {}
+    try:
+        size = chunk_size()
+        for start in range(0, len(rows), size):
+            chunk = rows[start:start + size]
+            new = {}
+            for row in chunk:
+                if row['email'] in existing:
+                    duplicates += 1
+                    continue
+                existing.add(row['email'])  # Repeated within the file
+                new[row['email']] = (row, Candidate(name=row['name'], email=row['email'], phone=row['phone'], added_by=recruiter))
+
+            # ignore_conflicts covers a candidate added by hand while the import runs - with the
+            # same spelling only, as unique_together is case-sensitive: a concurrent 'Jane@X.com'
+            # next to an imported 'jane@x.com' is not caught here
+            Candidate.objects.bulk_create([candidate for row, candidate in new.values()], batch_size=size, ignore_conflicts=True)
+            # Skipped conflicts get no pk on every backend - ours are the rows with the added_at we set
+            inserted = []
+            for pk, email, added_at in Candidate.objects.filter(added_by=recruiter, email__in=new).values_list('pk', 'email', 'added_at'):
+                row, candidate = new[email]
+                if added_at == candidate.added_at:
+                    candidate.pk = pk
+                    inserted.append((row, candidate))
+            created += len(inserted)
+            duplicates += len(new) - len(inserted)
+
+            with_resumes = []
+            for row, candidate in inserted:
+                info = archive.find(row)
+                if info:
+                    try:
+                        candidate.resume = archive.save(info)
+                    except Exception as e:
+                        add_error(row['row'], row['email'], f"Resume not imported: {e}")
+                        continue
+                    resume_names[candidate.resume.name] = row
+                    with_resumes.append(candidate)
+                elif row['resume']:
+                    add_error(row['row'], row['email'], f"Resume {row['resume']} not found in the ZIP")
+            Candidate.objects.bulk_update(with_resumes, ['resume'], batch_size=size)
+
+            CandidateImport.objects.filter(pk=import_id).update(
+                processed_rows=len(row_errors) + start + len(chunk),
+                created_count=created, duplicate_count=duplicates,
+                error_count=len(errors), errors=errors[:MAX_STORED_ERRORS],
+            )
+    finally:
+        archive.close()
+
+    if resume_names:
+        try:
+            failures = cache_resume_texts(list(resume_names))
+        except Exception as e:
+            logger.warning(f"Candidate import {import_id} could not cache resume text: {e}")
+            failures = {}
+        for name, error in failures.items():
+            row = resume_names[name]
+            add_error(row['row'], row['email'], f"Resume text could not be extracted: {error}")
+
+    CandidateImport.objects.filter(pk=import_id).update(
+        status='completed', created_count=created, duplicate_count=duplicates,
+        resume_count=len(resume_names), error_count=len(errors), errors=errors[:MAX_STORED_ERRORS],
+        processed_rows=total, finished_at=timezone.now(),
+    )
+
+    # bulk_create sends no post_save, so invalidate the dashboard here
+    try:
+        from . import fragment_cache
+        fragment_cache.bump(recruiter.pk, 'counts', 'candidates')
+    except Exception as e:
+        logger.warning(f"Could not invalidate dashboard cache: {e}")
+    logger.info(f"✅ Candidate import {import_id}: {created} added, {duplicates} duplicates, {len(errors)} errors, {len(resume_names)} resumes")
+
+
+def progress(candidate_import):
+    """JSON-ready progress of a CandidateImport"""
+    total = candidate_import.total_rows
+    return {
+        'id': candidate_import.pk,
+        'status': candidate_import.status,
+        'total_rows': total,
+        'processed_rows': candidate_import.processed_rows,
+        'percent': round(100 * candidate_import.processed_rows / total) if total else (100 if candidate_import.status == 'completed' else 0),
+        'created': candidate_import.created_count,
+        'duplicates': candidate_import.duplicate_count,
+        'resumes': candidate_import.resume_count,
+        'error_count': candidate_import.error_count,
+        'errors': candidate_import.errors,
+    }
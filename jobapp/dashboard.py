@@ -0,0 +1,136 @@
+"""
+Recruiter dashboard data.
+
+The dashboard shows headline counts plus a handful of cards per section.
+Counts come from one query of scalar COUNT subqueries, and each section
+loads only its visible page - keyset paginated, with only the columns its
+cards render - so the cost of a dashboard stays flat as a recruiter's
+history grows. Sections other than the default one are fetched over AJAX
+when first opened, and "Load more" continues from the section's cursor.
+"""
+import logging
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import Count, F, Func, IntegerField, OuterRef, Prefetch, Subquery, prefetch_related_objects
+
+from .interview_state import pair_turns
+from .pagination import paginate
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_SECTIONS = {}
+
+
+def dashboard_section(name, keys, templates):
+    """Register ``func(user) -> queryset`` as dashboard section ``name``.
+
+    ``templates`` maps the id of each list container the section fills to
+    the partial rendering its cards.
+    """
+    def decorator(func):
+        DASHBOARD_SECTIONS[name] = {'queryset': func, 'keys': keys, 'templates': templates}
+        return func
+    return decorator
+
+
+def section_size():
+    return getattr(settings, 'DASHBOARD_SECTION_SIZE', 10)
+
+
+def _count(queryset):
+    return Subquery(queryset.order_by().values(n=Func(F('pk'), function='COUNT')), output_field=IntegerField())
+
+
+def counts(user):
+    """Headline counts for ``user``'s dashboard, in a single query"""
+    from .models import Application, Candidate, Interview, Job
+
+    mine = {'posted_by': OuterRef('pk')}
+    through_jobs = {'job__posted_by': OuterRef('pk')}
+    return get_user_model().objects.filter(pk=user.pk).annotate(
+        jobs_count=_count(Job.objects.filter(**mine)),
+        active_jobs_count=_count(Job.objects.filter(status='active', **mine)),
+        applications_count=_count(Application.objects.filter(**through_jobs)),
+        interviews_count=_count(Interview.objects.filter(**through_jobs)),
+        completed_interviews_count=_count(Interview.objects.filter(status='completed', **through_jobs)),
+        candidates_count=_count(Candidate.objects.filter(added_by=OuterRef('pk'))),
+    ).values(
+        'jobs_count', 'active_jobs_count', 'applications_count',
+        'interviews_count', 'completed_interviews_count', 'candidates_count',
+    ).get()
+
+
+@dashboard_section('applications', ('-applied_at', '-id'), {
+    'applications_list': 'jobapp/dashboard/_applications.html',
+})
+def _applications(user):
+    from .models import Application
+    return Application.objects.filter(job__posted_by=user).select_related('job', 'applicant').only(
+        'id', 'status', 'applied_at', 'job__id', 'job__title', 'applicant__id', 'applicant__username',
+    )
+
+
+@dashboard_section('jobs', ('-date_posted', '-id'), {
+    'posted_jobs_list': 'jobapp/dashboard/_jobs.html',
+    'edit_jobs_list': 'jobapp/dashboard/_edit_jobs.html',
+})
+def _jobs(user):
+    from .models import Job
+    return Job.objects.filter(posted_by=user).only(
+        'id', 'title', 'company', 'location', 'status', 'date_posted', 'created_at',
+    ).annotate(application_count=Count('application'))
+
+
+@dashboard_section('interviews', ('-created_at', '-id'), {
+    'scheduled_interviews_list': 'jobapp/dashboard/_interviews.html',
+    'interview_results_list': 'jobapp/dashboard/_results.html',
+})
+def _interviews(user):
+    from .models import Interview
+    # Everything the interview and result cards show - but not transcripts or recording data
+    return Interview.objects.filter(job__posted_by=user).select_related('job').only(
+        'id', 'uuid', 'status', 'scheduled_at', 'created_at', 'completed_at',
+        'candidate_name', 'candidate_email', 'recording_path', 'recording_review_path',
+        'overall_score', 'technical_score', 'communication_score', 'problem_solving_score',
+        'recommendation', 'ai_feedback',
+        'job__id', 'job__title', 'job__company',
+    )
+
+
+@dashboard_section('candidates', ('-added_at', '-id'), {
+    'all_candidates_list': 'jobapp/dashboard/_candidates.html',
+})
+def _candidates(user):
+    from .models import Candidate
+    return Candidate.objects.filter(added_by=user).select_related('added_by').only(
+        'id', 'name', 'email', 'phone', 'resume', 'added_at', 'added_by__id', 'added_by__username',
+    )
+
+
+def load_section(user, name, cursor=None):
+    """The visible page of section ``name``: ``(page, context)`` for its partials"""
+    section = DASHBOARD_SECTIONS[name]
+    page = paginate(section['queryset'](user), section['keys'], cursor, section_size())
+    context = {'items': page.items}
+    if name == 'interviews':
+        # The results cards are the completed interviews of the same page - no second query
+        completed = [interview for interview in page.items if interview.is_completed and interview.has_results]
+        # Their question and answer lists - one query for the turns of all of them
+        from .models import InterviewTurn
+        prefetch_related_objects(completed, Prefetch(
+            'turns', queryset=InterviewTurn.objects.only('interview_id', 'sequence', 'speaker', 'message', 'timestamp', 'response_ms', 'answer_ms'),
+        ))
+        for interview in completed:
+            interview.qa_pairs = pair_turns(interview.turns.all())
+        context['completed_interviews'] = completed
+    return page, context
+
+
+def schedule_options(user):
+    """Jobs and candidates for the schedule interview modal"""
+    from .models import Candidate, Job
+    return {
+        'jobs': list(Job.objects.filter(posted_by=user).order_by('-date_posted').values('id', 'title', 'company')),
+        'candidates': list(Candidate.objects.filter(added_by=user).order_by('-added_at').values('id', 'name', 'email')),
+    }
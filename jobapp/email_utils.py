@@ -2,122 +2,112 @@
 Email utilities for sending interview links to candidates
 """
 import logging
-from django.core.mail import send_mail, EmailMessage
+from django.core.mail import send_mail
 from django.conf import settings
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 from django.urls import reverse
-import threading
-import time
+
+from .outbox import queue_email, queue_emails
 
 logger = logging.getLogger(__name__)
 
 def send_interview_email_async(interview):
     """
-    Send interview email in a separate thread to avoid blocking
+    Queue the interview link email - delivered by the outbox worker, never on the request thread
     """
-    def send_email():
-        try:
-            time.sleep(1)  # Small delay to ensure interview is saved
-            send_interview_link_email(interview)
-        except Exception as e:
-            logger.error(f"Async email sending failed: {e}")
-    
-    thread = threading.Thread(target=send_email)
-    thread.daemon = True
-    thread.start()
+    return send_interview_link_email(interview, key=f'interview_link:{interview.uuid}')
 
-def send_interview_link_email(interview):
+def build_interview_link_email(interview):
     """
-    Send interview link email to candidate with multiple fallback options
+    Subject, plain text, HTML and interview URL of the interview link email
     """
-    try:
-        # Generate interview URL
-        domain = getattr(settings, 'PRODUCTION_DOMAIN', 'job-portalweb-ga7b.onrender.com')
-        if settings.DEBUG:
-            domain = 'localhost:8000'
-        
-        protocol = 'https' if not settings.DEBUG else 'http'
-        interview_url = f"{protocol}://{domain}/interview/ready/{interview.uuid}/"
-        
-        # Prepare email content
-        context = {
-            'candidate_name': interview.candidate_name,
-            'job_title': interview.job.title,
-            'company_name': interview.job.company,
-            'interview_url': interview_url,
-            'scheduled_date': interview.scheduled_at.strftime('%B %d, %Y at %I:%M %p') if interview.scheduled_at else 'To be confirmed',
-            'interview_id': interview.interview_id,
-        }
-        
-        # Create email subject and body
-        subject = f"🎯 Interview Scheduled - {interview.job.title} at {interview.job.company}"
-        
-        # HTML email template
-        html_message = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background: #007bff; color: white; padding: 20px; text-align: center; border-radius: 8px 8px 0 0; }}
-                .content {{ background: #f8f9fa; padding: 30px; border-radius: 0 0 8px 8px; }}
-                .interview-link {{ background: #28a745; color: white; padding: 15px 30px; text-decoration: none; border-radius: 5px; display: inline-block; margin: 20px 0; font-weight: bold; }}
-                .details {{ background: white; padding: 20px; border-radius: 5px; margin: 20px 0; }}
-                .footer {{ text-align: center; margin-top: 30px; color: #666; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>🎉 Interview Scheduled!</h1>
-                </div>
-                <div class="content">
-                    <h2>Hello {context['candidate_name']},</h2>
-                    <p>Great news! Your interview has been scheduled for the <strong>{context['job_title']}</strong> position at <strong>{context['company_name']}</strong>.</p>
-                    
-                    <div class="details">
-                        <h3>📋 Interview Details:</h3>
-                        <ul>
-                            <li><strong>Position:</strong> {context['job_title']}</li>
-                            <li><strong>Company:</strong> {context['company_name']}</li>
-                            <li><strong>Date & Time:</strong> {context['scheduled_date']}</li>
-                            <li><strong>Interview ID:</strong> {context['interview_id']}</li>
-                        </ul>
-                    </div>
-                    
-                    <div style="text-align: center;">
-                        <a href="{context['interview_url']}" class="interview-link">
-                            🚀 Start Your Interview
-                        </a>
-                    </div>
-                    
-                    <p><strong>Important Instructions:</strong></p>
+    # Generate interview URL
+    domain = getattr(settings, 'PRODUCTION_DOMAIN', 'job-portalweb-ga7b.onrender.com')
+    if settings.DEBUG:
+        domain = 'localhost:8000'
+    
+    protocol = 'https' if not settings.DEBUG else 'http'
+    interview_url = f"{protocol}://{domain}/interview/ready/{interview.uuid}/"
+    
+    # Prepare email content
+    context = {
+        'candidate_name': interview.candidate_name,
+        'job_title': interview.job.title,
+        'company_name': interview.job.company,
+        'interview_url': interview_url,
+        'scheduled_date': interview.scheduled_at.strftime('%B %d, %Y at %I:%M %p') if interview.scheduled_at else 'To be confirmed',
+        'interview_id': interview.interview_id,
+    }
+    
+    # Create email subject and body
+    subject = f"🎯 Interview Scheduled - {interview.job.title} at {interview.job.company}"
+    
+    # HTML email template
+    html_message = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <style>
+            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
+            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
+            .header {{ background: #007bff; color: white; padding: 20px; text-align: center; border-radius: 8px 8px 0 0; }}
+            .content {{ background: #f8f9fa; padding: 30px; border-radius: 0 0 8px 8px; }}
+            .interview-link {{ background: #28a745; color: white; padding: 15px 30px; text-decoration: none; border-radius: 5px; display: inline-block; margin: 20px 0; font-weight: bold; }}
+            .details {{ background: white; padding: 20px; border-radius: 5px; margin: 20px 0; }}
+            .footer {{ text-align: center; margin-top: 30px; color: #666; }}
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="header">
+                <h1>🎉 Interview Scheduled!</h1>
+            </div>
+            <div class="content">
+                <h2>Hello {context['candidate_name']},</h2>
+                <p>Great news! Your interview has been scheduled for the <strong>{context['job_title']}</strong> position at <strong>{context['company_name']}</strong>.</p>
+                
+                <div class="details">
+                    <h3>📋 Interview Details:</h3>
                     <ul>
-                        <li>Click the button above to access your interview</li>
-                        <li>Make sure you have a stable internet connection</li>
-                        <li>Test your microphone and camera beforehand</li>
-                        <li>Find a quiet, well-lit space for the interview</li>
-                        <li>Have your resume and any relevant documents ready</li>
+                        <li><strong>Position:</strong> {context['job_title']}</li>
+                        <li><strong>Company:</strong> {context['company_name']}</li>
+                        <li><strong>Date & Time:</strong> {context['scheduled_date']}</li>
+                        <li><strong>Interview ID:</strong> {context['interview_id']}</li>
                     </ul>
-                    
-                    <p>If you have any technical issues, please contact our support team.</p>
-                    
-                    <div class="footer">
-                        <p>Best of luck with your interview!</p>
-                        <p><strong>Job Portal Team</strong></p>
-                        <hr>
-                        <p style="font-size: 12px;">Interview Link: {context['interview_url']}</p>
-                    </div>
+                </div>
+                
+                <div style="text-align: center;">
+                    <a href="{context['interview_url']}" class="interview-link">
+                        🚀 Start Your Interview
+                    </a>
+                </div>
+                
+                <p><strong>Important Instructions:</strong></p>
+                <ul>
+                    <li>Click the button above to access your interview</li>
+                    <li>Make sure you have a stable internet connection</li>
+                    <li>Test your microphone and camera beforehand</li>
+                    <li>Find a quiet, well-lit space for the interview</li>
+                    <li>Have your resume and any relevant documents ready</li>
+                </ul>
+                
+                <p>If you have any technical issues, please contact our support team.</p>
+                
+                <div class="footer">
+                    <p>Best of luck with your interview!</p>
+                    <p><strong>Job Portal Team</strong></p>
+                    <hr>
+                    <p style="font-size: 12px;">Interview Link: {context['interview_url']}</p>
                 </div>
             </div>
-        </body>
-        </html>
-        """
-        
-        # Plain text version
-        plain_message = f"""
+        </div>
+    </body>
+    </html>
+    """
+    
+    # Plain text version
+    plain_message = f"""
 Hello {context['candidate_name']},
 
 🎉 Great news! Your interview has been scheduled.
@@ -146,61 +136,38 @@ Job Portal Team
 === INTERVIEW LINK ===
 {context['interview_url']}
 === END LINK ===
-        """
-        
-        # Try to send email with multiple methods
-        email_sent = False
-        
-        # Method 1: Try HTML email
-        try:
-            msg = EmailMessage(
-                subject=subject,
-                body=html_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                to=[interview.candidate_email],
-            )
-            msg.content_subtype = "html"
-            msg.send()
-            email_sent = True
-            logger.info(f"✅ HTML email sent successfully to {interview.candidate_email}")
-        except Exception as e:
-            logger.warning(f"HTML email failed: {e}")
-        
-        # Method 2: Fallback to plain text email
-        if not email_sent:
-            try:
-                send_mail(
-                    subject=subject,
-                    message=plain_message,
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[interview.candidate_email],
-                    fail_silently=False
-                )
-                email_sent = True
-                logger.info(f"✅ Plain text email sent successfully to {interview.candidate_email}")
-            except Exception as e:
-                logger.warning(f"Plain text email failed: {e}")
-        
-        # Method 3: Console output (always works)
-        logger.info(f"""
-        ==========================================
-        📧 EMAIL CONTENT FOR: {interview.candidate_email}
-        ==========================================
-        Subject: {subject}
+    """
+    
+    return {
+        'subject': subject,
+        'body': plain_message,
+        'html_body': html_message,
+        'interview_url': context['interview_url'],
+    }
+
+
+def send_interview_link_email(interview, key=None):
+    """
+    Queue the interview link email (HTML with a plain text alternative) for the candidate.
+    With ``key``, it is queued at most once.
+    """
+    try:
+        message = build_interview_link_email(interview)
         
-        {plain_message}
-        ==========================================
-        🔗 COPY THIS LINK TO SEND MANUALLY:
-        {context['interview_url']}
-        ==========================================
-        """)
+        # One multipart message - mail clients without HTML show the plain text part
+        email = queue_email(
+            interview.candidate_email, message['subject'], message['body'],
+            html_body=message['html_body'], key=key,
+        )
+        logger.info(f"📧 Interview email {email.pk} queued for {interview.candidate_email} - link: {message['interview_url']}")
         
         # Return result
         return {
-            'success': email_sent,
-            'interview_url': context['interview_url'],
+            'success': True,
+            'interview_url': message['interview_url'],
             'email': interview.candidate_email,
-            'method': 'email' if email_sent else 'console'
+            'method': 'outbox',
+            'outbox_id': email.pk,
         }
         
     except Exception as e:
@@ -239,9 +206,26 @@ Job Portal Team
                 'emergency_error': str(emergency_error)
             }
 
+def queue_interview_link_emails(interviews):
+    """
+    Queue the link emails of many new interviews in one batch - what the post_save
+    signal does for a single interview. Returns the number queued.
+    """
+    messages = []
+    for interview in interviews:
+        message = build_interview_link_email(interview)
+        messages.append({
+            'to': interview.candidate_email,
+            'subject': message['subject'],
+            'body': message['body'],
+            'html_body': message['html_body'],
+            'key': f'interview_link:{interview.uuid}',
+        })
+    return queue_emails(messages)
+
 def send_bulk_interview_emails(interviews):
     """
-    Send interview emails to multiple candidates
+    Queue interview emails for multiple candidates
     """
     results = []
     for interview in interviews:
@@ -255,7 +239,7 @@ def send_bulk_interview_emails(interviews):
 
 def test_email_configuration():
     """
-    Test email configuration and return status
+    Test email configuration and return status - sends directly, bypassing the outbox
     """
     try:
         # Test basic email sending
@@ -414,4 +414,75 @@ class AddCandidateForm(forms.ModelForm):
         phone = self.cleaned_data.get('phone')
         if not phone or not phone.strip():
             raise forms.ValidationError('Phone number is required.')
-        return phone.strip()        
\ No newline at end of file
+        return phone.strip()        
+
+
+class CandidateImportForm(forms.Form):
+    csv_file = forms.FileField(
+        label='Candidates CSV',
+        help_text='Columns: name, email, phone and optionally resume (a file name in the ZIP)',
+        widget=forms.FileInput(attrs={'class': 'form-control', 'accept': '.csv'}),
+    )
+    resumes_zip = forms.FileField(
+        label='Resumes ZIP (Optional)',
+        required=False,
+        help_text='Resumes are matched by the resume column, or by files named after the email',
+        widget=forms.FileInput(attrs={'class': 'form-control', 'accept': '.zip'}),
+    )
+    
+    def clean_csv_file(self):
+        csv_file = self.cleaned_data.get('csv_file')
+        if csv_file and not csv_file.name.lower().endswith('.csv'):
+            raise forms.ValidationError('Please upload a .csv file.')
+        return csv_file
+    
+    def clean_resumes_zip(self):
+        import zipfile
+        resumes_zip = self.cleaned_data.get('resumes_zip')
+        if resumes_zip and not zipfile.is_zipfile(resumes_zip):
+            raise forms.ValidationError('Please upload a valid .zip file.')
+        return resumes_zip
+
+
+
+class BulkScheduleInterviewForm(forms.Form):
+    job = forms.ModelChoiceField(
+        queryset=None,
+        widget=forms.Select(attrs={'class': 'form-control'}),
+        label='Which job is it?',
+        empty_label='Select a job...',
+    )
+    candidates = forms.ModelMultipleChoiceField(
+        queryset=None,
+        widget=forms.CheckboxSelectMultiple,
+        label='Candidates',
+    )
+    scheduled_at = forms.DateTimeField(
+        widget=forms.DateTimeInput(attrs={'type': 'date', 'class': 'form-control'}),
+        label='Interview Deadline Date',
+    )
+    interview_duration_minutes = forms.TypedChoiceField(
+        choices=Interview._meta.get_field('interview_duration_minutes').choices,
+        coerce=int,
+        initial=15,
+        widget=forms.Select(attrs={'class': 'form-control'}),
+        label='Interview Duration',
+    )
+    
+    def __init__(self, *args, **kwargs):
+        user = kwargs.pop('user', None)
+        super().__init__(*args, **kwargs)
+        
+        if user and getattr(user, 'is_recruiter', False):
+            self.fields['job'].queryset = Job.objects.filter(posted_by=user)
+            self.fields['candidates'].queryset = Candidate.objects.filter(added_by=user)
+        else:
+            self.fields['job'].queryset = Job.objects.none()
+            self.fields['candidates'].queryset = Candidate.objects.none()
+    
+    def clean_candidates(self):
+        from .bulk_schedule import max_candidates
+        candidates = self.cleaned_data.get('candidates')
+        if candidates is not None and len(candidates) > max_candidates():
+            raise forms.ValidationError(f'You can schedule up to {max_candidates()} candidates at once.')
+        return candidates
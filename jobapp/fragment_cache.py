@@ -0,0 +1,109 @@
+"""
+Per-user cache of rendered dashboard HTML.
+
+Every user has a version stamp per dashboard section ('counts', 'jobs',
+'applications', 'interviews', 'candidates' for recruiters, 'seeker' for
+job seekers). Fragment keys include the stamps of the sections they were
+rendered from, and signals on Job, Application, Interview, Candidate and
+Profile writes bump the stamps of the affected users, so a stale fragment
+is simply never looked up again and expires on its own.
+
+Uses the FRAGMENT_CACHE_ALIAS cache, which must be shared between worker
+processes in production for invalidation to reach all of them.
+"""
+import time
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+RECRUITER_SECTIONS = ('counts', 'applications', 'jobs', 'interviews', 'candidates')
+SEEKER_SECTIONS = ('seeker',)
+
+
+def backend():
+    return caches[getattr(settings, 'FRAGMENT_CACHE_ALIAS', 'default')]
+
+
+def default_timeout():
+    return getattr(settings, 'FRAGMENT_CACHE_TIMEOUT', 600)
+
+
+def _version_key(user_id, section):
+    return f'dashboard_version:{user_id}:{section}'
+
+
+def versions(user_id, sections):
+    """Current version stamp of each of ``user_id``'s ``sections``"""
+    cache = backend()
+    keys = {_version_key(user_id, section): section for section in sections}
+    found = cache.get_many(list(keys))
+    missing = {key: time.time_ns() for key in keys if key not in found}
+    if missing:
+        # A lost stamp restarts from the clock, above any stamp used before
+        cache.set_many(missing, None)
+        found.update(missing)
+    return {keys[key]: stamp for key, stamp in found.items()}
+
+
+def bump(user_ids, *sections):
+    """Invalidate ``sections`` of every user in ``user_ids`` (one id or several)"""
+    if not isinstance(user_ids, (list, tuple, set)):
+        user_ids = [user_ids]
+    stamp = time.time_ns()
+    stamps = {_version_key(user_id, section): stamp for user_id in set(user_ids) if user_id for section in sections}
+    if stamps:
+        backend().set_many(stamps, None)
+
+
+def vary_on_request(request):
+    """Request details rendered into dashboard HTML: host and CSRF secret"""
+    from django.middleware.csrf import get_token
+    # Makes sure a secret exists (and its cookie is sent) even when the page comes from cache
+    get_token(request)
+    csrf = request.META.get('CSRF_COOKIE') or ''
+    return (request.get_host(), hashlib.md5(csrf.encode()).hexdigest()[:12])
+
+
+def fragment_key(user_id, name, sections, *vary):
+    stamps = versions(user_id, sections)
+    parts = [str(stamps[section]) for section in sections] + [str(value) for value in vary]
+    digest = hashlib.md5(':'.join(parts).encode()).hexdigest()
+    return f'dashboard_fragment:{user_id}:{name}:{digest}'
+
+
+def get_or_render(user_id, name, sections, render, *vary):
+    """Cached fragment ``name`` of ``user_id``, rendered from ``sections``.
+
+    ``render()`` returns ``(value, timeout)``, with None for the default
+    timeout. Falls back to rendering directly if the cache is unavailable.
+    """
+    try:
+        cache = backend()
+        key = fragment_key(user_id, name, sections, *vary)
+        value = cache.get(key)
+        if value is not None:
+            return value
+    except Exception as e:
+        logger.warning(f"Fragment cache unavailable: {e}")
+        return render()[0]
+
+    value, timeout = render()
+    try:
+        cache.set(key, value, default_timeout() if timeout is None else max(1, min(timeout, default_timeout())))
+    except Exception as e:
+        logger.warning(f"Could not cache fragment {name}: {e}")
+    return value
+
+
+def seconds_until_next(datetimes):
+    """Seconds until the earliest future ``datetimes`` value, for fragments that
+    change when a deadline passes; None if there is none"""
+    from django.utils import timezone
+
+    now = timezone.now()
+    upcoming = [value for value in datetimes if value and value > now]
+    return int((min(upcoming) - now).total_seconds()) + 1 if upcoming else None
@@ -53,6 +53,39 @@ def health_check(request):
         health_status['checks']['ai_api'] = 'error'
         health_status['status'] = 'degraded'
     
+    # LLM connection pool stats for this worker
+    try:
+        from .utils.llm_client import get_llm_pool_stats
+        health_status['checks']['llm_pool'] = get_llm_pool_stats()
+    except Exception as e:
+        health_status['checks']['llm_pool'] = f'error: {str(e)}'
+    
+    # Interviewer completion cache for this worker - hit ratio and upstream calls saved
+    try:
+        from .utils.llm_cache import llm_cache
+        health_status['checks']['llm_cache'] = llm_cache.stats()
+    except Exception as e:
+        health_status['checks']['llm_cache'] = f'error: {str(e)}'
+    
+    # Circuit breakers of the LLM and TTS upstreams in this worker
+    try:
+        from . import tts  # noqa: F401 - registers the upstreams
+        from .utils import interview_ai_nvidia  # noqa: F401
+        from .upstream_health import stats as upstream_stats
+        upstreams = upstream_stats()
+        health_status['checks']['upstreams'] = upstreams
+        if any(upstream['state'] != 'closed' for upstream in upstreams.values()) and health_status['status'] == 'healthy':
+            health_status['status'] = 'degraded'
+    except Exception as e:
+        health_status['checks']['upstreams'] = f'error: {str(e)}'
+    
+    # TTS audio cache stats for this worker
+    try:
+        from .tts_cache import tts_cache
+        health_status['checks']['tts_cache'] = tts_cache.stats()
+    except Exception as e:
+        health_status['checks']['tts_cache'] = f'error: {str(e)}'
+    
     # Return appropriate status code
     status_code = 200
     if health_status['status'] == 'unhealthy':
@@ -0,0 +1,116 @@
+"""
+HTTP caching for the public job pages.
+
+job_detail answers conditional GETs from the job's ``updated_at`` (ETag
+and Last-Modified), so revalidation costs one indexed lookup and no
+rendering. job_list responses are cached server side by normalized query
+string until any job changes (a version stamp bumped from signals). Both
+send Cache-Control headers that let a CDN or reverse proxy serve
+anonymous traffic for a short while.
+"""
+import hashlib
+import logging
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+from . import fragment_cache
+
+logger = logging.getLogger(__name__)
+
+# Query parameters job_list renders from; anything else (utm_*, ...) shares the cached page
+JOB_LIST_PARAMS = ('search', 'status', 'job_type', 'cursor')
+
+
+def page_version():
+    """Changes with each deploy, so template changes are never served from old ETags"""
+    return getattr(settings, 'PUBLIC_PAGE_VERSION', 'dev')
+
+
+def patch_public_cache(response, request, personalised=True):
+    """Let shared caches keep anonymous pages briefly; keep personalised ones private.
+
+    Pages that never look at the user pass ``personalised=False`` and are public for everyone.
+    """
+    if personalised and request.user.is_authenticated:
+        patch_cache_control(response, private=True, no_cache=True)
+    else:
+        patch_cache_control(
+            response, public=True,
+            max_age=getattr(settings, 'PUBLIC_PAGE_MAX_AGE', 60),
+            s_maxage=getattr(settings, 'PUBLIC_PAGE_SHARED_MAX_AGE', 300),
+            stale_while_revalidate=getattr(settings, 'PUBLIC_PAGE_STALE_WHILE_REVALIDATE', 60),
+        )
+    return response
+
+
+# job_detail
+
+def _job_updated_at(request, job_id):
+    from .models import Job
+
+    # The ETag and Last-Modified checks share one lookup
+    if getattr(request, '_job_updated_at', (None,))[0] != job_id:
+        updated_at = Job.objects.filter(pk=job_id).values_list('updated_at', flat=True).first()
+        request._job_updated_at = (job_id, updated_at)
+    return request._job_updated_at[1]
+
+
+def job_detail_etag(request, job_id):
+    updated_at = _job_updated_at(request, job_id)
+    if updated_at is None:
+        return None
+    # The page differs for the job owner and other signed-in users
+    viewer = request.user.pk if request.user.is_authenticated else 'anon'
+    raw = f"{job_id}:{updated_at.isoformat()}:{viewer}:{page_version()}"
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def job_detail_last_modified(request, job_id):
+    # Only anonymous pages are fully described by the job's timestamp
+    if request.user.is_authenticated:
+        return None
+    return _job_updated_at(request, job_id)
+
+
+# job_list
+
+def job_list_cache_key(request):
+    params = sorted(
+        (name, ' '.join(request.GET.get(name, '').split()))
+        for name in JOB_LIST_PARAMS if request.GET.get(name, '').strip()
+    )
+    raw = f"{params}:{request.get_host()}:{page_version()}"
+    return f"job_list:{hashlib.md5(raw.encode()).hexdigest()}"
+
+
+def cached_job_list(request, render):
+    """Response for job_list from cache, or from ``render() -> html``; honours If-None-Match"""
+    try:
+        cache = fragment_cache.backend()
+        stamp = fragment_cache.versions('public', ['job_list'])['job_list']
+        key = f"{job_list_cache_key(request)}:{stamp}"
+        cached = cache.get(key)
+    except Exception as e:
+        logger.warning(f"Job list cache unavailable: {e}")
+        cache = cached = None
+
+    if cached is None:
+        html = render()
+        cached = {'html': html, 'etag': f'"{hashlib.md5(html.encode()).hexdigest()}"'}
+        if cache is not None:
+            try:
+                cache.set(key, cached, fragment_cache.default_timeout())
+            except Exception as e:
+                logger.warning(f"Could not cache job list: {e}")
+
+    response = get_conditional_response(request, etag=cached['etag'])
+    if response is None:
+        response = HttpResponse(cached['html'])
+    response['ETag'] = cached['etag']
+    return patch_public_cache(response, request, personalised=False)
+
+
+def bump_job_list():
+    fragment_cache.bump('public', 'job_list')
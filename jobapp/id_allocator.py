@@ -0,0 +1,172 @@
+"""
+Interview ID allocation.
+
+Interview IDs keep their ``xxx-xxx-xxx`` form (9 hex digits, 36 bits) but
+are no longer random: each one is a value of a database sequence (an
+IdSequence row) run through a keyed Feistel permutation of the 36-bit
+space. A permutation never maps two values to the same ID, so new IDs are
+unique by construction and never need an exists() check. The IDs still
+look random, so they cannot be guessed from one another.
+
+Processes reserve blocks of sequence values with one UPDATE and hand them
+out from memory, so an insert normally does no extra query at all. The
+permutation key is stored on the sequence row, so IDs stay consistent
+across processes and deploys.
+
+Reserving inside a transaction (a bulk schedule, ATOMIC_REQUESTS) would
+keep the sequence row locked until that transaction ends, serialising all
+other interview creation behind it. On PostgreSQL such reservations go
+through a short-lived connection of their own in autocommit instead, so
+the row is locked for one statement and a rollback does not undo the
+reservation. Other backends reserve in the caller's transaction, only as
+many values as needed, since a rollback would hand them out again; SQLite
+locks the whole database for a writing transaction anyway. IDs created before this scheme were random
+and can, very rarely, coincide with a new one; Interview.save retries with
+the next ID when the unique constraint says so.
+"""
+import os
+import hashlib
+import secrets
+import logging
+import threading
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, connection, connections, transaction
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+ID_BITS = 36
+HALF_BITS = ID_BITS // 2
+HALF_MASK = (1 << HALF_BITS) - 1
+ROUNDS = 4
+SEQUENCE_NAME = 'interview_id'
+
+
+def block_size():
+    return getattr(settings, 'INTERVIEW_ID_BLOCK_SIZE', 50)
+
+
+def _round_keys(key):
+    return [hashlib.blake2b(f"{key}:{i}".encode(), digest_size=16).digest() for i in range(ROUNDS)]
+
+
+def permute(value, round_keys):
+    """Keyed bijection of [0, 2**36) - a balanced Feistel network on 18-bit halves"""
+    left, right = value >> HALF_BITS, value & HALF_MASK
+    for round_key in round_keys:
+        mixed = int.from_bytes(hashlib.blake2b(right.to_bytes(3, 'big'), key=round_key, digest_size=4).digest(), 'big')
+        left, right = right, left ^ (mixed & HALF_MASK)
+    return (left << HALF_BITS) | right
+
+
+def unpermute(value, round_keys):
+    """Inverse of permute"""
+    left, right = value >> HALF_BITS, value & HALF_MASK
+    for round_key in reversed(round_keys):
+        mixed = int.from_bytes(hashlib.blake2b(left.to_bytes(3, 'big'), key=round_key, digest_size=4).digest(), 'big')
+        left, right = right ^ (mixed & HALF_MASK), left
+    return (left << HALF_BITS) | right
+
+
+def format_id(value):
+    hex_9 = f"{value:09x}"
+    return f"{hex_9[:3]}-{hex_9[3:6]}-{hex_9[6:9]}"
+
+
+def parse_id(interview_id):
+    return int(interview_id.replace('-', ''), 16)
+
+
+class SequenceAllocator:
+    """Hands out values of one IdSequence, reserving them from the database a block at a time"""
+
+    def __init__(self, name):
+        self.name = name
+        self.lock = threading.Lock()
+        self.pid = None
+        self.next_value = self.end = 0
+        self.round_keys = None
+
+    def _round_keys(self):
+        from .models import IdSequence
+
+        if self.round_keys is not None:
+            return self.round_keys
+        # Normally created by migration 0011
+        try:
+            with transaction.atomic():
+                sequence, created = IdSequence.objects.get_or_create(name=self.name, defaults={'key': secrets.token_hex(16)})
+        except IntegrityError:
+            sequence, created = IdSequence.objects.get(name=self.name), False
+        round_keys = _round_keys(sequence.key)
+        # A key created inside a transaction that later rolls back must not stay cached
+        if not (created and connection.in_atomic_block):
+            self.round_keys = round_keys
+        return round_keys
+
+    def _reserves_separately(self):
+        """Whether a reservation now goes through a connection of its own (see the module docstring)"""
+        return connection.in_atomic_block and connection.vendor == 'postgresql'
+
+    def _reserve(self, count):
+        """Reserve ``count`` values; returns the first"""
+        from .models import IdSequence
+
+        if self._reserves_separately():
+            own_connection = connections.create_connection(DEFAULT_DB_ALIAS)
+            try:
+                with own_connection.cursor() as cursor:
+                    cursor.execute(
+                        f"UPDATE {own_connection.ops.quote_name(IdSequence._meta.db_table)} "
+                        "SET next_value = next_value + %s WHERE name = %s RETURNING next_value",
+                        [count, self.name]
+                    )
+                    end = cursor.fetchone()[0]
+            finally:
+                own_connection.close()
+        else:
+            # The UPDATE row lock makes the read-back ours alone, on every backend
+            with transaction.atomic():
+                IdSequence.objects.filter(name=self.name).update(next_value=F('next_value') + count)
+                end = IdSequence.objects.filter(name=self.name).values_list('next_value', flat=True).get()
+        if end > 1 << ID_BITS:
+            raise OverflowError(f"The {self.name} sequence has run out of IDs")
+        return end - count
+
+    def take(self, count=1):
+        """``count`` fresh sequence values, permuted: ``count`` distinct IDs as integers"""
+        with self.lock:
+            if self.pid != os.getpid():
+                # A forked worker must not reuse its parent's block
+                self.pid = os.getpid()
+                self.next_value = self.end = 0
+            round_keys = self._round_keys()
+            take = min(count, self.end - self.next_value)
+            values = list(range(self.next_value, self.next_value + take))
+            self.next_value += take
+            missing = count - len(values)
+            if missing:
+                if connection.in_atomic_block and not self._reserves_separately():
+                    # A reservation inside a transaction is undone if it rolls back, so
+                    # nothing from it may be kept for later transactions
+                    first = self._reserve(missing)
+                    values.extend(range(first, first + missing))
+                else:
+                    wanted = max(block_size(), missing)
+                    first = self._reserve(wanted)
+                    values.extend(range(first, first + missing))
+                    self.next_value, self.end = first + missing, first + wanted
+            return [permute(value, round_keys) for value in values]
+
+
+_interview_ids = SequenceAllocator(SEQUENCE_NAME)
+
+
+def next_interview_ids(count=1):
+    """``count`` new interview IDs in ``xxx-xxx-xxx`` form"""
+    return [format_id(value) for value in _interview_ids.take(count)]
+
+
+def next_interview_id():
+    return next_interview_ids(1)[0]
@@ -0,0 +1,247 @@
+"""
+Fixed interviewer phrases and their pre-synthesized audio.
+
+Scripted interviewer lines only vary by candidate name, job title and
+company. Each template is split around ``{candidate_name}`` into segments:
+job segments are synthesized ahead of time for every active job, the name
+segment once per candidate, and a turn's audio is spliced together from
+cached segments instead of calling the TTS API on the request path.
+Segments are only synthesized by the warm-up tasks: if any segment of a
+phrase is not cached, the phrase gets ordinary whole-phrase TTS.
+"""
+import os
+import re
+import hashlib
+import logging
+from functools import lru_cache
+
+from .tts_cache import tts_cache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CANDIDATE_NAME = "the candidate"
+DEFAULT_JOB_TITLE = "Software Developer"
+DEFAULT_COMPANY_NAME = "Our Company"
+
+GREETING = "Hi there! I'm Sarah. Before we begin, could you please tell me your name?"
+
+TIME_UP = "Thank you so much for your time today, {candidate_name}! We've covered a lot of ground in our conversation. I really enjoyed learning about your background, skills, and experiences. Your insights have been valuable, and we appreciate your interest in the {job_title} position at {company_name}. Our team will review everything we discussed and get back to you with next steps within 2-3 business days. Have a wonderful day!"
+
+LAST_QUESTIONS = [
+    "We're coming to the end of our time together, {candidate_name}. For my final question: Is there anything important about your skills, experience, or qualifications that we haven't discussed yet that you'd like me to know about?",
+
+    "This will be our last question today, {candidate_name}. Before we wrap up: What makes you particularly excited about this {job_title} opportunity, and why do you think you'd be a great fit for our team at {company_name}?",
+
+    "We have just a couple of minutes left, {candidate_name}. As a final question: If you were to start in this role next week, what would be your top priority in your first 30 days?",
+
+    "For our final question today, {candidate_name}: What's one professional achievement you're most proud of, and what did you learn from that experience?",
+]
+
+AUDIO_CHECK = "Yes, I can hear you perfectly, {candidate_name}! Your audio is crystal clear and you sound great. I'm Sarah, and I'm so excited to get to know you better today! Let's dive in - could you tell me about your background, your experience with {job_title} work, and what specifically drew you to apply for this position with {company_name}?"
+
+# Fallback replies are an opening that reacts to the candidate's tone
+# followed by a follow-up question for the current stage of the interview
+FALLBACK_OPENINGS = {
+    'nervous': "I completely understand, {candidate_name}. Interviews can feel nerve-wracking, but you're doing fantastic! Let's keep this conversational and relaxed. ",
+    'excited': "I can really hear the passion in your voice, {candidate_name}! That enthusiasm is exactly what we love to see. ",
+    'challenge': "That sounds like a great learning experience, {candidate_name}. I appreciate you sharing that challenge with me. ",
+    'default': "Thank you for sharing that, {candidate_name}. That's really insightful! ",
+}
+
+FALLBACK_FOLLOW_UPS = {
+    'greeting': "Nice to meet you! How are you feeling today?",
+    'ready': "Great! Now that we're getting to know each other, are you ready to start our interview for the {job_title} position at {company_name}?",
+    'begin': "Perfect! Let's begin. Could you tell me a bit about yourself and what drew you to apply for this {job_title} role?",
+    'tech_project': "Excellent technical foundation! Can you walk me through a specific project where you used these technologies? I'm particularly interested in any challenges you faced and how you overcame them.",
+    'project_challenge': "That sounds like a fascinating project! What was the most challenging technical problem you encountered while building it, and how did you approach solving it?",
+    'tools_project': "Great choice of technologies! Can you describe a specific project where you implemented these tools? What made you choose them for that particular solution?",
+    'proud_project': "I'd love to hear about a project you've worked on that you're particularly proud of. Can you walk me through the technical challenges and how you solved them?",
+    'team_disagreement': "Collaboration is so crucial in development! Can you give me an example of a time when you had to work through a technical disagreement with a team member? How did you handle it?",
+    'debugging': "Great problem-solving approach! How do you typically approach debugging complex issues, especially when working with a team? Do you have a systematic process?",
+    'methodology': "Excellent experience with development methodologies! How do you handle changing requirements or tight deadlines while maintaining code quality?",
+    'teamwork': "How do you approach working in team environments, especially when collaborating on complex technical projects? Can you share an example?",
+    'career_goals': "I love hearing about career aspirations! What specifically excites you about this {job_title} role at {company_name}, and how does it align with your professional goals?",
+    'questions': "That's exactly the kind of thinking we value! Do you have any questions about the day-to-day responsibilities, our team dynamics, or the company culture?",
+    'tech_trends': "Your interest in technology trends is great! How do you stay updated with the latest developments in {job_title}, and what emerging technologies are you most excited about?",
+    'role_interest': "What draws you most to this {job_title} position at {company_name}? What aspects of the role or our company culture interest you the most?",
+}
+
+SINGLE_PHRASES = [GREETING, TIME_UP, AUDIO_CHECK] + LAST_QUESTIONS
+
+# Changes whenever a template changes, so warm-up tasks re-run after edits
+TEMPLATES_DIGEST = hashlib.md5('\n'.join(
+    SINGLE_PHRASES + list(FALLBACK_OPENINGS.values()) + list(FALLBACK_FOLLOW_UPS.values())
+).encode()).hexdigest()[:8]
+
+# The name segment takes the punctuation right after it, so job segments
+# never start with a stray "!" or ","
+NAME_PATTERN = re.compile(r'\{candidate_name\}([!?.,:]?)')
+
+
+def render(template, candidate_name=None, job_title=None, company_name=None):
+    return template.format(
+        candidate_name=candidate_name or DEFAULT_CANDIDATE_NAME,
+        job_title=job_title or DEFAULT_JOB_TITLE,
+        company_name=company_name or DEFAULT_COMPANY_NAME,
+    )
+
+
+def segments(template, candidate_name=None, job_title=None, company_name=None):
+    """Split ``template`` into speakable segments: ``[(text, is_name), ...]``"""
+    parts = NAME_PATTERN.split(template)
+    result = []
+    # re.split alternates text, punctuation, text, ...
+    for index, part in enumerate(parts):
+        if index % 2:
+            result.append((f"{candidate_name or DEFAULT_CANDIDATE_NAME}{part}", True))
+            continue
+        text = render(part, candidate_name, job_title, company_name).strip()
+        if text:
+            result.append((text, False))
+    return result
+
+
+def name_segments(candidate_name):
+    """Every name segment used by the templates, e.g. "Asha!" and "Asha," """
+    templates = SINGLE_PHRASES + list(FALLBACK_OPENINGS.values())
+    suffixes = sorted({suffix for template in templates for suffix in NAME_PATTERN.findall(template)})
+    return [f"{candidate_name or DEFAULT_CANDIDATE_NAME}{suffix}" for suffix in suffixes]
+
+
+def job_segments(job_title=None, company_name=None):
+    """Every non-name segment of every template for one job"""
+    templates = SINGLE_PHRASES + list(FALLBACK_OPENINGS.values()) + list(FALLBACK_FOLLOW_UPS.values())
+    texts = []
+    for template in templates:
+        for text, is_name in segments(template, None, job_title, company_name):
+            if not is_name and text not in texts:
+                texts.append(text)
+    return texts
+
+
+@lru_cache(maxsize=256)
+def _phrase_lookup(candidate_name, job_title, company_name):
+    names = (candidate_name, job_title, company_name)
+    singles = {render(template, *names): template for template in SINGLE_PHRASES}
+    openings = {render(template, *names): template for template in FALLBACK_OPENINGS.values()}
+    follow_ups = {render(template, *names): template for template in FALLBACK_FOLLOW_UPS.values()}
+    return singles, openings, follow_ups
+
+
+def phrase_segments(text, candidate_name=None, job_title=None, company_name=None):
+    """Segments for ``text`` if it is a rendered template (or fallback opening +
+    follow-up), otherwise None"""
+    names = (candidate_name, job_title, company_name)
+    singles, openings, follow_ups = _phrase_lookup(*names)
+    if text in singles:
+        return segments(singles[text], *names)
+    for opening, template in openings.items():
+        if text.startswith(opening) and text[len(opening):] in follow_ups:
+            return segments(template, *names) + segments(follow_ups[text[len(opening):]], *names)
+    return None
+
+
+def _strip_id3(data):
+    """Drop a leading ID3v2 tag so spliced MP3 segments play back to back"""
+    if data[:3] == b'ID3' and len(data) > 10:
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        return data[10 + size:]
+    return data
+
+
+def _segment_audio(text, pin=False):
+    """Synthesize one segment for the warm-up; its cache filename, or None.
+
+    Audio from the gTTS fallback is not used, so a phrase is never spliced
+    from two voices.
+    """
+    from .tts import generate_tts, tts_file
+
+    filename = tts_file(text)
+    audio_url = generate_tts(text, "female_interview")
+    if not audio_url or os.path.basename(audio_url) != filename:
+        return None
+    if pin:
+        tts_cache.pin(filename)
+    return filename
+
+
+def phrase_audio(text, candidate_name=None, job_title=None, company_name=None):
+    """Media URL of spliced audio for a scripted phrase, or None if ``text`` is not one"""
+    parts = phrase_segments(text, candidate_name, job_title, company_name)
+    if not parts:
+        return None
+
+    filename = f"phrase_{hashlib.md5(text.encode()).hexdigest()[:10]}.mp3"
+    cached_url = tts_cache.get(filename)
+    if cached_url:
+        return cached_url
+
+    from .tts import tts_file
+
+    # Cache lookups only - one missing segment means whole-phrase TTS, not a TTS call per segment
+    segment_files = [tts_file(segment_text) for segment_text, is_name in parts]
+    for segment_file in segment_files:
+        if not tts_cache.get(segment_file):
+            logger.info(f"Phrase segment {segment_file} not warmed, phrase not spliced")
+            return None
+
+    content = b''
+    durations = []
+    for segment_file in segment_files:
+        with open(tts_cache.path(segment_file), 'rb') as f:
+            content += f.read() if not content else _strip_id3(f.read())
+        durations.append(tts_cache.duration(segment_file))
+
+    # Headers of the first segment only describe that segment, so add up the parts
+    duration = round(sum(durations), 3) if all(durations) else None
+    logger.info(f"🧩 Spliced phrase audio {filename} from {len(parts)} segments")
+    return tts_cache.put(filename, content, duration=duration)
+
+
+def _warm(texts, pin=False):
+    failed = [text for text in texts if not _segment_audio(text, pin=pin)]
+    tts_cache.flush()
+    if failed:
+        raise RuntimeError(f"TTS failed for {len(failed)} of {len(texts)} phrase segments")
+    return len(texts)
+
+
+def warm_job(job_title=None, company_name=None):
+    """Synthesize and pin every job segment; returns the number of segments"""
+    count = _warm(job_segments(job_title, company_name), pin=True)
+    logger.info(f"🔥 Warmed {count} phrase segments for {job_title or DEFAULT_JOB_TITLE} at {company_name or DEFAULT_COMPANY_NAME}")
+    return count
+
+
+def warm_candidate(candidate_name):
+    """Synthesize the name segments for one candidate"""
+    return _warm(name_segments(candidate_name))
+
+
+def interview_phrase_names(interview):
+    """(candidate_name, job_title, company_name) as the interview view resolves them"""
+    if interview.is_registered_candidate:
+        candidate_name = interview.candidate.get_full_name() or interview.candidate.username
+    else:
+        candidate_name = interview.candidate_name or DEFAULT_CANDIDATE_NAME
+    job = interview.job
+    return candidate_name, (job.title if job else None) or DEFAULT_JOB_TITLE, (job.company if job else None) or DEFAULT_COMPANY_NAME
+
+
+def warm_all(include_candidates=True):
+    """Warm phrase audio for every active job and upcoming interview"""
+    from .models import Interview, Job
+
+    count = warm_job()
+    count += warm_candidate(DEFAULT_CANDIDATE_NAME)
+    for title, company in Job.objects.filter(status='active').values_list('title', 'company').distinct():
+        count += warm_job(title, company)
+
+    if include_candidates:
+        interviews = Interview.objects.filter(status='scheduled').select_related('job', 'candidate')
+        for interview in interviews:
+            if interview.is_expired:
+                continue
+            count += warm_candidate(interview_phrase_names(interview)[0])
+    return count
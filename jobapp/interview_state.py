@@ -0,0 +1,354 @@
+import abc
+import copy
+import logging
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.db.models import Max
+from django.utils.dateparse import parse_datetime
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+# Number of most recent turns loaded into the interview context
+HISTORY_LIMIT = 40
+
+HEADER_FIELDS = [
+    'candidate_name', 'job_title', 'company_name', 'resume_text',
+    'job_description', 'job_location', 'is_registered_candidate',
+    'interview_duration_minutes', 'question_count', 'interview_completed',
+    'started_at', 'last_processed_input', 'last_processed_time',
+]
+TURN_FIELDS = ['speaker', 'message', 'question_number', 'time_remaining', 'timestamp', 'response_ms', 'answer_ms']
+
+
+class BaseInterviewStateBackend(abc.ABC):
+    """Storage for interview state: a small header plus an append-only turn log.
+
+    Headers and turns are plain dicts. Backends must return copies so callers
+    can mutate what they load.
+    """
+
+    @abc.abstractmethod
+    def load_header(self, interview):
+        pass
+
+    @abc.abstractmethod
+    def create(self, interview, header):
+        pass
+
+    @abc.abstractmethod
+    def update_header(self, interview, changes):
+        pass
+
+    @abc.abstractmethod
+    def append_turns(self, interview, turns):
+        """Store ``turns`` after the existing ones, setting ``turn['sequence']`` on each"""
+
+    @abc.abstractmethod
+    def load_turns(self, interview, limit=None):
+        pass
+
+    @abc.abstractmethod
+    def delete(self, interview):
+        pass
+
+
+class DatabaseBackend(BaseInterviewStateBackend):
+    """InterviewStateHeader / InterviewTurn tables - one row per turn"""
+
+    def _split(self, data, fields):
+        columns = {k: v for k, v in data.items() if k in fields}
+        extra = {k: v for k, v in data.items() if k not in fields and k != 'sequence'}
+        for key in ('started_at', 'timestamp'):
+            if isinstance(columns.get(key), str):
+                columns[key] = parse_datetime(columns[key])
+        return columns, extra
+
+    def _join(self, row, fields):
+        data = dict(row.extra or {})
+        for field in fields:
+            value = getattr(row, field)
+            data[field] = value.isoformat() if hasattr(value, 'isoformat') else value
+        return data
+
+    def load_header(self, interview):
+        from .models import InterviewStateHeader
+        row = InterviewStateHeader.objects.filter(interview_id=interview.pk).first()
+        return self._join(row, HEADER_FIELDS) if row else None
+
+    def create(self, interview, header):
+        from .models import InterviewStateHeader
+        columns, extra = self._split(header, HEADER_FIELDS)
+        InterviewStateHeader.objects.update_or_create(
+            interview_id=interview.pk,
+            defaults={**columns, 'extra': extra}
+        )
+
+    def update_header(self, interview, changes):
+        from .models import InterviewStateHeader
+        columns, extra = self._split(changes, HEADER_FIELDS)
+        with transaction.atomic():
+            if extra:
+                row = InterviewStateHeader.objects.select_for_update().only('extra').get(interview_id=interview.pk)
+                columns['extra'] = {**(row.extra or {}), **extra}
+            InterviewStateHeader.objects.filter(interview_id=interview.pk).update(**columns)
+
+    def turn_row(self, interview, turn, sequence):
+        from .models import InterviewTurn
+        columns, extra = self._split(turn, TURN_FIELDS)
+        return InterviewTurn(interview_id=interview.pk, sequence=sequence, extra=extra, **columns)
+
+    def append_turns(self, interview, turns):
+        from .models import InterviewStateHeader, InterviewTurn
+        with transaction.atomic():
+            # Lock the header row so concurrent turns get distinct sequence numbers
+            InterviewStateHeader.objects.select_for_update().filter(interview_id=interview.pk).exists()
+            last = InterviewTurn.objects.filter(interview_id=interview.pk).aggregate(last=Max('sequence'))['last']
+            sequence = 0 if last is None else last + 1
+            rows = []
+            for turn in turns:
+                rows.append(self.turn_row(interview, turn, sequence))
+                turn['sequence'] = sequence
+                sequence += 1
+            InterviewTurn.objects.bulk_create(rows)
+
+    def load_turns(self, interview, limit=None):
+        from .models import InterviewTurn
+        rows = InterviewTurn.objects.filter(interview_id=interview.pk).order_by('-sequence')
+        if limit:
+            rows = rows[:limit]
+        turns = []
+        for row in reversed(list(rows)):
+            turn = self._join(row, TURN_FIELDS)
+            turn['sequence'] = row.sequence
+            turns.append(turn)
+        return turns
+
+    def delete(self, interview):
+        from .models import InterviewStateHeader, InterviewTurn
+        InterviewTurn.objects.filter(interview_id=interview.pk).delete()
+        InterviewStateHeader.objects.filter(interview_id=interview.pk).delete()
+
+
+class MemoryBackend(BaseInterviewStateBackend):
+    """Process-local store for tests and single-process development"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._states = {}
+
+    def load_header(self, interview):
+        with self._lock:
+            state = self._states.get(str(interview.uuid))
+            return copy.deepcopy(state['header']) if state else None
+
+    def create(self, interview, header):
+        with self._lock:
+            self._states[str(interview.uuid)] = {'header': copy.deepcopy(header), 'turns': []}
+
+    def update_header(self, interview, changes):
+        with self._lock:
+            self._states[str(interview.uuid)]['header'].update(copy.deepcopy(changes))
+
+    def append_turns(self, interview, turns):
+        with self._lock:
+            log = self._states[str(interview.uuid)]['turns']
+            for turn in turns:
+                turn['sequence'] = len(log)
+                log.append(copy.deepcopy(turn))
+
+    def load_turns(self, interview, limit=None):
+        with self._lock:
+            log = self._states.get(str(interview.uuid), {}).get('turns', [])
+            return copy.deepcopy(log[-limit:] if limit else log)
+
+    def delete(self, interview):
+        with self._lock:
+            self._states.pop(str(interview.uuid), None)
+
+
+class CacheBackend(BaseInterviewStateBackend):
+    """Django cache store - one key for the header and one per turn.
+
+    The cache must be shared by every worker process, since an interview's
+    requests land on any of them: a per-process alias (LocMemCache) is
+    refused rather than silently losing state between requests.
+    """
+
+    PER_PROCESS_BACKENDS = ('LocMemCache', 'DummyCache')
+
+    def __init__(self):
+        alias = getattr(settings, 'INTERVIEW_STATE_CACHE_ALIAS', 'fragments')
+        backend = settings.CACHES.get(alias, {}).get('BACKEND', '')
+        if backend.endswith(self.PER_PROCESS_BACKENDS):
+            raise ImproperlyConfigured(
+                f"INTERVIEW_STATE_CACHE_ALIAS '{alias}' uses {backend.rsplit('.', 1)[-1]}, which is not "
+                "shared between worker processes - point it at Redis or Memcached"
+            )
+        self.cache = caches[alias]
+        self.timeout = getattr(settings, 'INTERVIEW_STATE_CACHE_TIMEOUT', 4 * 60 * 60)
+
+    def _key(self, interview, suffix):
+        return f'interview_state:{interview.uuid}:{suffix}'
+
+    def load_header(self, interview):
+        return self.cache.get(self._key(interview, 'header'))
+
+    def create(self, interview, header):
+        self.cache.set(self._key(interview, 'header'), header, self.timeout)
+        self.cache.set(self._key(interview, 'length'), 0, self.timeout)
+
+    def update_header(self, interview, changes):
+        header = self.load_header(interview) or {}
+        header.update(changes)
+        self.cache.set(self._key(interview, 'header'), header, self.timeout)
+
+    def append_turns(self, interview, turns):
+        length_key = self._key(interview, 'length')
+        self.cache.add(length_key, 0, self.timeout)
+        for turn in turns:
+            # incr is atomic on shared caches, so concurrent appends never collide
+            turn['sequence'] = self.cache.incr(length_key) - 1
+            self.cache.set(self._key(interview, f"turn:{turn['sequence']}"), turn, self.timeout)
+
+    def load_turns(self, interview, limit=None):
+        length = self.cache.get(self._key(interview, 'length')) or 0
+        start = max(0, length - limit) if limit else 0
+        keys = [self._key(interview, f'turn:{n}') for n in range(start, length)]
+        found = self.cache.get_many(keys)
+        return [found[key] for key in keys if key in found]
+
+    def delete(self, interview):
+        length = self.cache.get(self._key(interview, 'length')) or 0
+        self.cache.delete_many(
+            [self._key(interview, 'header'), self._key(interview, 'length')] +
+            [self._key(interview, f'turn:{n}') for n in range(length)]
+        )
+
+
+_backends = {}
+
+
+def get_interview_state_backend():
+    path = getattr(settings, 'INTERVIEW_STATE_BACKEND', 'jobapp.interview_state.DatabaseBackend')
+    if path not in _backends:
+        _backends[path] = import_string(path)()
+    return _backends[path]
+
+
+class InterviewState:
+    """Conversation state of one interview.
+
+    ``context`` is a plain dict of header fields plus ``conversation_history``
+    (the most recent turns). ``save()`` writes only the header fields that
+    changed and the turns appended since the state was loaded.
+    """
+
+    def __init__(self, interview, header, turns, backend):
+        self.interview = interview
+        self.backend = backend
+        self.context = dict(header)
+        self.context['conversation_history'] = turns
+        self._saved_header = copy.deepcopy(header)
+
+    @classmethod
+    def load(cls, interview, history_limit=HISTORY_LIMIT):
+        """Return the saved state for ``interview``, or None if it has not started"""
+        backend = get_interview_state_backend()
+        header = backend.load_header(interview)
+        if header is None:
+            return None
+        return cls(interview, header, backend.load_turns(interview, history_limit), backend)
+
+    @classmethod
+    def create(cls, interview, header):
+        backend = get_interview_state_backend()
+        header = {k: v for k, v in header.items() if k != 'conversation_history'}
+        backend.create(interview, header)
+        logger.info(f"🗂️ Created interview state for {interview.uuid} ({type(backend).__name__})")
+        return cls(interview, header, [], backend)
+
+    def save(self):
+        header = {k: v for k, v in self.context.items() if k != 'conversation_history'}
+        changes = {
+            k: v for k, v in header.items()
+            if k not in self._saved_header or self._saved_header[k] != v
+        }
+        if changes:
+            self.backend.update_header(self.interview, changes)
+            self._saved_header.update(copy.deepcopy(changes))
+
+        new_turns = [turn for turn in self.context.get('conversation_history', []) if 'sequence' not in turn]
+        if new_turns:
+            self.backend.append_turns(self.interview, new_turns)
+
+
+def persist_turns(interview, fallback=None):
+    """Make sure the whole conversation of ``interview`` is stored as InterviewTurn rows.
+
+    The database backend writes the rows as the interview runs. With the
+    memory or cache backend they are copied over once, when the results are
+    generated; ``fallback`` (a conversation_history list) is used when the
+    backend no longer has the turns.
+    """
+    from .models import InterviewTurn
+
+    if InterviewTurn.objects.filter(interview_id=interview.pk).exists():
+        return
+    backend = get_interview_state_backend()
+    turns = [] if isinstance(backend, DatabaseBackend) else backend.load_turns(interview)
+    turns = turns or fallback or []
+    database = DatabaseBackend()
+    InterviewTurn.objects.bulk_create(
+        [database.turn_row(interview, turn, sequence) for sequence, turn in enumerate(turns)],
+        ignore_conflicts=True,
+    )
+    if turns:
+        logger.info(f"🗂️ Stored {len(turns)} turns of interview {interview.uuid} from {type(backend).__name__}")
+
+
+def pair_turns(turns):
+    """Pair stored turns (in sequence order) into questions and answers.
+
+    Each interviewer turn opens a pair; the candidate turns that follow it,
+    up to the next interviewer turn, are its answer.
+    """
+    pairs = []
+    for turn in turns:
+        if turn.speaker == 'interviewer' or not pairs:
+            pairs.append({
+                'question_number': len(pairs) + 1,
+                'question': turn.message if turn.speaker == 'interviewer' else 'Question not recorded',
+                'question_timestamp': turn.timestamp if turn.speaker == 'interviewer' else None,
+                'response_ms': turn.response_ms if turn.speaker == 'interviewer' else None,
+                'answers': [],
+                'answer_timestamp': None,
+                'answer_ms': None,
+            })
+        if turn.speaker == 'candidate':
+            pair = pairs[-1]
+            pair['answers'].append(turn.message)
+            pair['answer_timestamp'] = pair['answer_timestamp'] or turn.timestamp
+            pair['answer_ms'] = pair['answer_ms'] or turn.answer_ms
+    for pair in pairs:
+        pair['answer'] = '\n\n'.join(pair.pop('answers')) or 'Answer not recorded'
+    return pairs
+
+
+def turn_stats(interview):
+    """Questions, answers, average answer length and reply latency of an interview, counted in SQL"""
+    from django.db.models import Avg, Count, Q
+    from django.db.models.functions import Length
+    from .models import InterviewTurn
+
+    return InterviewTurn.objects.filter(interview_id=interview.pk).aggregate(
+        questions=Count('id', filter=Q(speaker='interviewer')),
+        answers=Count('id', filter=Q(speaker='candidate')),
+        avg_answer_length=Avg(Length('message'), filter=Q(speaker='candidate')),
+        avg_response_ms=Avg('response_ms'),
+        avg_answer_ms=Avg('answer_ms'),
+    )
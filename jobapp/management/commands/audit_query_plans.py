@@ -0,0 +1,139 @@
+import random
+import uuid
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from jobapp.models import Application, Candidate, Interview, Job
+from jobapp.query_audit import HOT_QUERIES, audit
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the hot queries and fail if any of them does a full table scan'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Seed this many jobs (plus related rows) first; rolled back afterwards')
+        parser.add_argument('--query', action='append', choices=sorted(HOT_QUERIES), help='Only audit these queries')
+        parser.add_argument('--show-plans', action='store_true', help='Print every plan, not just failing ones')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Database: {connection.vendor}")
+        try:
+            with transaction.atomic():
+                sample = self._seed(options['seed']) if options['seed'] else self._existing_sample()
+                self._analyze()
+                results = audit(sample, options['query'])
+                # Never keep the seeded rows
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        failures = 0
+        for result in results:
+            if result['full_scans']:
+                failures += 1
+                self.stdout.write(self.style.ERROR(f"✗ {result['name']}: full scan of {', '.join(result['full_scans'])}"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"✓ {result['name']}"))
+            if result['full_scans'] or options['show_plans']:
+                self.stdout.write('    ' + result['plan'].replace('\n', '\n    '))
+
+        if failures:
+            raise CommandError(f"{failures} of {len(results)} hot queries use a full table scan")
+        self.stdout.write(self.style.SUCCESS(f"All {len(results)} hot queries use indexes"))
+
+    def _analyze(self):
+        # Give the planner statistics for the (possibly just seeded) tables
+        tables = [model._meta.db_table for model in (Job, Application, Interview, Candidate, get_user_model())]
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                for table in tables:
+                    cursor.execute(f'ANALYZE {connection.ops.quote_name(table)}')
+            elif connection.vendor == 'sqlite':
+                cursor.execute('ANALYZE')
+
+    def _existing_sample(self):
+        User = get_user_model()
+        recruiter = User.objects.filter(is_recruiter=True).first()
+        candidate_user = User.objects.filter(is_recruiter=False).first()
+        if not recruiter or not candidate_user:
+            raise CommandError('Need at least one recruiter and one candidate user - or run with --seed')
+        candidate = Candidate.objects.filter(added_by=recruiter).first()
+        return {
+            'recruiter': recruiter,
+            'candidate_user': candidate_user,
+            'job': Job.objects.first(),
+            'candidate_email': candidate.email if candidate else candidate_user.email,
+        }
+
+    def _seed(self, job_count):
+        """Bulk insert a realistic spread of jobs, applications, interviews and candidates"""
+        User = get_user_model()
+        run = uuid.uuid4().hex[:6]
+        now = timezone.now()
+        recruiter_count = max(2, job_count // 50)
+        seeker_count = max(2, job_count // 5)
+
+        users = [User(username=f'audit_{run}_r{n}', email=f'r{n}@audit.example', is_recruiter=True) for n in range(recruiter_count)]
+        users += [User(username=f'audit_{run}_c{n}', email=f'c{n}@audit.example') for n in range(seeker_count)]
+        User.objects.bulk_create(users, batch_size=1000)
+        recruiters = list(User.objects.filter(username__startswith=f'audit_{run}_r'))
+        seekers = list(User.objects.filter(username__startswith=f'audit_{run}_c'))
+
+        statuses = ['active'] * 6 + ['closed', 'expired', 'filled']
+        employment_types = ['full_time', 'part_time', 'internship', 'freelance']
+        Job.objects.bulk_create([
+            Job(
+                title=f'Audit job {n}', company=f'Company {n % 300}', location='Remote', description='Seeded for query audit',
+                status=random.choice(statuses), employment_type=random.choice(employment_types),
+                posted_by=recruiters[n % len(recruiters)],
+            )
+            for n in range(job_count)
+        ], batch_size=1000)
+        jobs = list(Job.objects.filter(description='Seeded for query audit').only('id', 'posted_by_id'))
+        # auto_now_add ignores explicit values, so spread the dates afterwards
+        for job in jobs:
+            job.date_posted = now - timedelta(minutes=random.randint(0, 500000))
+        Job.objects.bulk_update(jobs, ['date_posted'], batch_size=1000)
+
+        Application.objects.bulk_create([
+            Application(applicant=random.choice(seekers), job=random.choice(jobs), resume='applications/resumes/audit.pdf')
+            for _ in range(job_count * 2)
+        ], batch_size=1000)
+
+        interview_statuses = ['scheduled'] * 3 + ['completed'] * 2 + ['cancelled']
+        interviews = []
+        for n in range(job_count * 2):
+            status = random.choice(interview_statuses)
+            interviews.append(Interview(
+                job=random.choice(jobs), candidate=random.choice(seekers) if n % 3 else None,
+                candidate_name=f'Audit {n}', candidate_email=f'audit{n}@audit.example',
+                interview_id=f'{run[:2]}{n:09d}', status=status,
+                scheduled_at=now + timedelta(days=random.randint(-30, 30)),
+                completed_at=now - timedelta(minutes=random.randint(0, 50000)) if status == 'completed' else None,
+            ))
+        Interview.objects.bulk_create(interviews, batch_size=1000)
+
+        Candidate.objects.bulk_create([
+            Candidate(name=f'Audit {n}', email=f'cand{n}@audit.example', phone='000', added_by=recruiters[n % len(recruiters)])
+            for n in range(job_count)
+        ], batch_size=1000)
+
+        self.stdout.write(
+            f"Seeded {job_count} jobs, {job_count * 2} applications, {job_count * 2} interviews, "
+            f"{job_count} candidates, {len(users)} users"
+        )
+        return {
+            'recruiter': recruiters[0],
+            'candidate_user': seekers[0],
+            'job': jobs[0],
+            'candidate_email': 'cand0@audit.example',
+        }
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from jobapp.models import OutboxEmail
+from jobapp.outbox import deliver
+
+
+class Command(BaseCommand):
+    help = 'Send due emails from the outbox (normally done by the task worker)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--status', action='store_true', help='Only show how many emails are in each state')
+
+    def handle(self, *args, **options):
+        if not options['status']:
+            sent = deliver()
+            self.stdout.write(self.style.SUCCESS(f"Sent {sent} emails"))
+        for row in OutboxEmail.objects.values('status').annotate(n=Count('pk')).order_by('status'):
+            self.stdout.write(f"{row['status']}: {row['n']}")
@@ -0,0 +1,184 @@
+import asyncio
+import json
+import statistics
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from jobapp.interview_state import InterviewState
+from jobapp.models import Interview, Job
+
+ENDPOINTS = {
+    'sync': 'start_interview',
+    'async': 'interview_turn_async',
+    'stream': 'stream_interview_turn',
+}
+
+ANSWERS = [
+    "I have three years of experience building web applications with Python and Django.",
+    "My favourite project was a booking system where I designed the database and REST API.",
+    "I usually start debugging by reproducing the issue and reading the logs carefully.",
+    "In my last team we did two week sprints and I often paired with junior developers.",
+]
+
+
+class _StubLLMHandler(BaseHTTPRequestHandler):
+    """OpenAI-compatible chat completion endpoint that answers after a fixed delay"""
+    protocol_version = 'HTTP/1.1'
+    delay = 1.0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        time.sleep(self.delay)
+        body = json.dumps({
+            'id': 'stub', 'object': 'chat.completion', 'created': int(time.time()), 'model': 'stub',
+            'choices': [{
+                'index': 0, 'finish_reason': 'stop',
+                'message': {'role': 'assistant', 'content': 'That sounds great. What did you learn from it?'},
+            }],
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class Command(BaseCommand):
+    help = 'Run concurrent simulated interviews against a running server and report turn latency'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000', help='Server to test')
+        parser.add_argument('--endpoint', choices=sorted(ENDPOINTS), default='async', help='Interview turn endpoint')
+        parser.add_argument('--interviews', type=int, default=20, help='Concurrent interviews')
+        parser.add_argument('--turns', type=int, default=3, help='Candidate answers per interview')
+        parser.add_argument('--job-id', type=int, help='Job to attach test interviews to (default: first job)')
+        parser.add_argument('--timeout', type=float, default=120.0, help='Per-request timeout in seconds')
+        parser.add_argument('--keep', action='store_true', help='Keep the test interviews afterwards')
+        parser.add_argument('--stub-llm-port', type=int,
+                            help='Also serve a slow stub LLM on this port (start the server with '
+                                 'NVIDIA_BASE_URL=http://127.0.0.1:<port>/v1)')
+        parser.add_argument('--stub-llm-delay', type=float, default=2.0, help='Stub LLM response delay in seconds')
+
+    def handle(self, *args, **options):
+        job = Job.objects.filter(pk=options['job_id']).first() if options['job_id'] else Job.objects.first()
+        if not job:
+            raise CommandError('No job found to attach test interviews to')
+
+        stub = None
+        if options['stub_llm_port']:
+            _StubLLMHandler.delay = options['stub_llm_delay']
+            stub = ThreadingHTTPServer(('127.0.0.1', options['stub_llm_port']), _StubLLMHandler)
+            threading.Thread(target=stub.serve_forever, daemon=True).start()
+            self.stdout.write(f"Stub LLM on port {options['stub_llm_port']} ({options['stub_llm_delay']}s delay)")
+
+        interviews = self._create_interviews(job, options['interviews'])
+        try:
+            started = time.monotonic()
+            results = asyncio.run(self._run(interviews, options))
+            elapsed = time.monotonic() - started
+            self._report(results, elapsed, options)
+        finally:
+            if stub:
+                stub.shutdown()
+            if not options['keep']:
+                Interview.objects.filter(pk__in=[interview.pk for interview in interviews]).delete()
+
+    def _create_interviews(self, job, count):
+        """Create interviews with initialized state, bypassing signals (no emails)"""
+        interviews = []
+        for n in range(count):
+            interview = Interview(
+                job=job,
+                candidate_name=f'Load Test {n}',
+                candidate_email=f'loadtest{n}@example.com',
+                interview_duration_minutes=15,
+            )
+            interview.interview_id = interview.generate_unique_id()
+            interview.link = f"/interview/ready/{interview.uuid}/"
+            interviews.append(interview)
+        Interview.objects.bulk_create(interviews)
+
+        for interview in interviews:
+            InterviewState.create(interview, {
+                'candidate_name': interview.candidate_name,
+                'job_title': job.title,
+                'company_name': job.company,
+                'resume_text': f'Candidate: {interview.candidate_name}, applying for {job.title} position.',
+                'job_description': job.description or '',
+                'job_location': job.location or '',
+                'question_count': 0,
+                'is_registered_candidate': False,
+                'interview_completed': False,
+                'interview_duration_minutes': 15,
+            })
+        self.stdout.write(f"Created {len(interviews)} test interviews for job {job.pk}")
+        return interviews
+
+    async def _run(self, interviews, options):
+        limits = httpx.Limits(max_connections=len(interviews) + 10)
+        async with httpx.AsyncClient(base_url=options['base_url'], timeout=options['timeout'], limits=limits) as client:
+            per_interview = await asyncio.gather(*[
+                self._interview(client, interview, options) for interview in interviews
+            ])
+        return [result for results in per_interview for result in results]
+
+    async def _interview(self, client, interview, options):
+        url = reverse(ENDPOINTS[options['endpoint']], args=[interview.uuid])
+        results = []
+        for turn in range(options['turns']):
+            data = {'text': ANSWERS[turn % len(ANSWERS)], 'time_remaining': 900 - turn * 60}
+            started = time.monotonic()
+            try:
+                if options['endpoint'] == 'stream':
+                    async with client.stream('POST', url, data=data) as response:
+                        first_event = None
+                        async for _ in response.aiter_bytes():
+                            if first_event is None:
+                                first_event = time.monotonic() - started
+                        ok = response.status_code == 200
+                else:
+                    response = await client.post(url, data=data)
+                    first_event = None
+                    ok = response.status_code == 200 and response.json().get('success', False)
+                    if response.status_code == 200 and not ok:
+                        raise RuntimeError(response.json().get('error', 'unsuccessful response'))
+                error = None if ok else f"HTTP {response.status_code}"
+            except Exception as e:
+                ok, first_event, error = False, None, str(e) or type(e).__name__
+            results.append({'ok': ok, 'latency': time.monotonic() - started, 'first_event': first_event, 'error': error})
+        return results
+
+    def _report(self, results, elapsed, options):
+        latencies = sorted(r['latency'] for r in results if r['ok'])
+        errors = sum(1 for r in results if not r['ok'])
+
+        def percentile(values, pct):
+            return values[min(len(values) - 1, int(len(values) * pct))] if values else 0.0
+
+        self.stdout.write(f"\nEndpoint: {options['endpoint']}  Interviews: {options['interviews']}  Turns each: {options['turns']}")
+        self.stdout.write(f"Turns: {len(results)}  Errors: {errors}  Wall time: {elapsed:.2f}s")
+        self.stdout.write(f"Throughput: {len(latencies) / elapsed:.2f} turns/s" if elapsed else "Throughput: n/a")
+        if latencies:
+            self.stdout.write(
+                f"Latency p50: {statistics.median(latencies):.2f}s  "
+                f"p95: {percentile(latencies, 0.95):.2f}s  max: {latencies[-1]:.2f}s"
+            )
+        first_events = sorted(r['first_event'] for r in results if r['ok'] and r['first_event'] is not None)
+        if first_events:
+            self.stdout.write(f"Time to first byte p50: {statistics.median(first_events):.2f}s")
+
+        if errors:
+            reasons = Counter(r['error'] for r in results if not r['ok'])
+            summary = ', '.join(f"{reason} x{count}" for reason, count in reasons.most_common())
+            self.stdout.write(self.style.WARNING(f"{errors} turns failed ({summary})"))
+        else:
+            self.stdout.write(self.style.SUCCESS("All turns succeeded"))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from jobapp.models import Job, JobSearchDocument
+from jobapp.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the job search index (postings and, on PostgreSQL, the search_vector column)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--if-empty', action='store_true',
+                            help='Only rebuild when jobs exist but none are indexed (safe to run on every deploy)')
+
+    def handle(self, *args, **options):
+        if options['if_empty'] and (JobSearchDocument.objects.exists() or not Job.objects.exists()):
+            self.stdout.write("Search index already built, skipping")
+            return
+        count = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} jobs"))
@@ -0,0 +1,58 @@
+import multiprocessing
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from jobapp.tasks import work
+
+
+def _worker_process(poll_interval):
+    stop_event = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *args: stop_event.set())
+    work(poll_interval=poll_interval, stop_event=stop_event)
+
+
+class Command(BaseCommand):
+    help = 'Run background task workers (interview results, status emails, recording processing)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=1, help='Number of worker processes')
+        parser.add_argument('--poll-interval', type=float, default=2.0, help='Seconds between queue checks when idle')
+        parser.add_argument('--once', action='store_true', help='Run due tasks and exit when the queue is empty')
+
+    def handle(self, *args, **options):
+        if options['once']:
+            processed = work(once=True)
+            self.stdout.write(self.style.SUCCESS(f"Processed {processed} tasks"))
+            return
+
+        if options['processes'] <= 1:
+            self.stdout.write(f"Task worker started (poll every {options['poll_interval']}s)")
+            stop_event = threading.Event()
+            signal.signal(signal.SIGTERM, lambda *args: stop_event.set())
+            try:
+                work(poll_interval=options['poll_interval'], stop_event=stop_event)
+            except KeyboardInterrupt:
+                pass
+            return
+
+        # Children must open their own database connections
+        connections.close_all()
+        workers = [
+            multiprocessing.Process(target=_worker_process, args=(options['poll_interval'],), daemon=True)
+            for _ in range(options['processes'])
+        ]
+        for process in workers:
+            process.start()
+        self.stdout.write(f"Started {len(workers)} task worker processes")
+
+        try:
+            for process in workers:
+                process.join()
+        except KeyboardInterrupt:
+            for process in workers:
+                process.terminate()
+            for process in workers:
+                process.join()
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from jobapp.tts_cache import tts_cache
+
+
+class Command(BaseCommand):
+    help = 'Show, rebuild or prune the TTS audio cache index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild', action='store_true', help='Re-index the audio files in MEDIA_ROOT/tts')
+        parser.add_argument('--prune', action='store_true', help='Evict least recently used audio down to the budget')
+        parser.add_argument('--max-mb', type=float, help='Size budget for --prune (default: TTS_CACHE_MAX_BYTES)')
+        parser.add_argument('--max-files', type=int, help='File budget for --prune (default: TTS_CACHE_MAX_FILES)')
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            count = tts_cache.rebuild()
+            self.stdout.write(self.style.SUCCESS(f"Indexed {count} audio files"))
+
+        if options['prune']:
+            max_bytes = int(options['max_mb'] * 1024 * 1024) if options['max_mb'] is not None else None
+            removed = tts_cache.prune(max_bytes=max_bytes, max_files=options['max_files'])
+            self.stdout.write(self.style.SUCCESS(f"Evicted {removed} audio files"))
+
+        stats = tts_cache.stats()
+        self.stdout.write(
+            f"TTS cache: {stats['files']} files, {stats['bytes'] / (1024 * 1024):.1f} MB "
+            f"(budget {stats['max_bytes'] / (1024 * 1024):.0f} MB / {stats['max_files']} files)"
+        )
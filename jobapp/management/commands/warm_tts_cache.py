@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from jobapp import interview_phrases
+from jobapp.models import Job
+
+
+class Command(BaseCommand):
+    help = 'Pre-synthesize the scripted interviewer phrases for active jobs and upcoming interviews'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--job-id', type=int, help='Only warm the phrases of this job')
+        parser.add_argument('--skip-candidates', action='store_true', help='Do not synthesize candidate name segments')
+
+    def handle(self, *args, **options):
+        try:
+            if options['job_id']:
+                job = Job.objects.filter(pk=options['job_id']).first()
+                if not job:
+                    raise CommandError(f"Job {options['job_id']} not found")
+                count = interview_phrases.warm_job(job.title, job.company)
+            else:
+                count = interview_phrases.warm_all(include_candidates=not options['skip_candidates'])
+        except RuntimeError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(f"Warmed {count} phrase segments"))
@@ -0,0 +1,293 @@
+"""
+Media file delivery.
+
+Everything under MEDIA_URL goes through ``serve``. Requests are answered
+with strong ETags (inode, size and mtime) so revalidation never reads the
+file, and single byte ranges get a 206 so audio players can seek. Behind
+nginx or Apache the bytes are handed off with X-Accel-Redirect or
+X-Sendfile (MEDIA_OFFLOAD) and no worker streams them. Otherwise, under
+WSGI, a FileResponse is returned, which gunicorn sends with
+``os.sendfile``. Under ASGI there is no sendfile and Django would read a
+sync file iterator into memory whole, so the file is streamed by an async
+iterator reading one block at a time in a worker thread instead.
+
+TTS files are named after a hash of what they say, so they are cached as
+immutable. Resumes, candidate imports and interview recordings are
+private: only their owner, the recruiter they were shared with and staff
+can fetch them.
+"""
+import os
+import re
+import logging
+import mimetypes
+import posixpath
+from urllib.parse import quote
+
+from asgiref.sync import sync_to_async
+
+from django.conf import settings
+from django.contrib.auth.views import redirect_to_login
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Q
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, parse_http_date_safe
+
+logger = logging.getLogger(__name__)
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+# Directories whose files are named after a hash of their content
+IMMUTABLE_PREFIXES = ('tts/',)
+ONE_YEAR = 365 * 24 * 60 * 60
+
+# Private directory prefix -> check(user, name) -> bool
+_access_rules = {}
+
+
+def access_rule(prefix):
+    """Register ``check(user, name)`` as the access rule for files under ``prefix``"""
+    def decorator(check):
+        _access_rules[prefix] = check
+        return check
+    return decorator
+
+
+def offload():
+    """'' (serve from Django), 'x-accel-redirect' (nginx) or 'x-sendfile' (Apache, lighttpd)"""
+    return (getattr(settings, 'MEDIA_OFFLOAD', '') or '').lower()
+
+
+def _rule_for(name):
+    return next((check for prefix, check in _access_rules.items() if name.startswith(prefix)), None)
+
+
+def is_private(name):
+    return _rule_for(name) is not None
+
+
+def can_access(user, name):
+    check = _rule_for(name)
+    if check is None:
+        return True
+    if not user.is_authenticated:
+        return False
+    if user.is_staff:
+        return True
+    try:
+        return bool(check(user, name))
+    except Exception as e:
+        logger.error(f"Access check failed for media file {name}: {e}")
+        return False
+
+
+@access_rule('resumes/')
+def _profile_resume(user, name):
+    from .models import Application, Profile
+
+    owner_id = Profile.objects.filter(resume=name).values_list('user_id', flat=True).first()
+    if owner_id is None:
+        return False
+    # Recruiters see the profile resume of anyone who applied to one of their jobs
+    return owner_id == user.pk or Application.objects.filter(applicant_id=owner_id, job__posted_by=user).exists()
+
+
+@access_rule('applications/')
+def _application_resume(user, name):
+    from .models import Application
+
+    return Application.objects.filter(resume=name).filter(Q(applicant=user) | Q(job__posted_by=user)).exists()
+
+
+@access_rule('candidate_resumes/')
+def _candidate_resume(user, name):
+    from .models import Candidate
+
+    return Candidate.objects.filter(resume=name, added_by=user).exists()
+
+
+@access_rule('candidate_imports/')
+def _candidate_import(user, name):
+    from .models import CandidateImport
+
+    return CandidateImport.objects.filter(Q(csv_file=name) | Q(resumes_zip=name), added_by=user).exists()
+
+
+@access_rule('interview_recordings/')
+def _interview_recording(user, name):
+    from .models import Interview
+
+    return Interview.objects.filter(Q(recording_path=name) | Q(recording_review_path=name), job__posted_by=user).exists()
+
+
+def parse_range(header, size):
+    """``(start, end)`` (inclusive) for a single byte range, 'unsatisfiable', or None to send everything.
+
+    Multiple ranges and malformed headers are answered with the whole file,
+    which RFC 9110 allows.
+    """
+    match = RANGE_RE.match(header.strip()) if header and size else None
+    if not match or match.group(1) == match.group(2) == '':
+        return None
+    first, last = match.groups()
+    if first == '':
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            return 'unsatisfiable'
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        return 'unsatisfiable'
+    return start, end
+
+
+def strong_etag(stat):
+    return f'"{stat.st_ino:x}-{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def _range_applies(request, etag, stat):
+    """False when If-Range names another version of the file"""
+    if_range = request.META.get('HTTP_IF_RANGE', '').strip()
+    if not if_range:
+        return True
+    if if_range.startswith('"'):
+        return if_range == etag
+    modified = parse_http_date_safe(if_range)
+    return modified is not None and modified == int(stat.st_mtime)
+
+
+class _RangeFile:
+    """File object limited to ``length`` bytes from its current position.
+
+    It keeps ``fileno``, so gunicorn's file wrapper (WSGI) still uses
+    sendfile; that starts at the file's offset and stops at Content-Length.
+    """
+
+    def __init__(self, f, length):
+        self.f = f
+        self.remaining = length
+        self.name = f.name
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        size = self.remaining if size is None or size < 0 else min(size, self.remaining)
+        data = self.f.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.f.fileno()
+
+    def close(self):
+        self.f.close()
+
+
+async def _async_chunks(f, block_size=FileResponse.block_size):
+    """Blocks of ``f`` read in a worker thread - an ASGI response is never buffered whole"""
+    read = sync_to_async(f.read, thread_sensitive=False)
+    try:
+        while True:
+            data = await read(block_size)
+            if not data:
+                break
+            yield data
+    finally:
+        await sync_to_async(f.close, thread_sensitive=False)()
+
+
+def _stream(request, f, length, content_type, status=200):
+    if isinstance(request, ASGIRequest):
+        response = StreamingHttpResponse(_async_chunks(f), content_type=content_type, status=status)
+    else:
+        response = FileResponse(f, content_type=content_type, status=status)
+    response['Content-Length'] = length
+    return response
+
+
+def _cache_headers(response, name):
+    if is_private(name):
+        # Revalidated with the ETag on every use, never stored by shared caches
+        patch_cache_control(response, private=True, no_cache=True)
+        response['Vary'] = 'Cookie'
+    elif name.startswith(IMMUTABLE_PREFIXES):
+        patch_cache_control(response, public=True, max_age=ONE_YEAR, immutable=True)
+    else:
+        patch_cache_control(response, public=True, max_age=getattr(settings, 'MEDIA_MAX_AGE', 3600))
+
+
+def _offload_response(name, full_path, content_type):
+    response = HttpResponse(content_type=content_type)
+    if offload() == 'x-accel-redirect':
+        prefix = getattr(settings, 'MEDIA_ACCEL_REDIRECT_PREFIX', '/protected-media/')
+        response['X-Accel-Redirect'] = quote(f"{prefix.rstrip('/')}/{name}")
+    else:
+        response['X-Sendfile'] = full_path
+    # The proxy sends the file and answers Range requests itself
+    return response
+
+
+def _file_response(request, full_path, stat, etag, content_type):
+    size = stat.st_size
+    byte_range = parse_range(request.META.get('HTTP_RANGE'), size) if _range_applies(request, etag, stat) else None
+    if byte_range == 'unsatisfiable':
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    f = open(full_path, 'rb')
+    if byte_range is None:
+        return _stream(request, f, size, content_type)
+    start, end = byte_range
+    f.seek(start)
+    response = _stream(request, _RangeFile(f, end - start + 1), end - start + 1, content_type, status=206)
+    response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    return response
+
+
+def serve(request, path):
+    """Serve MEDIA_ROOT/``path`` with access checks, conditional GETs and byte ranges"""
+    name = posixpath.normpath(path).lstrip('/')
+    if name.startswith('..') or name in ('', '.'):
+        raise Http404("Media file not found")
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, name)
+    except SuspiciousFileOperation:
+        raise Http404("Media file not found")
+
+    if not can_access(request.user, name):
+        if not request.user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        logger.warning(f"🔒 User {request.user.pk} denied media file {name}")
+        raise Http404("Media file not found")
+
+    try:
+        stat = os.stat(full_path)
+    except OSError:
+        raise Http404("Media file not found")
+    if not os.path.isfile(full_path):
+        raise Http404("Media file not found")
+
+    etag = strong_etag(stat)
+    last_modified = int(stat.st_mtime)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        content_type, encoding = mimetypes.guess_type(name)
+        content_type = content_type if content_type and not encoding else 'application/octet-stream'
+        if offload() in ('x-accel-redirect', 'x-sendfile'):
+            response = _offload_response(name, full_path, content_type)
+        else:
+            response = _file_response(request, full_path, stat, etag, content_type)
+        if name.lower().endswith('.pdf'):
+            response['Content-Disposition'] = f'inline; filename="{os.path.basename(name)}"'
+
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Accept-Ranges'] = 'bytes'
+    _cache_headers(response, name)
+    return response
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.3 on 2026-10-18 08:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobapp', '0003_resumetext'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InterviewStateHeader',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('candidate_name', models.CharField(blank=True, max_length=255)),
+                ('job_title', models.CharField(blank=True, max_length=255)),
+                ('company_name', models.CharField(blank=True, max_length=255)),
+                ('resume_text', models.TextField(blank=True)),
+                ('job_description', models.TextField(blank=True)),
+                ('job_location', models.CharField(blank=True, max_length=255)),
+                ('is_registered_candidate', models.BooleanField(default=False)),
+                ('interview_duration_minutes', models.PositiveIntegerField(default=15)),
+                ('question_count', models.IntegerField(default=0)),
+                ('interview_completed', models.BooleanField(default=False)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('last_processed_input', models.CharField(blank=True, max_length=64)),
+                ('last_processed_time', models.FloatField(default=0)),
+                ('extra', models.JSONField(blank=True, default=dict, help_text='Less common context fields')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('interview', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='state_header', to='jobapp.interview')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='InterviewTurn',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sequence', models.PositiveIntegerField()),
+                ('speaker', models.CharField(choices=[('interviewer', 'Interviewer'), ('candidate', 'Candidate')], max_length=20)),
+                ('message', models.TextField()),
+                ('question_number', models.IntegerField(default=0)),
+                ('time_remaining', models.IntegerField(blank=True, null=True)),
+                ('timestamp', models.DateTimeField(blank=True, null=True)),
+                ('extra', models.JSONField(blank=True, default=dict)),
+                ('interview', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='turns', to='jobapp.interview')),
+            ],
+            options={
+                'ordering': ['interview', 'sequence'],
+                'unique_together': {('interview', 'sequence')},
+            },
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.3 on 2026-10-18 08:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobapp', '0005_background_task'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['applicant', 'job'], name='application_applicant_job'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', '-applied_at'], name='application_job_recent'),
+        ),
+        migrations.AddIndex(
+            model_name='candidate',
+            index=models.Index(fields=['added_by', '-added_at'], name='candidate_added_by_recent'),
+        ),
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(fields=['candidate', '-created_at'], name='interview_candidate_recent'),
+        ),
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(fields=['job', '-scheduled_at'], name='interview_job_scheduled'),
+        ),
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(condition=models.Q(('status', 'completed')), fields=['job', '-completed_at'], name='interview_job_completed'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['-date_posted', '-id'], name='job_recent'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['status', 'employment_type', '-date_posted'], name='job_status_type_recent'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['-date_posted'], name='job_active_recent'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['posted_by', '-date_posted'], name='job_posted_by_recent'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.3 on 2026-10-18 08:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def add_search_vector(apps, schema_editor):
+    # PostgreSQL only - other databases use the JobSearchTerm index alone
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("ALTER TABLE jobapp_job ADD COLUMN IF NOT EXISTS search_vector tsvector")
+    schema_editor.execute("CREATE INDEX IF NOT EXISTS job_search_vector_gin ON jobapp_job USING GIN (search_vector)")
+
+
+def drop_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS job_search_vector_gin")
+    schema_editor.execute("ALTER TABLE jobapp_job DROP COLUMN IF EXISTS search_vector")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobapp', '0006_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('length', models.FloatField(help_text='Field-weighted token count')),
+                ('indexed_at', models.DateTimeField(auto_now=True)),
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='search_document', to='jobapp.job')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='JobSearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=64)),
+                ('weight', models.FloatField(help_text='Field-weighted term frequency')),
+                ('doc_length', models.FloatField(help_text="Copy of the job's document length, so scoring needs no join")),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='jobapp.job')),
+            ],
+            options={
+                'unique_together': {('token', 'job')},
+            },
+        ),
+        migrations.RunPython(add_search_vector, drop_search_vector),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.3 on 2026-10-18 08:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobapp', '0007_job_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['applicant', '-applied_at', '-id'], name='application_applicant_recent'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.3 on 2026-10-18 09:12
+
+import secrets
+
+from django.db import migrations, models
+
+
+def create_interview_id_sequence(apps, schema_editor):
+    # The permutation key is fixed for good here - changing it could repeat IDs
+    IdSequence = apps.get_model('jobapp', 'IdSequence')
+    IdSequence.objects.get_or_create(name='interview_id', defaults={'key': secrets.token_hex(16)})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobapp', '0010_candidate_import'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('next_value', models.BigIntegerField(default=0)),
+                ('key', models.CharField(help_text='Key of the permutation applied to the values', max_length=64)),
+            ],
+        ),
+        migrations.RunPython(create_interview_id_sequence, migrations.RunPython.noop),
+    ]
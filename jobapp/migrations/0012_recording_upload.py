@@ -0,0 +1,32 @@
+# Generated by Django 5.2.3 on 2026-10-18 09:17
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobapp', '0011_interview_id_sequence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecordingUpload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('upload_id', models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                ('file_path', models.CharField(help_text='Path of the recording under MEDIA_ROOT', max_length=500)),
+                ('content_type', models.CharField(blank=True, max_length=100)),
+                ('next_chunk', models.PositiveIntegerField(default=0, help_text='Index of the next chunk expected')),
+                ('bytes_received', models.BigIntegerField(default=0)),
+                ('status', models.CharField(choices=[('uploading', 'Uploading'), ('complete', 'Complete')], default='uploading', max_length=20)),
+                ('duration', models.FloatField(blank=True, help_text='Duration reported by the browser, in seconds', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('interview', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recording_uploads', to='jobapp.interview')),
+            ],
+        ),
+    ]
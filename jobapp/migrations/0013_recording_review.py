@@ -0,0 +1,28 @@
+# Generated by Django 5.2.3 on 2026-10-18 09:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobapp', '0012_recording_upload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interview',
+            name='recording_peaks',
+            field=models.JSONField(blank=True, help_text='Waveform peaks (0-1) of the recording, for the results page scrubber', null=True),
+        ),
+        migrations.AddField(
+            model_name='interview',
+            name='recording_processed_at',
+            field=models.DateTimeField(blank=True, help_text='When the recording was probed and transcoded', null=True),
+        ),
+        migrations.AddField(
+            model_name='interview',
+            name='recording_review_path',
+            field=models.CharField(blank=True, help_text='Compact audio rendition of the recording for review', max_length=500, null=True),
+        ),
+    ]
@@ -0,0 +1,82 @@
+# Generated by Django 5.2.3 on 2026-10-18 09:26
+
+import json
+
+from django.db import migrations, models
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+def _load(value):
+    try:
+        entries = json.loads(value) if value else []
+    except (TypeError, ValueError):
+        return []
+    return [entry for entry in entries if isinstance(entry, dict)] if isinstance(entries, list) else []
+
+
+def backfill_interview_turns(apps, schema_editor):
+    # Interviews whose conversation only exists in the questions_asked / answers_given JSON
+    Interview = apps.get_model('jobapp', 'Interview')
+    InterviewTurn = apps.get_model('jobapp', 'InterviewTurn')
+
+    interviews = Interview.objects.filter(
+        Q(questions_asked__gt='') | Q(answers_given__gt=''), turns__isnull=True,
+    ).values_list('pk', 'questions_asked', 'answers_given')
+    rows = []
+    for pk, questions_asked, answers_given in interviews.iterator():
+        entries = [
+            ('interviewer', entry.get('question'), entry) for entry in _load(questions_asked)
+        ] + [
+            ('candidate', entry.get('answer'), entry) for entry in _load(answers_given)
+        ]
+        turns = []
+        for position, (speaker, message, entry) in enumerate(entries):
+            if not message:
+                continue
+            timestamp = parse_datetime(entry['timestamp']) if isinstance(entry.get('timestamp'), str) else None
+            question_number = entry.get('question_number') if isinstance(entry.get('question_number'), int) else 0
+            # Answer N came in before question N was asked
+            turns.append(((timestamp is None, timestamp.timestamp() if timestamp else 0, question_number, speaker == 'interviewer', position),
+                          speaker, message, question_number, timestamp))
+        turns.sort(key=lambda turn: turn[0])
+        rows.extend(
+            InterviewTurn(interview_id=pk, sequence=sequence, speaker=speaker, message=message,
+                          question_number=question_number, timestamp=timestamp, extra={'backfilled': True})
+            for sequence, (_, speaker, message, question_number, timestamp) in enumerate(turns)
+        )
+        if len(rows) >= 1000:
+            InterviewTurn.objects.bulk_create(rows)
+            rows = []
+    InterviewTurn.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobapp', '0013_recording_review'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interviewturn',
+            name='answer_ms',
+            field=models.PositiveIntegerField(blank=True, help_text="Candidate turns: time since the interviewer's previous turn", null=True),
+        ),
+        migrations.AddField(
+            model_name='interviewturn',
+            name='response_ms',
+            field=models.PositiveIntegerField(blank=True, help_text='Interviewer turns: time from the answer arriving to the reply being ready', null=True),
+        ),
+        migrations.AlterField(
+            model_name='interview',
+            name='answers_given',
+            field=models.TextField(blank=True, help_text='Legacy: JSON data of candidate answers, see InterviewTurn', null=True),
+        ),
+        migrations.AlterField(
+            model_name='interview',
+            name='questions_asked',
+            field=models.TextField(blank=True, help_text='Legacy: JSON data of questions asked, see InterviewTurn', null=True),
+        ),
+        migrations.RunPython(backfill_interview_turns, migrations.RunPython.noop),
+    ]
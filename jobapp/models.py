@@ -1,13 +1,12 @@
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth.models import AbstractUser , User
 from django.conf import settings
 from taggit.managers import TaggableManager
 
 import uuid
 
-# for integrating timestamp 
-import hashlib
-import time
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 
 
@@ -134,6 +133,15 @@ class Job(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        # Matched to the job list filters and the recruiter dashboard
+        indexes = [
+            models.Index(fields=['-date_posted', '-id'], name='job_recent'),
+            models.Index(fields=['status', 'employment_type', '-date_posted'], name='job_status_type_recent'),
+            models.Index(fields=['-date_posted'], condition=Q(status='active'), name='job_active_recent'),
+            models.Index(fields=['posted_by', '-date_posted'], name='job_posted_by_recent'),
+        ]
+
     def __str__(self):
         return self.title
 
@@ -151,6 +159,12 @@ class Application(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Pending')
     applied_at = models.DateTimeField(auto_now_add=True)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['applicant', 'job'], name='application_applicant_job'),
+            models.Index(fields=['job', '-applied_at'], name='application_job_recent'),
+            models.Index(fields=['applicant', '-applied_at', '-id'], name='application_applicant_recent'),
+        ]
     
     def __str__(self):
         return f"{self.applicant.username} - {self.job.title}"
@@ -199,10 +213,14 @@ class Interview(models.Model):
     recording_path = models.CharField(max_length=500, blank=True, null=True, help_text="Path to the recorded interview file")
     recording_duration = models.FloatField(blank=True, null=True, help_text="Duration of recording in seconds")
     is_recorded = models.BooleanField(default=False, help_text="Whether this interview was recorded")
+    recording_review_path = models.CharField(max_length=500, blank=True, null=True, help_text="Compact audio rendition of the recording for review")
+    recording_peaks = models.JSONField(blank=True, null=True, help_text="Waveform peaks (0-1) of the recording, for the results page scrubber")
+    recording_processed_at = models.DateTimeField(blank=True, null=True, help_text="When the recording was probed and transcoded")
     
     # Interview Results Fields
-    questions_asked = models.TextField(blank=True, null=True, help_text="JSON data of questions asked during interview")
-    answers_given = models.TextField(blank=True, null=True, help_text="JSON data of candidate answers")
+    # Legacy JSON copies of the conversation - it is stored as InterviewTurn rows
+    questions_asked = models.TextField(blank=True, null=True, help_text="Legacy: JSON data of questions asked, see InterviewTurn")
+    answers_given = models.TextField(blank=True, null=True, help_text="Legacy: JSON data of candidate answers, see InterviewTurn")
     overall_score = models.FloatField(blank=True, null=True, help_text="Overall interview score out of 10")
     technical_score = models.FloatField(blank=True, null=True, help_text="Technical skills score out of 10")
     communication_score = models.FloatField(blank=True, null=True, help_text="Communication skills score out of 10")
@@ -235,34 +253,48 @@ class Interview(models.Model):
         help_text="Duration set by recruiter for this specific interview"
     )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['candidate', '-created_at'], name='interview_candidate_recent'),
+            models.Index(fields=['job', '-scheduled_at'], name='interview_job_scheduled'),
+            # Only completed interviews appear in the results list
+            models.Index(fields=['job', '-completed_at'], condition=Q(status='completed'), name='interview_job_completed'),
+        ]
+
     def save(self, *args, **kwargs):
         if not self.uuid:
             self.uuid = uuid.uuid4()
             
-        if not self.interview_id:
+        allocated_id = not self.interview_id
+        if allocated_id:
             self.interview_id = self.generate_unique_id()
             
         if not self.link:
             self.link = f"/interview/ready/{self.uuid}/"
-                
-        super().save(*args, **kwargs)
+        
+        if not allocated_id:
+            return super().save(*args, **kwargs)
+        
+        # New IDs never repeat each other, but may hit one of the random pre-allocator IDs
+        for attempt in range(3):
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                if attempt == 2 or not Interview.objects.filter(interview_id=self.interview_id).exclude(pk=self.pk).exists():
+                    raise
+                self.interview_id = self.generate_unique_id()
 
     def generate_unique_id(self):
-        job_name = self.job.title.strip().lower()
-        candidate = self.candidate_name.strip().lower()
-        timestamp = str(int(time.time() * 1000000))  # microseconds
-        raw_string = f"{job_name}{candidate}{timestamp}"
-        hash_value = hashlib.md5(raw_string.encode()).hexdigest()
-        hex_9 = hash_value[:9]
-        formatted_id = f"{hex_9[:3]}-{hex_9[3:6]}-{hex_9[6:9]}"
-
-        while Interview.objects.filter(interview_id=formatted_id).exists():
-            timestamp = str(int(time.time() * 1000000))
-            raw_string = f"{job_name}{candidate}{timestamp}"
-            hash_value = hashlib.md5(raw_string.encode()).hexdigest()
-            hex_9 = hash_value[:9]
-            formatted_id = f"{hex_9[:3]}-{hex_9[3:6]}-{hex_9[6:9]}"
-        return formatted_id
+        """Next interview ID in xxx-xxx-xxx form, unique by construction (see jobapp.id_allocator)"""
+        from .id_allocator import next_interview_id
+        return next_interview_id()
+
+    @staticmethod
+    def allocate_interview_ids(count):
+        """``count`` new interview IDs for bulk_create"""
+        from .id_allocator import next_interview_ids
+        return next_interview_ids(count)
     
     @property
     def get_uuid(self):
@@ -270,6 +302,12 @@ class Interview(models.Model):
         return self.uuid
     
     
+    @property
+    def recording_url(self):
+        """URL of the recording to play - the compact review rendition once it exists"""
+        path = self.recording_review_path or self.recording_path
+        return f"{settings.MEDIA_URL}{path}" if path else ''
+    
     @property
     def is_registered_candidate(self):
         """Check if candidate is a registered user"""
@@ -288,9 +326,7 @@ class Interview(models.Model):
         return (
             self.overall_score is not None or 
             self.ai_feedback is not None and self.ai_feedback.strip() != '' or
-            self.recommendation is not None and self.recommendation.strip() != '' or
-            self.questions_asked is not None and self.questions_asked.strip() != '' or
-            self.answers_given is not None and self.answers_given.strip() != ''
+            self.recommendation is not None and self.recommendation.strip() != ''
         )
     
     @property
@@ -363,7 +399,12 @@ class Candidate(models.Model):
     added_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
-        unique_together = ['email', 'added_by']  # Prevent duplicate candidates per recruiter
+        # Prevent duplicate candidates per recruiter. Case-sensitive: the views and the
+        # CSV import compare emails case-insensitively before inserting
+        unique_together = ['email', 'added_by']
+        indexes = [
+            models.Index(fields=['added_by', '-added_at'], name='candidate_added_by_recent'),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.email})"        
@@ -372,4 +413,218 @@ class Candidate(models.Model):
     
     
 
-    
\ No newline at end of file
+    
+
+class ResumeText(models.Model):
+    """Extracted resume text, cached so interviews never re-parse the file"""
+    file_name = models.CharField(max_length=500, unique=True, help_text="Storage path relative to MEDIA_ROOT")
+    file_size = models.BigIntegerField()
+    file_mtime = models.FloatField()
+    content_hash = models.CharField(max_length=64, db_index=True, help_text="SHA-256 of the file contents")
+    text = models.TextField(blank=True)
+    extracted_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"Resume text for {self.file_name}"
+
+
+class CandidateImport(models.Model):
+    """A bulk candidate import from a CSV (plus an optional ZIP of resumes) - see jobapp.candidate_import"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+    
+    added_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='candidate_imports')
+    csv_file = models.FileField(upload_to='candidate_imports/')
+    resumes_zip = models.FileField(upload_to='candidate_imports/', blank=True, null=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    total_rows = models.PositiveIntegerField(default=0)
+    processed_rows = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    duplicate_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    resume_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True, help_text="Per-row errors: {row, email, error}")
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    def __str__(self):
+        return f"Candidate import {self.pk} by {self.added_by_id} ({self.status})"
+
+
+class RecordingUpload(models.Model):
+    """A chunked, resumable interview recording upload - see jobapp.recording_upload"""
+    STATUS_CHOICES = [
+        ('uploading', 'Uploading'),
+        ('complete', 'Complete'),
+    ]
+
+    interview = models.ForeignKey(Interview, on_delete=models.CASCADE, related_name='recording_uploads')
+    upload_id = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
+    file_path = models.CharField(max_length=500, help_text="Path of the recording under MEDIA_ROOT")
+    content_type = models.CharField(max_length=100, blank=True)
+    next_chunk = models.PositiveIntegerField(default=0, help_text="Index of the next chunk expected")
+    bytes_received = models.BigIntegerField(default=0)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='uploading')
+    duration = models.FloatField(null=True, blank=True, help_text="Duration reported by the browser, in seconds")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Recording upload {self.upload_id} for {self.interview_id} ({self.status})"
+
+
+class InterviewStateHeader(models.Model):
+    """Per-interview conversation header - the small, mutable part of the interview state"""
+    interview = models.OneToOneField(Interview, on_delete=models.CASCADE, related_name='state_header')
+    candidate_name = models.CharField(max_length=255, blank=True)
+    job_title = models.CharField(max_length=255, blank=True)
+    company_name = models.CharField(max_length=255, blank=True)
+    resume_text = models.TextField(blank=True)
+    job_description = models.TextField(blank=True)
+    job_location = models.CharField(max_length=255, blank=True)
+    is_registered_candidate = models.BooleanField(default=False)
+    interview_duration_minutes = models.PositiveIntegerField(default=15)
+    question_count = models.IntegerField(default=0)
+    interview_completed = models.BooleanField(default=False)
+    started_at = models.DateTimeField(null=True, blank=True)
+    last_processed_input = models.CharField(max_length=64, blank=True)
+    last_processed_time = models.FloatField(default=0)
+    extra = models.JSONField(default=dict, blank=True, help_text="Less common context fields")
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"Interview state for {self.interview_id}"
+
+
+class InterviewTurn(models.Model):
+    """One entry of the append-only interview conversation log"""
+    SPEAKER_CHOICES = [
+        ('interviewer', 'Interviewer'),
+        ('candidate', 'Candidate'),
+    ]
+    
+    interview = models.ForeignKey(Interview, on_delete=models.CASCADE, related_name='turns')
+    sequence = models.PositiveIntegerField()
+    speaker = models.CharField(max_length=20, choices=SPEAKER_CHOICES)
+    message = models.TextField()
+    question_number = models.IntegerField(default=0)
+    time_remaining = models.IntegerField(null=True, blank=True)
+    timestamp = models.DateTimeField(null=True, blank=True)
+    response_ms = models.PositiveIntegerField(null=True, blank=True, help_text="Interviewer turns: time from the answer arriving to the reply being ready")
+    answer_ms = models.PositiveIntegerField(null=True, blank=True, help_text="Candidate turns: time since the interviewer's previous turn")
+    extra = models.JSONField(default=dict, blank=True)
+    
+    class Meta:
+        ordering = ['interview', 'sequence']
+        # Also the index every transcript read walks: (interview, sequence)
+        unique_together = ['interview', 'sequence']
+    
+    def __str__(self):
+        return f"{self.speaker} turn {self.sequence} for interview {self.interview_id}"
+
+
+class IdSequence(models.Model):
+    """A named counter handed out in blocks - see jobapp.id_allocator"""
+    name = models.CharField(max_length=50, unique=True)
+    next_value = models.BigIntegerField(default=0)
+    key = models.CharField(max_length=64, help_text="Key of the permutation applied to the values")
+    
+    def __str__(self):
+        return f"{self.name} at {self.next_value}"
+
+
+class BackgroundTask(models.Model):
+    """Durable task queue entry - see jobapp.tasks"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+    ]
+    
+    task_name = models.CharField(max_length=100)
+    kwargs = models.JSONField(default=dict, blank=True)
+    idempotency_key = models.CharField(max_length=255, unique=True, null=True, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=255, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_after']),
+        ]
+    
+    def __str__(self):
+        return f"{self.task_name} ({self.status})"
+
+
+class OutboxEmail(models.Model):
+    """Queued outgoing email - see jobapp.outbox"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+    
+    to = models.JSONField(default=list, help_text="Recipient addresses")
+    from_email = models.CharField(max_length=255, blank=True)
+    subject = models.CharField(max_length=998)
+    body = models.TextField(help_text="Plain text part")
+    html_body = models.TextField(blank=True, help_text="Optional HTML alternative")
+    idempotency_key = models.CharField(max_length=255, unique=True, null=True, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=6)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=255, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_after']),
+        ]
+    
+    def __str__(self):
+        return f"{self.subject} to {', '.join(self.to)} ({self.status})"
+
+
+# Job search inverted index - see jobapp.search
+class JobSearchDocument(models.Model):
+    """Indexed length of a job, for BM25 length normalization"""
+    job = models.OneToOneField(Job, on_delete=models.CASCADE, related_name='search_document')
+    length = models.FloatField(help_text="Field-weighted token count")
+    indexed_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"Search document for job {self.job_id}"
+
+
+class JobSearchTerm(models.Model):
+    """One posting: a token that occurs in a job"""
+    token = models.CharField(max_length=64)
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='search_terms')
+    weight = models.FloatField(help_text="Field-weighted term frequency")
+    doc_length = models.FloatField(help_text="Copy of the job's document length, so scoring needs no join")
+    
+    class Meta:
+        # (token, job) also serves token lookups and prefix ranges
+        unique_together = ['token', 'job']
+    
+    def __str__(self):
+        return f"{self.token} in job {self.job_id}"
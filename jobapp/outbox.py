@@ -0,0 +1,237 @@
+"""
+Outgoing email outbox.
+
+Views and signals only queue messages (``queue_email``), which is one
+INSERT - no request ever waits on SMTP. Delivery runs on the background
+task queue (jobapp.tasks): a ``deliver_outbox`` task claims due messages
+in batches and sends each batch over one authenticated SMTP connection,
+retrying failures with exponential backoff and recording the state of
+every message. Messages survive worker restarts; a message whose worker
+died mid-send is claimed again after OUTBOX_LOCK_TIMEOUT.
+"""
+import os
+import random
+import socket
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def batch_size():
+    return getattr(settings, 'OUTBOX_BATCH_SIZE', 50)
+
+
+def queue_email(to, subject, body, html_body='', from_email=None, key=None):
+    """Queue an email for delivery and return its OutboxEmail.
+
+    ``to`` is an address or a list of them. With ``key``, an email already
+    queued under that key is returned instead of queueing a second one.
+    """
+    from .models import OutboxEmail
+
+    recipients = [to] if isinstance(to, str) else list(to)
+    fields = {
+        'to': recipients,
+        'from_email': from_email or settings.DEFAULT_FROM_EMAIL,
+        'subject': subject,
+        'body': body,
+        'html_body': html_body or '',
+        'max_attempts': getattr(settings, 'OUTBOX_MAX_ATTEMPTS', 6),
+    }
+    if key:
+        try:
+            with transaction.atomic():
+                email, created = OutboxEmail.objects.get_or_create(idempotency_key=key, defaults=fields)
+        except IntegrityError:
+            email, created = OutboxEmail.objects.get(idempotency_key=key), False
+        if not created:
+            return email
+    else:
+        email = OutboxEmail.objects.create(**fields)
+
+    logger.info(f"📥 Queued email {email.pk} to {', '.join(recipients)}: {subject}")
+    # Wake a worker once the message is visible to it
+    transaction.on_commit(lambda: _schedule_delivery(email.pk))
+    return email
+
+
+def queue_emails(messages):
+    """Queue many emails with one INSERT batch; returns the number queued.
+
+    ``messages`` are dicts of queue_email's arguments. Messages whose
+    ``key`` is already in the outbox are skipped (one IN query).
+    """
+    from .models import OutboxEmail
+
+    keys = [message['key'] for message in messages if message.get('key')]
+    existing = set(OutboxEmail.objects.filter(idempotency_key__in=keys).values_list('idempotency_key', flat=True)) if keys else set()
+    emails = []
+    for message in messages:
+        key = message.get('key') or None
+        if key in existing:
+            continue
+        if key:
+            existing.add(key)
+        emails.append(OutboxEmail(
+            to=[message['to']] if isinstance(message['to'], str) else list(message['to']),
+            from_email=message.get('from_email') or settings.DEFAULT_FROM_EMAIL,
+            subject=message['subject'],
+            body=message['body'],
+            html_body=message.get('html_body') or '',
+            idempotency_key=key,
+            max_attempts=getattr(settings, 'OUTBOX_MAX_ATTEMPTS', 6),
+        ))
+    if not emails:
+        return 0
+
+    created = OutboxEmail.objects.bulk_create(emails, batch_size=500)
+    logger.info(f"📥 Queued {len(created)} emails")
+    # One delivery run picks up the whole batch
+    marker = created[0].pk or timezone.now().strftime('%Y%m%d%H%M%S%f')
+    transaction.on_commit(lambda: _schedule_delivery(f'batch-{marker}'))
+    return len(created)
+
+
+def _schedule_delivery(email_id, delay=0, attempt=0):
+    from .tasks import enqueue
+    try:
+        enqueue('deliver_outbox', key=f'deliver_outbox:{email_id}:{attempt}', delay=delay)
+    except Exception as e:
+        # The message stays pending and goes out with the next delivery run
+        logger.warning(f"Could not schedule delivery of email {email_id}: {e}")
+
+
+def _backoff_delay(attempts):
+    base = getattr(settings, 'OUTBOX_RETRY_BASE_DELAY', 60)
+    cap = getattr(settings, 'OUTBOX_RETRY_MAX_DELAY', 3600)
+    return min(cap, base * (2 ** (attempts - 1))) * random.uniform(0.8, 1.2)
+
+
+def claim_batch(worker_id, size=None):
+    """Mark up to ``size`` due emails as sending and return them"""
+    from .models import OutboxEmail
+
+    size = size or batch_size()
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=getattr(settings, 'OUTBOX_LOCK_TIMEOUT', 300))
+    due = OutboxEmail.objects.filter(
+        Q(status='pending', run_after__lte=now) | Q(status='sending', locked_at__lt=stale_before)
+    ).order_by('run_after')
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(due.select_for_update(skip_locked=True).values_list('pk', flat=True)[:size])
+            OutboxEmail.objects.filter(pk__in=ids).update(status='sending', locked_by=worker_id, locked_at=now)
+        return list(OutboxEmail.objects.filter(pk__in=ids).order_by('run_after'))
+
+    # No SKIP LOCKED (SQLite) - claim row by row with a conditional update
+    claimed = []
+    for email in due[:size]:
+        if OutboxEmail.objects.filter(pk=email.pk, status=email.status, locked_at=email.locked_at).update(
+            status='sending', locked_by=worker_id, locked_at=now
+        ):
+            claimed.append(email.pk)
+    return list(OutboxEmail.objects.filter(pk__in=claimed).order_by('run_after'))
+
+
+def _message(email, smtp):
+    message = EmailMultiAlternatives(email.subject, email.body, email.from_email, email.to, connection=smtp)
+    if email.html_body:
+        message.attach_alternative(email.html_body, 'text/html')
+    return message
+
+
+def _record_failure(email, error):
+    email.attempts += 1
+    email.last_error = f"{type(error).__name__}: {error}"[:5000]
+    email.locked_by = ''
+    email.locked_at = None
+    if email.attempts < email.max_attempts:
+        delay = _backoff_delay(email.attempts)
+        email.status = 'pending'
+        email.run_after = timezone.now() + timedelta(seconds=delay)
+        email.save(update_fields=['attempts', 'last_error', 'status', 'run_after', 'locked_by', 'locked_at'])
+        logger.warning(f"🔁 Email {email.pk} to {', '.join(email.to)} failed, retry {email.attempts}/{email.max_attempts} in {delay:.0f}s: {error}")
+        transaction.on_commit(lambda: _schedule_delivery(email.pk, delay=delay, attempt=email.attempts))
+    else:
+        email.status = 'failed'
+        email.save(update_fields=['attempts', 'last_error', 'status', 'locked_by', 'locked_at'])
+        logger.error(f"❌ Email {email.pk} to {', '.join(email.to)} failed permanently: {error}")
+
+
+def send_batch(emails):
+    """Send ``emails`` over one connection; returns the number sent"""
+    from .models import OutboxEmail
+
+    sent = 0
+    smtp = get_connection(fail_silently=False)
+    try:
+        for email in emails:
+            try:
+                # A no-op while the connection is open, so the batch shares one login
+                smtp.open()
+                if not _message(email, smtp).send():
+                    raise RuntimeError("Backend accepted no messages")
+            except Exception as e:
+                _record_failure(email, e)
+                # The server may have dropped us - reconnect for the next message
+                try:
+                    smtp.close()
+                except Exception:
+                    pass
+                continue
+            OutboxEmail.objects.filter(pk=email.pk).update(
+                status='sent', attempts=email.attempts + 1, sent_at=timezone.now(),
+                last_error='', locked_by='', locked_at=None,
+            )
+            sent += 1
+    finally:
+        try:
+            smtp.close()
+        except Exception:
+            pass
+    return sent
+
+
+def deliver(worker_id=None, max_batches=None):
+    """Send due emails batch by batch until none are left; returns the number sent"""
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+    sent = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        emails = claim_batch(worker_id)
+        if not emails:
+            break
+        sent += send_batch(emails)
+        batches += 1
+        logger.info(f"📤 Outbox batch {batches}: {len(emails)} claimed, {sent} sent so far")
+    return sent
+
+
+def prune(days=None):
+    """Delete sent and failed emails older than OUTBOX_RETENTION_DAYS; returns the number deleted.
+
+    Emails queued with a key are kept for OUTBOX_KEY_RETENTION_DAYS, with
+    their bodies cleared, so the key still stops the same email being sent again.
+    """
+    from .models import OutboxEmail
+
+    days = getattr(settings, 'OUTBOX_RETENTION_DAYS', 30) if days is None else days
+    now = timezone.now()
+    finished = OutboxEmail.objects.filter(status__in=['sent', 'failed'])
+    deleted, _ = finished.filter(created_at__lt=now - timedelta(days=days), idempotency_key__isnull=True).delete()
+    keyed = finished.filter(idempotency_key__isnull=False)
+    key_days = getattr(settings, 'OUTBOX_KEY_RETENTION_DAYS', 365)
+    deleted += keyed.filter(created_at__lt=now - timedelta(days=key_days)).delete()[0]
+    cleared = keyed.filter(created_at__lt=now - timedelta(days=days)).exclude(body='', html_body='').update(body='', html_body='')
+    if deleted or cleared:
+        logger.info(f"🧹 Deleted {deleted} old outbox emails, cleared the bodies of {cleared}")
+    return deleted
@@ -0,0 +1,185 @@
+"""
+Keyset (cursor) pagination.
+
+Pages are selected with a ``WHERE (date_posted, id) < (last seen)`` style
+condition on an indexed ordering instead of ``OFFSET``, so a deep page
+costs the same as the first one and no ``COUNT(*)`` is needed to page.
+Cursors are signed, so they are opaque to clients and cannot be forged
+into arbitrary filters. Key fields must be non-null and the last key
+must be unique (normally ``id``).
+"""
+import json
+import logging
+
+from django.core import signing
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connection
+from django.db.models import Q
+
+logger = logging.getLogger(__name__)
+
+CURSOR_SALT = 'jobapp.pagination'
+# Up to this many rows an exact count is cheap enough
+EXACT_COUNT_LIMIT = 1000
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class KeysetPage:
+    """One page of results plus the cursors around it"""
+
+    def __init__(self, items, next_cursor=None, previous_cursor=None):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    @property
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def _split(key):
+    return (key[1:], True) if key.startswith('-') else (key, False)
+
+
+def _json_value(value):
+    # Full precision - DjangoJSONEncoder drops microseconds, which would skip rows
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if isinstance(value, (int, float, str)) or value is None:
+        return value
+    return str(value)
+
+
+def encode_cursor(values, direction='next'):
+    payload = [_json_value(value) for value in values]
+    return signing.dumps({'v': payload, 'd': direction}, salt=CURSOR_SALT, compress=True)
+
+
+def decode_cursor(cursor, queryset, keys):
+    """(values, direction) from a cursor, with values converted back to field types"""
+    try:
+        data = signing.loads(cursor, salt=CURSOR_SALT)
+        values, direction = data['v'], data['d']
+    except (signing.BadSignature, KeyError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {e}")
+    if len(values) != len(keys) or direction not in ('next', 'previous'):
+        raise InvalidCursor("Cursor does not match this ordering")
+
+    converted = []
+    for key, value in zip(keys, values):
+        name, _ = _split(key)
+        try:
+            field = queryset.model._meta.get_field(name)
+            value = field.to_python(value)
+        except FieldDoesNotExist:
+            # Annotations such as a search rank are stored as-is
+            pass
+        except Exception as e:
+            raise InvalidCursor(f"Invalid cursor value for {name}: {e}")
+        converted.append(value)
+    return converted, direction
+
+
+def _after(keys, values, reverse=False):
+    """Rows strictly after ``values`` in the ``keys`` ordering (before it with ``reverse``)"""
+    condition = Q()
+    for i, key in enumerate(keys):
+        name, descending = _split(key)
+        lookup = 'lt' if descending != reverse else 'gt'
+        term = Q(**{f'{name}__{lookup}': values[i]})
+        for previous_key, value in zip(keys[:i], values):
+            term &= Q(**{_split(previous_key)[0]: value})
+        condition |= term
+    return condition
+
+
+def _values(item, keys):
+    return [getattr(item, _split(key)[0]) for key in keys]
+
+
+def paginate(queryset, keys, cursor=None, page_size=20):
+    """Return the ``KeysetPage`` of ``queryset`` ordered by ``keys`` at ``cursor``.
+
+    ``keys`` is an ordering such as ``('-date_posted', '-id')``. Raises
+    InvalidCursor for a tampered or mismatched cursor.
+    """
+    keys = list(keys)
+    if not cursor:
+        rows = list(queryset.order_by(*keys)[:page_size + 1])
+        items = rows[:page_size]
+        next_cursor = encode_cursor(_values(items[-1], keys)) if len(rows) > page_size else None
+        return KeysetPage(items, next_cursor=next_cursor)
+
+    values, direction = decode_cursor(cursor, queryset, keys)
+    if direction == 'next':
+        rows = list(queryset.filter(_after(keys, values)).order_by(*keys)[:page_size + 1])
+        items = rows[:page_size]
+        more = len(rows) > page_size
+        return KeysetPage(
+            items,
+            next_cursor=encode_cursor(_values(items[-1], keys)) if more else None,
+            previous_cursor=encode_cursor(_values(items[0], keys), 'previous') if items else None,
+        )
+
+    # Walk backwards with the ordering flipped, then restore the page order
+    reversed_keys = [key[1:] if key.startswith('-') else f'-{key}' for key in keys]
+    rows = list(queryset.filter(_after(keys, values, reverse=True)).order_by(*reversed_keys)[:page_size + 1])
+    items = rows[:page_size][::-1]
+    more = len(rows) > page_size
+    return KeysetPage(
+        items,
+        next_cursor=encode_cursor(_values(items[-1], keys)) if items else None,
+        previous_cursor=encode_cursor(_values(items[0], keys), 'previous') if more else None,
+    )
+
+
+def page_url(request, cursor, keep=None):
+    """The current URL with its query string pointing at ``cursor`` (the first page for None).
+
+    ``keep`` limits the query parameters carried over.
+    """
+    params = request.GET.copy()
+    for name in list(params):
+        if name in ('cursor', 'page') or (keep is not None and name not in keep):
+            params.pop(name)
+    if cursor:
+        params['cursor'] = cursor
+    return f"{request.path}?{params.urlencode()}" if params else request.path
+
+
+def approximate_count(queryset):
+    """Row count of ``queryset``; exact when small, the planner's estimate on PostgreSQL otherwise.
+
+    Returns ``(count, is_exact)``.
+    """
+    queryset = queryset.order_by()
+    if connection.vendor == 'postgresql':
+        try:
+            plan = json.loads(queryset.explain(format='json'))
+            estimate = int(plan[0]['Plan']['Plan Rows'])
+            if estimate > EXACT_COUNT_LIMIT:
+                return estimate, False
+        except Exception as e:
+            logger.warning(f"Could not estimate row count: {e}")
+    # Never count more than the limit exactly
+    count = queryset[:EXACT_COUNT_LIMIT + 1].count()
+    if count > EXACT_COUNT_LIMIT:
+        return EXACT_COUNT_LIMIT, False
+    return count, True
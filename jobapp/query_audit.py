@@ -0,0 +1,135 @@
+"""
+Query plan audit for the hot ORM lookups.
+
+Each hot query is registered with @hot_query and builds its queryset from
+sample values (a recruiter, a candidate, a job, ...). ``audit()`` runs
+EXPLAIN for every one and flags full table scans, so a missing or unused
+index shows up before it reaches production.
+"""
+import re
+import logging
+
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+HOT_QUERIES = {}
+
+
+def hot_query(name):
+    """Register ``func(sample) -> queryset`` as a hot query under ``name``"""
+    def decorator(func):
+        HOT_QUERIES[name] = func
+        return func
+    return decorator
+
+
+@hot_query('recruiter_completed_interviews')
+def _recruiter_completed_interviews(sample):
+    from .models import Interview
+    return Interview.objects.filter(job__posted_by=sample['recruiter'], status='completed').order_by('-completed_at')
+
+
+@hot_query('recruiter_scheduled_interviews')
+def _recruiter_scheduled_interviews(sample):
+    from .models import Interview
+    return Interview.objects.filter(job__posted_by=sample['recruiter']).order_by('-scheduled_at')
+
+
+@hot_query('candidate_interviews')
+def _candidate_interviews(sample):
+    from .models import Interview
+    return Interview.objects.filter(candidate=sample['candidate_user']).order_by('-created_at')
+
+
+@hot_query('application_exists')
+def _application_exists(sample):
+    from .models import Application
+    return Application.objects.filter(applicant=sample['candidate_user'], job=sample['job'])
+
+
+@hot_query('recruiter_applications')
+def _recruiter_applications(sample):
+    from .models import Application
+    return Application.objects.filter(job__posted_by=sample['recruiter']).order_by('-applied_at')
+
+
+@hot_query('candidate_lookup')
+def _candidate_lookup(sample):
+    from .models import Candidate
+    return Candidate.objects.filter(email=sample['candidate_email'], added_by=sample['recruiter'])
+
+
+@hot_query('recruiter_candidates')
+def _recruiter_candidates(sample):
+    from .models import Candidate
+    return Candidate.objects.filter(added_by=sample['recruiter']).order_by('-added_at')
+
+
+@hot_query('job_list_filtered')
+def _job_list_filtered(sample):
+    from .models import Job
+    return Job.objects.filter(status='active', employment_type='full_time').order_by('-date_posted')
+
+
+@hot_query('job_list_open')
+def _job_list_open(sample):
+    from .models import Job
+    return Job.objects.filter(status='active').order_by('-date_posted')
+
+
+@hot_query('job_list_recent')
+def _job_list_recent(sample):
+    from .models import Job
+    return Job.objects.order_by('-date_posted', '-id')
+
+
+@hot_query('recruiter_jobs')
+def _recruiter_jobs(sample):
+    from .models import Job
+    return Job.objects.filter(posted_by=sample['recruiter']).order_by('-date_posted')
+
+
+@hot_query('job_list_deep_page')
+def _job_list_deep_page(sample):
+    from .models import Job
+    from .pagination import _after
+    keys = ['-date_posted', '-id']
+    return Job.objects.filter(_after(keys, [sample['job'].date_posted, sample['job'].pk])).order_by(*keys)[:6]
+
+
+@hot_query('candidate_applications_page')
+def _candidate_applications_page(sample):
+    from .models import Application
+    return Application.objects.filter(applicant=sample['candidate_user']).order_by('-applied_at', '-id')[:21]
+
+
+def find_full_scans(plan, vendor=None):
+    """Tables read with a full sequential scan in an EXPLAIN ``plan``"""
+    vendor = vendor or connection.vendor
+    if vendor == 'postgresql':
+        return re.findall(r'Seq Scan on (\w+)', plan)
+    if vendor == 'sqlite':
+        # "SCAN t USING [COVERING] INDEX ..." walks an index; a bare "SCAN t" reads the table
+        return [
+            match.group(1) for match in re.finditer(r'SCAN (\w+)(.*)', plan)
+            if 'USING' not in match.group(2)
+        ]
+    return []
+
+
+def explain(queryset):
+    if connection.vendor == 'postgresql':
+        return queryset.explain(format='text')
+    return queryset.explain()
+
+
+def audit(sample, names=None):
+    """EXPLAIN each hot query; returns ``[{'name', 'plan', 'full_scans'}, ...]``"""
+    results = []
+    for name, build in HOT_QUERIES.items():
+        if names and name not in names:
+            continue
+        plan = explain(build(sample))
+        results.append({'name': name, 'plan': plan, 'full_scans': find_full_scans(plan)})
+    return results
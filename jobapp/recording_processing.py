@@ -0,0 +1,219 @@
+"""
+Interview recording post-processing.
+
+Recordings arrive as raw browser WebM (video and all). The
+process_interview_recording task hands each one to a small process pool,
+where one ffmpeg run decodes the audio once and produces both a compact,
+loudness-normalized mono Opus (or AAC) rendition for reviewers and a
+low-rate PCM stream. The
+PCM gives the real duration (browser WebM headers usually carry none)
+and the waveform peaks the results page draws its scrubber from, so
+nobody downloads the original to see or hear the interview. The results
+are written back to the Interview in one UPDATE.
+
+Without ffmpeg the task only records the file size, and the duration the
+browser reported is kept.
+"""
+import os
+import json
+import array
+import shutil
+import logging
+import threading
+import subprocess
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+REVIEW_DIR = 'review'
+# Codec -> (ffmpeg encoder arguments, container, extension)
+CODECS = {
+    'opus': (['-c:a', 'libopus', '-application', 'voip'], 'webm', '.webm'),
+    'aac': (['-c:a', 'aac', '-movflags', '+faststart'], 'mp4', '.m4a'),
+}
+# EBU R128 loudness normalization of the review rendition - quiet candidates become audible
+LOUDNORM = 'loudnorm=I=-16:TP=-1.5:LRA=11'
+PEAK_SAMPLE_RATE = 8000
+# Peaks are first taken per 50ms window, then reduced to the requested count
+PEAK_WINDOW = PEAK_SAMPLE_RATE // 20
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def ffmpeg_path():
+    return getattr(settings, 'RECORDING_FFMPEG', None) or shutil.which('ffmpeg')
+
+
+def review_settings():
+    return {
+        'codec': getattr(settings, 'RECORDING_REVIEW_CODEC', 'opus'),
+        'bitrate': getattr(settings, 'RECORDING_REVIEW_BITRATE', '16k'),
+        'peaks': getattr(settings, 'RECORDING_PEAKS', 800),
+        'timeout': getattr(settings, 'RECORDING_PROCESS_TIMEOUT', 900),
+        'normalize': getattr(settings, 'RECORDING_NORMALIZE', True),
+    }
+
+
+def review_name(recording_path, codec='opus'):
+    """Where the review rendition of ``recording_path`` goes, relative to MEDIA_ROOT"""
+    directory, filename = os.path.split(recording_path)
+    return os.path.join(directory, REVIEW_DIR, os.path.splitext(filename)[0] + CODECS[codec][2])
+
+
+def reduce_peaks(window_peaks, count):
+    """Reduce per-window peaks (0-32768) to ``count`` values between 0 and 1"""
+    if not window_peaks:
+        return []
+    if len(window_peaks) <= count:
+        buckets = [[peak] for peak in window_peaks]
+    else:
+        step = len(window_peaks) / count
+        buckets = [window_peaks[int(i * step):max(int((i + 1) * step), int(i * step) + 1)] for i in range(count)]
+    return [round(max(bucket) / 32768, 3) for bucket in buckets]
+
+
+def transcode(ffmpeg, source, destination, codec, bitrate, peak_count, timeout, normalize=True):
+    """Runs in a pool process - no database access.
+
+    Writes the review rendition to ``destination`` and returns
+    ``{'duration', 'peaks', 'review_size'}``.
+    """
+    encoder, container, _ = CODECS[codec]
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    tmp_path = f"{destination}.{os.getpid()}.tmp"
+    command = [
+        ffmpeg, '-nostdin', '-hide_banner', '-v', 'error', '-y', '-i', source,
+        # Output 1: the review rendition
+        # (loudnorm resamples to 192kHz internally, hence the explicit rate)
+        '-map', '0:a:0', '-vn', '-ac', '1', '-ar', '48000', *(['-af', LOUDNORM] if normalize else []),
+        *encoder, '-b:a', bitrate, '-f', container, tmp_path,
+        # Output 2: low-rate PCM for duration and peaks, from the same decode
+        '-map', '0:a:0', '-vn', '-ac', '1', '-ar', str(PEAK_SAMPLE_RATE), '-f', 's16le', 'pipe:1',
+    ]
+
+    window_peaks = []
+    samples = 0
+    with tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr)
+        timer = threading.Timer(timeout, process.kill)
+        timer.start()
+        try:
+            leftover = b''
+            while True:
+                data = process.stdout.read(PEAK_WINDOW * 2 * 50)
+                if not data:
+                    break
+                data = leftover + data
+                usable = len(data) - len(data) % 2
+                leftover = data[usable:]
+                pcm = array.array('h', data[:usable])
+                samples += len(pcm)
+                for start in range(0, len(pcm), PEAK_WINDOW):
+                    window = pcm[start:start + PEAK_WINDOW]
+                    window_peaks.append(max(max(window), -min(window)))
+            process.wait()
+        finally:
+            timer.cancel()
+        if process.returncode != 0:
+            stderr.seek(0)
+            error = stderr.read().decode(errors='replace').strip()[-1000:]
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise RuntimeError(f"ffmpeg exited with {process.returncode}: {error or 'killed after timeout'}")
+
+    os.replace(tmp_path, destination)
+    return {
+        'duration': round(samples / PEAK_SAMPLE_RATE, 3),
+        'peaks': reduce_peaks(window_peaks, peak_count),
+        'review_size': os.path.getsize(destination),
+    }
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn, not fork - the worker process has threads and open connections
+            _pool = ProcessPoolExecutor(
+                max_workers=max(1, getattr(settings, 'RECORDING_PROCESSES', 1)),
+                mp_context=multiprocessing.get_context('spawn'),
+                max_tasks_per_child=getattr(settings, 'RECORDING_PROCESS_MAX_TASKS', 20),
+            )
+        return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def run_transcode(*args):
+    """transcode() in the pool; in this process if the pool broke"""
+    try:
+        return _get_pool().submit(transcode, *args).result()
+    except BrokenProcessPool as e:
+        logger.warning(f"Recording pool failed, transcoding in process: {e}")
+        _reset_pool()
+        return transcode(*args)
+
+
+def process_recording(interview_uuid, recording_path):
+    """Probe, transcode and measure the peaks of a recording, then update its Interview"""
+    from .models import Interview
+
+    full_path = os.path.join(settings.MEDIA_ROOT, recording_path)
+    if not os.path.exists(full_path):
+        raise FileNotFoundError(full_path)
+
+    interview = Interview.objects.filter(uuid=interview_uuid).values('pk', 'recording_data', 'job__posted_by_id').get()
+    recording_info = json.loads(interview['recording_data'] or '{}')
+    recording_info['file_size'] = os.path.getsize(full_path)
+    recording_info['processed_at'] = timezone.now().isoformat()
+    fields = {'recording_processed_at': timezone.now()}
+
+    ffmpeg = ffmpeg_path()
+    if ffmpeg:
+        options = review_settings()
+        review_path = review_name(recording_path, options['codec'])
+        result = run_transcode(
+            ffmpeg, full_path, os.path.join(settings.MEDIA_ROOT, review_path),
+            options['codec'], options['bitrate'], options['peaks'], options['timeout'], options['normalize'],
+        )
+        recording_info.update({
+            'client_duration': recording_info.get('duration'),
+            'duration': result['duration'],
+            'review_path': review_path,
+            'review_size': result['review_size'],
+        })
+        fields.update(
+            recording_duration=result['duration'],
+            recording_review_path=review_path,
+            recording_peaks=result['peaks'],
+        )
+        logger.info(
+            f"🎞️ Recording of interview {interview_uuid} processed: {result['duration']:.1f}s, "
+            f"{recording_info['file_size']} -> {result['review_size']} bytes"
+        )
+    else:
+        logger.warning(f"ffmpeg not found, recording of interview {interview_uuid} left unprocessed")
+
+    fields['recording_data'] = json.dumps(recording_info)
+    # Only if the interview still points at this recording
+    Interview.objects.filter(pk=interview['pk'], recording_path=recording_path).update(**fields)
+
+    # update() sends no post_save, so invalidate the dashboard here
+    try:
+        from . import fragment_cache
+        fragment_cache.bump(interview['job__posted_by_id'], 'interviews')
+    except Exception as e:
+        logger.warning(f"Could not invalidate dashboard cache: {e}")
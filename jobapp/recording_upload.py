@@ -0,0 +1,202 @@
+"""
+Chunked, resumable interview recording uploads.
+
+The interview page streams MediaRecorder segments while the interview is
+running: ``start`` opens an upload and an empty file under
+interview_recordings/, each segment is PUT as chunk N and appended to that
+file straight from the request stream (never more than one block in
+memory), and ``finalize`` records the file on the Interview and queues
+its processing. A chunk that was already stored is acknowledged again, a
+chunk from the future is refused with the index expected, so a client
+that lost its connection asks for the upload's state and carries on where
+the server stopped. Finalize is idempotent. An upload the browser never
+finalizes (tab closed) is finalized by a task once the interview is over,
+so whatever reached the server is kept.
+"""
+import os
+import json
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+RECORDINGS_DIR = 'interview_recordings'
+BLOCK_SIZE = 64 * 1024
+EXTENSIONS = {'video/webm': '.webm', 'audio/webm': '.webm', 'video/mp4': '.mp4', 'audio/mp4': '.m4a', 'audio/ogg': '.ogg'}
+
+
+class UploadError(Exception):
+    """A chunk was refused; ``status`` is the HTTP status to answer with"""
+
+    def __init__(self, message, status=400, progress=None):
+        super().__init__(message)
+        self.status = status
+        self.progress = progress or {}
+
+
+def max_chunk_bytes():
+    return getattr(settings, 'RECORDING_CHUNK_MAX_BYTES', 8 * 1024 * 1024)
+
+
+def max_recording_bytes():
+    return getattr(settings, 'RECORDING_MAX_BYTES', 500 * 1024 * 1024)
+
+
+def _full_path(upload):
+    return os.path.join(settings.MEDIA_ROOT, upload.file_path)
+
+
+def start(interview, content_type=''):
+    """Open a new upload for ``interview`` and create its (empty) file"""
+    from .models import RecordingUpload
+
+    content_type = (content_type or 'video/webm').split(';')[0].strip().lower()
+    extension = EXTENSIONS.get(content_type, '.webm')
+    timestamp = timezone.now().strftime('%Y%m%d_%H%M%S')
+    upload = RecordingUpload(interview=interview, content_type=content_type)
+    upload.file_path = os.path.join(RECORDINGS_DIR, f"interview_{interview.uuid}_{timestamp}_{upload.upload_id.hex[:8]}{extension}")
+
+    os.makedirs(os.path.join(settings.MEDIA_ROOT, RECORDINGS_DIR), exist_ok=True)
+    open(_full_path(upload), 'wb').close()
+    upload.save()
+    logger.info(f"🎥 Recording upload {upload.upload_id} started for interview {interview.uuid}")
+
+    # Keep what arrived even if the browser never finalizes
+    grace = getattr(settings, 'RECORDING_UPLOAD_GRACE_SECONDS', 600)
+    transaction.on_commit(lambda: _schedule_finalize(upload, interview.interview_duration_minutes * 60 + grace))
+    return upload
+
+
+def _schedule_finalize(upload, delay, check=0):
+    from .tasks import enqueue
+    try:
+        enqueue(
+            'finalize_recording_upload', key=f'finalize_recording:{upload.upload_id}:{check}',
+            delay=delay, upload_id=str(upload.upload_id), check=check,
+        )
+    except Exception as e:
+        logger.warning(f"Could not schedule finalizing recording upload {upload.upload_id}: {e}")
+
+
+def progress(upload):
+    """JSON-ready state of an upload - what a resuming client needs"""
+    return {
+        'upload_id': str(upload.upload_id),
+        'status': upload.status,
+        'next_chunk': upload.next_chunk,
+        'bytes_received': upload.bytes_received,
+        'max_chunk_bytes': max_chunk_bytes(),
+    }
+
+
+def append_chunk(upload_id, index, stream, length):
+    """Append chunk ``index`` (``length`` bytes read from ``stream``) to an upload.
+
+    Returns ``(upload, stored)``; ``stored`` is False for a chunk that was
+    already received. Raises UploadError when the chunk is refused.
+    """
+    from .models import RecordingUpload
+
+    if length is None:
+        raise UploadError('Content-Length is required', status=411)
+    if length <= 0:
+        raise UploadError('Empty chunk')
+    if length > max_chunk_bytes():
+        raise UploadError(f'Chunks are limited to {max_chunk_bytes()} bytes', status=413)
+
+    with transaction.atomic():
+        # One writer per upload: concurrent retries of a chunk wait here
+        upload = RecordingUpload.objects.select_for_update().get(upload_id=upload_id)
+        if upload.status != 'uploading':
+            raise UploadError('Upload is already finalized', status=409, progress=progress(upload))
+        if index < upload.next_chunk:
+            return upload, False
+        if index > upload.next_chunk:
+            raise UploadError(f'Expected chunk {upload.next_chunk}', status=409, progress=progress(upload))
+        if upload.bytes_received + length > max_recording_bytes():
+            raise UploadError('Recording is too large', status=413)
+
+        written = 0
+        with open(_full_path(upload), 'r+b') as f:
+            # Drop whatever a failed earlier attempt at this chunk left behind
+            f.truncate(upload.bytes_received)
+            f.seek(upload.bytes_received)
+            while written < length:
+                block = stream.read(min(BLOCK_SIZE, length - written))
+                if not block:
+                    break
+                f.write(block)
+                written += len(block)
+            if written != length:
+                f.truncate(upload.bytes_received)
+                raise UploadError(f'Chunk {index} was cut short ({written} of {length} bytes)')
+
+        upload.next_chunk += 1
+        upload.bytes_received += written
+        upload.save(update_fields=['next_chunk', 'bytes_received', 'updated_at'])
+    return upload, True
+
+
+def finalize(upload_id, duration=None):
+    """Record the upload's file on its interview and queue processing; safe to call again"""
+    from .models import RecordingUpload
+    from .tasks import enqueue_recording_processing
+
+    with transaction.atomic():
+        upload = RecordingUpload.objects.select_for_update().select_related('interview').get(upload_id=upload_id)
+        if upload.status == 'complete':
+            return upload
+        if not upload.bytes_received:
+            # Nothing arrived - no recording to attach
+            upload.status = 'complete'
+            upload.completed_at = timezone.now()
+            upload.save(update_fields=['status', 'completed_at', 'updated_at'])
+            return upload
+
+        if duration is None:
+            # Finalized by the task: estimate from how long chunks kept arriving
+            duration = max(0.0, (upload.updated_at - upload.created_at).total_seconds())
+        upload.duration = float(duration)
+        upload.status = 'complete'
+        upload.completed_at = timezone.now()
+        upload.save(update_fields=['duration', 'status', 'completed_at', 'updated_at'])
+
+        interview = upload.interview
+        recording_info = {
+            'recording_path': upload.file_path,
+            'duration': upload.duration,
+            'file_size': upload.bytes_received,
+            'recorded_at': upload.completed_at.isoformat(),
+            'filename': os.path.basename(upload.file_path),
+            'chunks': upload.next_chunk,
+        }
+        interview.recording_data = json.dumps(recording_info)
+        interview.recording_path = upload.file_path
+        interview.recording_duration = upload.duration
+        interview.is_recorded = True
+        # A save, not an update, so the dashboard signals see it
+        interview.save(update_fields=['recording_data', 'recording_path', 'recording_duration', 'is_recorded'])
+        transaction.on_commit(lambda: enqueue_recording_processing(interview, upload.file_path))
+
+    logger.info(f"✅ Recording upload {upload.upload_id} finalized: {upload.bytes_received} bytes in {upload.next_chunk} chunks")
+    return upload
+
+
+def finalize_abandoned(upload_id, check=0):
+    """Finalize an upload the browser left open, unless chunks are still arriving"""
+    from .models import RecordingUpload
+
+    upload = RecordingUpload.objects.filter(upload_id=upload_id).first()
+    if upload is None or upload.status == 'complete':
+        return
+    grace = getattr(settings, 'RECORDING_UPLOAD_GRACE_SECONDS', 600)
+    if timezone.now() - upload.updated_at < timedelta(seconds=grace):
+        # Still live (an interview that ran over) - look again later
+        _schedule_finalize(upload, grace, check=check + 1)
+        return
+    logger.warning(f"Recording upload {upload_id} was never finalized by the browser, finalizing it now")
+    finalize(upload_id)
@@ -0,0 +1,264 @@
+"""
+Full-text job search.
+
+Every job is tokenized into a portable inverted index (JobSearchTerm rows,
+one per token per job, holding a field-weighted term frequency) that is
+kept current from signals on Job save and tag changes. Matching jobs are
+found with one aggregate over the postings of the query terms and scored
+with BM25 from their own postings, so cost follows the size of those
+posting lists rather than the jobs table. Results are paged with keyset
+pagination on the score, so no match is cut off. The last query term also
+matches as a prefix, for search-as-you-type.
+
+On PostgreSQL a weighted ``search_vector`` tsvector column with a GIN index
+(added by migration 0007) is maintained as well and used for queries
+instead, ranked with ts_rank_cd.
+"""
+import re
+import math
+import logging
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Avg, BooleanField, Case, Count, F, FloatField, IntegerField, OuterRef, Subquery, Sum, Value, When
+from django.db.models.expressions import RawSQL
+
+logger = logging.getLogger(__name__)
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Term frequency weight of each field (BM25F-style)
+FIELD_WEIGHTS = {
+    'title': 3.0,
+    'tags': 2.5,
+    'required_skills': 2.0,
+    'company': 1.5,
+    'location': 1.0,
+    'description': 1.0,
+}
+
+# tsvector weight class of each field on PostgreSQL
+PG_FIELD_CLASSES = {
+    'title': 'A',
+    'tags': 'B',
+    'required_skills': 'B',
+    'company': 'C',
+    'location': 'D',
+    'description': 'D',
+}
+
+STOP_WORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is', 'it',
+    'of', 'on', 'or', 'our', 'the', 'to', 'we', 'will', 'with', 'you', 'your',
+}
+
+# Keeps "c++", "c#" and "node.js" as single tokens
+TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#.]*')
+MAX_TOKEN_LENGTH = 64
+MIN_PREFIX_LENGTH = 2
+# Expansions per prefix term, and their idf weight relative to the typed word
+PREFIX_EXPANSIONS = 30
+PREFIX_DISCOUNT = 0.25
+
+# Result order of search_jobs - also the keyset pagination keys
+SEARCH_ORDERING = ('-search_score', '-id')
+
+STATS_CACHE_KEY = 'job_search_stats'
+
+
+def tokenize(text):
+    tokens = []
+    for token in TOKEN_RE.findall((text or '').lower()):
+        token = token.rstrip('.')[:MAX_TOKEN_LENGTH]
+        if token and token not in STOP_WORDS:
+            tokens.append(token)
+    return tokens
+
+
+def job_fields(job):
+    return {
+        'title': job.title,
+        'tags': ' '.join(job.tags.names()) if job.pk else '',
+        'required_skills': job.required_skills,
+        'company': job.company,
+        'location': job.location,
+        'description': job.description,
+    }
+
+
+def use_postgres():
+    return connection.vendor == 'postgresql' and getattr(settings, 'JOB_SEARCH_POSTGRES', True)
+
+
+# Indexing
+
+def index_job(job):
+    """(Re)build the postings of one job"""
+    from .models import JobSearchDocument, JobSearchTerm
+
+    fields = job_fields(job)
+    weights = Counter()
+    doc_length = 0.0
+    for field, text in fields.items():
+        tokens = tokenize(text)
+        doc_length += FIELD_WEIGHTS[field] * len(tokens)
+        for token in tokens:
+            weights[token] += FIELD_WEIGHTS[field]
+
+    with transaction.atomic():
+        JobSearchTerm.objects.filter(job_id=job.pk).delete()
+        JobSearchTerm.objects.bulk_create([
+            JobSearchTerm(token=token, job_id=job.pk, weight=weight, doc_length=doc_length)
+            for token, weight in weights.items()
+        ], batch_size=1000)
+        _, created = JobSearchDocument.objects.update_or_create(job_id=job.pk, defaults={'length': doc_length})
+        if use_postgres():
+            _update_search_vector(job.pk, fields)
+    if created:
+        cache.delete(STATS_CACHE_KEY)
+
+
+def _update_search_vector(job_id, fields):
+    config = getattr(settings, 'JOB_SEARCH_PG_CONFIG', 'english')
+    parts = []
+    params = []
+    for field, text in fields.items():
+        parts.append(f"setweight(to_tsvector(%s::regconfig, %s), '{PG_FIELD_CLASSES[field]}')")
+        params.extend([config, text or ''])
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE jobapp_job SET search_vector = {' || '.join(parts)} WHERE id = %s",
+            params + [job_id]
+        )
+
+
+def rebuild_index(batch_size=500):
+    """Index every job; returns the number of jobs indexed"""
+    from .models import Job, JobSearchDocument, JobSearchTerm
+
+    JobSearchTerm.objects.all().delete()
+    JobSearchDocument.objects.all().delete()
+    count = 0
+    for job in Job.objects.iterator(chunk_size=batch_size):
+        index_job(job)
+        count += 1
+    cache.delete(STATS_CACHE_KEY)
+    return count
+
+
+def _collection_stats():
+    """(document count, average document length), cached briefly"""
+    from .models import JobSearchDocument
+
+    stats = cache.get(STATS_CACHE_KEY)
+    if stats is None:
+        aggregate = JobSearchDocument.objects.aggregate(count=Count('pk'), avg_length=Avg('length'))
+        stats = (aggregate['count'] or 0, aggregate['avg_length'] or 1.0)
+        cache.set(STATS_CACHE_KEY, stats, 600)
+    return stats
+
+
+# Querying
+
+def parse_query(query, prefix=True):
+    """Distinct query terms and whether the last one is matched as a prefix"""
+    terms = list(dict.fromkeys(tokenize(query)))
+    # A trailing space means the last word is finished
+    last_is_prefix = prefix and bool(terms) and not query.endswith(' ') and len(terms[-1]) >= MIN_PREFIX_LENGTH
+    return terms, last_is_prefix
+
+
+def _expand_prefix(term):
+    from .models import JobSearchTerm
+    # A range on the token index instead of LIKE, so every backend can use it;
+    # distinct tokens in index order keep the cost flat for short prefixes
+    return list(
+        JobSearchTerm.objects.filter(token__gte=term, token__lt=term + '\uffff')
+        .order_by('token').values_list('token', flat=True).distinct()[:PREFIX_EXPANSIONS]
+    )
+
+
+def _bm25_ranked(terms, last_is_prefix, queryset):
+    from .models import JobSearchTerm
+
+    expansions = [[term] for term in terms]
+    if last_is_prefix:
+        expansions[-1] = list(dict.fromkeys([terms[-1]] + _expand_prefix(terms[-1])))
+    tokens = sorted({token for group in expansions for token in group})
+
+    doc_count, avg_length = _collection_stats()
+    doc_freqs = dict(
+        JobSearchTerm.objects.filter(token__in=tokens).values('token')
+        .annotate(df=Count('pk')).values_list('token', 'df')
+    )
+    # The cached count can lag behind the postings; a negative idf would invert the ranking
+    doc_count = max([doc_count] + list(doc_freqs.values()))
+    idf = {
+        token: math.log(1 + (doc_count - doc_freqs.get(token, 0) + 0.5) / (doc_freqs.get(token, 0) + 0.5))
+        for token in tokens
+    }
+    if last_is_prefix:
+        # "python" should not rank a job higher just because it also says "pythonic"
+        for token in expansions[-1][1:]:
+            idf[token] *= PREFIX_DISCOUNT
+
+    idf_case = Case(*[When(token=token, then=Value(idf[token])) for token in tokens], output_field=FloatField())
+    saturation = (F('weight') * (K1 + 1)) / (F('weight') + K1 * (1 - B + B * F('doc_length') / avg_length))
+    # Every query term (or one of its prefix expansions) must match
+    term_index = Case(*[When(token__in=group, then=Value(i)) for i, group in enumerate(expansions)], output_field=IntegerField())
+
+    postings = JobSearchTerm.objects.filter(token__in=tokens)
+    matches = (
+        postings.values('job_id')
+        .annotate(matched=Count(term_index, distinct=True))
+        .filter(matched=len(expansions))
+        .values('job_id')
+    )
+    score = (
+        postings.filter(job_id=OuterRef('pk')).values('job_id')
+        .annotate(score=Sum(idf_case * saturation, output_field=FloatField()))
+        .values('score')
+    )
+    return queryset.filter(pk__in=matches).annotate(search_score=Subquery(score, output_field=FloatField()))
+
+
+def _postgres_ranked(terms, last_is_prefix, queryset):
+    config = getattr(settings, 'JOB_SEARCH_PG_CONFIG', 'english')
+    # Tokens are [a-z0-9+#.] only; "+" and "#" are dropped as tsquery operators
+    words = [re.sub(r'[^a-z0-9.]', '', term) for term in terms]
+    words = [word for word in words if word]
+    if not words:
+        return queryset.none()
+    tsquery = ' & '.join(words[:-1] + [words[-1] + (':*' if last_is_prefix else '')])
+
+    params = (config, tsquery)
+    return (
+        queryset
+        .alias(search_match=RawSQL("jobapp_job.search_vector @@ to_tsquery(%s::regconfig, %s)", params, output_field=BooleanField()))
+        .filter(search_match=True)
+        # float8, so the rank in a page cursor compares equal to the recomputed one
+        .annotate(search_score=RawSQL("ts_rank_cd(jobapp_job.search_vector, to_tsquery(%s::regconfig, %s))::float8", params, output_field=FloatField()))
+    )
+
+
+def search_jobs(query, queryset=None, prefix=True):
+    """``queryset`` narrowed to the jobs matching ``query``, best first.
+
+    Every match is included: page through the results with keyset
+    pagination on SEARCH_ORDERING (the ``search_score`` annotation).
+    """
+    from .models import Job
+
+    queryset = queryset if queryset is not None else Job.objects.all()
+    terms, last_is_prefix = parse_query(query, prefix)
+    if not terms:
+        return queryset.none()
+    if use_postgres():
+        ranked = _postgres_ranked(terms, last_is_prefix, queryset)
+    else:
+        ranked = _bm25_ranked(terms, last_is_prefix, queryset)
+    return ranked.order_by(*SEARCH_ORDERING)
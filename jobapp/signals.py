@@ -1,9 +1,9 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_init, post_save, post_delete, m2m_changed
 from django.dispatch import receiver
 from django.core.mail import send_mail
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from .models import Application, Interview, Profile
+from .models import Application, Interview, Job, Profile, Candidate
 
 # AUTOMATIC EMAIL SENDING WITH GMAIL SMTP
 # Using threading and timeouts to prevent worker crashes
@@ -24,6 +24,144 @@ def create_profile(sender, instance, created, **kwargs):
             email=instance.email or ''
         )
        
+
+
+# Extract resume text once at upload so interviews read it from the cache
+def _resume_name(instance):
+    # From __dict__: a deferred resume field must not cost a query
+    value = instance.__dict__.get('resume')
+    return getattr(value, 'name', value) or ''
+
+
+@receiver(post_init, sender=Profile)
+@receiver(post_init, sender=Candidate)
+@receiver(post_init, sender=Application)
+def remember_resume_name(sender, instance, **kwargs):
+    instance._saved_resume_name = _resume_name(instance)
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_save, sender=Candidate)
+@receiver(post_save, sender=Application)
+def cache_uploaded_resume_text(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and 'resume' not in update_fields:
+        return
+    name = _resume_name(instance)
+    if not name or (not created and name == getattr(instance, '_saved_resume_name', None)):
+        return
+    instance._saved_resume_name = name
+    from .utils.resume_reader import cache_resume_text
+    cache_resume_text(instance.resume)
+
+
+# Keep the job search index current
+@receiver(post_save, sender=Job)
+def index_job_for_search(sender, instance, **kwargs):
+    try:
+        from .search import index_job
+        index_job(instance)
+    except Exception as e:
+        import logging
+        logging.getLogger(__name__).error(f"Search indexing failed for job {instance.pk}: {e}")
+
+
+@receiver(m2m_changed, sender=Job.tags.through)
+def reindex_job_tags(sender, instance, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear') and isinstance(instance, Job):
+        index_job_for_search(Job, instance)
+        bump_job_list_cache(Job, instance)
+
+
+# Invalidate cached dashboard HTML of the users a change shows up for
+def _bump_dashboards(recruiter_id, recruiter_sections, seeker_ids=()):
+    try:
+        from . import fragment_cache
+        fragment_cache.bump(recruiter_id, 'counts', *recruiter_sections)
+        fragment_cache.bump(list(seeker_ids), *fragment_cache.SEEKER_SECTIONS)
+    except Exception as e:
+        import logging
+        logging.getLogger(__name__).warning(f"Could not invalidate dashboard cache: {e}")
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def bump_job_list_cache(sender, instance, **kwargs):
+    try:
+        from .http_cache import bump_job_list
+        bump_job_list()
+    except Exception as e:
+        import logging
+        logging.getLogger(__name__).warning(f"Could not invalidate job list cache: {e}")
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def bump_job_dashboards(sender, instance, **kwargs):
+    # Job titles appear on application and interview cards too
+    seeker_ids = set(Application.objects.filter(job_id=instance.pk).values_list('applicant_id', flat=True))
+    seeker_ids |= set(Interview.objects.filter(job_id=instance.pk, candidate__isnull=False).values_list('candidate_id', flat=True))
+    _bump_dashboards(instance.posted_by_id, ('jobs', 'applications', 'interviews'), seeker_ids)
+
+
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+def bump_application_dashboards(sender, instance, **kwargs):
+    recruiter_id = Job.objects.filter(pk=instance.job_id).values_list('posted_by_id', flat=True).first()
+    _bump_dashboards(recruiter_id, ('applications', 'jobs'), [instance.applicant_id])
+
+
+@receiver(post_save, sender=Interview)
+@receiver(post_delete, sender=Interview)
+def bump_interview_dashboards(sender, instance, **kwargs):
+    recruiter_id = Job.objects.filter(pk=instance.job_id).values_list('posted_by_id', flat=True).first()
+    _bump_dashboards(recruiter_id, ('interviews',), [instance.candidate_id] if instance.candidate_id else [])
+
+
+@receiver(post_save, sender=Candidate)
+@receiver(post_delete, sender=Candidate)
+def bump_candidate_dashboards(sender, instance, **kwargs):
+    _bump_dashboards(instance.added_by_id, ('candidates',))
+
+
+@receiver(post_save, sender=Profile)
+def bump_profile_dashboard(sender, instance, **kwargs):
+    _bump_dashboards(None, (), [instance.user_id])
+
+
+# Cached interviewer completions of a job are stale once its description, title or company changes
+@receiver(post_save, sender=Job)
+def invalidate_job_llm_cache(sender, instance, created, update_fields=None, **kwargs):
+    if created or (update_fields and not {'description', 'title', 'company'} & set(update_fields)):
+        return
+    try:
+        from .utils.llm_cache import invalidate_job
+        invalidate_job(instance.pk)
+    except Exception as e:
+        import logging
+        logging.getLogger(__name__).warning(f"Could not invalidate LLM cache for job {instance.pk}: {e}")
+
+
+# Pre-synthesize scripted interviewer audio for new jobs and candidates
+@receiver(post_save, sender=Job)
+def warm_job_phrase_audio(sender, instance, **kwargs):
+    if instance.status == 'active' and getattr(settings, 'TTS_PHRASE_WARMUP', True):
+        try:
+            from .tasks import enqueue_job_phrase_warmup
+            enqueue_job_phrase_warmup(instance)
+        except Exception as e:
+            import logging
+            logging.getLogger(__name__).warning(f"Could not queue phrase audio for job {instance.pk}: {e}")
+
+
+@receiver(post_save, sender=Interview)
+def warm_candidate_phrase_audio(sender, instance, created, **kwargs):
+    if created and getattr(settings, 'TTS_PHRASE_WARMUP', True):
+        try:
+            from .tasks import enqueue_candidate_phrase_warmup
+            enqueue_candidate_phrase_warmup(instance)
+        except Exception as e:
+            import logging
+            logging.getLogger(__name__).warning(f"Could not queue phrase audio for interview {instance.uuid}: {e}")
        
 # 2. Application Submitted Email - TEMPORARILY DISABLED
 
@@ -74,16 +212,10 @@ def send_interview_email(sender, instance, created, **kwargs):
     if created:
         try:
             from .email_utils import send_interview_email_async
-            import logging
-            logger = logging.getLogger(__name__)
             
-            logger.info(f"📧 Sending interview email for {instance.candidate_email}")
-            
-            # Send email asynchronously to avoid blocking
+            # Queued in the outbox - delivered by the task worker
             send_interview_email_async(instance)
             
-            logger.info(f"✅ Interview email process initiated for {instance.candidate_email}")
-            
         except Exception as e:
             import logging
             logger = logging.getLogger(__name__)
@@ -0,0 +1,424 @@
+"""
+Durable background tasks stored in the BackgroundTask table.
+
+Tasks are registered with @task and queued with enqueue(). Workers
+(``manage.py run_task_worker``, or the embedded worker thread started on
+first enqueue) claim due tasks, run them and retry failures with
+exponential backoff. An idempotency key makes repeated enqueues of the
+same work - e.g. results for one interview - a no-op. A daily
+``prune_history`` task deletes finished tasks and old outbox emails.
+"""
+import os
+import random
+import socket
+import threading
+import time
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+TASKS = {}
+
+
+def task(name, max_attempts=5):
+    """Register a function as a background task under ``name``"""
+    def decorator(func):
+        func.task_name = name
+        func.max_attempts = max_attempts
+        TASKS[name] = func
+        return func
+    return decorator
+
+
+def enqueue(name, key=None, delay=0, **kwargs):
+    """Queue task ``name`` with JSON-serializable ``kwargs``.
+
+    With ``key``, a task that is already queued, running or done for that key
+    is returned as-is; a failed one is reset and queued again.
+    """
+    from .models import BackgroundTask
+
+    if name not in TASKS:
+        raise ValueError(f"Unknown task: {name}")
+
+    run_after = timezone.now() + timedelta(seconds=delay)
+    defaults = {
+        'task_name': name,
+        'kwargs': kwargs,
+        'max_attempts': TASKS[name].max_attempts,
+        'run_after': run_after,
+    }
+
+    if key:
+        background_task, created = BackgroundTask.objects.get_or_create(idempotency_key=key, defaults=defaults)
+        if not created and background_task.status == 'failed':
+            background_task.status = 'pending'
+            background_task.attempts = 0
+            background_task.run_after = run_after
+            background_task.kwargs = kwargs
+            background_task.save(update_fields=['status', 'attempts', 'run_after', 'kwargs', 'updated_at'])
+            created = True
+    else:
+        background_task = BackgroundTask.objects.create(**defaults)
+        created = True
+
+    if created:
+        logger.info(f"📥 Queued task {name} (id={background_task.pk}, key={key})")
+        _wake_embedded_worker()
+    return background_task
+
+
+def _backoff_delay(attempts):
+    base = getattr(settings, 'TASK_RETRY_BASE_DELAY', 30)
+    cap = getattr(settings, 'TASK_RETRY_MAX_DELAY', 3600)
+    delay = min(cap, base * (2 ** (attempts - 1)))
+    return delay * random.uniform(0.8, 1.2)
+
+
+def claim_task(worker_id):
+    """Atomically mark the next due task as running and return it (or None)"""
+    from .models import BackgroundTask
+
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=getattr(settings, 'TASK_LOCK_TIMEOUT', 600))
+    due = BackgroundTask.objects.filter(
+        Q(status='pending', run_after__lte=now) | Q(status='running', locked_at__lt=stale_before)
+    ).order_by('run_after')
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            background_task = due.select_for_update(skip_locked=True).first()
+            if background_task is None:
+                return None
+            background_task.status = 'running'
+            background_task.locked_by = worker_id
+            background_task.locked_at = now
+            background_task.save(update_fields=['status', 'locked_by', 'locked_at', 'updated_at'])
+            return background_task
+
+    # No SKIP LOCKED (SQLite) - claim with a conditional update instead
+    for background_task in due[:5]:
+        claimed = BackgroundTask.objects.filter(
+            pk=background_task.pk, status=background_task.status, locked_at=background_task.locked_at
+        ).update(status='running', locked_by=worker_id, locked_at=now, updated_at=now)
+        if claimed:
+            background_task.refresh_from_db()
+            return background_task
+    return None
+
+
+def _heartbeat(task_id, worker_id, stop):
+    """Refresh ``locked_at`` while the task runs, so a long task is not reclaimed as stale"""
+    from .models import BackgroundTask
+
+    interval = max(1.0, getattr(settings, 'TASK_LOCK_TIMEOUT', 600) / 4)
+    try:
+        while not stop.wait(interval):
+            try:
+                BackgroundTask.objects.filter(pk=task_id, status='running', locked_by=worker_id).update(locked_at=timezone.now())
+            except Exception as e:
+                logger.warning(f"Could not refresh the lock of task {task_id}: {e}")
+    finally:
+        connection.close()
+
+
+def run_task(background_task):
+    """Run a claimed task and record success, a scheduled retry, or failure.
+
+    The outcome is only written while this worker still holds the task's
+    lock; a task reclaimed by another worker in the meantime keeps that
+    worker's state.
+    """
+    from .models import BackgroundTask
+
+    func = TASKS.get(background_task.task_name)
+    worker_id = background_task.locked_by
+    background_task.attempts += 1
+    stop_heartbeat = threading.Event()
+    threading.Thread(
+        target=_heartbeat, args=(background_task.pk, worker_id, stop_heartbeat),
+        name=f'task-heartbeat-{background_task.pk}', daemon=True,
+    ).start()
+    try:
+        if func is None:
+            raise LookupError(f"Task {background_task.task_name} is not registered")
+        func(**background_task.kwargs)
+    except Exception as e:
+        background_task.last_error = f"{type(e).__name__}: {e}\n{traceback.format_exc()}"[:5000]
+        if background_task.attempts < background_task.max_attempts:
+            delay = _backoff_delay(background_task.attempts)
+            background_task.status = 'pending'
+            background_task.run_after = timezone.now() + timedelta(seconds=delay)
+            logger.warning(f"🔁 Task {background_task.task_name} (id={background_task.pk}) failed, retry {background_task.attempts}/{background_task.max_attempts} in {delay:.0f}s: {e}")
+        else:
+            background_task.status = 'failed'
+            background_task.finished_at = timezone.now()
+            logger.error(f"❌ Task {background_task.task_name} (id={background_task.pk}) failed permanently: {e}")
+    else:
+        background_task.status = 'succeeded'
+        background_task.last_error = ''
+        background_task.finished_at = timezone.now()
+        logger.info(f"✅ Task {background_task.task_name} (id={background_task.pk}) succeeded")
+    finally:
+        stop_heartbeat.set()
+
+    background_task.locked_by = ''
+    background_task.locked_at = None
+    finished = BackgroundTask.objects.filter(pk=background_task.pk, status='running', locked_by=worker_id).update(
+        status=background_task.status,
+        attempts=background_task.attempts,
+        last_error=background_task.last_error,
+        run_after=background_task.run_after,
+        finished_at=background_task.finished_at,
+        locked_by='',
+        locked_at=None,
+        updated_at=timezone.now(),
+    )
+    if not finished:
+        logger.warning(f"Task {background_task.task_name} (id={background_task.pk}) lost its lock to another worker; outcome not recorded")
+    return background_task.status
+
+
+def prune_history(days=None):
+    """Delete tasks that finished more than TASK_RETENTION_DAYS ago; returns the number deleted"""
+    from .models import BackgroundTask
+
+    days = getattr(settings, 'TASK_RETENTION_DAYS', 14) if days is None else days
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted, _ = BackgroundTask.objects.filter(status__in=['succeeded', 'failed'], finished_at__lt=cutoff).delete()
+    if deleted:
+        logger.info(f"🧹 Deleted {deleted} finished tasks older than {days} days")
+    return deleted
+
+
+def work(worker_id=None, once=False, poll_interval=2.0, stop_event=None, wake_event=None):
+    """Claim and run tasks until stopped; with ``once``, return when the queue is empty"""
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+    processed = 0
+    if not once:
+        try:
+            enqueue_history_prune()
+        except Exception as e:
+            logger.warning(f"Could not queue the task history sweep: {e}")
+    while not (stop_event and stop_event.is_set()):
+        close_old_connections()
+        try:
+            background_task = claim_task(worker_id)
+        except Exception as e:
+            logger.error(f"Task worker {worker_id} could not claim a task: {e}")
+            background_task = None
+
+        if background_task is None:
+            if once:
+                break
+            if wake_event:
+                wake_event.wait(poll_interval)
+                wake_event.clear()
+            else:
+                time.sleep(poll_interval)
+            continue
+
+        run_task(background_task)
+        processed += 1
+    close_old_connections()
+    return processed
+
+
+# Embedded worker - a daemon thread per web process, for deployments
+# without a separate ``run_task_worker`` process
+_embedded_worker = {'pid': None, 'thread': None, 'wake': threading.Event()}
+_embedded_lock = threading.Lock()
+
+
+def _wake_embedded_worker():
+    if not getattr(settings, 'TASK_WORKER_EMBEDDED', True):
+        return
+    ensure_embedded_worker()
+    _embedded_worker['wake'].set()
+
+
+def ensure_embedded_worker():
+    with _embedded_lock:
+        thread = _embedded_worker['thread']
+        if _embedded_worker['pid'] == os.getpid() and thread and thread.is_alive():
+            return
+        wake = threading.Event()
+        thread = threading.Thread(
+            target=work,
+            kwargs={'poll_interval': getattr(settings, 'TASK_POLL_INTERVAL', 5.0), 'wake_event': wake},
+            name='task-worker',
+            daemon=True,
+        )
+        _embedded_worker.update(pid=os.getpid(), thread=thread, wake=wake)
+        thread.start()
+        logger.info(f"🧵 Started embedded task worker in process {os.getpid()}")
+
+
+# Task definitions
+
+@task('generate_interview_results', max_attempts=4)
+def generate_interview_results_task(interview_uuid, conversation_history=None):
+    # conversation_history is only passed by tasks queued before turns were stored as rows
+    from .interview_state import persist_turns
+    from .models import Interview
+    from .views import generate_interview_results
+
+    interview = Interview.objects.select_related('job').get(uuid=interview_uuid)
+    if interview.results_generated_at:
+        logger.info(f"Results already generated for interview {interview_uuid}, skipping")
+        return
+    persist_turns(interview, fallback=conversation_history)
+    if not generate_interview_results(interview):
+        raise RuntimeError(f"Results generation failed for interview {interview_uuid}")
+    enqueue_status_email(interview, 'completed')
+
+
+@task('send_interview_status_email', max_attempts=5)
+def send_interview_status_email_task(interview_uuid, status_type):
+    from .models import Interview
+    from .views import send_interview_status_email
+
+    interview = Interview.objects.select_related('job').get(uuid=interview_uuid)
+    if not send_interview_status_email(interview, status_type):
+        raise RuntimeError(f"Status email ({status_type}) failed for interview {interview_uuid}")
+
+
+@task('deliver_outbox', max_attempts=3)
+def deliver_outbox_task():
+    from .outbox import deliver
+    deliver()
+
+
+@task('import_candidates', max_attempts=2)
+def import_candidates_task(import_id):
+    from .candidate_import import run_import
+    run_import(import_id)
+
+
+@task('process_interview_recording', max_attempts=3)
+def process_interview_recording_task(interview_uuid, recording_path):
+    from .recording_processing import process_recording
+    process_recording(interview_uuid, recording_path)
+
+
+@task('finalize_recording_upload', max_attempts=3)
+def finalize_recording_upload_task(upload_id, check=0):
+    from .recording_upload import finalize_abandoned
+    finalize_abandoned(upload_id, check=check)
+
+
+@task('warm_tts_cache', max_attempts=3)
+def warm_tts_cache_task():
+    from .interview_phrases import warm_all
+    warm_all()
+
+
+@task('warm_job_phrases', max_attempts=3)
+def warm_job_phrases_task(job_title, company_name):
+    from .interview_phrases import warm_job
+    warm_job(job_title, company_name)
+
+
+@task('warm_candidate_phrases', max_attempts=3)
+def warm_candidate_phrases_task(candidate_name):
+    from .interview_phrases import warm_candidate
+    warm_candidate(candidate_name)
+
+
+@task('warm_candidate_phrases_batch', max_attempts=3)
+def warm_candidate_phrases_batch_task(candidate_names):
+    from .interview_phrases import warm_candidate
+    for candidate_name in candidate_names:
+        warm_candidate(candidate_name)
+
+
+@task('prune_history', max_attempts=2)
+def prune_history_task():
+    from .outbox import prune
+    prune_history()
+    prune()
+    # Next sweep tomorrow - the key keeps it to one per day however many workers run
+    enqueue_history_prune(delay=24 * 60 * 60)
+
+
+# Helpers used by the views
+
+def enqueue_interview_results(interview):
+    return enqueue(
+        'generate_interview_results',
+        key=f'interview_results:{interview.uuid}',
+        interview_uuid=str(interview.uuid),
+    )
+
+
+def enqueue_status_email(interview, status_type):
+    # Rendering the message is cheap; send_interview_status_email only puts it in the outbox
+    from .views import send_interview_status_email
+    return send_interview_status_email(interview, status_type)
+
+
+def enqueue_recording_processing(interview, recording_path):
+    return enqueue(
+        'process_interview_recording',
+        key=f'recording:{interview.uuid}:{recording_path}',
+        interview_uuid=str(interview.uuid),
+        recording_path=recording_path,
+    )
+
+
+def enqueue_candidate_import(candidate_import):
+    return enqueue('import_candidates', key=f'candidate_import:{candidate_import.pk}', import_id=candidate_import.pk)
+
+
+def get_interview_results_task(interview):
+    from .models import BackgroundTask
+    return BackgroundTask.objects.filter(idempotency_key=f'interview_results:{interview.uuid}').first()
+
+
+def enqueue_phrase_warmup():
+    """Warm all phrase audio once per day and template version, however many workers start"""
+    from .interview_phrases import TEMPLATES_DIGEST
+    return enqueue('warm_tts_cache', key=f'warm_tts_cache:{TEMPLATES_DIGEST}:{timezone.now():%Y-%m-%d}')
+
+
+def enqueue_job_phrase_warmup(job):
+    from .interview_phrases import TEMPLATES_DIGEST
+    import hashlib
+    names_hash = hashlib.md5(f'{job.title}|{job.company}'.encode()).hexdigest()[:10]
+    return enqueue(
+        'warm_job_phrases',
+        key=f'warm_job_phrases:{names_hash}:{TEMPLATES_DIGEST}',
+        job_title=job.title,
+        company_name=job.company,
+    )
+
+
+def enqueue_candidate_phrase_warmup(interview):
+    from .interview_phrases import interview_phrase_names
+    return enqueue(
+        'warm_candidate_phrases',
+        key=f'warm_candidate_phrases:{interview.uuid}',
+        candidate_name=interview_phrase_names(interview)[0],
+    )
+
+
+def enqueue_candidate_phrase_warmup_batch(interviews):
+    """One warm-up task for the candidate names of many interviews"""
+    from .interview_phrases import interview_phrase_names
+    import hashlib
+    names = sorted({interview_phrase_names(interview)[0] for interview in interviews})
+    names_hash = hashlib.md5('|'.join(names).encode()).hexdigest()[:12]
+    return enqueue('warm_candidate_phrases_batch', key=f'warm_candidate_phrases_batch:{names_hash}', candidate_names=names)
+
+
+def enqueue_history_prune(delay=0):
+    """Queue the daily sweep of old task and outbox rows"""
+    day = (timezone.now() + timedelta(seconds=delay)).date()
+    return enqueue('prune_history', key=f'prune_history:{day:%Y-%m-%d}', delay=delay)
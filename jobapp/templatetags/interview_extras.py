@@ -1,14 +0,0 @@
-from django import template
-import json
-
-register = template.Library()
-
-@register.filter
-def from_json(value):
-    """Parse JSON string to Python object"""
-    if not value:
-        return []
-    try:
-        return json.loads(value)
-    except (json.JSONDecodeError, TypeError):
-        return []
\ No newline at end of file
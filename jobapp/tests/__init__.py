@@ -0,0 +1,5 @@
+# Process-local caches for tests, so they never touch the file caches shared through the temp directory
+LOCMEM_CACHES = {
+    alias: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': f'tests-{alias}'}
+    for alias in ('default', 'fragments', 'llm_versions')
+}
@@ -0,0 +1,40 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from jobapp.models import Candidate
+from jobapp.tests import LOCMEM_CACHES
+
+
+@override_settings(
+    CACHES=LOCMEM_CACHES,
+    TASK_WORKER_EMBEDDED=False,
+)
+class AddCandidateDashboardTests(TestCase):
+
+    def setUp(self):
+        self.recruiter = get_user_model().objects.create_user('recruiter', 'recruiter@example.com', is_recruiter=True)
+        self.client.force_login(self.recruiter)
+        Candidate.objects.create(name='Jane', email='Jane@X.com', phone='123', added_by=self.recruiter)
+
+    def add(self, email):
+        return self.client.post(
+            reverse('add_candidate_dashboard'),
+            {'name': 'Jane Doe', 'email': email, 'phone': '123'},
+            headers={'X-Requested-With': 'XMLHttpRequest'},
+        ).json()
+
+    def test_email_in_another_case_is_a_duplicate(self):
+        response = self.add('jane@x.com')
+        self.assertFalse(response['success'])
+        self.assertIn('already exists', response['message'])
+        self.assertEqual(Candidate.objects.count(), 1)
+
+    def test_new_email_is_added(self):
+        self.assertTrue(self.add('john@x.com')['success'])
+        self.assertEqual(Candidate.objects.count(), 2)
+
+    def test_other_recruiters_candidates_do_not_count(self):
+        other = get_user_model().objects.create_user('other', 'other@example.com', is_recruiter=True)
+        self.client.force_login(other)
+        self.assertTrue(self.add('jane@x.com')['success'])
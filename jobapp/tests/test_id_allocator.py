@@ -0,0 +1,122 @@
+import copy
+import random
+from unittest import mock
+
+from django.db import connection, transaction
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+
+from jobapp import id_allocator
+from jobapp.id_allocator import SequenceAllocator, format_id, parse_id, permute, unpermute
+from jobapp.models import IdSequence
+
+
+class Rollback(Exception):
+    pass
+
+
+class PermutationTests(SimpleTestCase):
+
+    def setUp(self):
+        self.round_keys = id_allocator._round_keys('test-key')
+
+    def test_unpermute_inverts_permute(self):
+        values = [0, 1, 2, (1 << 36) - 1, 1 << 18] + [random.randrange(1 << 36) for _ in range(500)]
+        for value in values:
+            permuted = permute(value, self.round_keys)
+            self.assertLess(permuted, 1 << 36)
+            self.assertEqual(unpermute(permuted, self.round_keys), value)
+
+    def test_consecutive_values_map_to_distinct_scattered_ids(self):
+        ids = [permute(value, self.round_keys) for value in range(5000)]
+        self.assertEqual(len(set(ids)), 5000)
+        self.assertNotEqual(sorted(ids), ids)
+
+    def test_key_changes_the_permutation(self):
+        other_keys = id_allocator._round_keys('other-key')
+        self.assertNotEqual(permute(7, self.round_keys), permute(7, other_keys))
+
+    def test_format_and_parse(self):
+        self.assertEqual(format_id(0xabc123def), 'abc-123-def')
+        self.assertEqual(format_id(5), '000-000-005')
+        self.assertEqual(parse_id('abc-123-def'), 0xabc123def)
+
+
+@override_settings(INTERVIEW_ID_BLOCK_SIZE=4)
+class SequenceAllocatorTests(TransactionTestCase):
+
+    def allocator(self):
+        return SequenceAllocator('test_sequence')
+
+    def counter(self):
+        return IdSequence.objects.get(name='test_sequence').next_value
+
+    def test_ids_are_distinct_across_block_boundaries(self):
+        allocator = self.allocator()
+        ids = [allocator.take()[0] for _ in range(10)] + allocator.take(7) + allocator.take(1)
+        self.assertEqual(len(set(ids)), 18)
+        # Three blocks of 4; the 7 use the 2 left and reserve 5 more; then a new block of 4
+        self.assertEqual(self.counter(), 21)
+
+    def test_processes_sharing_a_sequence_never_collide(self):
+        first, second = self.allocator(), self.allocator()
+        ids = []
+        for _ in range(9):
+            ids += first.take() + second.take(2)
+        self.assertEqual(len(set(ids)), 27)
+
+    def test_a_forked_worker_does_not_reuse_its_parents_block(self):
+        parent = self.allocator()
+        ids = parent.take()
+        child = copy.copy(parent)
+        with mock.patch.object(id_allocator.os, 'getpid', return_value=parent.pid + 1):
+            ids += child.take(3)
+        ids += parent.take(3)
+        self.assertEqual(len(set(ids)), 7)
+
+    def test_values_reserved_in_a_rolled_back_transaction_are_not_kept(self):
+        allocator, other = self.allocator(), self.allocator()
+        allocator.take()
+        allocator.next_value = allocator.end  # block used up
+        before = self.counter()
+        with self.assertRaises(Rollback):
+            with transaction.atomic():
+                allocator.take(2)
+                raise Rollback
+        # The reservation went with the transaction, and nothing of it is cached
+        self.assertEqual(self.counter(), before)
+        self.assertEqual(allocator.next_value, allocator.end)
+        # So values handed out again by the database cannot clash with a cached block
+        ids = other.take(2) + allocator.take(2)
+        self.assertEqual(len(set(ids)), 4)
+
+    def test_inside_a_transaction_only_what_is_needed_is_reserved(self):
+        allocator = self.allocator()
+        allocator.take()
+        allocator.next_value = allocator.end
+        before = self.counter()
+        with transaction.atomic():
+            allocator.take(2)
+        self.assertEqual(self.counter(), before + 2)
+
+    def test_separate_connection_reservation_survives_a_rollback(self):
+        allocator, other = self.allocator(), self.allocator()
+        allocator.take()
+        allocator.next_value = allocator.end
+        before = self.counter()
+        # Exercises the PostgreSQL path (UPDATE ... RETURNING on its own connection)
+        with mock.patch.object(SequenceAllocator, '_reserves_separately', lambda self: connection.in_atomic_block):
+            with self.assertRaises(Rollback):
+                with transaction.atomic():
+                    ids = allocator.take(2)
+                    raise Rollback
+        # Committed on its own, as a whole block that the allocator keeps using
+        self.assertEqual(self.counter(), before + 4)
+        self.assertEqual(allocator.end - allocator.next_value, 2)
+        ids += other.take(2) + allocator.take(2)
+        self.assertEqual(len(set(ids)), 6)
+
+    def test_next_interview_ids_format(self):
+        ids = id_allocator.next_interview_ids(3)
+        self.assertEqual(len(set(ids)), 3)
+        for interview_id in ids:
+            self.assertRegex(interview_id, r'^[0-9a-f]{3}-[0-9a-f]{3}-[0-9a-f]{3}$')
@@ -0,0 +1,43 @@
+import shutil
+import tempfile
+import uuid
+from types import SimpleNamespace
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+
+from jobapp.interview_state import CacheBackend
+from jobapp.tests import LOCMEM_CACHES
+
+
+class CacheBackendTests(SimpleTestCase):
+
+    def setUp(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, ignore_errors=True)
+        self.shared_caches = dict(LOCMEM_CACHES, interview_state={
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': location,
+        })
+        self.interview = SimpleNamespace(uuid=uuid.uuid4())
+
+    def test_per_process_cache_is_refused(self):
+        for alias in ('default', 'fragments'):
+            with override_settings(CACHES=LOCMEM_CACHES, INTERVIEW_STATE_CACHE_ALIAS=alias):
+                with self.assertRaises(ImproperlyConfigured):
+                    CacheBackend()
+
+    def test_state_round_trips_through_a_shared_cache(self):
+        with override_settings(CACHES=self.shared_caches, INTERVIEW_STATE_CACHE_ALIAS='interview_state'):
+            writer, reader = CacheBackend(), CacheBackend()
+            writer.create(self.interview, {'candidate_name': 'Ada'})
+            writer.update_header(self.interview, {'question_count': 2})
+            writer.append_turns(self.interview, [{'speaker': 'ai', 'message': 'Hi'}, {'speaker': 'candidate', 'message': 'Hello'}])
+
+            self.assertEqual(reader.load_header(self.interview), {'candidate_name': 'Ada', 'question_count': 2})
+            self.assertEqual([turn['sequence'] for turn in reader.load_turns(self.interview)], [0, 1])
+            self.assertEqual([turn['message'] for turn in reader.load_turns(self.interview, limit=1)], ['Hello'])
+
+            reader.delete(self.interview)
+            self.assertIsNone(writer.load_header(self.interview))
+            self.assertEqual(writer.load_turns(self.interview), [])
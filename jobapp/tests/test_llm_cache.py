@@ -0,0 +1,179 @@
+import asyncio
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+
+from jobapp.tests import LOCMEM_CACHES
+from jobapp.utils.llm_cache import LLMResponseCache, job_namespace
+
+
+@override_settings(CACHES=LOCMEM_CACHES, LLM_CACHE_ALIAS='llm_versions', LLM_CACHE_ENABLED=True, LLM_CACHE_VERSION_TTL=60.0)
+class LLMCacheTests(SimpleTestCase):
+
+    def setUp(self):
+        caches['llm_versions'].clear()
+        self.cache = LLMResponseCache()
+
+    def key(self, prompt='Tell me about yourself', namespace=None, cache=None):
+        return (cache or self.cache).make_key(prompt, 'You are Sarah', 'model', 0.5, 50, ['\n\n'], namespace)
+
+    # Keys
+
+    def test_keys_ignore_whitespace_and_case(self):
+        self.assertEqual(self.key('Tell me  about\nyourself'), self.key('tell me about yourself'))
+        self.assertNotEqual(self.key('Tell me about your project'), self.key())
+
+    def test_namespaces_separate_keys(self):
+        self.assertNotEqual(self.key(namespace=job_namespace(1)), self.key(namespace=job_namespace(2)))
+        self.assertEqual(job_namespace(None), None)
+
+    def test_version_is_read_once_per_ttl(self):
+        self.key(namespace='job:1')
+        with mock.patch.object(self.cache, '_versions') as versions:
+            for _ in range(20):
+                self.key(namespace='job:1')
+        versions.assert_not_called()
+
+    # Invalidation
+
+    def test_invalidate_drops_the_namespace(self):
+        job_key, other_key = self.key(namespace='job:1'), self.key(namespace='job:2')
+        self.cache.set(job_key, 'cached')
+        self.cache.set(other_key, 'other')
+        self.cache.invalidate('job:1')
+
+        self.assertIsNone(self.cache.get(job_key))
+        self.assertNotEqual(self.key(namespace='job:1'), job_key)
+        self.assertEqual(self.cache.get(other_key), 'other')
+        self.assertEqual(self.key(namespace='job:2'), other_key)
+
+    def test_invalidate_reaches_other_workers_after_the_version_ttl(self):
+        worker = LLMResponseCache()
+        old_key = self.key(namespace='job:1', cache=worker)
+        self.cache.invalidate('job:1')
+        # Within the TTL the worker still uses the version it read
+        self.assertEqual(self.key(namespace='job:1', cache=worker), old_key)
+        with override_settings(LLM_CACHE_VERSION_TTL=0):
+            self.assertEqual(self.key(namespace='job:1', cache=worker), self.key(namespace='job:1'))
+            self.assertNotEqual(self.key(namespace='job:1', cache=worker), old_key)
+
+    def test_versions_are_shared_between_workers(self):
+        self.assertEqual(self.key(namespace='job:1'), self.key(namespace='job:1', cache=LLMResponseCache()))
+
+    # Entries
+
+    def test_lru_bound_and_ttl(self):
+        with override_settings(LLM_CACHE_MAX_ENTRIES=2):
+            for key in ('a', 'b', 'c'):
+                self.cache.set(key, key)
+        self.assertEqual((self.cache.get('a'), self.cache.get('c')), (None, 'c'))
+        self.assertEqual(self.cache.metrics['evictions'], 1)
+        with override_settings(LLM_CACHE_TTL=-1):
+            self.cache.set('d', 'd')
+        self.assertIsNone(self.cache.get('d'))
+
+    def test_get_or_call_caches_only_answers(self):
+        self.assertEqual(self.cache.get_or_call('k', lambda: 'answer'), 'answer')
+        self.assertEqual(self.cache.get_or_call('k', lambda: 'other'), 'answer')
+        self.assertEqual(self.cache.get_or_call('empty', lambda: ''), '')
+        self.assertEqual(self.cache.get_or_call('empty', lambda: 'later'), 'later')
+
+    def test_disabled_cache_always_calls(self):
+        with override_settings(LLM_CACHE_ENABLED=False):
+            self.cache.get_or_call('k', lambda: 'first')
+            self.assertEqual(self.cache.get_or_call('k', lambda: 'second'), 'second')
+
+    # Coalescing
+
+    def run_concurrently(self, call, followers=4):
+        """Leader plus ``followers`` identical get_or_call()s; returns (results, errors)"""
+        results, errors = [], []
+
+        def request():
+            try:
+                results.append(self.cache.get_or_call('k', call))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=request) for _ in range(followers + 1)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        return results, errors
+
+    def slow_call(self, outcome):
+        calls = []
+
+        def call():
+            calls.append(1)
+            # Long enough for every follower to find the flight
+            time.sleep(0.2)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+        return call, calls
+
+    def test_followers_share_the_leaders_result(self):
+        call, calls = self.slow_call('answer')
+        results, errors = self.run_concurrently(call)
+        self.assertEqual((results, errors), (['answer'] * 5, []))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((self.cache.metrics['upstream_calls'], self.cache.metrics['coalesced']), (1, 4))
+
+    def test_followers_share_the_leaders_error(self):
+        error = TimeoutError('upstream timed out')
+        call, calls = self.slow_call(error)
+        results, errors = self.run_concurrently(call)
+        self.assertEqual((results, errors), ([], [error] * 5))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(self.cache.metrics['upstream_errors'], 1)
+        # Errors are not cached
+        self.assertEqual(self.cache.get_or_call('k', lambda: 'recovered'), 'recovered')
+
+    def test_async_followers_share_the_leaders_result_and_error(self):
+        calls = []
+
+        async def answer():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return 'answer'
+
+        async def failure():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            raise TimeoutError('upstream timed out')
+
+        async def scenario():
+            answers = await asyncio.gather(*[self.cache.aget_or_call('a', answer) for _ in range(4)])
+            failures = await asyncio.gather(*[self.cache.aget_or_call('f', failure) for _ in range(4)], return_exceptions=True)
+            return answers, failures
+
+        answers, failures = asyncio.run(scenario())
+        self.assertEqual(answers, ['answer'] * 4)
+        self.assertTrue(all(isinstance(error, TimeoutError) for error in failures))
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(self.cache.metrics['coalesced'], 6)
+
+    def test_cancelled_async_leader_fails_its_followers(self):
+        started = []
+
+        async def call():
+            started.append(1)
+            await asyncio.sleep(10)
+
+        async def scenario():
+            leader = asyncio.ensure_future(self.cache.aget_or_call('k', call))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(self.cache.aget_or_call('k', call))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            return await asyncio.gather(leader, follower, return_exceptions=True)
+
+        leader, follower = asyncio.run(scenario())
+        self.assertIsInstance(leader, asyncio.CancelledError)
+        self.assertIsInstance(follower, RuntimeError)
+        self.assertEqual(len(started), 1)
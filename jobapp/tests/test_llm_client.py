@@ -0,0 +1,128 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import httpx
+from django.test import SimpleTestCase, override_settings
+
+from jobapp.utils.llm_client import LLMClientRegistry, _AsyncPoolTransport, _PoolTransport
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class PoolStatsTests(SimpleTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f'http://127.0.0.1:{cls.server.server_address[1]}/'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def pooled_client(self, http2=False):
+        transport = _PoolTransport(http2=http2, limits=httpx.Limits(max_connections=1))
+        client = httpx.Client(transport=transport)
+        self.addCleanup(client.close)
+        return client, transport
+
+    def test_requests_reuse_the_connection(self):
+        client, transport = self.pooled_client()
+        for _ in range(3):
+            client.get(self.url)
+        stats = transport.pool_stats()
+        self.assertEqual((stats['requests'], stats['connections_opened'], stats['requests_reused_approx']), (3, 1, 2))
+        self.assertEqual((stats['requests_in_flight'], stats['requests_waiting']), (0, 0))
+
+    def test_streamed_response_stays_in_flight_until_closed(self):
+        client, transport = self.pooled_client()
+        with client.stream('GET', self.url) as response:
+            stats = transport.pool_stats()
+            self.assertEqual((stats['requests_in_flight'], stats['connections_idle'], stats['requests_waiting']), (1, 0, 0))
+            # The stream holds the pool's only connection, so a second request waits for it
+            second = threading.Thread(target=client.get, args=(self.url,))
+            second.start()
+            for _ in range(100):
+                if transport.pool_stats()['requests_in_flight'] == 2:
+                    break
+                time.sleep(0.01)
+            self.assertEqual(transport.pool_stats()['requests_waiting'], 1)
+            response.read()
+        second.join(5)
+        stats = transport.pool_stats()
+        self.assertEqual((stats['requests_in_flight'], stats['requests_waiting']), (0, 0))
+
+    def test_failed_request_leaves_flight(self):
+        client, transport = self.pooled_client()
+        with self.assertRaises(httpx.ConnectError):
+            client.get('http://127.0.0.1:1/')
+        self.assertEqual(transport.pool_stats()['requests_in_flight'], 0)
+
+    def test_waiting_is_not_reported_for_http2(self):
+        _, transport = self.pooled_client(http2=True)
+        self.assertIsNone(transport.pool_stats()['requests_waiting'])
+
+    def test_async_transport_counts_until_closed(self):
+        async def scenario():
+            transport = _AsyncPoolTransport(limits=httpx.Limits(max_connections=1))
+            async with httpx.AsyncClient(transport=transport) as client:
+                async with client.stream('GET', self.url) as response:
+                    during = transport.pool_stats()['requests_in_flight']
+                    await response.aread()
+            return during, transport.pool_stats()['requests_in_flight']
+
+        self.assertEqual(asyncio.run(scenario()), (1, 0))
+
+
+@override_settings(LLM_HTTP2=False)
+class CloseAllTests(SimpleTestCase):
+
+    def setUp(self):
+        self.registry = LLMClientRegistry()
+        self.registry._api_key = 'test-key'
+
+    def test_closes_sync_and_async_clients(self):
+        sync_client = self.registry.get_client('http://llm.invalid/v1', 'model')
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+
+        async def get_async_client():
+            return self.registry.get_async_client('http://llm.invalid/v1', 'model')
+        async_client = loop.run_until_complete(get_async_client())
+
+        self.registry.close_all()
+        self.assertTrue(sync_client.is_closed())
+        self.assertTrue(async_client.is_closed())
+        self.assertEqual(self.registry.stats()['pools'], [])
+
+    def test_async_client_of_a_closed_loop_is_skipped(self):
+        loop = asyncio.new_event_loop()
+
+        async def get_async_client():
+            return self.registry.get_async_client('http://llm.invalid/v1', 'model')
+        loop.run_until_complete(get_async_client())
+        loop.close()
+        with mock.patch('jobapp.utils.llm_client.logger') as logger:
+            self.registry.close_all()
+        logger.warning.assert_not_called()
+        self.assertEqual(self.registry.stats()['pools'], [])
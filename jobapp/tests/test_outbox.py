@@ -0,0 +1,142 @@
+from datetime import timedelta
+
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from jobapp import outbox
+from jobapp.models import OutboxEmail
+
+
+class FlakyBackend(EmailBackend):
+    """locmem backend that refuses mail to addresses starting with 'bounce'"""
+
+    def send_messages(self, messages):
+        for message in messages:
+            if any(address.startswith('bounce') for address in message.to):
+                raise ConnectionError('421 try again later')
+        return super().send_messages(messages)
+
+
+@override_settings(
+    EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    DEFAULT_FROM_EMAIL='jobs@example.com',
+    TASK_WORKER_EMBEDDED=False,
+    OUTBOX_MAX_ATTEMPTS=3,
+    OUTBOX_RETRY_BASE_DELAY=60,
+    OUTBOX_LOCK_TIMEOUT=300,
+)
+class OutboxTests(TestCase):
+
+    def queue(self, to='jane@example.com', **kwargs):
+        return outbox.queue_email(to, kwargs.pop('subject', 'Interview scheduled'), 'See you soon', **kwargs)
+
+    def test_queue_email_with_key_is_idempotent(self):
+        first = self.queue(key='invite:1')
+        second = self.queue(key='invite:1', subject='Another subject')
+        self.assertEqual(first.pk, second.pk)
+        self.assertEqual(OutboxEmail.objects.count(), 1)
+
+    def test_queue_email_schedules_delivery_on_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.queue()
+        self.assertEqual(len(callbacks), 1)
+
+    def test_queue_emails_skips_known_keys(self):
+        self.queue(key='invite:1')
+        queued = outbox.queue_emails([
+            {'to': 'a@example.com', 'subject': 's', 'body': 'b', 'key': 'invite:1'},
+            {'to': 'b@example.com', 'subject': 's', 'body': 'b', 'key': 'invite:2'},
+            {'to': 'c@example.com', 'subject': 's', 'body': 'b', 'key': 'invite:2'},
+            {'to': ['d@example.com', 'e@example.com'], 'subject': 's', 'body': 'b'},
+        ])
+        self.assertEqual(queued, 2)
+        self.assertEqual(OutboxEmail.objects.count(), 3)
+
+    def test_claim_batch_claims_due_emails_up_to_size(self):
+        emails = [self.queue(to=f'user{i}@example.com') for i in range(3)]
+        not_due = self.queue()
+        OutboxEmail.objects.filter(pk=not_due.pk).update(run_after=timezone.now() + timedelta(minutes=5))
+
+        claimed = outbox.claim_batch('worker-a', size=2)
+        self.assertEqual([email.pk for email in claimed], [emails[0].pk, emails[1].pk])
+        self.assertTrue(all(email.status == 'sending' and email.locked_by == 'worker-a' for email in claimed))
+
+        self.assertEqual([email.pk for email in outbox.claim_batch('worker-b', size=10)], [emails[2].pk])
+        self.assertEqual(outbox.claim_batch('worker-c', size=10), [])
+
+    def test_claim_batch_reclaims_stale_sending_emails(self):
+        stale = self.queue()
+        fresh = self.queue()
+        OutboxEmail.objects.filter(pk=stale.pk).update(status='sending', locked_by='dead', locked_at=timezone.now() - timedelta(seconds=301))
+        OutboxEmail.objects.filter(pk=fresh.pk).update(status='sending', locked_by='busy', locked_at=timezone.now())
+        self.assertEqual([email.pk for email in outbox.claim_batch('worker-a')], [stale.pk])
+
+    def test_send_batch_sends_over_locmem(self):
+        self.queue(to='a@example.com')
+        self.queue(to=['b@example.com', 'c@example.com'], html_body='<p>See you soon</p>')
+        sent = outbox.send_batch(outbox.claim_batch('worker-a'))
+
+        self.assertEqual(sent, 2)
+        self.assertEqual([message.to for message in mail.outbox], [['a@example.com'], ['b@example.com', 'c@example.com']])
+        self.assertEqual(mail.outbox[0].from_email, 'jobs@example.com')
+        self.assertEqual(mail.outbox[1].alternatives[0][1], 'text/html')
+        for email in OutboxEmail.objects.all():
+            self.assertEqual((email.status, email.attempts, email.locked_by), ('sent', 1, ''))
+            self.assertIsNotNone(email.sent_at)
+
+    @override_settings(EMAIL_BACKEND='jobapp.tests.test_outbox.FlakyBackend')
+    def test_send_batch_records_failures_and_keeps_going(self):
+        bounce = self.queue(to='bounce@example.com')
+        self.queue(to='ok@example.com')
+        before = timezone.now()
+        with self.captureOnCommitCallbacks() as callbacks:
+            sent = outbox.send_batch(outbox.claim_batch('worker-a'))
+
+        self.assertEqual(sent, 1)
+        self.assertEqual([message.to for message in mail.outbox], [['ok@example.com']])
+        bounce.refresh_from_db()
+        self.assertEqual((bounce.status, bounce.attempts, bounce.locked_by), ('pending', 1, ''))
+        self.assertIsNone(bounce.locked_at)
+        self.assertIn('421 try again later', bounce.last_error)
+        delay = (bounce.run_after - before).total_seconds()
+        self.assertTrue(48 <= delay <= 72.5, delay)
+        # The retry is scheduled as its own delivery task
+        self.assertEqual(len(callbacks), 1)
+
+    def test_record_failure_backs_off_then_gives_up(self):
+        email = self.queue()
+        delays = []
+        for attempt in range(1, 4):
+            before = timezone.now()
+            outbox._record_failure(email, ConnectionError('refused'))
+            email.refresh_from_db()
+            self.assertEqual(email.attempts, attempt)
+            if email.status == 'pending':
+                delays.append((email.run_after - before).total_seconds())
+        self.assertEqual(email.status, 'failed')
+        self.assertEqual(len(delays), 2)
+        self.assertTrue(48 <= delays[0] <= 72.5 and 96 <= delays[1] <= 144.5, delays)
+        self.assertEqual(outbox.claim_batch('worker-a'), [])
+
+    def test_deliver_sends_every_due_email(self):
+        for i in range(5):
+            self.queue(to=f'user{i}@example.com')
+        with override_settings(OUTBOX_BATCH_SIZE=2):
+            self.assertEqual(outbox.deliver('worker-a'), 5)
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertFalse(OutboxEmail.objects.exclude(status='sent').exists())
+
+    def test_prune_keeps_keyed_emails_without_bodies(self):
+        old = timezone.now() - timedelta(days=40)
+        plain = self.queue()
+        keyed = self.queue(key='invite:1')
+        pending = self.queue()
+        OutboxEmail.objects.filter(pk__in=[plain.pk, keyed.pk]).update(status='sent', created_at=old)
+        OutboxEmail.objects.filter(pk=pending.pk).update(created_at=old)
+
+        self.assertEqual(outbox.prune(days=30), 1)
+        keyed.refresh_from_db()
+        self.assertEqual((keyed.body, keyed.html_body), ('', ''))
+        self.assertEqual(set(OutboxEmail.objects.values_list('pk', flat=True)), {keyed.pk, pending.pk})
@@ -0,0 +1,154 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from jobapp.models import Job
+from jobapp.pagination import InvalidCursor, approximate_count, decode_cursor, encode_cursor, paginate
+from jobapp.tests import LOCMEM_CACHES
+
+KEYS = ('-date_posted', '-id')
+
+
+@override_settings(
+    CACHES=LOCMEM_CACHES,
+    TASK_WORKER_EMBEDDED=False,
+    TTS_PHRASE_WARMUP=False,
+)
+class PaginationTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = get_user_model().objects.create_user('recruiter', 'recruiter@example.com', is_recruiter=True)
+
+    def make_jobs(self, dates):
+        jobs = []
+        for i, date_posted in enumerate(dates):
+            job = Job.objects.create(title=f'Job {i}', company='Acme', location='Remote', description='', posted_by=self.recruiter)
+            Job.objects.filter(pk=job.pk).update(date_posted=date_posted)
+            jobs.append(job.pk)
+        return jobs
+
+    def expected_order(self):
+        return list(Job.objects.order_by(*KEYS).values_list('pk', flat=True))
+
+
+class KeysetPaginateTests(PaginationTestCase):
+
+    def setUp(self):
+        base = datetime(2026, 5, 1, 12, 0, 0, tzinfo=dt_timezone.utc)
+        # Runs of identical timestamps, and ones a microsecond apart
+        dates = [base] * 4 + [base + timedelta(microseconds=i) for i in range(1, 6)] + [base - timedelta(days=1)] * 3
+        self.make_jobs(dates)
+
+    def walk_forward(self, page_size):
+        pages = [paginate(Job.objects.all(), KEYS, page_size=page_size)]
+        while pages[-1].has_next:
+            pages.append(paginate(Job.objects.all(), KEYS, pages[-1].next_cursor, page_size=page_size))
+        return pages
+
+    def test_next_pages_cover_every_row_once(self):
+        for page_size in (1, 3, 5, 12, 50):
+            pages = self.walk_forward(page_size)
+            self.assertEqual([job.pk for page in pages for job in page], self.expected_order(), page_size)
+            self.assertFalse(pages[0].has_previous)
+
+    def test_previous_round_trip(self):
+        pages = self.walk_forward(3)
+        back = [pages[-1]]
+        while back[-1].has_previous:
+            back.append(paginate(Job.objects.all(), KEYS, back[-1].previous_cursor, page_size=3))
+        self.assertEqual([[job.pk for job in page] for page in reversed(back)], [[job.pk for job in page] for page in pages])
+        # The first page reached backwards links forwards again but not further back
+        self.assertTrue(back[-1].has_next)
+
+    def test_next_from_a_previous_page(self):
+        pages = self.walk_forward(4)
+        previous = paginate(Job.objects.all(), KEYS, pages[2].previous_cursor, page_size=4)
+        self.assertEqual([job.pk for job in previous], [job.pk for job in pages[1]])
+        following = paginate(Job.objects.all(), KEYS, previous.next_cursor, page_size=4)
+        self.assertEqual([job.pk for job in following], [job.pk for job in pages[2]])
+
+    def test_microsecond_keys_round_trip(self):
+        job = Job.objects.order_by(*KEYS).first()
+        cursor = encode_cursor([job.date_posted, job.pk])
+        values, direction = decode_cursor(cursor, Job.objects.all(), KEYS)
+        self.assertEqual(values, [job.date_posted, job.pk])
+        self.assertEqual(values[0].microsecond, 5)
+        self.assertEqual(direction, 'next')
+
+    def test_tampered_cursor_is_rejected(self):
+        cursor = paginate(Job.objects.all(), KEYS, page_size=2).next_cursor
+        for bad in (cursor[:-2] + ('A' if cursor[-2] != 'A' else 'B') + cursor[-1], 'garbage', cursor + 'x'):
+            with self.assertRaises(InvalidCursor):
+                paginate(Job.objects.all(), KEYS, bad, page_size=2)
+
+    def test_cursor_for_another_ordering_is_rejected(self):
+        cursor = encode_cursor([1])
+        with self.assertRaises(InvalidCursor):
+            decode_cursor(cursor, Job.objects.all(), KEYS)
+        with self.assertRaises(InvalidCursor):
+            decode_cursor(encode_cursor(['not a date', 1]), Job.objects.all(), KEYS)
+
+    def test_approximate_count_is_exact_for_small_tables(self):
+        self.assertEqual(approximate_count(Job.objects.all()), (12, True))
+
+
+class KeysetPaginationAPITests(PaginationTestCase):
+
+    def setUp(self):
+        base = datetime(2026, 5, 1, tzinfo=dt_timezone.utc)
+        self.make_jobs([base + timedelta(microseconds=i) for i in range(105)])
+        self.client = APIClient()
+        self.client.force_authenticate(self.recruiter)
+        self.url = reverse('job_list_create')
+
+    def test_pages_through_every_job(self):
+        seen = []
+        url = self.url + '?page_size=40'
+        while url:
+            body = self.client.get(url).json()
+            seen.extend(job['id'] for job in body['results'])
+            url = body['next']
+        self.assertEqual(seen, self.expected_order())
+
+    def test_page_size_is_capped(self):
+        body = self.client.get(self.url, {'page_size': 1000}).json()
+        self.assertEqual(len(body['results']), 100)
+        body = self.client.get(self.url, {'page_size': 0}).json()
+        self.assertEqual(len(body['results']), 1)
+        body = self.client.get(self.url, {'page_size': 'lots'}).json()
+        self.assertEqual(len(body['results']), 20)
+
+    def test_tampered_cursor_is_404(self):
+        response = self.client.get(self.url, {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_count_is_opt_in(self):
+        self.assertNotIn('count', self.client.get(self.url).json())
+        body = self.client.get(self.url, {'count': 1}).json()
+        self.assertEqual((body['count'], body['count_is_exact']), (105, True))
+
+
+class JobListCountTests(PaginationTestCase):
+
+    def count_queries(self, path):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return response, [query['sql'] for query in queries if 'COUNT(' in query['sql'].upper()]
+
+    def test_single_page_needs_no_count(self):
+        self.make_jobs([datetime(2026, 5, 1, tzinfo=dt_timezone.utc)] * 3)
+        _, counts = self.count_queries(reverse('job_list'))
+        self.assertEqual(counts, [])
+
+    def test_pager_shows_the_total(self):
+        self.make_jobs([datetime(2026, 5, 1, tzinfo=dt_timezone.utc)] * 7)
+        response, counts = self.count_queries(reverse('job_list'))
+        self.assertEqual(len(counts), 1)
+        self.assertContains(response, '7 jobs')
@@ -0,0 +1,161 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from jobapp import search
+from jobapp.models import Job, JobSearchTerm
+from jobapp.pagination import paginate
+from jobapp.tests import LOCMEM_CACHES
+
+
+@override_settings(
+    CACHES=LOCMEM_CACHES,
+    TASK_WORKER_EMBEDDED=False,
+    TTS_PHRASE_WARMUP=False,
+)
+class SearchTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.recruiter = get_user_model().objects.create_user('recruiter', 'recruiter@example.com', is_recruiter=True)
+
+    def job(self, title, description='', **fields):
+        fields.setdefault('company', 'Acme')
+        fields.setdefault('location', 'Remote')
+        return Job.objects.create(title=title, description=description, posted_by=self.recruiter, **fields)
+
+    def ids(self, query, **kwargs):
+        return list(search.search_jobs(query, **kwargs).values_list('id', flat=True))
+
+    # Tokenizing
+
+    def test_tokenize_keeps_symbol_languages_whole(self):
+        self.assertEqual(search.tokenize('C++ and C# or Node.js.'), ['c++', 'c#', 'node.js'])
+
+    def test_tokenize_drops_stop_words_and_trailing_dots(self):
+        self.assertEqual(search.tokenize('The engineer, for our team...'), ['engineer', 'team'])
+
+    def test_tokenize_truncates_long_tokens(self):
+        self.assertEqual(search.tokenize('x' * 100), ['x' * search.MAX_TOKEN_LENGTH])
+
+    def test_parse_query(self):
+        self.assertEqual(search.parse_query('python dev'), (['python', 'dev'], True))
+        # A trailing space finishes the last word
+        self.assertEqual(search.parse_query('python dev '), (['python', 'dev'], False))
+        self.assertEqual(search.parse_query('python python'), (['python'], True))
+        self.assertEqual(search.parse_query('python d'), (['python', 'd'], False))
+        self.assertEqual(search.parse_query('python dev', prefix=False), (['python', 'dev'], False))
+        self.assertEqual(search.parse_query('the and'), ([], False))
+
+    # Indexing
+
+    def test_index_weights_fields(self):
+        job = self.job('Python Developer', 'We write python daily', required_skills='Django')
+        weights = dict(JobSearchTerm.objects.filter(job=job).values_list('token', 'weight'))
+        self.assertEqual(weights['python'], search.FIELD_WEIGHTS['title'] + search.FIELD_WEIGHTS['description'])
+        self.assertEqual(weights['django'], search.FIELD_WEIGHTS['required_skills'])
+
+    def test_reindex_on_save_replaces_postings(self):
+        job = self.job('Python Developer')
+        job.title = 'Rust Developer'
+        job.save()
+        self.assertEqual(self.ids('python '), [])
+        self.assertEqual(self.ids('rust '), [job.pk])
+
+    def test_tags_are_indexed(self):
+        job = self.job('Backend Developer')
+        job.tags.add('kubernetes')
+        self.assertEqual(self.ids('kubernetes '), [job.pk])
+
+    # Matching and ranking
+
+    def test_symbol_tokens_match_exactly(self):
+        cpp = self.job('C++ Engineer')
+        self.job('C Engineer')
+        node = self.job('Node.js Engineer')
+        self.assertEqual(self.ids('c++ '), [cpp.pk])
+        self.assertEqual(self.ids('node.js '), [node.pk])
+
+    def test_every_term_must_match(self):
+        both = self.job('Python Django Developer')
+        self.job('Python Developer')
+        self.job('Django Consultant')
+        self.assertEqual(self.ids('python django '), [both.pk])
+
+    def test_empty_query_matches_nothing(self):
+        self.job('Python Developer')
+        self.assertEqual(self.ids('   '), [])
+        self.assertEqual(self.ids('the'), [])
+
+    def test_last_term_matches_as_prefix(self):
+        python = self.job('Python Developer')
+        self.job('Pyramid Expert')
+        self.assertEqual(self.ids('pyth'), [python.pk])
+        self.assertEqual(self.ids('pyth '), [])
+        self.assertEqual(self.ids('pyth', prefix=False), [])
+
+    def test_only_the_last_term_is_a_prefix(self):
+        self.job('Python Developer')
+        self.assertEqual(self.ids('pyth developer'), [])
+
+    def test_exact_word_outranks_prefix_expansion(self):
+        pythonic = self.job('Pythonic Engineer', 'pythonic pythonic')
+        python = self.job('Python Engineer')
+        self.assertEqual(self.ids('python'), [python.pk, pythonic.pk])
+
+    def test_title_match_outranks_description_match(self):
+        in_description = self.job('Backend Engineer', 'Mostly golang services')
+        in_title = self.job('Golang Engineer', 'Backend services')
+        self.assertEqual(self.ids('golang '), [in_title.pk, in_description.pk])
+
+    def test_rare_term_outweighs_common_term(self):
+        for i in range(6):
+            self.job('Developer', 'java')
+        rare_twice = self.job('Developer', 'haskell haskell java')
+        common_twice = self.job('Developer', 'haskell java java')
+        self.assertEqual(self.ids('java haskell '), [rare_twice.pk, common_twice.pk])
+
+    def test_bm25_prefers_shorter_documents(self):
+        long = self.job('Data Engineer', 'airflow ' + ' '.join(f'word{i}' for i in range(200)))
+        short = self.job('Data Engineer', 'airflow')
+        scores = dict(search.search_jobs('airflow ').values_list('id', 'search_score'))
+        self.assertGreater(scores[short.pk], scores[long.pk])
+        self.assertEqual(self.ids('airflow '), [short.pk, long.pk])
+
+    def test_search_respects_the_queryset(self):
+        active = self.job('Python Developer')
+        self.job('Python Developer', status='closed')
+        self.assertEqual(self.ids('python ', queryset=Job.objects.filter(status='active')), [active.pk])
+
+    # Paging
+
+    def test_paging_returns_every_match_exactly_once(self):
+        # Equal scores in runs, so pages split inside ties on search_score
+        for i in range(23):
+            self.job('Python Developer', 'python ' * (i % 4))
+        for i in range(5):
+            self.job('Ruby Developer')
+        expected = self.ids('python ')
+        self.assertEqual(len(expected), 23)
+
+        seen = []
+        cursor = None
+        pages = 0
+        while True:
+            page = paginate(search.search_jobs('python '), search.SEARCH_ORDERING, cursor, page_size=5)
+            seen.extend(job.pk for job in page)
+            pages += 1
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+        self.assertEqual(pages, 5)
+        self.assertEqual(seen, expected)
+
+        # And back again from the last page
+        backwards = []
+        cursor = page.previous_cursor
+        while cursor:
+            page = paginate(search.search_jobs('python '), search.SEARCH_ORDERING, cursor, page_size=5)
+            backwards[:0] = [job.pk for job in page]
+            cursor = page.previous_cursor
+        self.assertEqual(backwards, expected[:20])
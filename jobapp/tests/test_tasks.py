@@ -0,0 +1,204 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from jobapp import tasks
+from jobapp.models import BackgroundTask
+
+
+@override_settings(TASK_WORKER_EMBEDDED=False, TASK_RETRY_BASE_DELAY=30, TASK_RETRY_MAX_DELAY=3600, TASK_LOCK_TIMEOUT=600)
+class TaskQueueTests(TestCase):
+
+    def setUp(self):
+        registry = mock.patch.dict(tasks.TASKS)
+        registry.start()
+        self.addCleanup(registry.stop)
+        self.calls = []
+
+        @tasks.task('test_ok')
+        def ok(**kwargs):
+            self.calls.append(kwargs)
+
+        @tasks.task('test_fail', max_attempts=3)
+        def fail(**kwargs):
+            raise RuntimeError('boom')
+
+    def test_enqueue_unknown_task(self):
+        with self.assertRaises(ValueError):
+            tasks.enqueue('no_such_task')
+
+    def test_enqueue_with_key_reuses_the_task(self):
+        first = tasks.enqueue('test_ok', key='k1', value=1)
+        second = tasks.enqueue('test_ok', key='k1', value=2)
+        self.assertEqual(first.pk, second.pk)
+        self.assertEqual(BackgroundTask.objects.count(), 1)
+        self.assertEqual(second.kwargs, {'value': 1})
+
+    def test_enqueue_with_key_requeues_a_failed_task(self):
+        first = tasks.enqueue('test_ok', key='k1', value=1)
+        BackgroundTask.objects.filter(pk=first.pk).update(status='failed', attempts=5)
+        again = tasks.enqueue('test_ok', key='k1', value=2)
+        self.assertEqual(again.pk, first.pk)
+        again.refresh_from_db()
+        self.assertEqual((again.status, again.attempts, again.kwargs), ('pending', 0, {'value': 2}))
+
+    def test_enqueue_without_key_always_creates(self):
+        tasks.enqueue('test_ok')
+        tasks.enqueue('test_ok')
+        self.assertEqual(BackgroundTask.objects.count(), 2)
+
+    def test_claim_marks_the_task_running(self):
+        queued = tasks.enqueue('test_ok')
+        claimed = tasks.claim_task('worker-a')
+        self.assertEqual(claimed.pk, queued.pk)
+        self.assertEqual((claimed.status, claimed.locked_by), ('running', 'worker-a'))
+        self.assertIsNotNone(claimed.locked_at)
+        self.assertIsNone(tasks.claim_task('worker-b'))
+
+    def test_claim_skips_tasks_not_yet_due(self):
+        tasks.enqueue('test_ok', delay=60)
+        self.assertIsNone(tasks.claim_task('worker-a'))
+
+    def test_claim_takes_the_oldest_due_task_first(self):
+        later = tasks.enqueue('test_ok')
+        earlier = tasks.enqueue('test_ok')
+        BackgroundTask.objects.filter(pk=earlier.pk).update(run_after=timezone.now() - timedelta(minutes=5))
+        self.assertEqual(tasks.claim_task('worker-a').pk, earlier.pk)
+        self.assertEqual(tasks.claim_task('worker-a').pk, later.pk)
+
+    def test_claim_loses_to_a_concurrent_claim(self):
+        tasks.enqueue('test_ok')
+        real_filter = BackgroundTask.objects.filter
+
+        def claimed_elsewhere(*args, **kwargs):
+            # Another worker claims the row between our read and our conditional UPDATE
+            if 'locked_at' in kwargs:
+                BackgroundTask.objects.update(status='running', locked_by='worker-b', locked_at=timezone.now())
+            return real_filter(*args, **kwargs)
+
+        with mock.patch.object(BackgroundTask.objects, 'filter', side_effect=claimed_elsewhere):
+            self.assertIsNone(tasks.claim_task('worker-a'))
+        self.assertEqual(BackgroundTask.objects.get().locked_by, 'worker-b')
+
+    def test_stale_running_task_is_reclaimed(self):
+        queued = tasks.enqueue('test_ok')
+        BackgroundTask.objects.filter(pk=queued.pk).update(
+            status='running', locked_by='dead-worker', locked_at=timezone.now() - timedelta(seconds=601)
+        )
+        claimed = tasks.claim_task('worker-a')
+        self.assertEqual((claimed.pk, claimed.locked_by), (queued.pk, 'worker-a'))
+
+    def test_recently_locked_task_is_not_reclaimed(self):
+        queued = tasks.enqueue('test_ok')
+        BackgroundTask.objects.filter(pk=queued.pk).update(
+            status='running', locked_by='busy-worker', locked_at=timezone.now() - timedelta(seconds=30)
+        )
+        self.assertIsNone(tasks.claim_task('worker-a'))
+
+    def test_run_success(self):
+        tasks.enqueue('test_ok', value=3)
+        background_task = tasks.claim_task('worker-a')
+        self.assertEqual(tasks.run_task(background_task), 'succeeded')
+        background_task.refresh_from_db()
+        self.assertEqual(self.calls, [{'value': 3}])
+        self.assertEqual((background_task.status, background_task.attempts, background_task.locked_by), ('succeeded', 1, ''))
+        self.assertIsNone(background_task.locked_at)
+        self.assertIsNotNone(background_task.finished_at)
+
+    def test_run_failure_retries_with_backoff(self):
+        tasks.enqueue('test_fail')
+        delays = []
+        for attempt in (1, 2):
+            background_task = tasks.claim_task('worker-a')
+            before = timezone.now()
+            self.assertEqual(tasks.run_task(background_task), 'pending')
+            background_task.refresh_from_db()
+            self.assertEqual(background_task.attempts, attempt)
+            self.assertIn('RuntimeError: boom', background_task.last_error)
+            self.assertIsNone(background_task.finished_at)
+            delays.append((background_task.run_after - before).total_seconds())
+            BackgroundTask.objects.filter(pk=background_task.pk).update(run_after=timezone.now())
+        # 30s then 60s, with 20% jitter either way
+        self.assertTrue(24 <= delays[0] <= 36.5, delays)
+        self.assertTrue(48 <= delays[1] <= 72.5, delays)
+
+    def test_run_failure_gives_up_after_max_attempts(self):
+        tasks.enqueue('test_fail')
+        statuses = []
+        for _ in range(3):
+            background_task = tasks.claim_task('worker-a')
+            statuses.append(tasks.run_task(background_task))
+            BackgroundTask.objects.filter(pk=background_task.pk).update(run_after=timezone.now())
+        self.assertEqual(statuses, ['pending', 'pending', 'failed'])
+        background_task.refresh_from_db()
+        self.assertEqual((background_task.status, background_task.attempts), ('failed', 3))
+        self.assertIsNotNone(background_task.finished_at)
+        self.assertIsNone(tasks.claim_task('worker-a'))
+
+    def test_run_unregistered_task_fails(self):
+        tasks.enqueue('test_ok')
+        background_task = tasks.claim_task('worker-a')
+        del tasks.TASKS['test_ok']
+        tasks.run_task(background_task)
+        background_task.refresh_from_db()
+        self.assertIn('LookupError', background_task.last_error)
+
+    def test_backoff_is_capped(self):
+        with override_settings(TASK_RETRY_MAX_DELAY=100):
+            self.assertLessEqual(tasks._backoff_delay(20), 120)
+
+    def test_work_once_drains_the_queue(self):
+        for value in range(3):
+            tasks.enqueue('test_ok', value=value)
+        with mock.patch.object(tasks, 'close_old_connections'):
+            self.assertEqual(tasks.work(worker_id='worker-a', once=True), 3)
+        self.assertEqual(sorted(call['value'] for call in self.calls), [0, 1, 2])
+        self.assertFalse(BackgroundTask.objects.exclude(status='succeeded').exists())
+
+    def test_prune_history_keeps_recent_and_unfinished_tasks(self):
+        old = timezone.now() - timedelta(days=20)
+        done = tasks.enqueue('test_ok')
+        recent = tasks.enqueue('test_ok')
+        pending = tasks.enqueue('test_ok')
+        BackgroundTask.objects.filter(pk=done.pk).update(status='succeeded', finished_at=old)
+        BackgroundTask.objects.filter(pk=recent.pk).update(status='failed', finished_at=timezone.now())
+        BackgroundTask.objects.filter(pk=pending.pk).update(created_at=old)
+        self.assertEqual(tasks.prune_history(days=14), 1)
+        self.assertEqual(set(BackgroundTask.objects.values_list('pk', flat=True)), {recent.pk, pending.pk})
+
+    def test_run_does_not_overwrite_a_task_reclaimed_by_another_worker(self):
+        queued = tasks.enqueue('test_ok')
+        background_task = tasks.claim_task('worker-a')
+
+        def reclaimed(**kwargs):
+            BackgroundTask.objects.filter(pk=queued.pk).update(locked_by='worker-b', locked_at=timezone.now())
+
+        tasks.task('test_ok')(reclaimed)
+        tasks.run_task(background_task)
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.locked_by, queued.attempts), ('running', 'worker-b', 0))
+
+    def test_heartbeat_keeps_a_long_task_from_being_reclaimed(self):
+        tasks.enqueue('test_ok')
+        background_task = tasks.claim_task('worker-a')
+        long_ago = timezone.now() - timedelta(seconds=601)
+        BackgroundTask.objects.filter(pk=background_task.pk).update(locked_at=long_ago)
+
+        stop = mock.Mock()
+        stop.wait.side_effect = [False, True]
+        with mock.patch.object(tasks.connection, 'close'):
+            tasks._heartbeat(background_task.pk, 'worker-a', stop)
+        background_task.refresh_from_db()
+        self.assertGreater(background_task.locked_at, long_ago)
+        self.assertIsNone(tasks.claim_task('worker-b'))
+
+    def test_heartbeat_leaves_other_workers_locks_alone(self):
+        tasks.enqueue('test_ok')
+        background_task = tasks.claim_task('worker-b')
+        stop = mock.Mock()
+        stop.wait.side_effect = [False, True]
+        with mock.patch.object(tasks.connection, 'close'):
+            tasks._heartbeat(background_task.pk, 'worker-a', stop)
+        self.assertEqual(BackgroundTask.objects.get().locked_at, background_task.locked_at)
@@ -0,0 +1,99 @@
+import os
+import shutil
+import tempfile
+
+from django.test import SimpleTestCase, override_settings
+
+from jobapp.tts_cache import TTSCache
+
+AUDIO = b'\xff\xfb' + b'\x00' * 2000
+
+
+class TTSCacheTests(SimpleTestCase):
+    """Two TTSCache instances stand in for two worker processes sharing MEDIA_ROOT"""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings = override_settings(MEDIA_ROOT=media_root, TTS_CACHE_INDEX_REFRESH=60.0)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def put(self, cache, filename):
+        return cache.put(filename, AUDIO, duration=1.0)
+
+    def test_put_then_get(self):
+        cache = TTSCache()
+        self.assertEqual(self.put(cache, 'a.mp3'), '/media/tts/a.mp3')
+        self.assertEqual(cache.get('a.mp3'), '/media/tts/a.mp3')
+        self.assertIsNone(cache.get('b.mp3'))
+        self.assertEqual((cache.metrics['hits'], cache.metrics['misses']), (1, 1))
+
+    def test_too_small_audio_is_not_cached(self):
+        cache = TTSCache()
+        self.assertIsNone(cache.put('a.mp3', b'error'))
+        self.assertIsNone(cache.get('a.mp3'))
+
+    def test_file_evicted_by_another_process_is_a_miss(self):
+        web, other = TTSCache(), TTSCache()
+        self.put(web, 'a.mp3')
+        self.put(web, 'b.mp3')
+        self.assertEqual(other.get_entry('a.mp3')['size'], len(AUDIO))
+
+        # web evicts everything while other's index is still fresh (no reload for 60s)
+        self.assertEqual(web.prune(max_files=0), 2)
+        self.assertFalse(os.path.exists(web.path('a.mp3')))
+
+        # Not a dead URL: the entry predates other's index load, so the hit checks the file
+        self.assertIsNone(other.get('a.mp3'))
+        self.assertIsNone(other.get_entry('a.mp3'))
+        self.assertEqual(other.metrics['misses'], 1)
+        self.assertIsNone(other.get('b.mp3'))
+
+    def test_hits_on_entries_known_to_exist_skip_the_filesystem(self):
+        cache = TTSCache()
+        self.put(cache, 'a.mp3')
+        os.remove(cache.path('a.mp3'))
+        # Written by this process after its index was loaded: trusted without a stat
+        self.assertEqual(cache.get('a.mp3'), '/media/tts/a.mp3')
+
+    def test_writes_from_another_process_show_up_after_reload(self):
+        web, other = TTSCache(), TTSCache()
+        self.put(web, 'a.mp3')
+        self.assertEqual(other.get('a.mp3'), '/media/tts/a.mp3')
+        self.put(web, 'b.mp3')
+        self.assertIsNone(other.get('b.mp3'))
+        other._checked_at = 0
+        self.assertEqual(other.get('b.mp3'), '/media/tts/b.mp3')
+
+    def test_reput_keeps_the_pin(self):
+        cache = TTSCache()
+        self.put(cache, 'phrase.mp3')
+        cache.pin('phrase.mp3')
+        cache.flush()
+        self.put(cache, 'phrase.mp3')
+        self.assertTrue(cache.get_entry('phrase.mp3')['pinned'])
+        self.assertEqual(cache.prune(max_files=0), 0)
+        self.assertTrue(os.path.exists(cache.path('phrase.mp3')))
+        # And the pin reaches the shared index
+        self.assertTrue(TTSCache().get_entry('phrase.mp3')['pinned'])
+
+    def test_eviction_is_least_recently_hit_first(self):
+        cache = TTSCache()
+        for filename in ('a.mp3', 'b.mp3', 'c.mp3'):
+            self.put(cache, filename)
+        cache._entries['a.mp3']['last_hit'] += 10
+        self.assertEqual(cache.prune(max_files=1), 2)
+        self.assertEqual(list(cache._entries), ['a.mp3'])
+
+    def test_evictions_merge_across_processes(self):
+        web, other = TTSCache(), TTSCache()
+        self.put(web, 'a.mp3')
+        self.put(other, 'b.mp3')
+        # Each save merges into the shared index instead of overwriting it
+        self.assertTrue(all(TTSCache().get_entry(name) for name in ('a.mp3', 'b.mp3')))
+        web._checked_at = 0
+        web.prune(max_files=1)
+        remaining = [name for name in ('a.mp3', 'b.mp3') if TTSCache().get_entry(name)]
+        self.assertEqual(len(remaining), 1)
+        self.assertEqual([name for name in ('a.mp3', 'b.mp3') if os.path.exists(web.path(name))], remaining)
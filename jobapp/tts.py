@@ -3,10 +3,16 @@ TTS.PY - Configured for Daisy Studious voice using new TTS API
 """
 import requests
 import os
+import asyncio
+import weakref
+import httpx
 from gtts import gTTS
 from django.conf import settings
 import hashlib
 import logging
+from io import BytesIO
+from .tts_cache import tts_cache, probe_duration
+from .upstream_health import get_upstream, upstream_probe
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +26,39 @@ if NEW_TTS_API_KEY:
     NEW_TTS_API_KEY = NEW_TTS_API_KEY.strip()
 
 DAISY_VOICE_ID = NEW_TTS_VOICE_ID or "Daisy Studious"
+DAISY_TIMEOUT = 30
+
+# Circuit breaker and adaptive timeouts for the Daisy TTS host - gTTS while it is down
+tts_upstream = get_upstream('tts')
+
+def _daisy_tts_file(text):
+    """Cache filename for Daisy audio of ``text``"""
+    text_hash = hashlib.md5(f"{text}_daisy".encode()).hexdigest()[:10]
+    return f"daisy_{text_hash}.mp3"
+
+def _google_tts_file(text):
+    """Cache filename for gTTS audio of ``text``"""
+    text_hash = hashlib.md5(f"{text}_google".encode()).hexdigest()[:10]
+    return f"google_{text_hash}.mp3"
+
+def tts_file(text):
+    """Cache filename generate_tts gives ``text`` when the configured voice answers"""
+    return _daisy_tts_file(text) if NEW_TTS_API_KEY and NEW_TTS_API_URL else _google_tts_file(text)
+
+def _daisy_tts_request(text):
+    """URL, headers and payload for a Daisy TTS API call"""
+    url = f"{NEW_TTS_API_URL.rstrip('/')}/v1/text-to-speech"
+    headers = {
+        "Accept": "audio/mpeg",
+        "Content-Type": "application/json",
+        "xi-api-key": NEW_TTS_API_KEY
+    }
+    payload = {
+        "text": text.strip(),
+        "voice_id": DAISY_VOICE_ID,
+        "model_id": NEW_TTS_MODEL_ID or "coqui"
+    }
+    return url, headers, payload
 
 def generate_elevenlabs_tts(text, voice="female_interview"):
     """Generate TTS using new API with Daisy Studious voice"""
@@ -31,48 +70,31 @@ def generate_elevenlabs_tts(text, voice="female_interview"):
             logger.warning("Daisy TTS not configured, using Google TTS")
             return generate_google_tts(text)
         
-        # Create filename for caching
-        text_hash = hashlib.md5(f"{text}_daisy".encode()).hexdigest()[:10]
-        filename = f"daisy_{text_hash}.mp3"
-        tts_dir = os.path.join(settings.MEDIA_ROOT, 'tts')
-        os.makedirs(tts_dir, exist_ok=True)
-        filepath = os.path.join(tts_dir, filename)
-        
         # Check cache first
-        if os.path.exists(filepath) and os.path.getsize(filepath) > 1000:
+        filename = _daisy_tts_file(text)
+        cached_url = tts_cache.get(filename)
+        if cached_url:
             logger.info(f"Using cached Daisy TTS: {filename}")
-            return f"/media/tts/{filename}"
+            return cached_url
         
         # API request
-        url = f"{NEW_TTS_API_URL.rstrip('/')}/v1/text-to-speech"
-        headers = {
-            "Accept": "audio/mpeg",
-            "Content-Type": "application/json",
-            "xi-api-key": NEW_TTS_API_KEY
-        }
-        
-        payload = {
-            "text": text.strip(),
-            "voice_id": DAISY_VOICE_ID,
-            "model_id": NEW_TTS_MODEL_ID or "coqui"
-        }
-        logger.info(f"Making Daisy TTS API call for text: {text[:50]}...")
-        response = requests.post(url, json=payload, headers=headers, timeout=30)
+        url, headers, payload = _daisy_tts_request(text)
+        with tts_upstream.guard(DAISY_TIMEOUT) as call:
+            logger.info(f"Making Daisy TTS API call for text: {text[:50]}... (timeout={call.timeout:.1f}s)")
+            response = requests.post(url, json=payload, headers=headers, timeout=call.timeout)
+            if response.status_code >= 500:
+                call.failed(f"HTTP {response.status_code}")
         
         logger.info(f"Daisy TTS API Response: Status {response.status_code}")
         if response.status_code != 200:
             logger.error(f"Daisy TTS API Error: {response.status_code} - {response.text}")
             
         if response.status_code == 200:
-            with open(filepath, 'wb') as f:
-                f.write(response.content)
+            audio_url = tts_cache.put(filename, response.content)
+            if audio_url:
+                logger.info(f"Daisy TTS Success: {filename} ({len(response.content)} bytes)")
+                return audio_url
             
-            if os.path.exists(filepath) and os.path.getsize(filepath) > 1000:
-                logger.info(f"Daisy TTS Success: {filename} ({os.path.getsize(filepath)} bytes)")
-                return f"/media/tts/{filename}"
-            else:
-                logger.error(f"Daisy TTS file too small: {os.path.getsize(filepath) if os.path.exists(filepath) else 0} bytes")
-                
         
         # If failed, fall back to Google TTS
         logger.warning(f"Daisy TTS failed, falling back to Google TTS")
@@ -85,24 +107,18 @@ def generate_elevenlabs_tts(text, voice="female_interview"):
 def generate_google_tts(text, lang='en'):
     """Generate TTS using Google Text-to-Speech as fallback"""
     try:
-        text_hash = hashlib.md5(f"{text}_google".encode()).hexdigest()[:10]
-        filename = f"google_{text_hash}.mp3"
-        tts_dir = os.path.join(settings.MEDIA_ROOT, 'tts')
-        os.makedirs(tts_dir, exist_ok=True)
-        filepath = os.path.join(tts_dir, filename)
+        filename = _google_tts_file(text)
         
         # Check cache first
-        if os.path.exists(filepath) and os.path.getsize(filepath) > 1000:
-            return f"/media/tts/{filename}"
+        cached_url = tts_cache.get(filename)
+        if cached_url:
+            return cached_url
         
         # Generate with Google TTS
         tts = gTTS(text=text, lang=lang, slow=False)
-        tts.save(filepath)
-        
-        if os.path.exists(filepath) and os.path.getsize(filepath) > 1000:
-            return f"/media/tts/{filename}"
-        
-        return None
+        audio = BytesIO()
+        tts.write_to_fp(audio)
+        return tts_cache.put(filename, audio.getvalue())
         
     except Exception as e:
         logger.error(f"Google TTS failed: {e}")
@@ -115,6 +131,55 @@ def generate_tts(text, voice="female_interview"):
         return result
     return generate_google_tts(text)
 
+async def generate_tts_async(text, voice="female_interview"):
+    """Async generate_tts - Daisy over a pooled async HTTP client, gTTS in a worker thread"""
+    from asgiref.sync import sync_to_async
+    
+    try:
+        if not NEW_TTS_API_KEY or not NEW_TTS_API_URL:
+            logger.warning("Daisy TTS not configured, using Google TTS")
+            return await sync_to_async(generate_google_tts, thread_sensitive=False)(text)
+        
+        filename = _daisy_tts_file(text)
+        # The periodic index reload and hit flush touch the disk - keep them off the event loop
+        cached_url = await sync_to_async(tts_cache.get, thread_sensitive=False)(filename)
+        if cached_url:
+            logger.info(f"Using cached Daisy TTS: {filename}")
+            return cached_url
+        
+        url, headers, payload = _daisy_tts_request(text)
+        with tts_upstream.guard(DAISY_TIMEOUT) as call:
+            logger.info(f"Making async Daisy TTS API call for text: {text[:50]}... (timeout={call.timeout:.1f}s)")
+            response = await _get_async_tts_client().post(url, json=payload, headers=headers, timeout=call.timeout)
+            if response.status_code >= 500:
+                call.failed(f"HTTP {response.status_code}")
+        
+        logger.info(f"Daisy TTS API Response: Status {response.status_code}")
+        if response.status_code == 200 and len(response.content) > 1000:
+            audio_url = await sync_to_async(tts_cache.put, thread_sensitive=False)(filename, response.content)
+            if audio_url:
+                logger.info(f"Daisy TTS Success: {filename} ({len(response.content)} bytes)")
+                return audio_url
+        
+        logger.error(f"Daisy TTS API Error: {response.status_code} ({len(response.content)} bytes)")
+    
+    except Exception as e:
+        logger.error(f"Async Daisy TTS failed: {e}")
+    
+    logger.warning(f"Daisy TTS failed, falling back to Google TTS")
+    return await sync_to_async(generate_google_tts, thread_sensitive=False)(text)
+
+# Async HTTP clients for Daisy, one per event loop
+_async_tts_clients = weakref.WeakKeyDictionary()
+
+def _get_async_tts_client():
+    loop = asyncio.get_running_loop()
+    client = _async_tts_clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(timeout=httpx.Timeout(DAISY_TIMEOUT, connect=5.0))
+        _async_tts_clients[loop] = client
+    return client
+
 def generate_gtts_fallback(text):
     """Fallback function for Google TTS"""
     return generate_google_tts(text)
@@ -134,13 +199,15 @@ def estimate_audio_duration(text):
 def get_audio_duration(file_path):
     """Get actual audio duration from file"""
     try:
-        import os
+        # Cached TTS audio has its duration in the index - no file access needed
+        if os.path.dirname(os.path.abspath(file_path)) == os.path.abspath(tts_cache.directory):
+            duration = tts_cache.duration(file_path)
+            if duration:
+                return duration
+        
         if not os.path.exists(file_path):
             return None
-        
-        # For now, return None to fall back to estimation
-        # You could add audio library here if needed
-        return None
+        return probe_duration(file_path)
     except Exception as e:
         logger.error(f"Error getting audio duration: {e}")
         return None
@@ -163,4 +230,11 @@ def check_elevenlabs_status():
             return False, f"API error: {response.status_code}"
             
     except Exception as e:
-        return False, f"Connection error: {str(e)}"
\ No newline at end of file
+        return False, f"Connection error: {str(e)}"
+
+@upstream_probe('tts')
+def probe_tts():
+    """Run by the circuit breaker while the Daisy host looks down"""
+    working, message = check_elevenlabs_status()
+    if not working:
+        raise RuntimeError(message)
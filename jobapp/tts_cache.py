@@ -0,0 +1,388 @@
+"""
+TTS audio cache - synthesized MP3s in MEDIA_ROOT/tts with an in-memory index.
+
+The index maps a cache filename to its size, duration and last hit, so a
+cache hit is a dict lookup instead of filesystem checks. Durations are read
+from the MP3 frame headers once, when a file is written or first indexed. Files are written
+to a temporary name and renamed into place, and the least recently used
+entries are evicted once the cache goes over its size or file budget.
+The index is shared between processes through an ``index.json`` file next
+to the audio, reloaded when another process changes it. Each process
+merges its own changes (writes, evictions, pins, hits) into the file
+under a lock rather than overwriting it, and applies the budget to the
+merged index. A file missing from the index is a miss - run
+``manage.py tts_cache --rebuild`` to index files written some other way.
+Another process may evict a file before this one reloads the index, so a
+hit on an entry not written or hit here since the last reload checks that
+the file still exists.
+"""
+import os
+import json
+import time
+import uuid
+import threading
+import logging
+from io import BytesIO
+
+try:
+    import fcntl
+except ImportError:  # Windows - index merges are then best effort
+    fcntl = None
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = 'index.json'
+LOCK_FILENAME = 'index.lock'
+# Smaller files are error responses or truncated audio, never valid speech
+MIN_AUDIO_BYTES = 1000
+
+
+def probe_duration(source):
+    """Playback length in seconds of an MP3 path or bytes, from its frame headers"""
+    try:
+        from mutagen.mp3 import MP3
+        audio = MP3(BytesIO(source) if isinstance(source, bytes) else source)
+        length = audio.info.length
+        return round(length, 3) if length and length > 0 else None
+    except Exception as e:
+        logger.warning(f"Could not read MP3 duration: {e}")
+        return None
+
+
+class TTSCache:
+    """LRU cache of TTS audio files, see the module docstring"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._entries = None
+        self._index_mtime = None
+        self._checked_at = 0.0
+        # Wall-clock time the entries were last read from the index file
+        self._loaded_at = 0.0
+        self._saved_at = 0.0
+        self._dirty = False
+        # Changes since the last save, merged into the index file on save
+        self._added = set()
+        self._removed = set()
+        self._pins = {}
+        self.metrics = {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0, 'evicted_bytes': 0}
+
+    # Configuration
+
+    @property
+    def directory(self):
+        return os.path.join(settings.MEDIA_ROOT, 'tts')
+
+    @property
+    def max_bytes(self):
+        return getattr(settings, 'TTS_CACHE_MAX_BYTES', 500 * 1024 * 1024)
+
+    @property
+    def max_files(self):
+        return getattr(settings, 'TTS_CACHE_MAX_FILES', 5000)
+
+    def path(self, filename):
+        return os.path.join(self.directory, filename)
+
+    def url(self, filename):
+        return f"/media/tts/{filename}"
+
+    # Index persistence
+
+    def _index_path(self):
+        return self.path(INDEX_FILENAME)
+
+    def _ensure_loaded(self):
+        """Load the index on first use and pick up changes made by other processes"""
+        now = time.monotonic()
+        refresh = getattr(settings, 'TTS_CACHE_INDEX_REFRESH', 5.0)
+        if self._entries is not None and now - self._checked_at < refresh:
+            return
+        self._checked_at = now
+
+        try:
+            mtime = os.path.getmtime(self._index_path())
+        except OSError:
+            mtime = None
+
+        if self._entries is None and mtime is None:
+            self.rebuild()
+            return
+        if mtime is not None and mtime != self._index_mtime:
+            try:
+                entries = self._read_index()
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"TTS cache index unreadable ({e}), rebuilding")
+                self.rebuild()
+                return
+            if self._entries:
+                # Keep our own unsaved changes
+                entries = self._merge(entries)
+            self._entries = entries
+            self._index_mtime = mtime
+            self._loaded_at = time.time()
+        elif self._entries is None:
+            self._entries = {}
+
+    def _read_index(self):
+        with open(self._index_path()) as f:
+            return json.load(f)['entries']
+
+    def _merge(self, entries):
+        """Our changes since the last save applied to the index file's ``entries``"""
+        for filename in self._removed:
+            entries.pop(filename, None)
+        for filename in self._added:
+            if filename in self._entries:
+                entries[filename] = self._entries[filename]
+        for filename, entry in entries.items():
+            ours = self._entries.get(filename)
+            if ours and ours['last_hit'] > entry['last_hit']:
+                entry['last_hit'] = ours['last_hit']
+        for filename, pinned in self._pins.items():
+            if filename in entries:
+                entries[filename]['pinned'] = pinned
+        return entries
+
+    def _save(self, force=False, merge=True):
+        """Merge our changes into the index file atomically; hit timestamps alone are flushed at most every 30s"""
+        if not (force or (self._dirty and time.monotonic() - self._saved_at > 30)):
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{self._index_path()}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(self.path(LOCK_FILENAME), 'a') as lock:
+                if fcntl:
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+                if merge:
+                    try:
+                        self._entries = self._merge(self._read_index())
+                    except (OSError, ValueError, KeyError):
+                        pass
+                    # Other processes' writes count against the budget too
+                    self._evict()
+                with open(tmp_path, 'w') as f:
+                    json.dump({'version': 1, 'entries': self._entries}, f)
+                os.replace(tmp_path, self._index_path())
+            self._index_mtime = os.path.getmtime(self._index_path())
+            self._saved_at = time.monotonic()
+            self._dirty = False
+            self._added.clear()
+            self._removed.clear()
+            self._pins.clear()
+        except OSError as e:
+            logger.error(f"Could not save TTS cache index: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def _entry_for_file(self, filename):
+        """Index entry for an audio file already on disk, or None if it is unusable"""
+        try:
+            stat = os.stat(self.path(filename))
+        except OSError:
+            return None
+        if stat.st_size <= MIN_AUDIO_BYTES:
+            return None
+        return {
+            'size': stat.st_size,
+            'duration': None,
+            'created': stat.st_mtime,
+            'last_hit': stat.st_atime,
+        }
+
+    # Public API
+
+    def get(self, filename):
+        """Return the media URL for ``filename`` if it is cached, else None"""
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._entries.get(filename)
+            if entry is None:
+                # No filesystem check - files other processes write show up when their index is reloaded
+                self.metrics['misses'] += 1
+                return None
+            # Eviction goes least recently hit first, so an entry hit here since the
+            # reload is trusted; any other may have been evicted by another process
+            if entry['last_hit'] < self._loaded_at and not os.path.exists(self.path(filename)):
+                del self._entries[filename]
+                self._added.discard(filename)
+                self._removed.add(filename)
+                self._dirty = True
+                self.metrics['misses'] += 1
+                return None
+            entry['last_hit'] = time.time()
+            self._dirty = True
+            self.metrics['hits'] += 1
+            self._save()
+            return self.url(filename)
+
+    def get_entry(self, filename):
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._entries.get(filename)
+            return dict(entry) if entry else None
+
+    def duration(self, filename):
+        """Indexed duration of ``filename`` (a name or /media/tts/ URL), or None"""
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._entries.get(os.path.basename(filename))
+            return entry.get('duration') if entry else None
+
+    def pin(self, filename, pinned=True):
+        """Exempt ``filename`` from eviction (used for pre-synthesized phrases)"""
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._entries.get(filename)
+            if entry is None or bool(entry.get('pinned')) == pinned:
+                return
+            entry['pinned'] = pinned
+            self._pins[filename] = pinned
+            self._dirty = True
+
+    def flush(self):
+        """Write pending index changes (hits, pins) now"""
+        with self._lock:
+            if self._entries is not None and self._dirty:
+                self._save(force=True)
+
+    def put(self, filename, content, **extra):
+        """Write ``content`` as ``filename`` and index it; returns the media URL or None.
+
+        The duration is probed from ``content`` unless ``duration`` is passed.
+        """
+        if not content or len(content) <= MIN_AUDIO_BYTES:
+            logger.error(f"TTS audio too small to cache: {filename} ({len(content or b'')} bytes)")
+            return None
+
+        os.makedirs(self.directory, exist_ok=True)
+        final_path = self.path(filename)
+        tmp_path = f"{final_path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+            # Readers only ever see the complete file
+            os.replace(tmp_path, final_path)
+        except OSError as e:
+            logger.error(f"Could not write TTS audio {filename}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return None
+
+        if extra.get('duration') is None:
+            extra['duration'] = probe_duration(content)
+
+        with self._lock:
+            self._ensure_loaded()
+            now = time.time()
+            previous = self._entries.get(filename)
+            if previous and previous.get('pinned'):
+                # Re-synthesizing a pre-synthesized phrase keeps it exempt from eviction
+                extra.setdefault('pinned', True)
+            self._entries[filename] = {'size': len(content), 'created': now, 'last_hit': now, **extra}
+            self._added.add(filename)
+            self._removed.discard(filename)
+            self.metrics['writes'] += 1
+            self._save(force=True)
+        return self.url(filename)
+
+    def _evict(self, max_bytes=None, max_files=None):
+        """Remove least recently hit, unpinned files until the cache fits its budget"""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        max_files = self.max_files if max_files is None else max_files
+        total = sum(entry['size'] for entry in self._entries.values())
+        for filename, entry in sorted(self._entries.items(), key=lambda item: item[1]['last_hit']):
+            if total <= max_bytes and len(self._entries) <= max_files:
+                break
+            if entry.get('pinned'):
+                continue
+            try:
+                os.remove(self.path(filename))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Could not evict TTS audio {filename}: {e}")
+                continue
+            del self._entries[filename]
+            self._removed.add(filename)
+            self._added.discard(filename)
+            total -= entry['size']
+            self.metrics['evictions'] += 1
+            self.metrics['evicted_bytes'] += entry['size']
+            logger.info(f"🧹 Evicted TTS audio {filename} ({entry['size']} bytes)")
+
+    def rebuild(self):
+        """Re-index the audio files on disk, keeping known metadata; returns the entry count"""
+        with self._lock:
+            known = self._entries or {}
+            if not known:
+                try:
+                    with open(self._index_path()) as f:
+                        known = json.load(f).get('entries', {})
+                except (OSError, ValueError):
+                    known = {}
+
+            entries = {}
+            if os.path.isdir(self.directory):
+                for filename in os.listdir(self.directory):
+                    if filename.endswith('.tmp'):
+                        # Left behind by an interrupted write
+                        try:
+                            if time.time() - os.path.getmtime(self.path(filename)) > 3600:
+                                os.remove(self.path(filename))
+                        except OSError:
+                            pass
+                        continue
+                    if not filename.endswith('.mp3'):
+                        continue
+                    entry = self._entry_for_file(filename)
+                    if entry is None:
+                        continue
+                    if filename in known and known[filename].get('size') == entry['size']:
+                        entry = {**entry, **{k: v for k, v in known[filename].items() if v is not None}}
+                    if entry['duration'] is None:
+                        entry['duration'] = probe_duration(self.path(filename))
+                    entries[filename] = entry
+
+            self._entries = entries
+            self._checked_at = time.monotonic()
+            self._loaded_at = time.time()
+            # The directory listing is the truth - replace the index file rather than merge
+            self._added.clear()
+            self._removed.clear()
+            self._pins.clear()
+            self._save(force=True, merge=False)
+            logger.info(f"🗂️ TTS cache index rebuilt with {len(entries)} files")
+            return len(entries)
+
+    def prune(self, max_bytes=None, max_files=None):
+        """Evict down to the given (or configured) budget; returns the number of files removed"""
+        with self._lock:
+            self._ensure_loaded()
+            before = self.metrics['evictions']
+            self._evict(max_bytes, max_files)
+            self._save(force=True)
+            return self.metrics['evictions'] - before
+
+    def stats(self):
+        with self._lock:
+            self._ensure_loaded()
+            lookups = self.metrics['hits'] + self.metrics['misses']
+            return {
+                'pid': os.getpid(),
+                'files': len(self._entries),
+                'bytes': sum(entry['size'] for entry in self._entries.values()),
+                'max_bytes': self.max_bytes,
+                'max_files': self.max_files,
+                'hit_rate': round(self.metrics['hits'] / lookups, 3) if lookups else None,
+                **self.metrics,
+            }
+
+
+tts_cache = TTSCache()
@@ -0,0 +1,246 @@
+"""
+Health of the upstream services an interview turn waits on.
+
+Each upstream (the NVIDIA LLM endpoint, the Daisy TTS host) keeps a
+rolling window of its recent calls. After UPSTREAM_FAILURE_THRESHOLD
+consecutive failures its circuit opens and callers skip it - straight to
+the scripted reply or gTTS - instead of waiting out a timeout on every
+turn. Once the cooldown has passed, a probe registered for the upstream
+runs in a background thread (the circuit is half-open meanwhile, and
+requests keep skipping it); a successful probe closes the circuit, a
+failed one reopens it with a longer cooldown.
+
+While the circuit is closed, per-call timeouts follow the observed p95
+latency (times UPSTREAM_TIMEOUT_FACTOR, never below UPSTREAM_TIMEOUT_FLOOR
+and never above the caller's own timeout), so a slow upstream fails fast
+rather than holding a turn for the full default.
+
+State is per worker process; ``stats()`` is shown on /health/.
+"""
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# Upstream name -> probe() that raises (or returns False) while the upstream is down
+_probes = {}
+
+
+class CircuitOpenError(Exception):
+    """The upstream's circuit is open - the call was not attempted"""
+
+
+def upstream_probe(name):
+    """Register ``probe()`` as the half-open check of upstream ``name``"""
+    def decorator(probe):
+        _probes[name] = probe
+        return probe
+    return decorator
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class _Call:
+    """One guarded call: its timeout, and a way to report a failed response"""
+
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self.error = None
+        self.paused_for = 0.0
+
+    def failed(self, error):
+        self.error = error
+
+    @contextmanager
+    def paused(self):
+        """Leave the time spent in the block out of the call's latency (e.g. a streaming ``yield``)"""
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.paused_for += time.monotonic() - started
+
+
+class Upstream:
+    """Rolling latency/error window and circuit breaker of one upstream"""
+
+    def __init__(self, name):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls = deque(maxlen=_setting('UPSTREAM_WINDOW', 50))
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.cooldown = _setting('UPSTREAM_COOLDOWN', 15.0)
+        self.last_error = ''
+        self.short_circuited = 0
+        self.probes = 0
+
+    # Circuit
+
+    def allow(self):
+        """Whether a call may go to the upstream now; starts the probe once the cooldown is over"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            self.short_circuited += 1
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = HALF_OPEN
+                start_probe = True
+            else:
+                start_probe = False
+        if start_probe:
+            self._start_probe()
+        return False
+
+    def _open(self, error):
+        # Called with the lock held
+        if self.state == CLOSED:
+            self.cooldown = _setting('UPSTREAM_COOLDOWN', 15.0)
+            logger.warning(f"🔌 Circuit for {self.name} opened after {self.consecutive_failures} failures: {error}")
+        else:
+            self.cooldown = min(self.cooldown * 2, _setting('UPSTREAM_MAX_COOLDOWN', 300.0))
+            logger.warning(f"🔌 Circuit for {self.name} stays open for {self.cooldown:.0f}s: {error}")
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+
+    def _close(self):
+        # Called with the lock held
+        if self.state != CLOSED:
+            logger.info(f"✅ Circuit for {self.name} closed")
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+
+    def _start_probe(self):
+        probe = _probes.get(self.name)
+        if probe is None:
+            # Nothing to probe with - let the next real call be the trial
+            with self._lock:
+                self._close()
+            return
+        threading.Thread(target=self._run_probe, args=(probe,), name=f'probe-{self.name}', daemon=True).start()
+
+    def _run_probe(self, probe):
+        started = time.monotonic()
+        try:
+            if probe() is False:
+                raise RuntimeError('probe reported the upstream down')
+            error = None
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        with self._lock:
+            self.probes += 1
+            if error is None:
+                self._calls.append((True, time.monotonic() - started))
+                self._close()
+            else:
+                self.last_error = error
+                self._open(error)
+
+    # Calls
+
+    def record(self, ok, latency, error=None):
+        with self._lock:
+            self._calls.append((ok, latency))
+            if ok:
+                self.consecutive_failures = 0
+                return
+            self.consecutive_failures += 1
+            self.last_error = str(error or 'failed')[:300]
+            if self.state == CLOSED and self.consecutive_failures >= _setting('UPSTREAM_FAILURE_THRESHOLD', 3):
+                self._open(self.last_error)
+
+    def timeout(self, default):
+        """Timeout for the next call: ``default``, tightened to the observed p95 once there are samples"""
+        with self._lock:
+            latencies = [latency for ok, latency in self._calls if ok]
+        if len(latencies) < _setting('UPSTREAM_MIN_SAMPLES', 10):
+            return default
+        adaptive = _percentile(latencies, 0.95) * _setting('UPSTREAM_TIMEOUT_FACTOR', 2.0)
+        return min(default, max(_setting('UPSTREAM_TIMEOUT_FLOOR', 3.0), adaptive))
+
+    def guard(self, default_timeout):
+        """Context manager around one call; see the module docstring.
+
+        Raises CircuitOpenError on entry while the circuit is open. Yields a
+        call with ``timeout``; an exception, or ``call.failed(...)`` for a bad
+        response, counts as a failure. Time spent inside ``call.paused()``
+        is not counted as upstream latency.
+        """
+        return _Guard(self, default_timeout)
+
+    def stats(self):
+        with self._lock:
+            calls = list(self._calls)
+            stats = {
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'short_circuited': self.short_circuited,
+                'probes': self.probes,
+                'last_error': self.last_error,
+                'retry_in': round(max(0.0, self.cooldown - (time.monotonic() - self.opened_at)), 1) if self.state == OPEN else None,
+            }
+        latencies = [latency for ok, latency in calls if ok]
+        stats.update({
+            'window': len(calls),
+            'error_rate': round(sum(1 for ok, _ in calls if not ok) / len(calls), 3) if calls else 0.0,
+            'p50_ms': round(_percentile(latencies, 0.5) * 1000) if latencies else None,
+            'p95_ms': round(_percentile(latencies, 0.95) * 1000) if latencies else None,
+        })
+        return stats
+
+
+class _Guard:
+
+    def __init__(self, upstream, default_timeout):
+        self.upstream = upstream
+        self.call = _Call(upstream.timeout(default_timeout))
+
+    def __enter__(self):
+        if not self.upstream.allow():
+            raise CircuitOpenError(f"{self.upstream.name} circuit is {self.upstream.state}")
+        self.started = time.monotonic()
+        return self.call
+
+    def __exit__(self, exc_type, exc, tb):
+        latency = time.monotonic() - self.started - self.call.paused_for
+        if exc_type is None:
+            self.upstream.record(self.call.error is None, latency, self.call.error)
+        elif issubclass(exc_type, Exception):
+            self.upstream.record(False, latency, f"{exc_type.__name__}: {exc}")
+        # GeneratorExit / CancelledError: the caller went away, the upstream did nothing wrong
+        return False
+
+
+_upstreams = {}
+_upstreams_lock = threading.Lock()
+
+
+def get_upstream(name):
+    with _upstreams_lock:
+        if name not in _upstreams:
+            _upstreams[name] = Upstream(name)
+        return _upstreams[name]
+
+
+def stats():
+    with _upstreams_lock:
+        upstreams = dict(_upstreams)
+    return {name: upstream.stats() for name, upstream in upstreams.items()}
@@ -20,6 +20,7 @@ urlpatterns = [
     # 💼 Job pages
     path('post-job/',views.post_job, name='post_job'),
     path('jobs/',views.job_list, name='job_list'),
+    path('jobs/suggest/', views.job_search_suggest, name='job_search_suggest'),
     path('job/<int:job_id>/update-status/', views.update_job_status, name='update_job_status'),
     path('jobs/<int:job_id>/', views.job_detail, name='job_detail'),
     path('job/<int:job_id>/add-candidates/', views.add_candidates, name='add_candidates'),
@@ -30,12 +31,16 @@ urlpatterns = [
      # 🧑‍💼 Dashboards
     path('dashboard/seeker/', views.jobseeker_dashboard, name='jobseeker_dashboard'),
     path('dashboard/recruiter/', views.recruiter_dashboard, name='recruiter_dashboard'),
+    path('dashboard/recruiter/options/', views.recruiter_dashboard_options, name='recruiter_dashboard_options'),
+    path('dashboard/recruiter/<str:section>/', views.recruiter_dashboard_section, name='recruiter_dashboard_section'),
     # 📅 Interview scheduling - existing (for registered candidates)
     path('schedule-interview/<int:job_id>/<int:applicant_id>/', views.schedule_interview, name='schedule_interview'),
     # Interview scheduling - simplified for added candidates
     path('schedule-interview/', views.schedule_interview_simple, name='schedule_interview_simple'),
     # Schedule interview with specific candidate
     path('schedule-interview/candidate/<int:candidate_id>/', views.schedule_interview_with_candidate, name='schedule_interview_with_candidate'),
+    # Schedule many candidates for one job at once
+    path('schedule-interview/bulk/', views.bulk_schedule_interviews, name='bulk_schedule_interviews'),
     
     
     
@@ -43,6 +48,8 @@ urlpatterns = [
     path('interview/ready/<uuid:interview_uuid>/', views.interview_ready, name='interview_ready'),
      # 🗣️ Interview Start + AI Response
     path('interview/start/<uuid:interview_uuid>/', views.start_interview_by_uuid, name='start_interview'),
+    path('interview/stream/<uuid:interview_uuid>/', views.stream_interview_turn, name='stream_interview_turn'),
+    path('interview/async/<uuid:interview_uuid>/', views.interview_turn_async, name='interview_turn_async'),
     # path('debug/media/', views.test_media_debug, name='test_debug_media'),
    
     
@@ -73,6 +80,10 @@ urlpatterns = [
     
     # Recording and TTS endpoints
     path('save-interview-recording/', views.save_interview_recording, name='save_interview_recording'),
+    path('interview/<uuid:interview_uuid>/recording/', views.start_recording_upload, name='start_recording_upload'),
+    path('interview/<uuid:interview_uuid>/recording/<uuid:upload_id>/', views.recording_upload_status, name='recording_upload_status'),
+    path('interview/<uuid:interview_uuid>/recording/<uuid:upload_id>/chunks/<int:index>/', views.upload_recording_chunk, name='upload_recording_chunk'),
+    path('interview/<uuid:interview_uuid>/recording/<uuid:upload_id>/finalize/', views.finalize_recording_upload, name='finalize_recording_upload'),
     
     path('generate-audio/', views.generate_audio, name='generate_audio'),
     path('get-csrf-token/', views.get_csrf_token, name='get_csrf_token'),
@@ -84,6 +95,9 @@ urlpatterns = [
     
     # Add candidate from dashboard
     path('add-candidate-dashboard/', views.add_candidate_dashboard, name='add_candidate_dashboard'),
+    # Bulk candidate import (CSV + ZIP of resumes)
+    path('candidates/import/', views.import_candidates, name='import_candidates'),
+    path('candidates/import/<int:import_id>/', views.candidate_import_status, name='candidate_import_status'),
     
     # API endpoint for candidate email
     path('api/candidate/<int:candidate_id>/email/', views.get_candidate_email, name='get_candidate_email'),
@@ -92,6 +106,7 @@ urlpatterns = [
     
     # Interview results view
     path('interview-results/<uuid:interview_uuid>/', views.interview_results, name='interview_results'),
+    path('interview-results/<uuid:interview_uuid>/status/', views.interview_results_status, name='interview_results_status'),
     
   
     
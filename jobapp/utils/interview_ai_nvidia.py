@@ -1,32 +1,31 @@
 import os
-from openai import OpenAI
-from decouple import config
+import re
 import logging
 
+from decouple import config
+
+from .llm_client import get_llm_client, get_async_llm_client, llm_clients
+from .llm_cache import llm_cache, job_namespace
+from ..upstream_health import get_upstream, upstream_probe
+
 logger = logging.getLogger(__name__)
 
-def ask_ai_question(prompt, candidate_name=None, job_title=None, company_name=None,  timeout=None):
-    """Ask AI question with proper timeout and error handling"""
-    try:
-        api_key = config('NVIDIA_API_KEY')
-    except:
-        logger.error("NVIDIA_API_KEY not found in environment variables")
-        return get_fallback_response(prompt, candidate_name, job_title, company_name)
-        
-    if not api_key:
-        logger.error("NVIDIA_API_KEY is empty")
-        return get_fallback_response(prompt, candidate_name, job_title, company_name)
-        
-    candidate_name = candidate_name or "the candidate"
-    job_title = job_title or "Software Developer" 
-    company_name = company_name or "Our Company"
-        
-    if not prompt or not prompt.strip():
-        logger.error("Empty prompt provided to AI function")
-        return f"Hi {candidate_name}! I'm Sarah. Tell me about yourself."
-            
-    # Simple, direct interviewer prompt
-    system_prompt = f"""
+NVIDIA_BASE_URL = config('NVIDIA_BASE_URL', default="https://integrate.api.nvidia.com/v1")
+NVIDIA_MODEL = "nvidia/llama-3.3-nemotron-super-49b-v1"
+STOP_SEQUENCES = ["\n\n", "Candidate:", "You:", "Interviewer:", "Response as", "Here's my", "As Sarah", "Sarah responds", "*", "(", "Warm"]
+TEMPERATURE = 0.5
+MAX_TOKENS = 50
+
+# Circuit breaker and adaptive timeouts for the inference endpoint
+llm_upstream = get_upstream('llm')
+
+# Sentence boundary: terminal punctuation followed by whitespace
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+
+
+def build_system_prompt(candidate_name, job_title, company_name):
+    """Interviewer personality prompt shared by the blocking and streaming calls"""
+    return f"""
 You are Sarah, an HR interviewer at {company_name}. You are interviewing {candidate_name} for the {job_title} position.
 
 RULES:
@@ -52,19 +51,46 @@ EXAMPLES:
 
 Remember: Short responses, acknowledge their answer, ask one clear question.
 """
-                
-    try:
-        # Initialize client with timeout
-        client = OpenAI(               
-            base_url="https://integrate.api.nvidia.com/v1",
-            api_key=api_key,
-            timeout= timeout or 2.0 # reduced to 2.0 seconds
-        )
+
+def _cache_key(prompt, system_prompt, job_id):
+    return llm_cache.make_key(prompt, system_prompt, NVIDIA_MODEL, TEMPERATURE, MAX_TOKENS, STOP_SEQUENCES, job_namespace(job_id))
+
+
+def ask_ai_question(prompt, candidate_name=None, job_title=None, company_name=None,  timeout=None, job_id=None, upstream='llm'):
+    """Ask AI question with proper timeout and error handling.
+
+    Answers come from the completion cache when an identical prompt was
+    answered before (``job_id`` namespaces it, see jobapp.utils.llm_cache).
+    ``upstream`` names the circuit breaker the call is measured against;
+    long prompts such as the results analysis use their own, so their
+    latency neither caps nor is capped by the interview turns' timeouts.
+    """
+    if not llm_clients.api_key():
+        logger.error("NVIDIA_API_KEY not found in environment variables")
+        return get_fallback_response(prompt, candidate_name, job_title, company_name)
+        
+    candidate_name = candidate_name or "the candidate"
+    job_title = job_title or "Software Developer" 
+    company_name = company_name or "Our Company"
         
-        logger.info(f"Making AI API call with timeout=20s")
+    if not prompt or not prompt.strip():
+        logger.error("Empty prompt provided to AI function")
+        return f"Hi {candidate_name}! I'm Sarah. Tell me about yourself."
+            
+    system_prompt = build_system_prompt(candidate_name, job_title, company_name)
+    
+    def complete():
+        with get_upstream(upstream).guard(timeout or 2.0) as call:
+            return request(call.timeout)
+    
+    def request(call_timeout):
+        # Shared pooled client - reuses keep-alive connections across calls
+        client = get_llm_client(NVIDIA_BASE_URL, NVIDIA_MODEL, timeout=call_timeout)
+        
+        logger.info(f"Making AI API call with timeout={call_timeout:.1f}s")
         
         completion = client.chat.completions.create(
-            model="nvidia/llama-3.3-nemotron-super-49b-v1",
+            model=NVIDIA_MODEL,
             messages=[
                 {
                     "role": "system",
@@ -75,10 +101,10 @@ Remember: Short responses, acknowledge their answer, ask one clear question.
                     "content": prompt # This is candidate response + context
                 }
             ],
-            temperature=0.5,
-            max_tokens=50,
+            temperature=TEMPERATURE,
+            max_tokens=MAX_TOKENS,
             stream=False,
-            stop=["\n\n", "Candidate:", "You:", "Interviewer:", "Response as", "Here's my", "As Sarah", "Sarah responds", "*", "(", "Warm"]
+            stop=STOP_SEQUENCES
         )
         
         raw_response = completion.choices[0].message.content
@@ -86,11 +112,146 @@ Remember: Short responses, acknowledge their answer, ask one clear question.
         
         logger.info(f"AI API call successful, response length: {len(cleaned_response)}")
         return cleaned_response
+                
+    try:
+        return llm_cache.get_or_call(_cache_key(prompt, system_prompt, job_id), complete)
         
     except Exception as e:
         logger.error(f"AI API Error: {type(e).__name__}: {str(e)}")
         return get_fallback_response(prompt, candidate_name, job_title, company_name)
 
+async def ask_ai_question_async(prompt, candidate_name=None, job_title=None, company_name=None, timeout=None, job_id=None):
+    """Async version of ask_ai_question for the ASGI interview path"""
+    if not llm_clients.api_key():
+        logger.error("NVIDIA_API_KEY not found in environment variables")
+        return get_fallback_response(prompt, candidate_name, job_title, company_name)
+
+    candidate_name = candidate_name or "the candidate"
+    job_title = job_title or "Software Developer"
+    company_name = company_name or "Our Company"
+
+    if not prompt or not prompt.strip():
+        logger.error("Empty prompt provided to AI function")
+        return f"Hi {candidate_name}! I'm Sarah. Tell me about yourself."
+
+    system_prompt = build_system_prompt(candidate_name, job_title, company_name)
+
+    async def complete():
+        with llm_upstream.guard(timeout or 2.0) as call:
+            return await request(call.timeout)
+
+    async def request(call_timeout):
+        client = get_async_llm_client(NVIDIA_BASE_URL, NVIDIA_MODEL, timeout=call_timeout)
+
+        logger.info(f"Making async AI API call with timeout={call_timeout:.1f}s")
+
+        completion = await client.chat.completions.create(
+            model=NVIDIA_MODEL,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=TEMPERATURE,
+            max_tokens=MAX_TOKENS,
+            stream=False,
+            stop=STOP_SEQUENCES
+        )
+
+        cleaned_response = clean_text(completion.choices[0].message.content)
+        logger.info(f"Async AI API call successful, response length: {len(cleaned_response)}")
+        return cleaned_response
+
+    try:
+        return await llm_cache.aget_or_call(_cache_key(prompt, system_prompt, job_id), complete)
+
+    except Exception as e:
+        logger.error(f"Async AI API Error: {type(e).__name__}: {str(e)}")
+        return get_fallback_response(prompt, candidate_name, job_title, company_name)
+
+def ask_ai_question_stream(prompt, candidate_name=None, job_title=None, company_name=None, timeout=None, job_id=None):
+    """Stream the interviewer reply as raw text deltas.
+
+    Yields nothing when the API is unavailable or fails before the first
+    token, so callers can fall back to a scripted response. A cached
+    completion is yielded as one delta; a completed stream is cached.
+    """
+    if not llm_clients.api_key() or not prompt or not prompt.strip():
+        logger.error("Streaming AI call skipped - missing API key or prompt")
+        return
+
+    candidate_name = candidate_name or "the candidate"
+    job_title = job_title or "Software Developer"
+    company_name = company_name or "Our Company"
+    system_prompt = build_system_prompt(candidate_name, job_title, company_name)
+
+    cache_key = _cache_key(prompt, system_prompt, job_id)
+    cached = llm_cache.lookup(cache_key)
+    if cached:
+        yield cached
+        return
+
+    try:
+        with llm_upstream.guard(timeout or 2.0) as call:
+            client = get_llm_client(NVIDIA_BASE_URL, NVIDIA_MODEL, timeout=call.timeout)
+
+            logger.info(f"Making streaming AI API call with timeout={call.timeout:.1f}s")
+
+            stream = client.chat.completions.create(
+                model=NVIDIA_MODEL,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=TEMPERATURE,
+                max_tokens=MAX_TOKENS,
+                stream=True,
+                stop=STOP_SEQUENCES
+            )
+
+            raw_response = ""
+            try:
+                for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        raw_response += delta
+                        # Time the consumer spends between deltas (SSE writes, TTS) is not the endpoint's
+                        with call.paused():
+                            yield delta
+            finally:
+                stream.close()
+        llm_cache.record_streamed(cache_key, clean_text(raw_response) if raw_response.strip() else "")
+
+    except Exception as e:
+        logger.error(f"Streaming AI API Error: {type(e).__name__}: {str(e)}")
+
+@upstream_probe('llm')
+@upstream_probe('llm_analysis')
+def probe_llm():
+    """One-token completion - run by the circuit breaker while the endpoint looks down"""
+    client = get_llm_client(NVIDIA_BASE_URL, NVIDIA_MODEL, timeout=5.0)
+    if client is None:
+        return False
+    client.chat.completions.create(
+        model=NVIDIA_MODEL,
+        messages=[{"role": "user", "content": "Hi"}],
+        max_tokens=1,
+        stream=False,
+    )
+
+def split_sentences(buffer):
+    """Split complete sentences off the front of a streamed text buffer.
+
+    Returns ``(sentences, remainder)`` where ``remainder`` is the trailing
+    text that has not reached a sentence boundary yet.
+    """
+    parts = SENTENCE_BOUNDARY.split(buffer)
+    if len(parts) == 1:
+        return [], buffer
+    sentences = [part.strip() for part in parts[:-1] if part.strip()]
+    return sentences, parts[-1]
+
 def clean_text(text):
     """Clean AI response and keep it short and direct"""
     import re
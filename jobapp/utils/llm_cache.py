@@ -0,0 +1,268 @@
+"""
+Completion cache for the interviewer LLM calls.
+
+Completions are keyed by a hash of the normalized prompt (whitespace
+collapsed, case folded) together with the system prompt, model,
+temperature, max_tokens and stop sequences, so retries and prompts that
+differ only in formatting are answered from memory. Entries live in a
+per-process LRU bounded by LLM_CACHE_MAX_ENTRIES and LLM_CACHE_TTL.
+
+Identical requests that arrive while one is already waiting on the
+upstream do not send their own: they wait for that call and share its
+answer (or its error). Only successful completions are cached - never the
+scripted fallbacks.
+
+Every key carries the version stamp of its job namespace, kept in the
+LLM_CACHE_ALIAS cache (shared between workers), and ``invalidate_job``
+bumps it when a job's description changes, so the stale entries are never
+looked up again and age out of the LRU. Each process remembers a stamp
+for LLM_CACHE_VERSION_TTL seconds, so building a key normally reads no
+shared cache; another worker's invalidation is seen within that time.
+"""
+import re
+import time
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_NAMESPACE = 'global'
+WHITESPACE = re.compile(r'\s+')
+
+
+def normalize(text):
+    return WHITESPACE.sub(' ', text or '').strip().casefold()
+
+
+class _Flight:
+    """One upstream call in progress, waited on by identical requests"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class LLMResponseCache:
+    """Process-local LRU of completions with in-flight request coalescing"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._flights = {}
+        # Async flights are per event loop: (loop, key) -> asyncio.Future
+        self._async_flights = {}
+        # namespace -> (version stamp, monotonic time it was read)
+        self._known_versions = {}
+        self.metrics = {'hits': 0, 'misses': 0, 'coalesced': 0, 'upstream_calls': 0, 'upstream_errors': 0, 'evictions': 0}
+
+    # Configuration
+
+    @property
+    def enabled(self):
+        return getattr(settings, 'LLM_CACHE_ENABLED', True)
+
+    @property
+    def max_entries(self):
+        return getattr(settings, 'LLM_CACHE_MAX_ENTRIES', 2000)
+
+    @property
+    def ttl(self):
+        return getattr(settings, 'LLM_CACHE_TTL', 3600)
+
+    @property
+    def version_ttl(self):
+        return getattr(settings, 'LLM_CACHE_VERSION_TTL', 5.0)
+
+    def _versions(self):
+        return caches[getattr(settings, 'LLM_CACHE_ALIAS', 'default')]
+
+    # Keys and namespaces
+
+    def _namespace_version(self, namespace):
+        now = time.monotonic()
+        with self._lock:
+            known = self._known_versions.get(namespace)
+        if known and now - known[1] < self.version_ttl:
+            return known[0]
+
+        key = f'llm_cache_version:{namespace}'
+        try:
+            cache = self._versions()
+            version = cache.get(key)
+            if version is None:
+                version = time.time_ns()
+                cache.add(key, version, None)
+                version = cache.get(key, version)
+        except Exception as e:
+            logger.warning(f"LLM cache namespace lookup failed: {e}")
+            return 0
+        with self._lock:
+            self._known_versions[namespace] = (version, now)
+        return version
+
+    def make_key(self, prompt, system_prompt, model, temperature, max_tokens, stop=(), namespace=None):
+        namespace = str(namespace or GLOBAL_NAMESPACE)
+        parts = [model, repr(temperature), repr(max_tokens), '\x1f'.join(stop or ()), normalize(system_prompt), normalize(prompt)]
+        digest = hashlib.sha256('\x1e'.join(parts).encode()).hexdigest()
+        return f'{namespace}:{self._namespace_version(namespace)}:{digest}'
+
+    def invalidate(self, namespace):
+        """Make every cached completion of ``namespace`` unreachable, in all workers"""
+        namespace = str(namespace or GLOBAL_NAMESPACE)
+        version = time.time_ns()
+        try:
+            self._versions().set(f'llm_cache_version:{namespace}', version, None)
+        except Exception as e:
+            logger.warning(f"Could not invalidate LLM cache namespace {namespace}: {e}")
+        with self._lock:
+            self._known_versions[namespace] = (version, time.monotonic())
+            for key in [key for key in self._entries if key.startswith(f'{namespace}:')]:
+                del self._entries[key]
+
+    # Entries
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.metrics['evictions'] += 1
+
+    def _count(self, metric):
+        with self._lock:
+            self.metrics[metric] += 1
+
+    def lookup(self, key):
+        """Cached completion for ``key`` or None, counted as a hit or a miss"""
+        value = self.get(key)
+        self._count('hits' if value is not None else 'misses')
+        return value
+
+    # Cached, coalesced calls
+
+    def get_or_call(self, key, call):
+        """Cached completion for ``key``, else ``call()`` - shared with identical calls in flight"""
+        if not self.enabled:
+            return call()
+        value = self.lookup(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            self._count('coalesced')
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            self._count('upstream_calls')
+            flight.result = call()
+            if flight.result:
+                self.set(key, flight.result)
+            return flight.result
+        except Exception as e:
+            self._count('upstream_errors')
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    async def aget_or_call(self, key, call):
+        """Async get_or_call; ``call`` returns an awaitable"""
+        if not self.enabled:
+            return await call()
+        value = self.lookup(key)
+        if value is not None:
+            return value
+
+        flight_key = (asyncio.get_running_loop(), key)
+        with self._lock:
+            future = self._async_flights.get(flight_key)
+            leader = future is None
+            if leader:
+                future = self._async_flights[flight_key] = asyncio.get_running_loop().create_future()
+        if not leader:
+            self._count('coalesced')
+            # shield: a cancelled follower must not cancel the leader's result
+            return await asyncio.shield(future)
+
+        try:
+            self._count('upstream_calls')
+            result = await call()
+            if result:
+                self.set(key, result)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                # The leader's request went away - followers fall back like on any upstream error
+                future.set_exception(RuntimeError('Coalesced LLM request was cancelled'))
+            else:
+                self._count('upstream_errors')
+                future.set_exception(e)
+            # Followers see the error; don't warn about it never being retrieved
+            future.exception()
+            raise
+        finally:
+            with self._lock:
+                self._async_flights.pop(flight_key, None)
+
+    def record_streamed(self, key, text):
+        """Cache a completion that was streamed to the caller"""
+        if self.enabled and text:
+            self.set(key, text)
+
+    def stats(self):
+        with self._lock:
+            metrics = dict(self.metrics)
+            entries = len(self._entries)
+        lookups = metrics['hits'] + metrics['misses']
+        saved = metrics['hits'] + metrics['coalesced']
+        return {
+            'enabled': self.enabled,
+            'entries': entries,
+            'max_entries': self.max_entries,
+            'ttl': self.ttl,
+            **metrics,
+            'hit_ratio': round(metrics['hits'] / lookups, 3) if lookups else 0.0,
+            'upstream_calls_saved': saved,
+        }
+
+
+llm_cache = LLMResponseCache()
+
+
+def invalidate_job(job_id):
+    llm_cache.invalidate(f'job:{job_id}')
+
+
+def job_namespace(job_id):
+    return f'job:{job_id}' if job_id else None
@@ -0,0 +1,316 @@
+import os
+import asyncio
+import threading
+import logging
+import weakref
+
+import httpx
+from openai import OpenAI, AsyncOpenAI
+from decouple import config
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401 - httpx needs it for HTTP/2 (pinned in requirements.txt)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+    logger.warning("h2 is not installed - LLM clients fall back to HTTP/1.1")
+
+
+class _PoolStatsMixin:
+    """Counts requests and new connections on an httpx transport for pool stats.
+
+    Only httpcore's public ``ConnectionPool.connections`` is read: a
+    connection not seen before is counted as opened. A request stays in
+    flight until its response is closed, since a streamed answer holds its
+    connection until then.
+    """
+
+    def _init_stats(self, http2):
+        self._stats_lock = threading.Lock()
+        self._seen_connections = weakref.WeakSet()
+        self._http2 = http2
+        self.requests_sent = 0
+        self.requests_in_flight = 0
+        self.connections_opened = 0
+
+    def _request_started(self):
+        with self._stats_lock:
+            self.requests_sent += 1
+            self.requests_in_flight += 1
+
+    def _request_finished(self):
+        connections = list(self._pool.connections)
+        with self._stats_lock:
+            self.requests_in_flight -= 1
+            for connection in connections:
+                if connection not in self._seen_connections:
+                    self._seen_connections.add(connection)
+                    self.connections_opened += 1
+
+    def _finish_once(self):
+        finished = []
+
+        def finish():
+            if not finished:
+                finished.append(True)
+                self._request_finished()
+        return finish
+
+    def pool_stats(self):
+        """Pool counters for the health check.
+
+        ``requests_waiting`` is requests in flight minus busy connections:
+        exact for HTTP/1.1, where a busy connection carries one request, and
+        None for HTTP/2 pools, where it carries several. ``requests_reused_approx``
+        is requests minus connections opened - approximate, since a connection
+        opened and dropped between two reads of the pool is never seen.
+        """
+        connections = list(self._pool.connections)
+        with self._stats_lock:
+            requests_sent = self.requests_sent
+            requests_in_flight = self.requests_in_flight
+            connections_opened = self.connections_opened
+        idle = sum(1 for connection in connections if connection.is_idle())
+        busy = len(connections) - idle
+        return {
+            'connections_open': len(connections),
+            'connections_idle': idle,
+            'connections_opened': connections_opened,
+            'requests': requests_sent,
+            'requests_reused_approx': max(0, requests_sent - connections_opened),
+            'requests_in_flight': requests_in_flight,
+            'requests_waiting': None if self._http2 else max(0, requests_in_flight - busy),
+        }
+
+
+class _CountedStream(httpx.SyncByteStream):
+    """Response body that ends its request's time in flight when closed"""
+
+    def __init__(self, stream, finish):
+        self._stream = stream
+        self._finish = finish
+
+    def __iter__(self):
+        yield from self._stream
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            self._finish()
+
+
+class _AsyncCountedStream(httpx.AsyncByteStream):
+
+    def __init__(self, stream, finish):
+        self._stream = stream
+        self._finish = finish
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            self._finish()
+
+
+class _PoolTransport(_PoolStatsMixin, httpx.HTTPTransport):
+
+    def __init__(self, http2=False, **kwargs):
+        super().__init__(http2=http2, **kwargs)
+        self._init_stats(http2)
+
+    def handle_request(self, request):
+        self._request_started()
+        finish = self._finish_once()
+        try:
+            response = super().handle_request(request)
+        except BaseException:
+            finish()
+            raise
+        response.stream = _CountedStream(response.stream, finish)
+        return response
+
+
+class _AsyncPoolTransport(_PoolStatsMixin, httpx.AsyncHTTPTransport):
+
+    def __init__(self, http2=False, **kwargs):
+        super().__init__(http2=http2, **kwargs)
+        self._init_stats(http2)
+
+    async def handle_async_request(self, request):
+        self._request_started()
+        finish = self._finish_once()
+        try:
+            response = await super().handle_async_request(request)
+        except BaseException:
+            finish()
+            raise
+        response.stream = _AsyncCountedStream(response.stream, finish)
+        return response
+
+
+class LLMClientRegistry:
+    """Process-wide OpenAI clients with keep-alive connection pools.
+
+    One client is kept per (base_url, model). Clients are shared between
+    threads and rebuilt in a forked child, since gunicorn preloads the app
+    and sockets inherited from the master must not be reused.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._clients = {}
+        # Async clients are bound to the event loop that created them
+        self._async_clients = weakref.WeakKeyDictionary()
+        self._api_key = None
+
+    def _reset_after_fork(self):
+        # Drop (don't close) inherited clients - the parent still owns the sockets
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._clients = {}
+        self._async_clients = weakref.WeakKeyDictionary()
+
+    def _check_pid(self):
+        if self._pid != os.getpid():
+            self._reset_after_fork()
+
+    def api_key(self):
+        """NVIDIA API key, read from the environment once per process"""
+        if self._api_key is None:
+            try:
+                self._api_key = config('NVIDIA_API_KEY', default='')
+            except Exception:
+                self._api_key = ''
+        return self._api_key
+
+    def pool_limits(self):
+        return httpx.Limits(
+            max_connections=getattr(settings, 'LLM_POOL_MAX_CONNECTIONS', 20),
+            max_keepalive_connections=getattr(settings, 'LLM_POOL_MAX_KEEPALIVE', 10),
+            keepalive_expiry=getattr(settings, 'LLM_POOL_KEEPALIVE_EXPIRY', 30.0),
+        )
+
+    def _build_client(self, base_url, api_key, is_async=False):
+        http2 = getattr(settings, 'LLM_HTTP2', True) and HTTP2_AVAILABLE
+        timeout = httpx.Timeout(30.0, connect=5.0)
+        if is_async:
+            transport = _AsyncPoolTransport(limits=self.pool_limits(), http2=http2)
+            http_client = httpx.AsyncClient(transport=transport, timeout=timeout)
+            client = AsyncOpenAI(base_url=base_url, api_key=api_key, http_client=http_client)
+        else:
+            transport = _PoolTransport(limits=self.pool_limits(), http2=http2)
+            http_client = httpx.Client(transport=transport, timeout=timeout)
+            client = OpenAI(base_url=base_url, api_key=api_key, http_client=http_client)
+        logger.info(f"🔌 Created pooled {'async ' if is_async else ''}LLM client for {base_url} (pid={os.getpid()}, http2={http2})")
+        return {'client': client, 'transport': transport, 'http2': http2, 'async': is_async}
+
+    def get_client(self, base_url, model, timeout=None):
+        """Return the shared client for ``base_url``/``model``, or None without an API key"""
+        api_key = self.api_key()
+        if not api_key:
+            return None
+
+        self._check_pid()
+        key = (base_url, model)
+        entry = self._clients.get(key)
+        if entry is None:
+            with self._lock:
+                entry = self._clients.get(key)
+                if entry is None:
+                    entry = self._build_client(base_url, api_key)
+                    self._clients[key] = entry
+
+        client = entry['client']
+        if timeout:
+            # with_options shares the underlying httpx pool
+            client = client.with_options(timeout=timeout)
+        return client
+
+    def get_async_client(self, base_url, model, timeout=None):
+        """Async variant of get_client - one pool per (base_url, model) per event loop"""
+        api_key = self.api_key()
+        if not api_key:
+            return None
+
+        self._check_pid()
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            loop_clients = self._async_clients.setdefault(loop, {})
+            entry = loop_clients.get((base_url, model))
+            if entry is None:
+                entry = self._build_client(base_url, api_key, is_async=True)
+                loop_clients[(base_url, model)] = entry
+
+        client = entry['client']
+        if timeout:
+            client = client.with_options(timeout=timeout)
+        return client
+
+    def stats(self):
+        """Pool statistics per (base_url, model) for the current process"""
+        self._check_pid()
+        with self._lock:
+            entries = list(self._clients.items())
+            for loop_clients in list(self._async_clients.values()):
+                entries.extend(loop_clients.items())
+        return {
+            'pid': os.getpid(),
+            'pools': [
+                dict(base_url=base_url, model=model, http2=entry['http2'], is_async=entry['async'], **entry['transport'].pool_stats())
+                for (base_url, model), entry in entries
+            ],
+        }
+
+    def close_all(self):
+        """Close every pooled client, sync and async.
+
+        An async client is closed on its own loop: scheduled there if the
+        loop is running, run to completion if it is stopped, and skipped if
+        the loop is already closed.
+        """
+        with self._lock:
+            entries = list(self._clients.values())
+            async_entries = [(loop, entry) for loop, loop_clients in list(self._async_clients.items()) for entry in loop_clients.values()]
+            self._clients = {}
+            self._async_clients = weakref.WeakKeyDictionary()
+        for entry in entries:
+            try:
+                entry['client'].close()
+            except Exception as e:
+                logger.warning(f"Error closing LLM client: {e}")
+        for loop, entry in async_entries:
+            try:
+                if loop.is_closed():
+                    continue
+                if loop.is_running():
+                    asyncio.run_coroutine_threadsafe(entry['client'].close(), loop)
+                else:
+                    loop.run_until_complete(entry['client'].close())
+            except Exception as e:
+                logger.warning(f"Error closing async LLM client: {e}")
+
+llm_clients = LLMClientRegistry()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=llm_clients._reset_after_fork)
+
+
+def get_llm_client(base_url, model, timeout=None):
+    return llm_clients.get_client(base_url, model, timeout=timeout)
+
+
+def get_async_llm_client(base_url, model, timeout=None):
+    return llm_clients.get_async_client(base_url, model, timeout=timeout)
+
+
+def get_llm_pool_stats():
+    return llm_clients.stats()
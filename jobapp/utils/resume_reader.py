@@ -1,7 +1,12 @@
 import os
+import io
+import hashlib
+import logging
 import fitz  # PyMuPDF
 import docx
 
+logger = logging.getLogger(__name__)
+
 def extract_resume_text(resume_file):
     ext = os.path.splitext(resume_file.name)[1].lower()
 
@@ -21,3 +26,68 @@ def extract_resume_text(resume_file):
 
     else:
         return "Unsupported file format."
+
+
+def _resume_cache_name(path):
+    """Cache key for a resume path - relative to MEDIA_ROOT when possible"""
+    from django.conf import settings
+    path = os.path.abspath(path)
+    media_root = os.path.abspath(str(settings.MEDIA_ROOT))
+    if path.startswith(media_root + os.sep):
+        return os.path.relpath(path, media_root).replace(os.sep, '/')
+    return path
+
+
+def get_resume_text_for_path(path):
+    """Return resume text for a file on disk, extracting it only on a cache miss.
+
+    The cache is keyed by path and validated by size and mtime; a changed
+    mtime with identical contents (same SHA-256) reuses the stored text.
+    """
+    from jobapp.models import ResumeText
+
+    file_name = _resume_cache_name(path)
+    stat = os.stat(path)
+
+    cached = ResumeText.objects.filter(file_name=file_name).first()
+    if cached and cached.file_size == stat.st_size and cached.file_mtime == stat.st_mtime:
+        return cached.text
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    content_hash = hashlib.sha256(data).hexdigest()
+
+    same_content = cached if cached and cached.content_hash == content_hash else \
+        ResumeText.objects.filter(content_hash=content_hash).first()
+    if same_content:
+        text = same_content.text
+    else:
+        resume_file = io.BytesIO(data)
+        resume_file.name = path
+        text = extract_resume_text(resume_file)
+        logger.info(f"📄 Extracted resume text for {file_name} ({len(text)} chars)")
+
+    ResumeText.objects.update_or_create(
+        file_name=file_name,
+        defaults={
+            'file_size': stat.st_size,
+            'file_mtime': stat.st_mtime,
+            'content_hash': content_hash,
+            'text': text,
+        }
+    )
+    return text
+
+
+def get_resume_text(field_file):
+    """Return resume text for a FileField value (Profile, Candidate or Application resume)"""
+    return get_resume_text_for_path(field_file.path)
+
+
+def cache_resume_text(field_file):
+    """Fill the resume text cache at upload time; never raises"""
+    try:
+        if field_file and os.path.exists(field_file.path):
+            get_resume_text(field_file)
+    except Exception as e:
+        logger.warning(f"Could not cache resume text for {getattr(field_file, 'name', field_file)}: {e}")
@@ -1,10 +1,10 @@
 from django.shortcuts import render,redirect, get_object_or_404 , HttpResponse
 from django.contrib.auth import login, authenticate, logout
-from .forms import UserRegistrationForm, LoginForm , ProfileForm, JobForm, ApplicationForm, ScheduleInterviewForm , AddCandidateForm, ScheduleInterviewWithCandidateForm
-from .models import CustomUser , Profile, Job, Application , Interview, Candidate
+from .forms import UserRegistrationForm, LoginForm , ProfileForm, JobForm, ApplicationForm, ScheduleInterviewForm , AddCandidateForm, ScheduleInterviewWithCandidateForm, CandidateImportForm, BulkScheduleInterviewForm
+from .models import CustomUser , Profile, Job, Application , Interview, Candidate, RecordingUpload
 from django.contrib.auth.decorators import login_required , user_passes_test 
-from django.views.decorators.http import require_http_methods
-from django.http import HttpResponseForbidden , JsonResponse, Http404, FileResponse
+from django.views.decorators.http import condition, require_http_methods
+from django.http import HttpResponseForbidden , JsonResponse, Http404, FileResponse, StreamingHttpResponse
 from django.core.exceptions import PermissionDenied, ValidationError
 from django.middleware.csrf import CsrfViewMiddleware
 from django.db.models import Q
@@ -15,12 +15,14 @@ User = get_user_model()
 from datetime import datetime
 from django.contrib.auth import get_backends
 from django.urls import reverse
+from django.template.loader import render_to_string
 import os
 import uuid
 import base64
 import tempfile
 from gtts import gTTS
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.contrib import messages
 from django.http import JsonResponse
 from jobapp.tts import generate_tts, generate_google_tts
@@ -28,6 +30,13 @@ import json
 from django.conf import settings
 import logging
 from .health import health_check, readiness_check
+from .interview_state import InterviewState, pair_turns, turn_stats
+from asgiref.sync import sync_to_async
+from . import interview_phrases
+from .search import SEARCH_ORDERING, search_jobs
+from .pagination import InvalidCursor, KeysetPage, approximate_count, page_url, paginate
+from . import dashboard, fragment_cache, http_cache, media_delivery, recording_upload
+from .tasks import enqueue_interview_results, enqueue_status_email, enqueue_recording_processing, get_interview_results_task
 
 
 
@@ -49,9 +58,8 @@ from django.db import connection
 from django.core.exceptions import FieldError
 from django.views.static import serve
 
-from django.core.mail import send_mail
 from .email_utils import send_interview_link_email, test_email_configuration, get_email_settings_info
-from django.core.mail import send_mail
+from .outbox import queue_email
 
 
 from django.db import connection, transaction
@@ -69,7 +77,7 @@ if not logger.handlers:
 
 
 def send_interview_status_email(interview, status_type):
-    """Send email notification for interview status changes"""
+    """Queue the email notification for an interview status change"""
     try:
         if status_type == 'expired':
             subject = f'Interview Deadline Passed - {interview.job.title}'
@@ -110,52 +118,13 @@ HR Team
         else:
             return False
         
-        # Send the email
-        try:
-            # Check if we're using console backend
-            from django.conf import settings
-            is_console_backend = 'console' in settings.EMAIL_BACKEND.lower()
-            
-            send_mail(
-                subject,
-                message,
-                settings.DEFAULT_FROM_EMAIL,
-                [interview.candidate_email],
-                fail_silently=False  # Show email errors for debugging
-            )
-            
-            if is_console_backend:
-                logger.info(f"📧 Status email logged to console for {interview.candidate_email} (interview {interview.uuid}) - Type: {status_type}")
-                logger.info(f"""
-                ==========================================
-                📧 EMAIL CONTENT (CONSOLE OUTPUT):
-                ==========================================
-                To: {interview.candidate_email}
-                Subject: {subject}
-                
-                {message}
-                ==========================================
-                💡 NOTE: Email was sent to console. To send real emails, configure SMTP settings.
-                """)
-            else:
-                logger.info(f"✅ Status email sent successfully to {interview.candidate_email} for interview {interview.uuid} - Type: {status_type}")
-            
-            return True
-            
-        except Exception as email_error:
-            logger.error(f"❌ Email sending failed for {interview.candidate_email}: {email_error}")
-            # Log the email content for manual sending if needed
-            logger.info(f"""
-            ==========================================
-            📧 EMAIL CONTENT (FAILED TO SEND):
-            ==========================================
-            To: {interview.candidate_email}
-            Subject: {subject}
-            
-            {message}
-            ==========================================
-            """)
-            return False
+        # Queue the email - the outbox worker delivers it
+        queue_email(
+            interview.candidate_email, subject, message,
+            key=f'status_email:{interview.uuid}:{status_type}',
+        )
+        logger.info(f"📧 Status email queued for {interview.candidate_email} (interview {interview.uuid}) - Type: {status_type}")
+        return True
         
     except Exception as e:
         logger.error(f"Failed to send status email for interview {interview.uuid}: {e}")
@@ -164,15 +133,27 @@ HR Team
 
 #for Ai interview
 try:
-    from .utils.interview_ai_nvidia import ask_ai_question 
-    from jobapp.utils.resume_reader import extract_resume_text
+    from .utils.interview_ai_nvidia import ask_ai_question, ask_ai_question_async, ask_ai_question_stream, split_sentences, clean_text
+    from jobapp.utils.resume_reader import extract_resume_text, get_resume_text, get_resume_text_for_path
     from .asr import transcribe_audio
 except ImportError as e:
     print(f"Import error: {e}")
-    def ask_ai_question(prompt, candidate_name=None, job_title=None, company_name=None , timeout=None):
+    def ask_ai_question(prompt, candidate_name=None, job_title=None, company_name=None , timeout=None, job_id=None):
         return "AI service is currently unavailable. Please try again later."
+    async def ask_ai_question_async(prompt, candidate_name=None, job_title=None, company_name=None, timeout=None, job_id=None):
+        return "AI service is currently unavailable. Please try again later."
+    def ask_ai_question_stream(prompt, candidate_name=None, job_title=None, company_name=None, timeout=None, job_id=None):
+        return iter(())
+    def split_sentences(buffer):
+        return [], buffer
+    def clean_text(text):
+        return text.strip()
     def extract_resume_text(resume_file):
         return "Resume processing is currently unavailable."
+    def get_resume_text(field_file):
+        return "Resume processing is currently unavailable."
+    def get_resume_text_for_path(path):
+        return "Resume processing is currently unavailable."
     def transcribe_audio(audio_file):
         return {'success': False, 'text': '', 'error': 'ASR not available'}
 
@@ -356,8 +337,11 @@ def post_job(request):
 
 # Job List view
 def job_list(request):
-    from django.core.paginator import Paginator
-    
+    """Public job list, served from a response cache until a job changes (see jobapp.http_cache)"""
+    return http_cache.cached_job_list(request, lambda: _render_job_list(request))
+
+
+def _render_job_list(request):
     search_query = request.GET.get('search', '')
     status_filter = request.GET.get('status', '')
     job_type_filter = request.GET.get('job_type', '')
@@ -365,10 +349,6 @@ def job_list(request):
     # Start with all jobs
     jobs = Job.objects.all().order_by('-date_posted')
     
-    # Apply search filter
-    if search_query:
-        jobs = jobs.filter(title__icontains=search_query)
-    
     # Apply status filter
     if status_filter:
         if status_filter == 'open':
@@ -380,25 +360,57 @@ def job_list(request):
     if job_type_filter:
         jobs = jobs.filter(employment_type=job_type_filter)
     
-    # Pagination - 5 jobs per page
-    paginator = Paginator(jobs, 5)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Apply search - ranked full-text match over title, skills, tags, company, location and description
+    keys = ('-date_posted', '-id')
+    if search_query:
+        jobs = search_jobs(search_query, jobs)
+        keys = SEARCH_ORDERING
     
-    no_results = not jobs.exists()
-
-    return render(request, 'jobapp/job_list.html', {
+    # Keyset pagination - 5 jobs per page, deep pages cost the same as the first
+    cursor = request.GET.get('cursor')
+    try:
+        page_obj = paginate(jobs, keys, cursor, page_size=5)
+    except InvalidCursor:
+        cursor = None
+        page_obj = paginate(jobs, keys, page_size=5)
+    
+    # The total is only shown next to the pager - a single page needs no COUNT
+    if page_obj.has_other_pages:
+        job_count, job_count_exact = approximate_count(jobs)
+    else:
+        job_count, job_count_exact = len(page_obj), True
+    no_results = not page_obj.items and not cursor
+    
+    # The page is shared through the response cache, so links only carry the parameters it is keyed on
+    keep = http_cache.JOB_LIST_PARAMS
+    return render_to_string('jobapp/job_list.html', {
         'jobs': page_obj,
         'page_obj': page_obj,
+        'first_page_url': page_url(request, None, keep),
+        'next_page_url': page_url(request, page_obj.next_cursor, keep),
+        'previous_page_url': page_url(request, page_obj.previous_cursor, keep),
+        'job_count': job_count,
+        'job_count_exact': job_count_exact,
         'search_query': search_query,
         'no_results': no_results
-    })
+    }, request=request)
 
  
 
 
 
-# Job Detail view
+def job_search_suggest(request):
+    """Search-as-you-type suggestions for the job search box"""
+    query = request.GET.get('q', '').strip()
+    if len(query) < 2:
+        return JsonResponse({'results': []})
+    
+    jobs = search_jobs(query, Job.objects.filter(status='active')).values('id', 'title', 'company', 'location')[:8]
+    return http_cache.patch_public_cache(JsonResponse({'results': list(jobs)}), request, personalised=False)
+
+
+# Job Detail view - revalidated from updated_at, see jobapp.http_cache
+@condition(etag_func=http_cache.job_detail_etag, last_modified_func=http_cache.job_detail_last_modified)
 def job_detail(request, job_id):
     job = get_object_or_404(Job, id=job_id)
     
@@ -411,7 +423,7 @@ def job_detail(request, job_id):
         'is_recruiter': is_recruiter,
         'is_job_owner': is_job_owner
     }
-    return render(request, 'jobapp/job_detail.html', context)
+    return http_cache.patch_public_cache(render(request, 'jobapp/job_detail.html', context), request)
 
 
 
@@ -484,6 +496,20 @@ def apply_to_job(request, job_id):
 #job seeker Dashboard
 @login_required
 def jobseeker_dashboard(request):
+    """Job seeker dashboard, cached per user until their applications, interviews or profile change"""
+    def render_page():
+        response = _render_jobseeker_dashboard(request)
+        # Interview links turn into "expired" when a deadline passes
+        return response.content.decode(), fragment_cache.seconds_until_next(response.interview_deadlines)
+    
+    html = fragment_cache.get_or_render(
+        request.user.pk, 'jobseeker_dashboard', fragment_cache.SEEKER_SECTIONS, render_page,
+        *fragment_cache.vary_on_request(request)
+    )
+    return HttpResponse(html)
+
+
+def _render_jobseeker_dashboard(request):
     applications = Application.objects.filter(applicant=request.user)
     try:
         profile = Profile.objects.filter(user=request.user).first()
@@ -515,11 +541,13 @@ def jobseeker_dashboard(request):
     # Debug logging
     logger.info(f"Dashboard for {request.user.username}: {len(applications)} applications, {len(scheduled_interviews)} interviews")
     
-    return render(request, 'jobapp/jobseeker_dashboard.html', {
+    response = render(request, 'jobapp/jobseeker_dashboard.html', {
         'applications': applications, 
         'profile': profile,
         'scheduled_interviews': scheduled_interviews
-    })        
+    })
+    response.interview_deadlines = [interview.scheduled_at for interview in scheduled_interviews]
+    return response
 
 # The old recruiter_dashboard function has been replaced with the cleaner version below
 
@@ -552,7 +580,6 @@ def update_job_status(request, job_id):
 
 @login_required
 def schedule_interview(request, job_id, applicant_id):
-    from django.core.mail import send_mail
     from django.conf import settings
     
     logger.info(f"Schedule interview accessed by user {request.user.id} (is_recruiter: {request.user.is_recruiter}) for job {job_id}, applicant {applicant_id}")
@@ -610,16 +637,13 @@ Best regards,
 HR Team
 {interview.job.company}"""
                 
-                send_mail(
-                    email_subject,
-                    email_body,
-                    settings.DEFAULT_FROM_EMAIL,
-                    [interview.candidate_email],
-                    fail_silently=False  # Show email errors for debugging
+                queue_email(
+                    interview.candidate_email, email_subject, email_body,
+                    key=f'interview_scheduled:{interview.uuid}',
                 )
-                messages.success(request, f'Interview scheduled successfully! Email sent to {interview.candidate_email} with interview link.')
+                messages.success(request, f'Interview scheduled successfully! Email to {interview.candidate_email} with the interview link is on its way.')
             except Exception as e:
-                logger.warning(f'Email sending failed for interview {interview.uuid}: {str(e)}')
+                logger.warning(f'Email queueing failed for interview {interview.uuid}: {str(e)}')
                 messages.warning(request, f'Interview scheduled successfully! Email could not be sent, but the candidate can see the interview link on their dashboard.')
             
             return redirect('recruiter_dashboard')
@@ -648,7 +672,6 @@ HR Team
 @user_passes_test(lambda u: u.is_recruiter)
 def schedule_interview_simple(request):
     """Simple schedule interview for candidates added by recruiters"""
-    from django.core.mail import send_mail
     from django.conf import settings
     from django.urls import reverse
     
@@ -748,11 +771,44 @@ def schedule_interview_simple(request):
         'form': form
     })
 
+@login_required
+@user_passes_test(lambda u: u.is_recruiter)
+@require_http_methods(["POST"])
+def bulk_schedule_interviews(request):
+    """Schedule one job's interview for many candidates at once (see jobapp.bulk_schedule)"""
+    from .bulk_schedule import schedule_interviews
+    
+    form = BulkScheduleInterviewForm(request.POST, user=request.user)
+    if not form.is_valid():
+        return JsonResponse({'success': False, 'errors': form.errors}, status=400)
+    
+    try:
+        interviews, skipped = schedule_interviews(
+            request.user,
+            form.cleaned_data['job'],
+            form.cleaned_data['candidates'],
+            form.cleaned_data['scheduled_at'],
+            form.cleaned_data['interview_duration_minutes'],
+        )
+    except Exception as e:
+        logger.error(f"Bulk scheduling failed for {request.user.username}: {e}")
+        return JsonResponse({'success': False, 'message': f'Error scheduling interviews: {str(e)}'}, status=500)
+    
+    message = f'{len(interviews)} interviews scheduled, invitations are on their way.' if interviews else 'No new interviews scheduled.'
+    if skipped:
+        message += f' {len(skipped)} candidates already had an interview scheduled for this job.'
+    return JsonResponse({
+        'success': True,
+        'message': message,
+        'scheduled': len(interviews),
+        'skipped': [candidate.email for candidate in skipped],
+    })
+
+
 @login_required
 @user_passes_test(lambda u: u.is_recruiter) 
 def schedule_interview_with_candidate(request, candidate_id):
     """Schedule interview with a specific candidate"""
-    from django.core.mail import send_mail
     from django.conf import settings
     from django.urls import reverse
     
@@ -798,19 +854,16 @@ Best regards,
 {request.user.get_full_name() or request.user.username}
 {interview.job.company}"""
                     
-                    send_mail(
-                        email_subject,
-                        email_body,
-                        settings.DEFAULT_FROM_EMAIL,
-                        [interview.candidate_email],
-                        fail_silently=False
+                    queue_email(
+                        interview.candidate_email, email_subject, email_body,
+                        key=f'interview_scheduled:{interview.uuid}',
                     )
                     
-                    messages.success(request, f'Interview scheduled successfully! Email sent to {interview.candidate_email}.')
-                    logger.info(f"Email sent successfully to {interview.candidate_email}")
+                    messages.success(request, f'Interview scheduled successfully! Email to {interview.candidate_email} is on its way.')
+                    logger.info(f"Email queued for {interview.candidate_email}")
                     
                 except Exception as e:
-                    logger.warning(f'Email sending failed: {str(e)}')
+                    logger.warning(f'Email queueing failed: {str(e)}')
                     messages.warning(request, 'Interview scheduled successfully! Email could not be sent.')
                 
                 return redirect('recruiter_dashboard')
@@ -849,7 +902,7 @@ def interview_ready(request, interview_uuid):
         # Check if interview is completed
         if interview.is_completed:
             # Send completion email if not sent already
-            send_interview_status_email(interview, 'completed')
+            enqueue_status_email(interview, 'completed')
             return HttpResponse(
                 f'<div style="text-align: center; padding: 50px; font-family: Arial, sans-serif;">'
                 f'<h2>Interview Already Completed</h2>'
@@ -864,7 +917,7 @@ def interview_ready(request, interview_uuid):
         # Check if interview deadline has passed
         if interview.is_expired:
             # Send expiration email
-            send_interview_status_email(interview, 'expired')
+            enqueue_status_email(interview, 'expired')
             return HttpResponse(
                 f'<div style="text-align: center; padding: 50px; font-family: Arial, sans-serif;">'
                 f'<h2>Interview Deadline Passed</h2>'
@@ -894,6 +947,670 @@ def interview_ready(request, interview_uuid):
             
             
             
+# Short phrases candidates use to check their microphone rather than answer
+AUDIO_CHECK_PHRASES = [
+    'can you hear me', 'can you hear me can you hear me',
+    'hello can you hear me', 'can you hear', 'audio test', 'hello hello',
+    'testing testing', 'test test', 'hello', 'testing', 'test',
+    'i am can you hear me', 'hello hello hello', 'hello mam can you hear me',
+    'can you hear me mam', 'hello mam', 'mam can you hear me'
+]
+
+
+def _parse_interview_turn(request):
+    """Read the candidate's answer and the time remaining from a turn request.
+
+    Returns ``(user_text, time_remaining, error_response)``; ``error_response``
+    is a ready JsonResponse when the turn cannot be processed.
+    """
+    try:
+        user_text = ""
+        time_remaining = 900
+        
+        # Check if audio file was uploaded (Whisper ASR mode)
+        if 'audio' in request.FILES:
+            audio_file = request.FILES['audio']
+            logger.info(f"🎤 Audio file received: {audio_file.name} ({audio_file.size} bytes)")
+            
+            # Transcribe audio to text using Whisper
+            transcription_result = transcribe_audio(audio_file)
+            
+            if transcription_result['success']:
+                user_text = transcription_result['text']
+                logger.info(f"✅ Whisper transcription: {user_text}")
+                
+                # Get time_remaining from form data
+                try:
+                    time_remaining = int(request.POST.get("time_remaining", 900))
+                except (ValueError, TypeError):
+                    time_remaining = 900
+            else:
+                logger.error(f"❌ Whisper transcription failed: {transcription_result['error']}")
+                return "", time_remaining, JsonResponse({
+                    'error': 'Server-side speech recognition not available. Please use Chrome or Edge browser.',
+                    'response': 'Please use Chrome or Edge browser for speech recognition, or type your response.',
+                    'audio': '',
+                    'audio_duration': 3.0,
+                    'success': False,
+                    'transcription_error': transcription_result['error']
+                })
+        
+        # Handle text input (existing Web Speech API mode)
+        elif request.content_type == 'application/json':
+            data = json.loads(request.body)
+            user_text = data.get("text") or data.get("message")
+            time_remaining = int(data.get("time_remaining", 900))
+        else:
+            user_text = request.POST.get("text", "")
+            try:
+                time_remaining = int(request.POST.get("time_remaining", 900))
+            except (ValueError, TypeError):
+                time_remaining = 900
+                
+    except Exception as e:
+        logger.error(f"Error parsing request data: {e}")
+        user_text = request.POST.get("text", "")
+        time_remaining = 900  # Default 15 minutes
+        
+    # LOG for debugging
+    logger.info(f"Parsed time_remaining: {time_remaining} seconds ({time_remaining/60:.1f} minutes)")
+    
+    user_text = user_text or ""
+    if not user_text.strip():
+        return user_text, time_remaining, JsonResponse({
+            'error': 'Please provide a response.',
+            'response': 'I didn\'t receive your answer. Could you please respond?',
+            'audio': '',
+            'audio_duration': 3.0,
+            'success': False
+        })
+    
+    return user_text, time_remaining, None
+
+
+def _check_interview_turn(context, user_text, interview_uuid):
+    """Reject turns for finished interviews and rapid duplicate submissions"""
+    # Check if interview is already completed
+    if context.get('interview_completed', False):
+        logger.warning(f"Interview {interview_uuid} already marked as completed, returning completion message")
+        return JsonResponse({
+            'error': 'Interview already completed',
+            'response': 'Thank you! Your interview has been completed.',
+            'audio': '',
+            'audio_duration': 2.0,
+            'is_final': True,
+            'success': True
+        })
+    
+    # Prevent duplicate processing - but be more lenient
+    last_processed = context.get('last_processed_input', '')
+    current_input_hash = hashlib.md5(user_text.encode()).hexdigest()
+    
+    # Only block if it's EXACTLY the same AND was processed within last 5 seconds
+    last_processed_time = context.get('last_processed_time', 0)
+    current_time = timezone.now().timestamp()
+    time_since_last = current_time - last_processed_time
+    
+    if last_processed == current_input_hash and time_since_last < 5:
+        logger.warning(f"Duplicate request detected for interview {interview_uuid} (within 5s), ignoring")
+        return JsonResponse({
+            'error': 'Duplicate request detected',
+            'response': 'Please wait for the previous response to complete.',
+            'audio': '',
+            'audio_duration': 2.0,
+            'success': False
+        })
+    
+    context['last_processed_input'] = current_input_hash
+    context['last_processed_time'] = current_time
+    
+    logger.info(f"Processing new response (hash: {current_input_hash[:8]}...)")
+    return None
+
+
+def _answer_ms(conversation_history, received_at):
+    """Milliseconds since the interviewer's last turn, or None"""
+    for entry in reversed(conversation_history):
+        if entry.get('speaker') == 'interviewer':
+            asked_at = parse_datetime(entry['timestamp']) if isinstance(entry.get('timestamp'), str) else None
+            return max(0, int((received_at - asked_at).total_seconds() * 1000)) if asked_at else None
+    return None
+
+
+def _begin_interview_turn(interview, context, user_text, time_remaining):
+    """Record the candidate's answer and decide how the interviewer replies.
+
+    Returns a turn dict. ``turn['response']`` holds the scripted reply for
+    time-up, last-question and audio-check turns; otherwise it is None and
+    ``turn['prompt']`` holds the conversation context for the AI.
+    """
+    candidate_name = context.get('candidate_name') or "the candidate"
+    job_title = context.get('job_title') or "Software Developer"
+    company_name = context.get('company_name') or "Our Company"
+    
+    # Get current question count and increment
+    current_count = context.get('question_count', 0)
+    question_count = current_count + 1
+    context['question_count'] = question_count
+    
+    logger.info(f"Question count incremented from {current_count} to {question_count} for interview {interview.uuid}")
+    
+    # Check if this should be the last question (2 minutes or less remaining)
+    is_last_question = time_remaining <= 120  # 2 minutes = 120 seconds
+    is_time_up = time_remaining <= 30  # 30 seconds or less
+    
+    # LOG the decision logic
+    logger.info(f"Interview timing check - Time: {time_remaining}s, Last Question: {is_last_question}, Time Up: {is_time_up}")
+    
+    # More precise audio issue detection - must be exact match and short
+    user_text_lower = user_text.lower().strip()
+    is_simple_audio_issue = (
+        any(phrase == user_text_lower for phrase in AUDIO_CHECK_PHRASES) and 
+        len(user_text_lower) <= 30  # Must be short
+    )
+    
+    # Build conversation history
+    conversation_history = context.get('conversation_history', [])
+    
+    received_at = timezone.now()
+    
+    # Only add to conversation history if it's not a simple audio test
+    if not is_simple_audio_issue:
+        conversation_history.append({
+            'speaker': 'candidate',
+            'message': user_text,
+            'question_number': question_count,
+            'timestamp': received_at.isoformat(),
+            'time_remaining': time_remaining,
+            'answer_ms': _answer_ms(conversation_history, received_at),
+        })
+    else:
+        logger.info(f"Skipping conversation history for audio test: {user_text}")
+    
+    context['conversation_history'] = conversation_history
+    logger.info(f"Content analysis - Audio issue: {is_simple_audio_issue}, User text: '{user_text_lower}'")
+    
+    turn = {
+        'question_count': question_count,
+        'time_remaining': time_remaining,
+        'is_simple_audio_issue': is_simple_audio_issue,
+        'conversation_history': conversation_history,
+        'candidate_last_response': '',
+        'response': None,
+        'prompt': None,
+        'received_at': received_at,
+        'job_id': interview.job_id,
+    }
+    
+    if is_time_up:
+        # Time is up - end the interview
+        turn['response'] = interview_phrases.render(interview_phrases.TIME_UP, candidate_name, job_title, company_name)
+        
+        context['interview_completed'] = True
+        # Mark interview as completed in database
+        interview.status = 'completed'
+        interview.completed_at = timezone.now()
+        # Ensure started_at is set if not already
+        if not interview.started_at:
+            interview.started_at = timezone.now() - timezone.timedelta(minutes=15)  # Estimate 15 minutes ago
+        interview.save()
+        logger.info(f"Interview time completed for {interview.uuid}")
+        
+    elif is_last_question:
+        # 2 minutes or less - notify this is the last question
+        follow_up_questions = [
+            interview_phrases.render(template, candidate_name, job_title, company_name)
+            for template in interview_phrases.LAST_QUESTIONS
+        ]
+        
+        import random
+        turn['response'] = random.choice(follow_up_questions)
+        logger.info(f"Last question triggered for interview {interview.uuid} with {time_remaining}s remaining")
+        
+    elif is_simple_audio_issue:
+        # Audio test response - DON'T increment question count for audio tests
+        turn['response'] = interview_phrases.render(interview_phrases.AUDIO_CHECK, candidate_name, job_title, company_name)
+        
+        # CRITICAL FIX: Reset question count for audio issues to prevent premature completion
+        context['question_count'] = 0  # Reset to 0 for audio tests
+        turn['question_count'] = 0
+        logger.info(f"Audio test detected - resetting question count to 0")
+        
+    else:
+        # Generate intelligent follow-up questions based on candidate's response and conversation flow
+        logger.info(f"Generating conversational response for question {question_count}")
+        
+        # Get conversation context and candidate's responses
+        candidate_last_response = ""
+        previous_topics = []
+        candidate_responses = []
+        
+        for entry in conversation_history:
+            if entry['speaker'] == 'candidate':
+                candidate_responses.append(entry['message'])
+                candidate_last_response = entry['message']  # Keep updating to get the latest
+            elif entry['speaker'] == 'interviewer':
+                # Extract topics already covered
+                msg_lower = entry['message'].lower()
+                if any(word in msg_lower for word in ['technical', 'technology', 'programming', 'language']):
+                    previous_topics.append('technical_skills')
+                if any(word in msg_lower for word in ['project', 'built', 'developed']):
+                    previous_topics.append('projects')
+                if any(word in msg_lower for word in ['team', 'collaborate', 'work together']):
+                    previous_topics.append('teamwork')
+                if any(word in msg_lower for word in ['goal', 'future', 'career']):
+                    previous_topics.append('career_goals')
+        
+        # Build comprehensive context for AI conversation
+        conversation_summary = "\n".join([f"- {resp[:150]}..." for resp in candidate_responses[-3:]]) if candidate_responses else "No previous responses"
+        
+        turn['candidate_last_response'] = candidate_last_response
+        turn['prompt'] = f"""
+INTERVIEW CONTEXT:
+Candidate: {candidate_name}
+Position: {job_title} at {company_name}
+Question #{question_count}
+Topics covered: {', '.join(set(previous_topics)) if previous_topics else 'None yet'}
+
+CANDIDATE'S RECENT RESPONSES:
+{conversation_summary}
+
+LATEST RESPONSE: "{candidate_last_response}"
+
+As Sarah, respond to what they just shared. Acknowledge their answer, show genuine interest, and ask a follow-up question that builds naturally on what they said. Focus on their experience, skills, and fit for the {job_title} role.
+"""
+    
+    return turn
+
+
+def _fallback_interview_response(turn, context):
+    """Scripted reply used when the AI cannot produce one"""
+    candidate_name = context.get('candidate_name') or "the candidate"
+    job_title = context.get('job_title') or "Software Developer"
+    company_name = context.get('company_name') or "Our Company"
+    question_count = turn['question_count']
+    
+    # Enhanced fallback responses that acknowledge candidate's input
+    response_lower = turn['candidate_last_response'].lower()
+    
+    # Analyze candidate's response for emotional tone and content
+    if any(word in response_lower for word in ['nervous', 'anxious', 'worried', 'scared']):
+        opening = 'nervous'
+    elif any(word in response_lower for word in ['excited', 'passionate', 'love', 'enjoy', 'enthusiastic']):
+        opening = 'excited'
+    elif any(word in response_lower for word in ['challenge', 'difficult', 'problem', 'struggle']):
+        opening = 'challenge'
+    else:
+        opening = 'default'
+    
+    # Add contextual follow-up based on question progression and content
+    if question_count <= 3:
+        # ICE-BREAKING QUESTIONS (First 3 questions to make candidate comfortable)
+        if question_count == 1:
+            follow_up = 'greeting'
+        elif question_count == 2:
+            follow_up = 'ready'
+        else:  # question_count == 3
+            follow_up = 'begin'
+    
+    elif question_count <= 4:
+        if any(word in response_lower for word in ['python', 'javascript', 'java', 'react', 'django', 'node', 'html', 'css', 'sql']):
+            follow_up = 'tech_project'
+        elif any(word in response_lower for word in ['project', 'built', 'created', 'developed', 'application', 'website']):
+            follow_up = 'project_challenge'
+        elif any(word in response_lower for word in ['framework', 'library', 'tool', 'database']):
+            follow_up = 'tools_project'
+        else:
+            follow_up = 'proud_project'
+    #Techniacal questions
+    elif question_count <= 6:
+        if any(word in response_lower for word in ['team', 'collaborate', 'group', 'together', 'pair']):
+            follow_up = 'team_disagreement'
+        elif any(word in response_lower for word in ['problem', 'challenge', 'difficult', 'bug', 'issue', 'debug']):
+            follow_up = 'debugging'
+        elif any(word in response_lower for word in ['agile', 'scrum', 'methodology', 'process']):
+            follow_up = 'methodology'
+        else:
+            follow_up = 'teamwork'
+    #Advanced
+    else:
+        if any(word in response_lower for word in ['goal', 'future', 'career', 'grow', 'learn', 'aspiration']):
+            follow_up = 'career_goals'
+        elif any(word in response_lower for word in ['company', 'role', 'position', 'opportunity', 'culture']):
+            follow_up = 'questions'
+        elif any(word in response_lower for word in ['technology', 'innovation', 'cutting-edge', 'latest']):
+            follow_up = 'tech_trends'
+        else:
+            follow_up = 'role_interest'
+    
+    # Templates are shared with the phrase warm-up, so these replies have pre-synthesized audio
+    ai_response = interview_phrases.render(
+        interview_phrases.FALLBACK_OPENINGS[opening] + interview_phrases.FALLBACK_FOLLOW_UPS[follow_up],
+        candidate_name, job_title, company_name
+    )
+    
+    return ai_response
+
+
+def _clean_interview_ai_response(ai_response):
+    """Strip formatting from an AI reply and keep it to a speakable length"""
+    if not ai_response:
+        return ""
+    
+    # Remove any quotes or formatting that might have slipped through
+    ai_response = ai_response.replace('"', '').replace("'", "").strip()
+    if not ai_response:
+        return ""
+    
+    # Ensure it's not too long
+    if len(ai_response) > 350:
+        sentences = ai_response.split('. ')
+        if len(sentences) > 1:
+            ai_response = sentences[0] + '. ' + sentences[1] + '.'
+        else:
+            ai_response = ai_response[:347] + "..."
+    
+    # Ensure it ends properly
+    if not ai_response.endswith(('?', '.', '!')):
+        ai_response += "?"
+    
+    return ai_response
+
+
+def _generate_interview_ai_response(turn, context):
+    """Ask the AI for the interviewer reply, falling back to the scripted ladder"""
+    try:
+        # Use AI to generate contextual response
+        ai_response = _clean_interview_ai_response(ask_ai_question(
+            turn['prompt'],
+            candidate_name=context.get('candidate_name'),
+            job_title=context.get('job_title'),
+            company_name=context.get('company_name'),
+            timeout=15,
+            job_id=turn.get('job_id'),
+        ))
+        if not ai_response:
+            raise Exception("AI returned empty response")
+        
+        logger.info(f"Generated AI conversational response: {ai_response[:100]}...")
+        return ai_response
+    
+    except Exception as ai_error:
+        logger.warning(f"AI response generation failed: {ai_error}, using fallback")
+        return _fallback_interview_response(turn, context)
+
+
+async def _generate_interview_ai_response_async(turn, context):
+    """Async _generate_interview_ai_response for the ASGI turn endpoint"""
+    try:
+        ai_response = _clean_interview_ai_response(await ask_ai_question_async(
+            turn['prompt'],
+            candidate_name=context.get('candidate_name'),
+            job_title=context.get('job_title'),
+            company_name=context.get('company_name'),
+            timeout=15,
+            job_id=turn.get('job_id'),
+        ))
+        if not ai_response:
+            raise Exception("AI returned empty response")
+        
+        logger.info(f"Generated AI conversational response: {ai_response[:100]}...")
+        return ai_response
+    
+    except Exception as ai_error:
+        logger.warning(f"AI response generation failed: {ai_error}, using fallback")
+        return _fallback_interview_response(turn, context)
+
+
+def _finish_interview_turn(interview, state, turn, ai_response):
+    """Add the interviewer reply to the history, save the state and wrap up finished interviews"""
+    context = state.context
+    conversation_history = turn['conversation_history']
+    
+    # Add AI response to history (skip for audio tests)
+    if not turn['is_simple_audio_issue']:
+        replied_at = turn.get('replied_at') or timezone.now()
+        conversation_history.append({
+            'speaker': 'interviewer', 
+            'message': ai_response,
+            'question_number': turn['question_count'],
+            'timestamp': replied_at.isoformat(),
+            'time_remaining': turn['time_remaining'],
+            'response_ms': int((replied_at - turn['received_at']).total_seconds() * 1000),
+        })
+    else:
+        logger.info(f"Skipping AI response history for audio test response")
+    
+    # Keep conversation history manageable
+    if len(conversation_history) > 40:
+        conversation_history = conversation_history[-40:]
+        
+    context['conversation_history'] = conversation_history
+    
+    # CRITICAL FIX: Don't complete interview unless time is actually up or we have substantial conversation
+    if not context.get('interview_completed', False) and turn['question_count'] >= 15 and turn['time_remaining'] > 60:  # Only complete if we have many questions AND time is running out
+        logger.info(f"Interview has {turn['question_count']} questions but {turn['time_remaining']}s remaining - continuing interview")
+        # Don't complete yet, let time run out naturally
+    
+    # Update interview start time if not already set
+    if not interview.started_at:
+        interview.started_at = timezone.now()
+        interview.save(update_fields=['started_at'])
+        logger.info(f"Interview {interview.uuid} start time updated to {interview.started_at}")
+    
+    # Clear duplicate prevention after a delay
+    if 'last_processed_input' in context:
+        context['last_processed_input'] = ''
+    
+    # Save updated context - only the changed header fields and new turns are written
+    state.save()
+    
+    # Queue interview results if completed (but not already generated) - the
+    # closing turn returns immediately and a task worker does the LLM analysis
+    # from the stored turns, so only once the closing turn is saved
+    if context.get('interview_completed', False) and not interview.has_results:
+        try:
+            enqueue_interview_results(interview)
+            logger.info(f"Interview results generation queued for {interview.uuid}")
+        except Exception as e:
+            logger.error(f"Failed to queue interview results for {interview.uuid}: {e}")
+
+
+def _resolve_interview_audio(text, audio_path, min_duration=3.0):
+    """Validate a generated TTS path and work out its duration"""
+    from jobapp.tts import estimate_audio_duration, get_audio_duration
+    from jobapp.tts_cache import tts_cache
+    
+    audio_duration = None
+    if audio_path and audio_path != 'None':
+        try:
+            full_audio_path = os.path.join(settings.BASE_DIR, audio_path.lstrip('/'))
+            # TTS cache paths carry their duration in the index, so no file access is needed
+            indexed_duration = tts_cache.duration(audio_path)
+            if indexed_duration:
+                audio_duration = indexed_duration
+                logger.info(f"Using actual audio duration: {audio_duration:.2f} seconds")
+            elif os.path.exists(full_audio_path):
+                actual_duration = get_audio_duration(full_audio_path)
+                
+                if actual_duration and actual_duration > 0:
+                    audio_duration = actual_duration
+                    logger.info(f"Using actual audio duration: {audio_duration:.2f} seconds")
+                else:
+                    audio_duration = estimate_audio_duration(text)
+                    logger.info(f"Using estimated audio duration: {audio_duration:.2f} seconds")
+            else:
+                logger.warning(f"Audio file not found: {full_audio_path}")
+                audio_path = None
+                audio_duration = estimate_audio_duration(text)
+        except Exception as duration_error:
+            logger.error(f"Error getting audio duration: {duration_error}")
+            audio_duration = estimate_audio_duration(text)
+    else:
+        logger.info("No audio path returned from TTS generation")
+        audio_path = None
+        audio_duration = estimate_audio_duration(text)
+    
+    # Ensure we have a valid duration
+    if not audio_duration or audio_duration <= 0:
+        audio_duration = max(min_duration, len(text) * 0.05)
+    
+    return audio_path, audio_duration
+
+
+def _phrase_audio(text, context):
+    """Spliced audio for a scripted interviewer line, or None for any other text"""
+    if not context:
+        return None
+    try:
+        return interview_phrases.phrase_audio(
+            text, context.get('candidate_name'), context.get('job_title'), context.get('company_name')
+        )
+    except Exception as e:
+        logger.warning(f"Phrase audio failed, using TTS: {e}")
+        return None
+
+
+def _synthesize_interview_audio(text, interview_uuid, min_duration=3.0, context=None):
+    """Generate interviewer audio for ``text`` and return ``(audio_path, audio_duration)``.
+    
+    With the interview ``context``, scripted lines use pre-synthesized phrase audio.
+    """
+    try:
+        logger.info(f"Starting TTS generation for interview {interview_uuid}")
+        
+        from jobapp.tts import generate_tts
+        
+        # Always try Daisy TTS first
+        audio_path = _phrase_audio(text, context) or generate_tts(text, "female_interview")
+            
+    except Exception as e:
+        logger.error(f"TTS generation failed for interview {interview_uuid}: {e}")
+        audio_path = None
+    
+    try:
+        return _resolve_interview_audio(text, audio_path, min_duration)
+    except Exception:
+        return None, max(6.0, len(text) * 0.05)
+
+
+async def _synthesize_interview_audio_async(text, interview_uuid, min_duration=3.0, context=None):
+    """Async _synthesize_interview_audio - awaits TTS instead of blocking a worker"""
+    try:
+        logger.info(f"Starting async TTS generation for interview {interview_uuid}")
+        
+        from jobapp.tts import generate_tts_async
+        audio_path = (
+            await sync_to_async(_phrase_audio, thread_sensitive=False)(text, context)
+            or await generate_tts_async(text, "female_interview")
+        )
+    
+    except Exception as e:
+        logger.error(f"TTS generation failed for interview {interview_uuid}: {e}")
+        audio_path = None
+    
+    try:
+        return _resolve_interview_audio(text, audio_path, min_duration)
+    except Exception:
+        return None, max(6.0, len(text) * 0.05)
+
+
+def _load_interview_resume_text(interview, candidate_name, job_title):
+    """Resume text used to seed a new interview state.
+
+    Text comes from the ResumeText cache filled at upload time, so the PDF
+    is only parsed here for files uploaded before the cache existed.
+    """
+    interview_uuid = interview.uuid
+    
+    if interview.is_registered_candidate:
+        profile = getattr(interview.candidate, 'profile', None)
+        resume_file = profile.resume if profile and profile.resume else None
+        resume_text = ""
+        
+        if resume_file:
+            try:
+                # Check if file actually exists before trying to read it
+                if hasattr(resume_file, 'path') and os.path.exists(resume_file.path):
+                    resume_text = get_resume_text(resume_file)
+                else:
+                    # File is missing - continue without resume
+                    resume_text = f"Resume file is not available for {candidate_name}."
+                    logger.info(f"Resume file missing for {candidate_name}, continuing interview without resume")
+            except Exception as e:
+                resume_text = "Resume could not be processed."
+                logger.warning(f"Resume extraction error for interview {interview_uuid}: {e}")
+        else:
+            resume_text = f"Candidate: {candidate_name}, applying for {job_title} position."
+        
+        return resume_text
+    
+    # Try to find the candidate resume from the Candidate model
+    candidate_resume = None
+    try:
+        # Find the candidate by email and recruiter
+        candidate_obj = Candidate.objects.filter(
+            email=interview.candidate_email,
+            added_by=interview.job.posted_by
+        ).first()
+        
+        if candidate_obj and candidate_obj.resume:
+            candidate_resume = candidate_obj.resume
+            logger.info(f"Found resume for unregistered candidate {candidate_name}")
+    except Exception as e:
+        logger.warning(f"Could not find candidate resume: {e}")
+    
+    if candidate_resume:
+        try:
+            # Check if file actually exists before trying to read it
+            if hasattr(candidate_resume, 'path') and os.path.exists(candidate_resume.path):
+                resume_text = get_resume_text(candidate_resume)
+                logger.info(f"Successfully extracted resume text for {candidate_name}")
+            else:
+                # Try to find similar file in candidate_resumes folder
+                resume_found = False
+                try:
+                    candidate_resumes_dir = os.path.join(settings.MEDIA_ROOT, 'candidate_resumes')
+                    if os.path.exists(candidate_resumes_dir):
+                        # Get base filename without Django's random suffix
+                        original_name = candidate_resume.name
+                        base_name = original_name.split('/')[-1]  # Get filename only
+                        name_without_suffix = base_name.split('_')[:-1]  # Remove last part (random suffix)
+                        if name_without_suffix:
+                            search_pattern = '_'.join(name_without_suffix)
+                            
+                            # Look for files that start with the base name
+                            for filename in os.listdir(candidate_resumes_dir):
+                                if filename.startswith(search_pattern) and filename.endswith('.pdf'):
+                                    found_file_path = os.path.join(candidate_resumes_dir, filename)
+                                    logger.info(f"Found similar resume file: {filename} for {candidate_name}")
+                                    
+                                    # Try to extract from found file
+                                    resume_text = get_resume_text_for_path(found_file_path)
+                                    logger.info(f"Successfully extracted resume text from {filename} for {candidate_name}")
+                                    resume_found = True
+                                    break
+                except Exception as search_error:
+                    logger.warning(f"Error searching for similar resume file: {search_error}")
+                
+                if not resume_found:
+                    # File is missing - continue without resume
+                    resume_text = f"Resume file is not available for {candidate_name}."
+                    logger.info(f"Resume file missing for {candidate_name}, continuing interview without resume")
+        except Exception as e:
+            resume_text = f"Resume could not be processed for {candidate_name}."
+            logger.warning(f"Resume extraction error for unregistered candidate in interview {interview_uuid}: {e}")
+    else:
+        resume_text = f"Candidate: {candidate_name}"
+        if hasattr(interview, 'candidate_email') and interview.candidate_email:
+            resume_text += f", Email: {interview.candidate_email}"
+        if hasattr(interview, 'candidate_phone') and interview.candidate_phone:
+            resume_text += f", Phone: {interview.candidate_phone}"
+        resume_text += f", applying for {job_title} position."
+    
+    return resume_text
+
+
 #interview function
 @csrf_exempt
 def start_interview_by_uuid(request, interview_uuid):
@@ -904,14 +1621,14 @@ def start_interview_by_uuid(request, interview_uuid):
         # Check if interview is accessible (not expired or completed)
         if not interview.is_accessible:
             if interview.is_completed:
-                send_interview_status_email(interview, 'completed')
+                enqueue_status_email(interview, 'completed')
                 return JsonResponse({
                     'error': 'Interview already completed',
                     'message': 'This interview has already been completed. An email confirmation has been sent.',
                     'redirect': True
                 })
             elif interview.is_expired:
-                send_interview_status_email(interview, 'expired')
+                enqueue_status_email(interview, 'expired')
                 return JsonResponse({
                     'error': 'Interview deadline passed',
                     'message': 'The deadline for this interview has passed. Please contact HR for further assistance.',
@@ -924,584 +1641,92 @@ def start_interview_by_uuid(request, interview_uuid):
         if interview.is_registered_candidate:
             candidate_name = interview.candidate.get_full_name() or interview.candidate.username
             job_title = interview.job.title or "Software Developer"
-            
-            profile = getattr(interview.candidate, 'profile', None)
-            resume_file = profile.resume if profile and profile.resume else None
-            resume_text = ""
-            
-            if resume_file:
-                try:
-                    # Check if file actually exists before trying to open it
-                    if hasattr(resume_file, 'path') and os.path.exists(resume_file.path):
-                        # Open the file properly before passing to extract_resume_text
-                        with resume_file.open('rb') as file_obj:
-                            resume_text = extract_resume_text(file_obj)
-                    else:
-                        # File is missing - continue without resume
-                        resume_text = f"Resume file is not available for {candidate_name}."
-                        logger.info(f"Resume file missing for {candidate_name}, continuing interview without resume")
-                except Exception as e:
-                    resume_text = "Resume could not be processed."
-                    logger.warning(f"Resume extraction error for interview {interview_uuid}: {e}")
-            else:
-                resume_text = f"Candidate: {candidate_name}, applying for {job_title} position."
-                
         else:
             candidate_name = interview.candidate_name or "the candidate"
             job_title = interview.job.title if interview.job else "Software Developer"
-            
-            # Try to find the candidate resume from the Candidate model
-            candidate_resume = None
-            try:
-                # Find the candidate by email and recruiter
-                from .models import Candidate
-                candidate_obj = Candidate.objects.filter(
-                    email=interview.candidate_email,
-                    added_by=interview.job.posted_by
-                ).first()
-                
-                if candidate_obj and candidate_obj.resume:
-                    candidate_resume = candidate_obj.resume
-                    logger.info(f"Found resume for unregistered candidate {candidate_name}")
-            except Exception as e:
-                logger.warning(f"Could not find candidate resume: {e}")
-            
-            if candidate_resume:
-                try:
-                    # Check if file actually exists before trying to open it
-                    if hasattr(candidate_resume, 'path') and os.path.exists(candidate_resume.path):
-                        # Open the file properly before passing to extract_resume_text
-                        with candidate_resume.open('rb') as resume_file:
-                            resume_text = extract_resume_text(resume_file)
-                        logger.info(f"Successfully extracted resume text for {candidate_name}")
-                    else:
-                        # Try to find similar file in candidate_resumes folder
-                        resume_found = False
-                        try:
-                            candidate_resumes_dir = os.path.join(settings.MEDIA_ROOT, 'candidate_resumes')
-                            if os.path.exists(candidate_resumes_dir):
-                                # Get base filename without Django's random suffix
-                                original_name = candidate_resume.name
-                                base_name = original_name.split('/')[-1]  # Get filename only
-                                name_without_suffix = base_name.split('_')[:-1]  # Remove last part (random suffix)
-                                if name_without_suffix:
-                                    search_pattern = '_'.join(name_without_suffix)
-                                    
-                                    # Look for files that start with the base name
-                                    for filename in os.listdir(candidate_resumes_dir):
-                                        if filename.startswith(search_pattern) and filename.endswith('.pdf'):
-                                            found_file_path = os.path.join(candidate_resumes_dir, filename)
-                                            logger.info(f"Found similar resume file: {filename} for {candidate_name}")
-                                            
-                                            # Try to extract from found file
-                                            with open(found_file_path, 'rb') as resume_file:
-                                                resume_text = extract_resume_text(resume_file)
-                                            logger.info(f"Successfully extracted resume text from {filename} for {candidate_name}")
-                                            resume_found = True
-                                            break
-                        except Exception as search_error:
-                            logger.warning(f"Error searching for similar resume file: {search_error}")
-                        
-                        if not resume_found:
-                            # File is missing - continue without resume
-                            resume_text = f"Resume file is not available for {candidate_name}."
-                            logger.info(f"Resume file missing for {candidate_name}, continuing interview without resume")
-                except Exception as e:
-                    resume_text = f"Resume could not be processed for {candidate_name}."
-                    logger.warning(f"Resume extraction error for unregistered candidate in interview {interview_uuid}: {e}")
-            else:
-                resume_text = f"Candidate: {candidate_name}"
-                if hasattr(interview, 'candidate_email') and interview.candidate_email:
-                    resume_text += f", Email: {interview.candidate_email}"
-                if hasattr(interview, 'candidate_phone') and interview.candidate_phone:
-                    resume_text += f", Phone: {interview.candidate_phone}"
-                resume_text += f", applying for {job_title} position."
+        
         # job detail extraction
         try:
             company_name = interview.job.company if interview.job else "Our Company"
         except AttributeError:
             company_name = "Our Company"
-
-        if not resume_text.strip():
-            return HttpResponse(
-                "Resume information not found. Please ensure your resume is uploaded or contact support.", 
-                status=400
-            )
-        
-        # Use unique session key per interview
-        session_key = f'interview_context_{interview_uuid}'
         
-        # CRITICAL FIX: Only initialize session if it doesn't exist (don't reset on every request)
-        if session_key not in request.session:
-            logger.info(f"Creating new session context for interview {interview_uuid}")
+        # Conversation state lives in the interview state store, not the session
+        state = InterviewState.load(interview)
+        
+        # CRITICAL FIX: Only initialize state if it doesn't exist (don't reset on every request)
+        if state is None:
+            # Resume text is only needed to seed a new interview state
+            resume_text = _load_interview_resume_text(interview, candidate_name, job_title)
+            if not resume_text.strip():
+                return HttpResponse(
+                    "Resume information not found. Please ensure your resume is uploaded or contact support.", 
+                    status=400
+                )
+            
+            logger.info(f"Creating new interview state for interview {interview_uuid}")
             # Set the actual start time in the database when interview begins
             if not interview.started_at:
                 interview.started_at = timezone.now()
-                interview.save(update_fields=['started_at'])
-                logger.info(f"Interview {interview_uuid} started at {interview.started_at}")
-            
-            request.session[session_key] = {
-                'candidate_name': candidate_name,
-                'job_title': job_title,
-                'company_name': company_name,
-                'resume_text': resume_text,
-                'job_description': interview.job.description if interview.job else "",
-                'job_location': interview.job.location if interview.job else "",
-                'question_count': 0,
-                'is_registered_candidate': interview.is_registered_candidate,
-                'conversation_history': [],
-                'started_at': timezone.now().isoformat(),
-                'interview_completed': False,
-                'interview_duration_minutes': interview.interview_duration_minutes or 15  # Use actual duration or default to 15
-            }
-            request.session.modified = True
-        else:
-            logger.info(f"Using existing session context for interview {interview_uuid}")
-        
-        # HANDLE POST REQUEST - Process candidate responses
-        if request.method == "POST":
-            try:
-                user_text = ""
-                time_remaining = 900
-                
-                # Check if audio file was uploaded (Whisper ASR mode)
-                if 'audio' in request.FILES:
-                    audio_file = request.FILES['audio']
-                    logger.info(f"🎤 Audio file received: {audio_file.name} ({audio_file.size} bytes)")
-                    
-                    # Transcribe audio to text using Whisper
-                    transcription_result = transcribe_audio(audio_file)
-                    
-                    if transcription_result['success']:
-                        user_text = transcription_result['text']
-                        logger.info(f"✅ Whisper transcription: {user_text}")
-                        
-                        # Get time_remaining from form data
-                        try:
-                            time_remaining = int(request.POST.get("time_remaining", 900))
-                        except (ValueError, TypeError):
-                            time_remaining = 900
-                    else:
-                        logger.error(f"❌ Whisper transcription failed: {transcription_result['error']}")
-                        return JsonResponse({
-                            'error': 'Server-side speech recognition not available. Please use Chrome or Edge browser.',
-                            'response': 'Please use Chrome or Edge browser for speech recognition, or type your response.',
-                            'audio': '',
-                            'audio_duration': 3.0,
-                            'success': False,
-                            'transcription_error': transcription_result['error']
-                        })
-                
-                # Handle text input (existing Web Speech API mode)
-                elif request.content_type == 'application/json':
-                    data = json.loads(request.body)
-                    user_text = data.get("text") or data.get("message")
-                    time_remaining = int(data.get("time_remaining", 900))
-                else:
-                    user_text = request.POST.get("text", "")
-                    try:
-                        time_remaining = int(request.POST.get("time_remaining", 900))
-                    except (ValueError, TypeError):
-                        time_remaining = 900
-                        
-            except Exception as e:
-                logger.error(f"Error parsing request data: {e}")
-                user_text = request.POST.get("text", "")
-                time_remaining = 900  # Default 15 minutes
-                
-            # LOG for debugging
-            logger.info(f"Parsed time_remaining: {time_remaining} seconds ({time_remaining/60:.1f} minutes)")
-    
-            if not user_text.strip():
-                return JsonResponse({
-                    'error': 'Please provide a response.',
-                    'response': 'I didn\'t receive your answer. Could you please respond?',
-                    'audio': '',
-                    'audio_duration': 3.0,
-                    'success': False
-                })
-    
-            logger.info(f"User input for interview {interview_uuid}: {user_text[:100]}... (Time remaining: {time_remaining}s)")
-    
-            # Get current context
-            context = request.session.get(session_key, {})
-            logger.info(f"Retrieved session context: {context.keys() if context else 'None'}")
-            logger.info(f"Current question count in context: {context.get('question_count', 'Not found')}")
-            logger.info(f"Interview completed flag: {context.get('interview_completed', 'Not found')}")
-            
-            # Check if interview is already completed
-            if context.get('interview_completed', False):
-                logger.warning(f"Interview {interview_uuid} already marked as completed, returning completion message")
-                return JsonResponse({
-                    'error': 'Interview already completed',
-                    'response': 'Thank you! Your interview has been completed.',
-                    'audio': '',
-                    'audio_duration': 2.0,
-                    'is_final': True,
-                    'success': True
-                })
-    
-            # Prevent duplicate processing - but be more lenient
-            last_processed = context.get('last_processed_input', '')
-            current_input_hash = hashlib.md5(user_text.encode()).hexdigest()
-            
-            # Only block if it's EXACTLY the same AND was processed within last 5 seconds
-            last_processed_time = context.get('last_processed_time', 0)
-            current_time = timezone.now().timestamp()
-            time_since_last = current_time - last_processed_time
-            
-            if last_processed == current_input_hash and time_since_last < 5:
-                logger.warning(f"Duplicate request detected for interview {interview_uuid} (within 5s), ignoring")
-                return JsonResponse({
-                    'error': 'Duplicate request detected',
-                    'response': 'Please wait for the previous response to complete.',
-                    'audio': '',
-                    'audio_duration': 2.0,
-                    'success': False
-                })
-    
-            context['last_processed_input'] = current_input_hash
-            context['last_processed_time'] = current_time
-            
-            logger.info(f"Processing new response (hash: {current_input_hash[:8]}...)")
-    
-            # Get current question count and increment
-            current_count = context.get('question_count', 0)
-            question_count = current_count + 1
-    
-            # Save incremented count back to session IMMEDIATELY
-            context['question_count'] = question_count
-            request.session[session_key] = context
-            request.session.modified = True
-    
-            logger.info(f"Question count incremented from {current_count} to {question_count} for interview {interview_uuid}")
-    
-            # Check if this should be the last question (2 minutes or less remaining)
-            is_last_question = time_remaining <= 120  # 2 minutes = 120 seconds
-            is_time_up = time_remaining <= 30  # 30 seconds or less
-            
-            # LOG the decision logic
-            logger.info(f"Interview timing check - Time: {time_remaining}s, Last Question: {is_last_question}, Time Up: {is_time_up}")
-    
-            # FIXED: Better audio issue detection
-            user_text_lower = user_text.lower().strip()
-            
-            simple_audio_phrases = [
-                'can you hear me', 'can you hear me can you hear me',
-                'hello can you hear me', 'can you hear', 'audio test', 'hello hello',
-                'testing testing', 'test test', 'hello', 'testing', 'test',
-                'i am can you hear me', 'hello hello hello', 'hello mam can you hear me',
-                'can you hear me mam', 'hello mam', 'mam can you hear me'
-            ]
-            
-            # More precise audio issue detection - must be exact match and short
-            is_simple_audio_issue = (
-                any(phrase == user_text_lower for phrase in simple_audio_phrases) and 
-                len(user_text_lower) <= 30  # Must be short
-            )
-            
-            # Build conversation history
-            conversation_history = context.get('conversation_history', [])
-            
-            # Only add to conversation history if it's not a simple audio test
-            if not is_simple_audio_issue:
-                conversation_history.append({
-                    'speaker': 'candidate',
-                    'message': user_text,
-                    'question_number': question_count,
-                    'timestamp': timezone.now().isoformat(),
-                    'time_remaining': time_remaining
-                })
-            else:
-                logger.info(f"Skipping conversation history for audio test: {user_text}")
-                # For audio tests, don't increment question count
-                context['question_count'] = max(0, context.get('question_count', 0) - 1)
-                question_count = context['question_count']
-            
-            logger.info(f"Content analysis - Audio issue: {is_simple_audio_issue}, User text: '{user_text_lower}'")
-            
-            # Generate AI response - WRAP IN TRY-CATCH
-            logger.info(f"About to generate AI response - Audio issue: {is_simple_audio_issue}, Time up: {is_time_up}, Last question: {is_last_question}")
-            try:
-                if is_time_up:
-                    # Time is up - end the interview
-                    ai_response = f"Thank you so much for your time today, {candidate_name}! We've covered a lot of ground in our conversation. I really enjoyed learning about your background, skills, and experiences. Your insights have been valuable, and we appreciate your interest in the {job_title} position at {company_name}. Our team will review everything we discussed and get back to you with next steps within 2-3 business days. Have a wonderful day!"
-                    
-                    context['interview_completed'] = True
-                    # Mark interview as completed in database
-                    interview.status = 'completed'
-                    interview.completed_at = timezone.now()
-                    # Ensure started_at is set if not already
-                    if not interview.started_at:
-                        interview.started_at = timezone.now() - timezone.timedelta(minutes=15)  # Estimate 15 minutes ago
-                    interview.save()
-                    logger.info(f"Interview time completed for {interview_uuid}")
-                    
-                    # Generate interview results immediately
-                    try:
-                        generate_interview_results(interview, conversation_history)
-                        logger.info(f"Interview results generated for {interview_uuid}")
-                    except Exception as e:
-                        logger.error(f"Failed to generate interview results: {e}")
-                    
-                elif is_last_question:
-                    # 2 minutes or less - notify this is the last question
-                    follow_up_questions = [
-                        f"We're coming to the end of our time together, {candidate_name}. For my final question: Is there anything important about your skills, experience, or qualifications that we haven't discussed yet that you'd like me to know about?",
-                        
-                        f"This will be our last question today, {candidate_name}. Before we wrap up: What makes you particularly excited about this {job_title} opportunity, and why do you think you'd be a great fit for our team at {company_name}?",
-                        
-                        f"We have just a couple of minutes left, {candidate_name}. As a final question: If you were to start in this role next week, what would be your top priority in your first 30 days?",
-                        
-                        f"For our final question today, {candidate_name}: What's one professional achievement you're most proud of, and what did you learn from that experience?",
-                    ]
-                    
-                    import random
-                    ai_response = random.choice(follow_up_questions)
-                    logger.info(f"Last question triggered for interview {interview_uuid} with {time_remaining}s remaining")
-                    
-                elif is_simple_audio_issue:
-                    # Audio test response - DON'T increment question count for audio tests
-                    ai_response = f"Yes, I can hear you perfectly, {candidate_name}! Your audio is crystal clear and you sound great. I'm Sarah, and I'm so excited to get to know you better today! Let's dive in - could you tell me about your background, your experience with {job_title} work, and what specifically drew you to apply for this position with {company_name}?"
-                    
-                    # CRITICAL FIX: Reset question count for audio issues to prevent premature completion
-                    context['question_count'] = 0  # Reset to 0 for audio tests
-                    question_count = 0
-                    logger.info(f"Audio test detected - resetting question count to {question_count}")
-                    
-                else:
-                    # Generate intelligent follow-up questions based on candidate's response and conversation flow
-                    logger.info(f"Generating conversational response for question {question_count}")
-                    
-                    try:
-                        # Get conversation context and candidate's responses
-                        candidate_last_response = ""
-                        previous_topics = []
-                        candidate_responses = []
-                        
-                        if conversation_history:
-                            for entry in conversation_history:
-                                if entry['speaker'] == 'candidate':
-                                    candidate_responses.append(entry['message'])
-                                    candidate_last_response = entry['message']  # Keep updating to get the latest
-                                elif entry['speaker'] == 'interviewer':
-                                    # Extract topics already covered
-                                    msg_lower = entry['message'].lower()
-                                    if any(word in msg_lower for word in ['technical', 'technology', 'programming', 'language']):
-                                        previous_topics.append('technical_skills')
-                                    if any(word in msg_lower for word in ['project', 'built', 'developed']):
-                                        previous_topics.append('projects')
-                                    if any(word in msg_lower for word in ['team', 'collaborate', 'work together']):
-                                        previous_topics.append('teamwork')
-                                    if any(word in msg_lower for word in ['goal', 'future', 'career']):
-                                        previous_topics.append('career_goals')
-                        
-                        # Build comprehensive context for AI conversation
-                        conversation_summary = "\n".join([f"- {resp[:150]}..." for resp in candidate_responses[-3:]]) if candidate_responses else "No previous responses"
-                        
-                        conversation_context = f"""
-INTERVIEW CONTEXT:
-Candidate: {candidate_name}
-Position: {job_title} at {company_name}
-Question #{question_count}
-Topics covered: {', '.join(set(previous_topics)) if previous_topics else 'None yet'}
-
-CANDIDATE'S RECENT RESPONSES:
-{conversation_summary}
-
-LATEST RESPONSE: "{candidate_last_response}"
-
-As Sarah, respond to what they just shared. Acknowledge their answer, show genuine interest, and ask a follow-up question that builds naturally on what they said. Focus on their experience, skills, and fit for the {job_title} role.
-"""
-                        
-                        # Use AI to generate contextual response
-                        try:
-                            ai_response = ask_ai_question(
-                                conversation_context,
-                                candidate_name=candidate_name,
-                                job_title=job_title,
-                                company_name=company_name,
-                                timeout=15
-                            )
-                            
-                            # Clean and validate the AI response
-                            if ai_response:
-                                # Remove any quotes or formatting that might have slipped through
-                                ai_response = ai_response.replace('"', '').replace("'", "").strip()
-                                
-                                # Ensure it's not too long
-                                if len(ai_response) > 350:
-                                    sentences = ai_response.split('. ')
-                                    if len(sentences) > 1:
-                                        ai_response = sentences[0] + '. ' + sentences[1] + '.'
-                                    else:
-                                        ai_response = ai_response[:347] + "..."
-                                
-                                # Ensure it ends properly
-                                if not ai_response.endswith(('?', '.', '!')):
-                                    ai_response += "?"
-                                
-                                logger.info(f"Generated AI conversational response: {ai_response[:100]}...")
-                            else:
-                                raise Exception("AI returned empty response")
-                            
-                        except Exception as ai_error:
-                            logger.warning(f"AI response generation failed: {ai_error}, using fallback")
-                            
-                            # Enhanced fallback responses that acknowledge candidate's input
-                            response_lower = candidate_last_response.lower()
-                            
-                            
-                            # This logic ONLY runs when the AI fails (as a fallback)
-                            
-                            # Analyze candidate's response for emotional tone and content
-                            if any(word in response_lower for word in ['nervous', 'anxious', 'worried', 'scared']):
-                                ai_response = f"I completely understand, {candidate_name}. Interviews can feel nerve-wracking, but you're doing fantastic! Let's keep this conversational and relaxed. "
-                            elif any(word in response_lower for word in ['excited', 'passionate', 'love', 'enjoy', 'enthusiastic']):
-                                ai_response = f"I can really hear the passion in your voice, {candidate_name}! That enthusiasm is exactly what we love to see. "
-                            elif any(word in response_lower for word in ['challenge', 'difficult', 'problem', 'struggle']):
-                                ai_response = f"That sounds like a great learning experience, {candidate_name}. I appreciate you sharing that challenge with me. "
-                            else:
-                                ai_response = f"Thank you for sharing that, {candidate_name}. That's really insightful! "
-                            
-                            # Add contextual follow-up based on question progression and content
-                            if question_count <= 3:
-                                # ICE-BREAKING QUESTIONS (First 3 questions to make candidate comfortable)
-                                if question_count == 1:
-                                    ai_response += f"Nice to meet you! How are you feeling today?"
-                                elif question_count == 2:
-                                    ai_response += f"Great! Now that we're getting to know each other, are you ready to start our interview for the {job_title} position at {company_name}?"
-                                else:  # question_count == 3
-                                    ai_response += f"Perfect! Let's begin. Could you tell me a bit about yourself and what drew you to apply for this {job_title} role?"
-                            
-                            elif question_count <= 4:
-                                if any(word in response_lower for word in ['python', 'javascript', 'java', 'react', 'django', 'node', 'html', 'css', 'sql']):
-                                    ai_response += "Excellent technical foundation! Can you walk me through a specific project where you used these technologies? I'm particularly interested in any challenges you faced and how you overcame them."
-                                elif any(word in response_lower for word in ['project', 'built', 'created', 'developed', 'application', 'website']):
-                                    ai_response += "That sounds like a fascinating project! What was the most challenging technical problem you encountered while building it, and how did you approach solving it?"
-                                elif any(word in response_lower for word in ['framework', 'library', 'tool', 'database']):
-                                    ai_response += "Great choice of technologies! Can you describe a specific project where you implemented these tools? What made you choose them for that particular solution?"
-                                else:
-                                    ai_response += "I'd love to hear about a project you've worked on that you're particularly proud of. Can you walk me through the technical challenges and how you solved them?"
-                            #Techniacal questions
-                            elif question_count <= 6:
-                                if any(word in response_lower for word in ['team', 'collaborate', 'group', 'together', 'pair']):
-                                    ai_response += "Collaboration is so crucial in development! Can you give me an example of a time when you had to work through a technical disagreement with a team member? How did you handle it?"
-                                elif any(word in response_lower for word in ['problem', 'challenge', 'difficult', 'bug', 'issue', 'debug']):
-                                    ai_response += "Great problem-solving approach! How do you typically approach debugging complex issues, especially when working with a team? Do you have a systematic process?"
-                                elif any(word in response_lower for word in ['agile', 'scrum', 'methodology', 'process']):
-                                    ai_response += "Excellent experience with development methodologies! How do you handle changing requirements or tight deadlines while maintaining code quality?"
-                                else:
-                                    ai_response += "How do you approach working in team environments, especially when collaborating on complex technical projects? Can you share an example?"
-                            #Advanced
-                            else:
-                                if any(word in response_lower for word in ['goal', 'future', 'career', 'grow', 'learn', 'aspiration']):
-                                    ai_response += f"I love hearing about career aspirations! What specifically excites you about this {job_title} role at {company_name}, and how does it align with your professional goals?"
-                                elif any(word in response_lower for word in ['company', 'role', 'position', 'opportunity', 'culture']):
-                                    ai_response += "That's exactly the kind of thinking we value! Do you have any questions about the day-to-day responsibilities, our team dynamics, or the company culture?"
-                                elif any(word in response_lower for word in ['technology', 'innovation', 'cutting-edge', 'latest']):
-                                    ai_response += f"Your interest in technology trends is great! How do you stay updated with the latest developments in {job_title}, and what emerging technologies are you most excited about?"
-                                else:
-                                    ai_response += f"What draws you most to this {job_title} position at {company_name}? What aspects of the role or our company culture interest you the most?"
-                        
-                    except Exception as qgen_error:
-                        logger.error(f"Error generating conversational response: {qgen_error}")
-                        # Enhanced fallback that's more engaging and job-focused
-                        ai_response = f"Thank you for sharing that, {candidate_name}. That's really valuable insight! I'd love to learn more about your passion for {job_title} work. What aspects of technology and development motivate you most, and how do you see yourself contributing to our team?"
+                interview.save(update_fields=['started_at'])
+                logger.info(f"Interview {interview_uuid} started at {interview.started_at}")
+            
+            state = InterviewState.create(interview, {
+                'candidate_name': candidate_name,
+                'job_title': job_title,
+                'company_name': company_name,
+                'resume_text': resume_text,
+                'job_description': interview.job.description if interview.job else "",
+                'job_location': interview.job.location if interview.job else "",
+                'question_count': 0,
+                'is_registered_candidate': interview.is_registered_candidate,
+                'started_at': timezone.now().isoformat(),
+                'interview_completed': False,
+                'interview_duration_minutes': interview.interview_duration_minutes or 15  # Use actual duration or default to 15
+            })
+        else:
+            logger.info(f"Using existing interview state for interview {interview_uuid}")
+        
+        # HANDLE POST REQUEST - Process candidate responses
+        if request.method == "POST":
+            user_text, time_remaining, error_response = _parse_interview_turn(request)
+            if error_response:
+                return error_response
+    
+            logger.info(f"User input for interview {interview_uuid}: {user_text[:100]}... (Time remaining: {time_remaining}s)")
+    
+            # Get current context
+            context = state.context
+            logger.info(f"Retrieved interview context: {context.keys() if context else 'None'}")
+            logger.info(f"Current question count in context: {context.get('question_count', 'Not found')}")
+            logger.info(f"Interview completed flag: {context.get('interview_completed', 'Not found')}")
+            
+            error_response = _check_interview_turn(context, user_text, interview_uuid)
+            if error_response:
+                return error_response
+            
+            turn = _begin_interview_turn(interview, context, user_text, time_remaining)
+            
+            # Save incremented count and the candidate's turn IMMEDIATELY
+            state.save()
             
+            # Generate AI response - WRAP IN TRY-CATCH
+            try:
+                ai_response = turn['response'] or _generate_interview_ai_response(turn, context)
             except Exception as response_gen_error:
                 logger.error(f"CRITICAL: Error generating AI response: {response_gen_error}")
                 import traceback
                 logger.error(f"Traceback: {traceback.format_exc()}")
-                ai_response = f"Thank you for that response, {candidate_name}. Could you tell me more about your background and experience?"
+                ai_response = f"Thank you for that response, {context.get('candidate_name', candidate_name)}. Could you tell me more about your background and experience?"
                 # Mark as completion error to prevent interview from ending
                 context['interview_completed'] = False
             
             logger.info(f"AI response generated successfully ({len(ai_response)} chars)")
-
-    
-            # Add AI response to history (skip for audio tests)
-            if not is_simple_audio_issue:
-                conversation_history.append({
-                    'speaker': 'interviewer', 
-                    'message': ai_response,
-                    'question_number': question_count,
-                    'timestamp': timezone.now().isoformat(),
-                    'time_remaining': time_remaining
-                })
-            else:
-                logger.info(f"Skipping AI response history for audio test response")
-    
-            # Keep conversation history manageable
-            if len(conversation_history) > 40:
-                conversation_history = conversation_history[-40:]
-                
-            context['conversation_history'] = conversation_history
-            
-            # Generate interview results if completed (but not already generated)
-            if context.get('interview_completed', False) and not interview.has_results:
-                try:
-                    generate_interview_results(interview, conversation_history)
-                    logger.info(f"Interview results generation completed for {interview_uuid}")
-                except Exception as e:
-                    logger.error(f"Failed to generate interview results for {interview_uuid}: {e}")
-            
-            # CRITICAL FIX: Don't complete interview unless time is actually up or we have substantial conversation
-            elif question_count >= 15 and time_remaining > 60:  # Only complete if we have many questions AND time is running out
-                logger.info(f"Interview has {question_count} questions but {time_remaining}s remaining - continuing interview")
-                # Don't complete yet, let time run out naturally
             
-            # Save updated context
-            request.session[session_key] = context
-            request.session.modified = True
+            _finish_interview_turn(interview, state, turn, ai_response)
         
             # Generate TTS audio for the response
-            audio_path = None
-            audio_duration = None
-            try:
-                logger.info(f"Starting TTS generation for interview {interview_uuid}")
-                
-                from jobapp.tts import generate_tts, estimate_audio_duration, get_audio_duration
-                
-                # Always try Daisy TTS first
-                audio_path = generate_tts(ai_response, "female_interview")
-                
-                if audio_path and audio_path != 'None':
-                    try:
-                        full_audio_path = os.path.join(settings.BASE_DIR, audio_path.lstrip('/'))
-                        if os.path.exists(full_audio_path):
-                            actual_duration = get_audio_duration(full_audio_path)
-                            
-                            if actual_duration and actual_duration > 0:
-                                audio_duration = actual_duration
-                                logger.info(f"Using actual audio duration: {audio_duration:.2f} seconds")
-                            else:
-                                audio_duration = estimate_audio_duration(ai_response)
-                                logger.info(f"Using estimated audio duration: {audio_duration:.2f} seconds")
-                        else:
-                            logger.warning(f"Audio file not found: {full_audio_path}")
-                            audio_path = None
-                            audio_duration = estimate_audio_duration(ai_response)
-                    except Exception as duration_error:
-                        logger.error(f"Error getting audio duration: {duration_error}")
-                        audio_duration = estimate_audio_duration(ai_response)
-                else:
-                    logger.info("No audio path returned from TTS generation")
-                    audio_path = None
-                    audio_duration = estimate_audio_duration(ai_response)
-                    
-            except Exception as e:
-                logger.error(f"TTS generation failed for interview {interview_uuid}: {e}")
-                audio_path = None
-                try:
-                    from jobapp.tts import estimate_audio_duration
-                    audio_duration = estimate_audio_duration(ai_response)
-                except:
-                    audio_duration = max(6.0, len(ai_response) * 0.05)
-    
-            # Ensure we have a valid duration
-            if not audio_duration or audio_duration <= 0:
-                audio_duration = max(3.0, len(ai_response) * 0.05)
+            audio_path, audio_duration = _synthesize_interview_audio(ai_response, interview_uuid, context=context)
     
             # Return response data
             response_data = {
@@ -1509,43 +1734,26 @@ As Sarah, respond to what they just shared. Acknowledge their answer, show genui
                 'audio': audio_path if audio_path else '',
                 'audio_duration': audio_duration,
                 'success': True,
-                'question_count': question_count,
+                'question_count': turn['question_count'],
                 'is_final': context.get('interview_completed', False),
                 'has_audio': bool(audio_path),
                 'interview_completed': context.get('interview_completed', False),
                 'time_remaining': time_remaining
             }
     
-            logger.info(f"Sending response for interview {interview_uuid}: question_count={question_count}, time_remaining={time_remaining}s, is_final={response_data['is_final']}")
-            logger.info(f"Response data keys: {list(response_data.keys())}")
+            logger.info(f"Sending response for interview {interview_uuid}: question_count={turn['question_count']}, time_remaining={time_remaining}s, is_final={response_data['is_final']}")
             logger.info(f"AI response length: {len(ai_response)} characters")
-    
-            # Save updated context to session
-            request.session[session_key] = context
-            request.session.modified = True
-            
-            # Update interview start time if not already set
-            if not interview.started_at:
-                interview.started_at = timezone.now()
-                interview.save(update_fields=['started_at'])
-                logger.info(f"Interview {interview_uuid} start time updated to {interview.started_at}")
-            
-            # Clear duplicate prevention after a delay
-            if 'last_processed_input' in context:
-                context['last_processed_input'] = ''
-                request.session[session_key] = context
-                request.session.modified = True
             
             logger.info(f"About to return JsonResponse for interview {interview_uuid}")
             return JsonResponse(response_data)
         
         # HANDLE GET REQUEST - Show interview UI with first question
-        ai_question = f"Hi there! I'm Sarah. Before we begin, could you please tell me your name?"
+        ai_question = interview_phrases.GREETING
         
         logger.info(f"Generated AI initial question for interview {interview_uuid}")
         
         # Add initial question to context conversation history
-        context = request.session.get(session_key, {})
+        context = state.context
         conversation_history = context.get('conversation_history', [])
         conversation_history.append({
             'speaker': 'interviewer',
@@ -1559,54 +1767,10 @@ As Sarah, respond to what they just shared. Acknowledge their answer, show genui
         context['conversation_history'] = conversation_history
         context['interview_started_at'] = timezone.now().isoformat()
         context['interviewer_name'] = 'Sarah'
-        request.session[session_key] = context
-        request.session.modified = True
+        state.save()
         
         # Generate initial TTS
-        audio_path = None
-        audio_duration = None
-        try:
-            logger.info(f"Starting initial TTS generation for interview {interview_uuid}")
-            
-            from jobapp.tts import generate_tts, estimate_audio_duration, get_audio_duration
-            
-            audio_path = generate_tts(ai_question, "female_interview")
-            
-            if audio_path and audio_path != 'None':
-                try:
-                    full_audio_path = os.path.join(settings.BASE_DIR, audio_path.lstrip('/'))
-                    if os.path.exists(full_audio_path):
-                        actual_duration = get_audio_duration(full_audio_path)
-                        
-                        if actual_duration and actual_duration > 0:
-                            audio_duration = actual_duration
-                            logger.info(f"Initial question - using actual audio duration: {audio_duration:.2f} seconds")
-                        else:
-                            audio_duration = estimate_audio_duration(ai_question)
-                            logger.info(f"Initial question - using estimated audio duration: {audio_duration:.2f} seconds")
-                    else:
-                        logger.warning(f"Initial audio file not found: {full_audio_path}")
-                        audio_path = None
-                        audio_duration = estimate_audio_duration(ai_question)
-                except Exception as duration_error:
-                    logger.error(f"Error getting initial audio duration: {duration_error}")
-                    audio_duration = estimate_audio_duration(ai_question)
-            else:
-                logger.info("No initial audio path returned from TTS generation")
-                audio_path = None
-                audio_duration = estimate_audio_duration(ai_question)
-                
-        except Exception as e:
-            logger.error(f"Initial TTS generation failed for interview {interview_uuid}: {e}")
-            audio_path = None
-            try:
-                from jobapp.tts import estimate_audio_duration
-                audio_duration = estimate_audio_duration(ai_question)
-            except:
-                audio_duration = max(6.0, len(ai_question) * 0.05)
-
-        if not audio_duration or audio_duration <= 0:
-            audio_duration = max(5.0, len(ai_question) * 0.05)
+        audio_path, audio_duration = _synthesize_interview_audio(ai_question, interview_uuid, min_duration=5.0, context=context)
 
         # Template context
         context_data = {
@@ -1676,6 +1840,262 @@ As Sarah, respond to what they just shared. Acknowledge their answer, show genui
 
 
 
+# Worker threads that synthesize interviewer sentences while the AI is still streaming
+_tts_executor = None
+_tts_executor_pid = None
+
+
+def _get_tts_executor():
+    """Return the TTS thread pool, recreating it after a worker fork"""
+    global _tts_executor, _tts_executor_pid
+    if _tts_executor is None or _tts_executor_pid != os.getpid():
+        from concurrent.futures import ThreadPoolExecutor
+        _tts_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='interview-tts')
+        _tts_executor_pid = os.getpid()
+    return _tts_executor
+
+
+def _sse_event(event, data):
+    """Format one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _stream_interview_turn_events(state, turn):
+    """Yield SSE events for one interviewer turn.
+
+    AI tokens are forwarded as ``token`` events as they arrive. Each finished
+    sentence is handed to the TTS pool immediately and announced as an
+    ``audio`` event in order, so playback can start before the reply is
+    complete. A final ``done`` event carries the same fields as the JSON
+    endpoint.
+    """
+    interview = state.interview
+    context = state.context
+    interview_uuid = interview.uuid
+    executor = _get_tts_executor()
+    pending = []
+    audio_index = 0
+    
+    def queue_sentence(sentence, phrase_context=None):
+        # Scripted phrases are spoken verbatim so they match their pre-synthesized audio
+        sentence = sentence if phrase_context else clean_text(sentence)
+        if sentence:
+            pending.append((sentence, executor.submit(_synthesize_interview_audio, sentence, interview_uuid, 1.0, phrase_context)))
+    
+    def ready_audio_events(wait=False):
+        nonlocal audio_index
+        while pending and (wait or pending[0][1].done()):
+            sentence, future = pending.pop(0)
+            try:
+                audio_path, audio_duration = future.result()
+            except Exception as e:
+                logger.error(f"Sentence TTS failed for interview {interview_uuid}: {e}")
+                audio_path, audio_duration = None, max(1.0, len(sentence) * 0.05)
+            yield _sse_event('audio', {
+                'index': audio_index,
+                'text': sentence,
+                'audio': audio_path or '',
+                'audio_duration': audio_duration,
+                'has_audio': bool(audio_path),
+            })
+            audio_index += 1
+    
+    yield _sse_event('start', {
+        'question_count': turn['question_count'],
+        'time_remaining': turn['time_remaining'],
+    })
+    
+    ai_response = turn['response']
+    try:
+        if not ai_response:
+            buffer = ""
+            raw_response = ""
+            for delta in ask_ai_question_stream(
+                turn['prompt'],
+                candidate_name=context.get('candidate_name'),
+                job_title=context.get('job_title'),
+                company_name=context.get('company_name'),
+                timeout=15,
+                job_id=turn.get('job_id'),
+            ):
+                raw_response += delta
+                buffer += delta
+                yield _sse_event('token', {'text': delta})
+                sentences, buffer = split_sentences(buffer)
+                for sentence in sentences:
+                    queue_sentence(sentence)
+                yield from ready_audio_events()
+            
+            ai_response = _clean_interview_ai_response(clean_text(raw_response)) if raw_response.strip() else ""
+            if ai_response:
+                queue_sentence(buffer)
+                logger.info(f"Streamed AI conversational response: {ai_response[:100]}...")
+            else:
+                logger.warning(f"Streaming AI returned no text for interview {interview_uuid}, using fallback")
+                ai_response = _fallback_interview_response(turn, context)
+        
+        if not pending and audio_index == 0:
+            # Scripted or fallback reply - nothing was streamed. Pre-synthesized
+            # phrases go out as one segment, anything else is chunked now
+            if interview_phrases.phrase_segments(ai_response, context.get('candidate_name'), context.get('job_title'), context.get('company_name')):
+                queue_sentence(ai_response, context)
+            else:
+                sentences, remainder = split_sentences(ai_response)
+                for sentence in sentences + [remainder]:
+                    queue_sentence(sentence)
+    
+    except Exception as e:
+        logger.error(f"CRITICAL: Error streaming AI response: {e}")
+        ai_response = ai_response or f"Thank you for that response, {context.get('candidate_name', 'the candidate')}. Could you tell me more about your background and experience?"
+        if not turn['response']:
+            # Mark as completion error to prevent interview from ending
+            context['interview_completed'] = False
+        if not pending and audio_index == 0:
+            queue_sentence(ai_response)
+    
+    # The reply text is ready; waiting for its last audio segments is not response time
+    turn['replied_at'] = timezone.now()
+    yield from ready_audio_events(wait=True)
+    
+    _finish_interview_turn(interview, state, turn, ai_response)
+    
+    yield _sse_event('done', {
+        'response': ai_response,
+        'success': True,
+        'question_count': turn['question_count'],
+        'is_final': context.get('interview_completed', False),
+        'interview_completed': context.get('interview_completed', False),
+        'time_remaining': turn['time_remaining'],
+        'audio_segments': audio_index,
+    })
+
+
+@csrf_exempt
+@require_POST
+def stream_interview_turn(request, interview_uuid):
+    """Streaming variant of the interview POST - replies as server-sent events"""
+    interview = get_object_or_404(Interview, uuid=interview_uuid)
+    
+    if not interview.is_accessible:
+        return JsonResponse({
+            'error': 'Interview not accessible',
+            'message': 'This interview is no longer available.',
+            'redirect': True
+        }, status=403)
+    
+    state = InterviewState.load(interview)
+    if state is None:
+        # The interview page initializes the interview state
+        return JsonResponse({
+            'error': 'Interview session not started',
+            'success': False
+        }, status=400)
+    
+    user_text, time_remaining, error_response = _parse_interview_turn(request)
+    if error_response:
+        return error_response
+    
+    logger.info(f"Streaming turn for interview {interview_uuid}: {user_text[:100]}... (Time remaining: {time_remaining}s)")
+    
+    context = state.context
+    error_response = _check_interview_turn(context, user_text, interview_uuid)
+    if error_response:
+        return error_response
+    
+    turn = _begin_interview_turn(interview, context, user_text, time_remaining)
+    state.save()
+    
+    response = StreamingHttpResponse(
+        _stream_interview_turn_events(state, turn),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@csrf_exempt
+async def interview_turn_async(request, interview_uuid):
+    """Async interview POST for ASGI deployments.
+
+    Same request and response as the POST branch of start_interview_by_uuid,
+    but the LLM and TTS calls are awaited so a worker can hold many turns
+    that are waiting on upstream I/O.
+    """
+    if request.method != "POST":
+        return JsonResponse({'error': 'POST required', 'success': False}, status=405)
+    
+    try:
+        interview = await Interview.objects.select_related('job', 'candidate').aget(uuid=interview_uuid)
+    except Interview.DoesNotExist:
+        return JsonResponse({'error': 'Interview not found', 'success': False}, status=404)
+    
+    if not interview.is_accessible:
+        return JsonResponse({
+            'error': 'Interview not accessible',
+            'message': 'This interview is no longer available.',
+            'redirect': True
+        }, status=403)
+    
+    state = await sync_to_async(InterviewState.load)(interview)
+    if state is None:
+        # The interview page initializes the interview state
+        return JsonResponse({
+            'error': 'Interview session not started',
+            'success': False
+        }, status=400)
+    
+    try:
+        user_text, time_remaining, error_response = await sync_to_async(_parse_interview_turn)(request)
+        if error_response:
+            return error_response
+        
+        logger.info(f"Async turn for interview {interview_uuid}: {user_text[:100]}... (Time remaining: {time_remaining}s)")
+        
+        context = state.context
+        error_response = _check_interview_turn(context, user_text, interview_uuid)
+        if error_response:
+            return error_response
+        
+        turn = await sync_to_async(_begin_interview_turn)(interview, context, user_text, time_remaining)
+        await sync_to_async(state.save)()
+        
+        try:
+            ai_response = turn['response'] or await _generate_interview_ai_response_async(turn, context)
+        except Exception as response_gen_error:
+            logger.error(f"CRITICAL: Error generating AI response: {response_gen_error}")
+            ai_response = f"Thank you for that response, {context.get('candidate_name', 'the candidate')}. Could you tell me more about your background and experience?"
+            context['interview_completed'] = False
+        
+        await sync_to_async(_finish_interview_turn)(interview, state, turn, ai_response)
+        
+        audio_path, audio_duration = await _synthesize_interview_audio_async(ai_response, interview_uuid, context=context)
+        
+        return JsonResponse({
+            'response': ai_response,
+            'audio': audio_path if audio_path else '',
+            'audio_duration': audio_duration,
+            'success': True,
+            'question_count': turn['question_count'],
+            'is_final': context.get('interview_completed', False),
+            'has_audio': bool(audio_path),
+            'interview_completed': context.get('interview_completed', False),
+            'time_remaining': time_remaining
+        })
+    
+    except Exception as e:
+        logger.error(f"Async interview turn failed for {interview_uuid}: {type(e).__name__}: {e}")
+        return JsonResponse({
+            'success': False,
+            'error': 'Interview processing error',
+            'response': 'I apologize, there was a technical issue. Could you please repeat your response?',
+            'audio': '',
+            'audio_duration': 3.0,
+            'interview_completed': False,
+            'is_final': False
+        })
+
+
 # contact view
 # def contact_view(request):
 #     return render(request, 'jobapp/contact.html')
@@ -1725,35 +2145,9 @@ As Sarah, respond to what they just shared. Acknowledge their answer, show genui
 
 def serve_media(request, path):
     """
-    Serve media files in production with better error handling
+    Serve media files - access checks, conditional GETs and byte ranges (see jobapp.media_delivery)
     """
-    try:
-        # Try to serve the file
-        media_root = settings.MEDIA_ROOT
-        full_path = os.path.join(media_root, path)
-        
-        logger.info(f"Attempting to serve media file: {path}")
-        logger.info(f"Full path: {full_path}")
-        logger.info(f"File exists: {os.path.exists(full_path)}")
-        
-        if not os.path.exists(full_path):
-            logger.error(f"Media file not found: {full_path}")
-            raise Http404(f"Media file not found: {path}")
-        
-        # Get file info
-        file_size = os.path.getsize(full_path)
-        logger.info(f"File size: {file_size} bytes")
-        
-        # For PDF files, ensure proper content type
-        response = serve(request, path, document_root=media_root)
-        if path.lower().endswith('.pdf'):
-            response['Content-Type'] = 'application/pdf'
-            response['Content-Disposition'] = f'inline; filename="{os.path.basename(path)}"'
-            
-        return response
-    except Exception as e:
-        logger.error(f"Error serving media file {path}: {e}")
-        raise Http404(f"Media file not found: {path}")
+    return media_delivery.serve(request, path)
 
 # CSRF token endpoint
 def get_csrf_token(request):
@@ -1871,7 +2265,7 @@ def save_interview_recording(request):
             relative_path = os.path.join('interview_recordings', filename)
             
             # Add recording info to interview (you might want to create a separate Recording model)
-            # For now, we'll store it in the transcript field or create a new field
+            # recording_data keeps the details; the conversation itself is in InterviewTurn
             recording_info = {
                 'recording_path': relative_path,
                 'duration': float(duration),
@@ -1886,13 +2280,10 @@ def save_interview_recording(request):
             interview.recording_duration = float(duration)
             interview.is_recorded = True
             
-            # Also update transcript with recording info
-            current_transcript = interview.transcript or ''
-            interview.transcript = current_transcript + f"\n\nRecording saved: {json.dumps(recording_info)}"
-            
-            interview.save()
+            interview.save(update_fields=['recording_data', 'recording_path', 'recording_duration', 'is_recorded'])
             
             logger.info(f"Recording saved successfully: {file_path}")
+            enqueue_recording_processing(interview, relative_path)
             
             return JsonResponse({
                 'success': True,
@@ -1914,6 +2305,85 @@ def save_interview_recording(request):
     return JsonResponse({'error': 'Only POST method allowed'}, status=405)
 
 
+# Chunked, resumable recording uploads (jobapp.recording_upload) - the interview page
+# streams MediaRecorder segments while the interview runs
+def _recording_upload_urls(interview_uuid, upload):
+    upload_url = reverse('recording_upload_status', args=[interview_uuid, upload.upload_id])
+    return {
+        **recording_upload.progress(upload),
+        'upload_url': upload_url,
+        'finalize_url': reverse('finalize_recording_upload', args=[interview_uuid, upload.upload_id]),
+    }
+
+
+@require_POST
+def start_recording_upload(request, interview_uuid):
+    """Open a recording upload for an interview in progress"""
+    interview = get_object_or_404(Interview, uuid=interview_uuid)
+    if not interview.is_accessible:
+        return JsonResponse({'error': 'Interview not accessible'}, status=403)
+    
+    try:
+        data = json.loads(request.body or '{}')
+    except ValueError:
+        data = {}
+    upload = recording_upload.start(interview, data.get('content_type', ''))
+    return JsonResponse(_recording_upload_urls(interview_uuid, upload), status=201)
+
+
+@require_http_methods(["GET"])
+def recording_upload_status(request, interview_uuid, upload_id):
+    """Where an upload stands - a client resuming after a dropped connection starts from next_chunk"""
+    upload = get_object_or_404(RecordingUpload, upload_id=upload_id, interview__uuid=interview_uuid)
+    return JsonResponse(_recording_upload_urls(interview_uuid, upload))
+
+
+@require_http_methods(["PUT"])
+def upload_recording_chunk(request, interview_uuid, upload_id, index):
+    """Append chunk ``index``, read from the request body as it arrives"""
+    get_object_or_404(RecordingUpload, upload_id=upload_id, interview__uuid=interview_uuid)
+    try:
+        length = int(request.META['CONTENT_LENGTH'])
+    except (KeyError, ValueError):
+        length = None
+    
+    try:
+        upload, stored = recording_upload.append_chunk(upload_id, index, request, length)
+    except recording_upload.UploadError as e:
+        return JsonResponse({'error': str(e), **e.progress}, status=e.status)
+    except Exception as e:
+        logger.error(f"Error storing chunk {index} of recording upload {upload_id}: {e}")
+        return JsonResponse({'error': 'Failed to store chunk'}, status=500)
+    return JsonResponse({**recording_upload.progress(upload), 'stored': stored})
+
+
+@require_POST
+def finalize_recording_upload(request, interview_uuid, upload_id):
+    """Attach the uploaded recording to the interview; repeating it is harmless"""
+    get_object_or_404(RecordingUpload, upload_id=upload_id, interview__uuid=interview_uuid)
+    # JSON from fetch(), form data from navigator.sendBeacon() when the page is closing
+    if request.content_type == 'application/json':
+        try:
+            duration = json.loads(request.body or '{}').get('duration')
+        except ValueError:
+            duration = None
+    else:
+        duration = request.POST.get('duration')
+    try:
+        duration = float(duration) if duration not in (None, '') else None
+    except (TypeError, ValueError):
+        duration = None
+    
+    upload = recording_upload.finalize(upload_id, duration)
+    return JsonResponse({
+        **recording_upload.progress(upload),
+        'success': True,
+        'path': upload.file_path,
+        'file_size': upload.bytes_received,
+        'duration': upload.duration,
+    })
+
+
 
 
 @login_required
@@ -1945,7 +2415,7 @@ def add_candidates(request, job_id):
         
         # Check if candidate already exists for this recruiter (since Candidate model doesn't have job field)
         existing_candidate = Candidate.objects.filter(
-            email=candidate_email,
+            email__iexact=candidate_email,
             added_by=request.user
         ).first()
         
@@ -1993,7 +2463,7 @@ def add_candidate_dashboard(request):
                 # Check if candidate already exists for this recruiter
                 candidate_email = form.cleaned_data['email']
                 existing_candidate = Candidate.objects.filter(
-                    email=candidate_email,
+                    email__iexact=candidate_email,
                     added_by=request.user
                 ).first()
                 
@@ -2047,93 +2517,115 @@ def add_candidate_dashboard(request):
 
 @login_required
 @user_passes_test(lambda u: u.is_recruiter)
-def recruiter_dashboard(request):
-    """Updated recruiter dashboard with proper candidate handling"""
-    # Initialize all variables as empty
-    applications = []
-    jobs = []
-    scheduled_interviews = []
-    all_candidates = []
-    
-    try:
-        # Get jobs posted by this recruiter
-        jobs = Job.objects.filter(posted_by=request.user).order_by('-date_posted')
-        logger.info(f"Successfully loaded {len(jobs)} jobs for recruiter {request.user.username}")
-    except Exception as e:
-        logger.error(f"Job query failed for recruiter {request.user.username}: {e}")
-        jobs = []
-    
-    # Try to get applications for recruiter's jobs
-    try:
-        applications = Application.objects.filter(
-            job__posted_by=request.user
-        ).select_related('job', 'applicant').order_by('-applied_at')
-        logger.info(f"Successfully loaded {len(applications)} applications for recruiter {request.user.username}")
-    except Exception as e:
-        logger.warning(f"Application query failed for recruiter {request.user.username}: {e}")
-        applications = []
-    
-    # Try to get interviews for recruiter's jobs
-    try:
-        scheduled_interviews = Interview.objects.filter(
-            job__posted_by=request.user
-        ).select_related('job', 'candidate').order_by('-scheduled_at')
-        logger.info(f"Successfully loaded {len(scheduled_interviews)} interviews for recruiter {request.user.username}")
-    except Exception as e:
-        logger.warning(f"Interview query failed for recruiter {request.user.username}: {e}")
-        scheduled_interviews = []
-    
-    # Get completed interviews with results for the results section
-    try:
-        completed_interviews = Interview.objects.filter(
-            job__posted_by=request.user,
-            status='completed'
-        ).select_related('job', 'candidate').order_by('-completed_at')
-        logger.info(f"Successfully loaded {len(completed_interviews)} completed interviews for recruiter {request.user.username}")
-    except Exception as e:
-        logger.warning(f"Completed interview query failed for recruiter {request.user.username}: {e}")
-        completed_interviews = []
-    
-    # Get all candidates added by this recruiter
-    try:
-        all_candidates = Candidate.objects.filter(
-            added_by=request.user
-        ).order_by('-added_at')
-        logger.info(f"Successfully loaded {len(all_candidates)} candidates for recruiter {request.user.username}")
-    except Exception as e:
-        logger.warning(f"Candidate query failed for recruiter {request.user.username}: {e}")
-        all_candidates = []
-    
-    # Get user's jobs for the modal dropdown
-    try:
-        user_jobs = Job.objects.filter(posted_by=request.user).values('id', 'title', 'company', 'status')
-        user_jobs_list = list(user_jobs)
-        logger.info(f"Successfully loaded {len(user_jobs_list)} jobs for modal dropdown")
-    except Exception as e:
-        logger.warning(f"Could not fetch user jobs for modal: {e}")
-        user_jobs_list = []
+@require_http_methods(["POST"])
+def import_candidates(request):
+    """Start a bulk candidate import from a CSV and an optional ZIP of resumes (see jobapp.candidate_import)"""
+    from .models import CandidateImport
+    from .tasks import enqueue_candidate_import
+    
+    form = CandidateImportForm(request.POST, request.FILES)
+    if not form.is_valid():
+        return JsonResponse({'success': False, 'errors': form.errors}, status=400)
+    
+    candidate_import = CandidateImport.objects.create(
+        added_by=request.user,
+        csv_file=form.cleaned_data['csv_file'],
+        resumes_zip=form.cleaned_data.get('resumes_zip'),
+    )
+    enqueue_candidate_import(candidate_import)
+    logger.info(f"📥 Candidate import {candidate_import.pk} queued by {request.user.username}")
+    return JsonResponse({
+        'success': True,
+        'import_id': candidate_import.pk,
+        'status_url': reverse('candidate_import_status', args=[candidate_import.pk]),
+    })
+
+
+@login_required
+@user_passes_test(lambda u: u.is_recruiter)
+def candidate_import_status(request, import_id):
+    """Progress and per-row errors of a candidate import"""
+    from .models import CandidateImport
+    from .candidate_import import progress
     
-    # Prepare context
-    context = {
-        'applications': applications,
-        'scheduled_interviews': scheduled_interviews,
-        'completed_interviews': completed_interviews,
-        'all_candidates': all_candidates,
-        'jobs': jobs,
-        'user_jobs': user_jobs_list,
-        'user': request.user,
-        'debug_info': {
-            'jobs_count': len(jobs),
-            'applications_count': len(applications),
-            'interviews_count': len(scheduled_interviews),
-            'completed_interviews_count': len(completed_interviews),
-            'candidates_count': len(all_candidates)
+    candidate_import = get_object_or_404(CandidateImport, pk=import_id, added_by=request.user)
+    return JsonResponse(progress(candidate_import))
+
+
+@login_required
+@user_passes_test(lambda u: u.is_recruiter)
+def recruiter_dashboard(request):
+    """Recruiter dashboard - headline counts and the first page of applications.
+
+    The other sections are loaded over AJAX from recruiter_dashboard_section
+    when opened, see jobapp.dashboard. Rendered HTML is cached per user until
+    one of its sections changes, see jobapp.fragment_cache.
+    """
+    def render_page():
+        try:
+            counts = dashboard.counts(request.user)
+        except Exception as e:
+            logger.error(f"Dashboard counts failed for recruiter {request.user.username}: {e}")
+            counts = {}
+        
+        try:
+            applications_page, _ = dashboard.load_section(request.user, 'applications')
+        except Exception as e:
+            logger.warning(f"Application query failed for recruiter {request.user.username}: {e}")
+            applications_page = KeysetPage([])
+        
+        context = {
+            'counts': counts,
+            'applications_page': applications_page,
+            'user': request.user,
         }
-    }
+        logger.info(f"Recruiter dashboard rendered for {request.user.username}: {counts}")
+        return render_to_string('jobapp/recruiter_dashboard.html', context, request=request), None
     
-    logger.info(f"Recruiter dashboard loaded for {request.user.username}: {len(jobs)} jobs, {len(applications)} applications, {len(all_candidates)} candidates")
+    html = fragment_cache.get_or_render(
+        request.user.pk, 'recruiter_dashboard', ('counts', 'applications'), render_page,
+        *fragment_cache.vary_on_request(request)
+    )
+    return HttpResponse(html)
+
+
+@login_required
+@user_passes_test(lambda u: u.is_recruiter)
+def recruiter_dashboard_section(request, section):
+    """One page of a dashboard section as rendered card fragments"""
+    if section not in dashboard.DASHBOARD_SECTIONS:
+        return JsonResponse({'error': 'Unknown section'}, status=404)
+    cursor = request.GET.get('cursor')
+    
+    def render_section():
+        page, context = dashboard.load_section(request.user, section, cursor)
+        fragments = {
+            container: render_to_string(template, context, request=request)
+            for container, template in dashboard.DASHBOARD_SECTIONS[section]['templates'].items()
+        }
+        # Interview cards change from active to expired when a deadline passes
+        timeout = fragment_cache.seconds_until_next(item.scheduled_at for item in page.items) if section == 'interviews' else None
+        return {'fragments': fragments, 'next_cursor': page.next_cursor}, timeout
     
-    return render(request, 'jobapp/recruiter_dashboard.html', context)
+    try:
+        data = fragment_cache.get_or_render(
+            request.user.pk, f'section:{section}', (section,), render_section,
+            cursor or '', *fragment_cache.vary_on_request(request)
+        )
+    except InvalidCursor:
+        return JsonResponse({'error': 'Invalid cursor'}, status=400)
+    return JsonResponse(data)
+
+
+@login_required
+@user_passes_test(lambda u: u.is_recruiter)
+def recruiter_dashboard_options(request):
+    """Jobs and candidates for the schedule interview modal"""
+    data = fragment_cache.get_or_render(
+        request.user.pk, 'schedule_options', ('jobs', 'candidates'),
+        lambda: (dashboard.schedule_options(request.user), None)
+    )
+    return JsonResponse(data)
 
 
 
@@ -2288,47 +2780,23 @@ def get_candidate_email(request, candidate_id):
 
 
 
-def generate_interview_results(interview, conversation_history):
-    """Generate and save interview results from live conversation - FIXED VERSION"""
+def generate_interview_results(interview):
+    """Generate and save interview results from the stored interview turns"""
     try:
         logger.info(f"🔄 Starting results generation for interview {interview.uuid}")
-        logger.info(f"📊 Conversation history has {len(conversation_history)} exchanges")
-        
-        # Extract questions and answers from conversation history
-        #Collect the Conversation - Takes all questions asked by AI interviewer,Takes all answers given by candidate,
-        #Counts how many questions were asked , Measures how detailed the answers were
-        questions_asked = []
-        answers_given = []
-        candidate_responses = []
-        interviewer_questions = []
         
-        for entry in conversation_history:
-            if entry['speaker'] == 'candidate':
-                candidate_responses.append(entry['message'])
-                answers_given.append({
-                    'question_number': entry.get('question_number', 0),
-                    'answer': entry['message'],
-                    'timestamp': entry.get('timestamp', timezone.now().isoformat())
-                })
-            elif entry['speaker'] == 'interviewer':
-                interviewer_questions.append(entry['message'])
-                questions_asked.append({
-                    'question_number': entry.get('question_number', 0),
-                    'question': entry['message'],
-                    'timestamp': entry.get('timestamp', timezone.now().isoformat())
-                })
-                
-                
-                
+        # Collect the Conversation - the interviewer's questions and the
+        # candidate's answers, counted and measured in SQL
+        stats = turn_stats(interview)
+        total_questions = stats['questions']
+        total_responses = stats['answers']
         
-        logger.info(f"📝 Extracted {len(questions_asked)} questions and {len(answers_given)} answers")
+        logger.info(f"📝 Found {total_questions} questions and {total_responses} answers")
         
         # CRITICAL FIX: Handle edge case where no responses were recorded
-        if len(candidate_responses) == 0:
+        if total_responses == 0:
             logger.warning(f"⚠️ No candidate responses found for interview {interview.uuid}")
             # Still save partial results
-            interview.questions_asked = json.dumps(questions_asked)
-            interview.answers_given = json.dumps([])
             interview.overall_score = 1.0
             interview.technical_score = 1.0
             interview.communication_score = 1.0
@@ -2338,7 +2806,6 @@ def generate_interview_results(interview, conversation_history):
             interview.status = 'completed'
             interview.completed_at = timezone.now()
             interview.results_generated_at = timezone.now()
-            interview.transcript = "No conversation data available."
             interview.save()
             logger.info(f"✅ Saved partial results for interview {interview.uuid}")
             return True
@@ -2349,8 +2816,7 @@ def generate_interview_results(interview, conversation_history):
         #-Problem-Solving Score: How they think through problems (1-10)
         #-Overall Score: Average of all scores
         
-        total_responses = len(candidate_responses)
-        avg_response_length = sum(len(response) for response in candidate_responses) / max(total_responses, 1)
+        avg_response_length = stats['avg_answer_length'] or 0
         
         logger.info(f"📈 Calculating scores - Responses: {total_responses}, Avg length: {avg_response_length:.1f}")
         
@@ -2368,9 +2834,10 @@ def generate_interview_results(interview, conversation_history):
             #Generate AI Feedback
             
             
+            conversation = interview.turns.order_by('sequence').values_list('speaker', 'message')
             full_conversation = "\n\n".join([
-                f"{entry['speaker'].title()}: {entry['message']}"
-                for entry in conversation_history
+                f"{speaker.title()}: {message}"
+                for speaker, message in conversation
             ])
             
             # Create comprehensive analysis prompt
@@ -2403,7 +2870,9 @@ Focus your analysis on: technical competency demonstrated, communication clarity
                 candidate_name=interview.candidate_name,
                 job_title=interview.job.title if interview.job else 'Software Developer',
                 company_name=interview.job.company if interview.job else 'Our Company',
-                timeout=30
+                timeout=30,
+                job_id=interview.job_id,
+                upstream='llm_analysis',
             )
             
             
@@ -2458,8 +2927,6 @@ Due to the brief nature of this interview, we recommend scheduling a follow-up s
         # CRITICAL FIX: Save to database with explicit field assignment
         #Save Everything to Database
         try:
-            interview.questions_asked = json.dumps(questions_asked)
-            interview.answers_given = json.dumps(answers_given)
             interview.overall_score = round(overall_score, 1)
             interview.technical_score = round(technical_score, 1)
             interview.communication_score = round(communication_score, 1)
@@ -2470,19 +2937,12 @@ Due to the brief nature of this interview, we recommend scheduling a follow-up s
             interview.completed_at = timezone.now()
             interview.results_generated_at = timezone.now()
             
-            # Save the full conversation in transcript field
-            full_transcript = "\n\n".join([
-                f"{entry['speaker'].title()}: {entry['message']}"
-                for entry in conversation_history
-            ])
-            interview.transcript = full_transcript
-            
-            # CRITICAL: Force save to database
+            # CRITICAL: Force save to database - the conversation itself stays in InterviewTurn
             interview.save(update_fields=[
-                'questions_asked', 'answers_given', 'overall_score', 
+                'overall_score', 
                 'technical_score', 'communication_score', 'problem_solving_score',
                 'ai_feedback', 'recommendation', 'status', 'completed_at',
-                'results_generated_at', 'transcript', 'started_at'
+                'results_generated_at', 'started_at'
             ])
             
             
@@ -2490,21 +2950,13 @@ Due to the brief nature of this interview, we recommend scheduling a follow-up s
             logger.info(f"✅ Interview results saved successfully for {interview.uuid}")
             logger.info(f"📊 Final scores - Overall: {interview.overall_score}/10, Technical: {interview.technical_score}/10")
             logger.info(f"💼 Recommendation: {interview.recommendation}")
-            logger.info(f"❓ Questions: {len(questions_asked)}, 💬 Responses: {len(answers_given)}")
+            logger.info(f"❓ Questions: {total_questions}, 💬 Responses: {total_responses}")
             
             # VERIFICATION: Check if data was actually saved
             interview.refresh_from_db()
             if interview.overall_score is not None:
                 logger.info(f"✅ VERIFICATION PASSED: Results confirmed in database")
-                
-                # Send completion email automatically
-                # Email Confirmation code
-                try:
-                    send_interview_status_email(interview, 'completed')
-                    logger.info(f"✅ Completion email sent for interview {interview.uuid}")
-                except Exception as email_error:
-                    logger.error(f"❌ Failed to send completion email: {email_error}")
-                
+                # The completion email is queued by the results task
                 return True
             else:
                 logger.error(f"❌ VERIFICATION FAILED: Results not found in database after save")
@@ -2534,6 +2986,22 @@ Due to the brief nature of this interview, we recommend scheduling a follow-up s
         return False
     
     
+@login_required
+@user_passes_test(lambda u: u.is_recruiter)
+def interview_results_status(request, interview_uuid):
+    """Polled by the results page while the results task runs"""
+    interview = get_object_or_404(Interview, uuid=interview_uuid, job__posted_by=request.user)
+    results_task = get_interview_results_task(interview)
+    
+    return JsonResponse({
+        'has_results': interview.has_results,
+        'status': results_task.status if results_task else None,
+        'attempts': results_task.attempts if results_task else 0,
+        'max_attempts': results_task.max_attempts if results_task else 0,
+        'next_attempt_at': results_task.run_after.isoformat() if results_task and results_task.status == 'pending' else None,
+    })
+
+
 #interview results view 
 @login_required
 @user_passes_test(lambda u: u.is_recruiter)
@@ -2561,48 +3029,27 @@ def interview_results(request, interview_uuid):
         if not interview.has_results:
             logger.warning(f"⚠️ No results available for interview {interview_uuid}")
             logger.info(f"Debug info - Status: {interview.status}, Completed: {interview.completed_at}")
-            logger.info(f"Debug info - Questions: {bool(interview.questions_asked)}, Answers: {bool(interview.answers_given)}")
             
-            # Try to regenerate results if interview is completed but has no results
+            # Results are generated by a background task - show its progress
             if interview.status == 'completed' and interview.completed_at:
-                logger.info(f"🔄 Attempting to regenerate results...")
-                messages.info(request, 'Results are being generated for this interview. Please refresh in a moment.')
-            else:
-                messages.warning(request, 'This interview is not yet completed or has no results.')
+                results_task = get_interview_results_task(interview)
+                if results_task is None:
+                    logger.info(f"🔄 No results task found, queueing one...")
+                    results_task = enqueue_interview_results(interview)
+                return render(request, 'jobapp/interview_results_pending.html', {
+                    'interview': interview,
+                    'results_task': results_task,
+                })
             
+            messages.warning(request, 'This interview is not yet completed or has no results.')
             return redirect('recruiter_dashboard')
         
-        # Parse the questions and answers from JSON
-        questions_asked = []
-        answers_given = []
-        
-        try:
-            if interview.questions_asked:
-                questions_asked = json.loads(interview.questions_asked)
-                logger.info(f"✅ Parsed {len(questions_asked)} questions")
-        except (json.JSONDecodeError, TypeError) as e:
-            logger.error(f"❌ Could not parse questions_asked: {e}")
-        
-        try:
-            if interview.answers_given:
-                answers_given = json.loads(interview.answers_given)
-                logger.info(f"✅ Parsed {len(answers_given)} answers")
-        except (json.JSONDecodeError, TypeError) as e:
-            logger.error(f"❌ Could not parse answers_given: {e}")
-        
-        # Combine questions and answers for display 
-        qa_pairs = []
-        for i in range(max(len(questions_asked), len(answers_given))):
-            question = questions_asked[i] if i < len(questions_asked) else None
-            answer = answers_given[i] if i < len(answers_given) else None
-            
-            qa_pairs.append({
-                'question_number': i + 1,
-                'question': question['question'] if question else 'Question not recorded',
-                'answer': answer['answer'] if answer else 'Answer not recorded',
-                'question_timestamp': question.get('timestamp') if question else None,
-                'answer_timestamp': answer.get('timestamp') if answer else None
-            })
+        # Pair the stored turns into questions and answers, in conversation order
+        turns = interview.turns.only(
+            'sequence', 'speaker', 'message', 'timestamp', 'response_ms', 'answer_ms'
+        ).order_by('sequence')
+        qa_pairs = pair_turns(turns)
+        stats = turn_stats(interview)
         
         logger.info(f"✅ Created {len(qa_pairs)} Q&A pairs for display")
         
@@ -2653,8 +3100,8 @@ def interview_results(request, interview_uuid):
             'interview': interview,
             'qa_pairs': qa_pairs,
             'interview_duration': interview_duration,
-            'total_questions': len(questions_asked),
-            'total_answers': len(answers_given),
+            'total_questions': stats['questions'],
+            'total_answers': stats['answers'],
         }
         
         logger.info(f"✅ Rendering results page with {len(qa_pairs)} Q&A pairs")
@@ -2688,7 +3135,7 @@ def send_interview_email_manual(request, interview_uuid):
         result = send_interview_link_email(interview)
         
         if result['success']:
-            messages.success(request, f'Interview email sent successfully to {interview.candidate_email}!')
+            messages.success(request, f'Interview email to {interview.candidate_email} queued for delivery!')
         else:
             messages.warning(request, f'Email could not be sent, but interview link is available: {result["interview_url"]}')
         
@@ -0,0 +1,143 @@
+// Streams an interview recording to the server while it is being recorded.
+// MediaRecorder segments are PUT one by one as numbered chunks
+// (see jobapp.recording_upload); a segment is dropped from memory once the
+// server has acknowledged it. Failed chunks are retried with backoff, and
+// after a dropped connection the upload resumes from the server's next_chunk.
+class ChunkedRecordingUpload {
+    constructor({ startUrl, csrfToken, timeslice = 5000 }) {
+        this.startUrl = startUrl;
+        this.csrfToken = csrfToken;
+        this.timeslice = timeslice;
+        this.upload = null;
+        this.recorder = null;
+        this.queue = [];           // Blobs not yet acknowledged, queue[0] is chunk nextIndex
+        this.nextIndex = 0;
+        this.sending = false;
+        this.retryDelay = 1000;
+        this.startedAt = null;
+        this.finalized = false;
+        this.onPageHide = () => this.finalizeOnUnload();
+    }
+
+    static mimeType() {
+        const types = ['video/webm;codecs=vp8,opus', 'video/webm', 'audio/webm;codecs=opus', 'audio/webm', 'video/mp4'];
+        return types.find(type => window.MediaRecorder && MediaRecorder.isTypeSupported(type)) || '';
+    }
+
+    async start(stream) {
+        const mimeType = ChunkedRecordingUpload.mimeType();
+        const response = await fetch(this.startUrl, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json', 'X-CSRFToken': this.csrfToken },
+            body: JSON.stringify({ content_type: mimeType || 'video/webm' })
+        });
+        if (!response.ok) {
+            throw new Error(`Could not start recording upload (${response.status})`);
+        }
+        this.upload = await response.json();
+
+        this.recorder = new MediaRecorder(stream, mimeType ? { mimeType } : undefined);
+        this.recorder.ondataavailable = event => {
+            if (event.data && event.data.size > 0) {
+                this.queue.push(event.data);
+                this.pump();
+            }
+        };
+        this.recorder.start(this.timeslice);
+        this.startedAt = Date.now();
+        window.addEventListener('pagehide', this.onPageHide);
+        console.log('🎥 Recording upload started:', this.upload.upload_id);
+    }
+
+    chunkUrl(index) {
+        return `${this.upload.upload_url}chunks/${index}/`;
+    }
+
+    async pump() {
+        if (this.sending || !this.queue.length) return;
+        this.sending = true;
+        try {
+            while (this.queue.length) {
+                const response = await fetch(this.chunkUrl(this.nextIndex), {
+                    method: 'PUT',
+                    headers: { 'X-CSRFToken': this.csrfToken, 'Content-Type': 'application/octet-stream' },
+                    body: this.queue[0]
+                });
+                if (response.ok) {
+                    this.queue.shift();
+                    this.nextIndex += 1;
+                    this.retryDelay = 1000;
+                } else if (response.status === 409) {
+                    // Out of step with the server (a retry it already stored) - resync
+                    await this.resync();
+                } else {
+                    throw new Error(`Chunk ${this.nextIndex} failed (${response.status})`);
+                }
+            }
+        } catch (error) {
+            console.warn('⚠️ Recording chunk upload failed, retrying:', error.message);
+            this.sending = false;
+            setTimeout(() => this.pump(), this.retryDelay);
+            this.retryDelay = Math.min(this.retryDelay * 2, 30000);
+            return;
+        }
+        this.sending = false;
+        if (this.drained && !this.queue.length) this.drained();
+    }
+
+    async resync() {
+        const response = await fetch(this.upload.upload_url, { headers: { 'Accept': 'application/json' } });
+        if (!response.ok) throw new Error(`Upload status failed (${response.status})`);
+        const state = await response.json();
+        if (state.status !== 'uploading') {
+            this.queue = [];
+            return;
+        }
+        // Drop what the server already has
+        while (this.nextIndex < state.next_chunk && this.queue.length) {
+            this.queue.shift();
+            this.nextIndex += 1;
+        }
+        this.nextIndex = state.next_chunk;
+    }
+
+    // Stop recording, send what is left and finalize; resolves with the server's answer
+    async finish() {
+        if (!this.upload || this.finalized) return null;
+        if (this.recorder && this.recorder.state !== 'inactive') {
+            await new Promise(resolve => {
+                this.recorder.addEventListener('stop', resolve, { once: true });
+                this.recorder.stop();
+            });
+        }
+        if (this.queue.length || this.sending) {
+            await new Promise(resolve => { this.drained = resolve; this.pump(); });
+        }
+        this.finalized = true;
+        window.removeEventListener('pagehide', this.onPageHide);
+        const response = await fetch(this.upload.finalize_url, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json', 'X-CSRFToken': this.csrfToken },
+            body: JSON.stringify({ duration: this.duration() })
+        });
+        const result = await response.json();
+        console.log('✅ Recording upload finalized:', result);
+        return result;
+    }
+
+    duration() {
+        return this.startedAt ? (Date.now() - this.startedAt) / 1000 : 0;
+    }
+
+    // The tab is closing: chunks already sent are kept, the rest is lost
+    finalizeOnUnload() {
+        if (!this.upload || this.finalized) return;
+        this.finalized = true;
+        const form = new FormData();
+        form.append('csrfmiddlewaretoken', this.csrfToken);
+        form.append('duration', this.duration());
+        navigator.sendBeacon(this.upload.finalize_url, form);
+    }
+}
+
+window.ChunkedRecordingUpload = ChunkedRecordingUpload;